@@ -1,11 +1,18 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import base64
 import json
+import mmap
+import os
 import struct
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from io import BytesIO
-from typing import Final, Optional, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Final, Literal, Optional, Union, overload
 from urllib.parse import urlparse
 
+import numpy as np
 from mathutils import Quaternion, Vector
 
 from .convert import Json
@@ -24,95 +31,219 @@ from .gl import (
 FLOAT_POSITIVE_MAX: Final = 3.4028237e38
 FLOAT_NEGATIVE_MAX: Final = -FLOAT_POSITIVE_MAX
 
+COMPONENT_TYPE_TO_DTYPE: Final[Mapping[int, str]] = {
+    GL_BYTE: "<i1",
+    GL_UNSIGNED_BYTE: "<u1",
+    GL_SHORT: "<i2",
+    GL_UNSIGNED_SHORT: "<u2",
+    GL_INT: "<i4",
+    GL_UNSIGNED_INT: "<u4",
+    GL_FLOAT: "<f4",
+}
+
+# (columns, rows). Vectors are treated as a single column.
+ACCESSOR_TYPE_TO_SHAPE: Final[Mapping[str, tuple[int, ...]]] = {
+    "SCALAR": (),
+    "VEC2": (2,),
+    "VEC3": (3,),
+    "VEC4": (4,),
+    "MAT2": (2, 2),
+    "MAT3": (3, 3),
+    "MAT4": (4, 4),
+}
+
+if TYPE_CHECKING:
+    # Blender 2.93付属のNumPyにはnumpy.typingが存在しないため、型チェック時のみ使う
+    from numpy.typing import NDArray
+
+    AccessorArray = Union[
+        NDArray[np.int8],
+        NDArray[np.uint8],
+        NDArray[np.int16],
+        NDArray[np.uint16],
+        NDArray[np.int32],
+        NDArray[np.uint32],
+        NDArray[np.float32],
+    ]
+
+DecodedAccessor = Union[
+    tuple[int, ...],
+    tuple[float, ...],
+    tuple[tuple[int, int], ...],
+    tuple[tuple[float, float], ...],
+    tuple[tuple[int, int, int], ...],
+    tuple[tuple[float, float, float], ...],
+    tuple[tuple[int, int, int, int], ...],
+    tuple[tuple[float, float, float, float], ...],
+    tuple[
+        tuple[
+            tuple[int, int, int, int],
+            tuple[int, int, int, int],
+            tuple[int, int, int, int],
+            tuple[int, int, int, int],
+        ],
+        ...,
+    ],
+    tuple[
+        tuple[
+            tuple[float, float, float, float],
+            tuple[float, float, float, float],
+            tuple[float, float, float, float],
+            tuple[float, float, float, float],
+        ],
+        ...,
+    ],
+]
 
-def parse_glb(data: bytes) -> tuple[dict[str, Json], bytes]:
-    with BytesIO(data) as glb:
-        header_bytes = glb.read(12)
-        if len(header_bytes) != 12:
-            message = "Failed to read VRM glTF header: " + ",".join(
-                chr(b) for b in header_bytes
-            )
-            raise ValueError(message)
-
-        header: tuple[bytes, int, int] = struct.unpack("<4sII", header_bytes)
-        magic, version, length = header
-        if magic != b"glTF":
-            message = "Invalid VRM glTF magic bytes: " + ",".join(chr(b) for b in magic)
-            raise ValueError(message)
-
-        if version != 2:
-            message = f"Unsupported VRM glTF Version: {version}"
-            raise ValueError(message)
-
-        chunks_bytes_length = length - 12
-        if chunks_bytes_length < 0:
-            message = f"Invalid VRM glTF length: {length}"
-            raise ValueError(message)
-
-        chunks_bytes = glb.read(chunks_bytes_length)
-        if len(chunks_bytes) != chunks_bytes_length:
-            message = "Failed to read VRM chunks bytes"
-            raise ValueError(message)
-
-    with BytesIO(chunks_bytes) as chunks:
-        json_chunk_length_bytes = chunks.read(4)
-        if len(json_chunk_length_bytes) != 4:
-            message = "Failed to read VRM json chunk length bytes"
-            raise ValueError(message)
-
-        json_chunk_type_bytes = chunks.read(4)
-        if len(json_chunk_type_bytes) != 4:
-            message = "Failed to read VRM json chunk type bytes"
-            raise ValueError(message)
-
-        if json_chunk_type_bytes != b"JSON":
-            message = "Invalid VRM json chunk type bytes: " + ",".join(
-                chr(b) for b in json_chunk_type_bytes
-            )
-            raise ValueError(message)
-
-        json_chunk_data_length: int = struct.unpack("<I", json_chunk_length_bytes)[0]
-        json_chunk_data_bytes = chunks.read(json_chunk_data_length)
-        if len(json_chunk_data_bytes) != json_chunk_data_length:
-            message = "Failed to read VRM json chunk"
-            raise ValueError(message)
-
-        raw_json = json.loads(json_chunk_data_bytes)  # raises json.JSONDecodeError
-        json_obj = make_json(raw_json)
-        if not isinstance(json_obj, dict):
-            message = f"Unexpected VRM json format: {type(json_obj)}"
-            raise TypeError(message)
-
-        bin_chunk_length_bytes = chunks.read(4)
-        if not bin_chunk_length_bytes:
-            return json_obj, b""
-        if len(bin_chunk_length_bytes) != 4:
-            message = "Failed to read VRM bin chunk length bytes"
-            raise ValueError(message)
-
-        bin_chunk_type_bytes = chunks.read(4)
-        if len(bin_chunk_type_bytes) != 4:
-            message = "Failed to read VRM bin chunk type bytes"
-            raise ValueError(message)
-
-        if bin_chunk_type_bytes != b"BIN\x00":
-            message = "Invalid VRM bin chunk type bytes: " + ",".join(
-                chr(b) for b in bin_chunk_type_bytes
-            )
-            raise ValueError(message)
 
-        bin_chunk_data_length: int = struct.unpack("<I", bin_chunk_length_bytes)[0]
-        bin_chunk_data_bytes = chunks.read(bin_chunk_data_length)
-        if len(bin_chunk_data_bytes) != bin_chunk_data_length:
-            message = "Failed to read VRM bin chunk"
-            raise ValueError(message)
+def parse_glb(data: Union[bytes, memoryview]) -> tuple[dict[str, Json], bytes]:
+    json_dict, bin_chunk_data = parse_glb_as_memoryview(memoryview(data))
+    try:
+        return json_dict, bin_chunk_data.tobytes()
+    finally:
+        bin_chunk_data.release()
 
-    return json_obj, bin_chunk_data_bytes
 
+def parse_glb_as_memoryview(data: memoryview) -> tuple[dict[str, Json], memoryview]:
+    """Parse GLB without copying its BIN chunk.
 
-def pack_glb(
-    json_dict: dict[str, Json], bin_chunk_bytes: Union[bytes, bytearray]
-) -> bytes:
+    The returned BIN chunk is a slice of ``data``. Other slices are converted to
+    bytes immediately so that no view of ``data`` outlives a parse error.
+    """
+    header_bytes = bytes(data[:12])
+    if len(header_bytes) != 12:
+        message = "Failed to read VRM glTF header: " + ",".join(
+            chr(b) for b in header_bytes
+        )
+        raise ValueError(message)
+
+    header: tuple[bytes, int, int] = struct.unpack("<4sII", header_bytes)
+    magic, version, length = header
+    if magic != b"glTF":
+        message = "Invalid VRM glTF magic bytes: " + ",".join(chr(b) for b in magic)
+        raise ValueError(message)
+
+    if version != 2:
+        message = f"Unsupported VRM glTF Version: {version}"
+        raise ValueError(message)
+
+    chunks_bytes_length = length - 12
+    if chunks_bytes_length < 0:
+        message = f"Invalid VRM glTF length: {length}"
+        raise ValueError(message)
+
+    if len(data) < length:
+        message = "Failed to read VRM chunks bytes"
+        raise ValueError(message)
+
+    def read_chunks_bytes(start: int, size: int) -> bytes:
+        return bytes(data[start : min(start + size, length)])
+
+    json_chunk_length_bytes = read_chunks_bytes(12, 4)
+    if len(json_chunk_length_bytes) != 4:
+        message = "Failed to read VRM json chunk length bytes"
+        raise ValueError(message)
+
+    json_chunk_type_bytes = read_chunks_bytes(16, 4)
+    if len(json_chunk_type_bytes) != 4:
+        message = "Failed to read VRM json chunk type bytes"
+        raise ValueError(message)
+
+    if json_chunk_type_bytes != b"JSON":
+        message = "Invalid VRM json chunk type bytes: " + ",".join(
+            chr(b) for b in json_chunk_type_bytes
+        )
+        raise ValueError(message)
+
+    json_chunk_data_length: int = struct.unpack("<I", json_chunk_length_bytes)[0]
+    json_chunk_data_start = 12 + 8
+    json_chunk_data_end = json_chunk_data_start + json_chunk_data_length
+    json_chunk_data_bytes = read_chunks_bytes(
+        json_chunk_data_start, json_chunk_data_length
+    )
+    if len(json_chunk_data_bytes) != json_chunk_data_length:
+        message = "Failed to read VRM json chunk"
+        raise ValueError(message)
+
+    raw_json = json.loads(json_chunk_data_bytes)  # raises json.JSONDecodeError
+    json_obj = make_json(raw_json)
+    if not isinstance(json_obj, dict):
+        message = f"Unexpected VRM json format: {type(json_obj)}"
+        raise TypeError(message)
+
+    bin_chunk_length_bytes = read_chunks_bytes(json_chunk_data_end, 4)
+    if not bin_chunk_length_bytes:
+        return json_obj, memoryview(b"")
+    if len(bin_chunk_length_bytes) != 4:
+        message = "Failed to read VRM bin chunk length bytes"
+        raise ValueError(message)
+
+    bin_chunk_type_bytes = read_chunks_bytes(json_chunk_data_end + 4, 4)
+    if len(bin_chunk_type_bytes) != 4:
+        message = "Failed to read VRM bin chunk type bytes"
+        raise ValueError(message)
+
+    if bin_chunk_type_bytes != b"BIN\x00":
+        message = "Invalid VRM bin chunk type bytes: " + ",".join(
+            chr(b) for b in bin_chunk_type_bytes
+        )
+        raise ValueError(message)
+
+    bin_chunk_data_length: int = struct.unpack("<I", bin_chunk_length_bytes)[0]
+    bin_chunk_data_start = json_chunk_data_end + 8
+    bin_chunk_data_end = bin_chunk_data_start + bin_chunk_data_length
+    if bin_chunk_data_end > length:
+        message = "Failed to read VRM bin chunk"
+        raise ValueError(message)
+
+    return json_obj, data[bin_chunk_data_start:bin_chunk_data_end]
+
+
+@contextmanager
+def open_glb(path: Path) -> Iterator[tuple[dict[str, Json], memoryview]]:
+    """Memory-map a GLB file and parse it in place.
+
+    The file is read only once, by the page cache. The BIN chunk is a view of
+    the mapping and must not be used after leaving the context.
+    """
+    with path.open("rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # An empty file cannot be mapped
+            yield parse_glb_as_memoryview(memoryview(b""))
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = memoryview(mapped)
+            try:
+                json_dict, bin_chunk_bytes = parse_glb_as_memoryview(data)
+                try:
+                    yield json_dict, bin_chunk_bytes
+                finally:
+                    bin_chunk_bytes.release()
+            finally:
+                data.release()
+
+
+BinChunkSegment = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class Glb:
+    """GLB whose BIN chunk is kept as a sequence of segments.
+
+    The segments are concatenated only when written, so large buffers such as
+    images need not be copied into a single bytes object.
+    """
+
+    json_dict: dict[str, Json]
+    bin_chunk_segments: Sequence[BinChunkSegment]
+
+
+def write_glb(
+    file: BinaryIO,
+    json_dict: dict[str, Json],
+    bin_chunk_segments: Sequence[BinChunkSegment],
+) -> int:
+    """Write GLB to a file object segment by segment and return its length."""
     # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#binary-gltf-layout
     json_chunk_bytes = json.dumps(
         json_dict,
@@ -122,56 +253,43 @@ def pack_glb(
         # Unity Editor.
         ensure_ascii=False,
     ).encode()
+    json_chunk_padding_bytes = b"\x20" * (-len(json_chunk_bytes) % 4)
+    json_chunk_length = len(json_chunk_bytes) + len(json_chunk_padding_bytes)
 
-    while len(json_chunk_bytes) % 4 != 0:
-        json_chunk_bytes += b"\x20"
-
-    while len(bin_chunk_bytes) % 4 != 0:
-        bin_chunk_bytes += b"\x00"
-
-    glb = bytearray()
-
-    glb.extend(b"glTF")  # magic
-    glb.extend(struct.pack("<I", 2))  # version
-    glb.extend(  # length
-        struct.pack(
-            "<I",
-            # header
-            12
-            # json chunk
-            + 8
-            + len(json_chunk_bytes)
-            # binary chunk
-            + 8
-            + len(bin_chunk_bytes),
-        )
-    )
+    bin_chunk_length = sum(memoryview(segment).nbytes for segment in bin_chunk_segments)
+    bin_chunk_padding_bytes = b"\x00" * (-bin_chunk_length % 4)
+    bin_chunk_length += len(bin_chunk_padding_bytes)
 
-    glb.extend(struct.pack("<I", len(json_chunk_bytes)))
-    glb.extend(b"JSON")
-    glb.extend(json_chunk_bytes)
+    length = 12 + 8 + json_chunk_length + 8 + bin_chunk_length
 
-    glb.extend(struct.pack("<I", len(bin_chunk_bytes)))
-    glb.extend(b"BIN\x00")
-    glb.extend(bin_chunk_bytes)
+    file.write(struct.pack("<4sII", b"glTF", 2, length))
 
-    return bytes(glb)
+    file.write(struct.pack("<I", json_chunk_length))
+    file.write(b"JSON")
+    file.write(json_chunk_bytes)
+    file.write(json_chunk_padding_bytes)
 
+    file.write(struct.pack("<I", bin_chunk_length))
+    file.write(b"BIN\x00")
+    file.writelines(bin_chunk_segments)
+    file.write(bin_chunk_padding_bytes)
 
-def read_accessor_as_bytes(
-    accessor_dict: dict[str, Json],
-    buffer_view_dicts: list[Json],
+    return length
+
+
+def pack_glb(
+    json_dict: dict[str, Json], bin_chunk_bytes: Union[bytes, bytearray, memoryview]
+) -> bytes:
+    with BytesIO() as file:
+        write_glb(file, json_dict, [bin_chunk_bytes])
+        return file.getvalue()
+
+
+def read_buffer_view_as_memoryview(
+    buffer_view_dict: dict[str, Json],
     buffer_dicts: list[Json],
-    bin_chunk_bytes: Optional[bytes],
-) -> Optional[bytes]:
-    buffer_view_index = accessor_dict.get("bufferView")
-    if not isinstance(buffer_view_index, int):
-        return None
-    if not 0 <= buffer_view_index < len(buffer_view_dicts):
-        return None
-    buffer_view_dict = buffer_view_dicts[buffer_view_index]
-    if not isinstance(buffer_view_dict, dict):
-        return None
+    bin_chunk_bytes: Union[bytes, memoryview, None],
+) -> Optional[memoryview]:
     buffer_index = buffer_view_dict.get("buffer")
     if not isinstance(buffer_index, int):
         return None
@@ -211,143 +329,201 @@ def read_accessor_as_bytes(
         return None
     if not 0 <= byte_offset + byte_length <= len(buffer_bytes):
         return None
-    return buffer_bytes[slice(byte_offset, byte_offset + byte_length)]
-
-
-def unpack_component(
-    component_type: int, unpack_count: int, buffer_bytes: bytes
-) -> Optional[Union[tuple[int, ...], tuple[float, ...]]]:
-    for search_component_type, component_count, unpack_symbol in [
-        (GL_BYTE, 1, "b"),
-        (GL_UNSIGNED_BYTE, 1, "B"),
-        (GL_SHORT, 2, "h"),
-        (GL_UNSIGNED_SHORT, 2, "H"),
-        (GL_INT, 4, "i"),
-        (GL_UNSIGNED_INT, 4, "I"),
-        (GL_FLOAT, 4, "f"),
-    ]:
-        if search_component_type != component_type:
-            continue
-        if unpack_count == 0:
-            return ()
-        if not 1 <= unpack_count * component_count <= len(buffer_bytes):
-            return None
-        return struct.unpack("<" + unpack_symbol * unpack_count, buffer_bytes)
-    return None
+    # Slicing a memoryview does not copy the underlying buffer
+    return memoryview(buffer_bytes)[byte_offset : byte_offset + byte_length]
 
 
-def unpack_accessor_as_scalar_components(
+def get_accessor_buffer_view_dict(
+    accessor_dict: dict[str, Json],
+    buffer_view_dicts: list[Json],
+) -> Optional[dict[str, Json]]:
+    buffer_view_index = accessor_dict.get("bufferView")
+    if not isinstance(buffer_view_index, int):
+        return None
+    if not 0 <= buffer_view_index < len(buffer_view_dicts):
+        return None
+    buffer_view_dict = buffer_view_dicts[buffer_view_index]
+    if not isinstance(buffer_view_dict, dict):
+        return None
+    return buffer_view_dict
+
+
+def read_accessor_as_bytes(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
-    unpack_count: int,
-) -> Union[tuple[int, ...], tuple[float, ...], None]:
+    bin_chunk_bytes: Union[bytes, memoryview, None],
+) -> Optional[bytes]:
+    buffer_view_dict = get_accessor_buffer_view_dict(accessor_dict, buffer_view_dicts)
+    if buffer_view_dict is None:
+        return None
+    buffer_view_bytes = read_buffer_view_as_memoryview(
+        buffer_view_dict, buffer_dicts, bin_chunk_bytes
+    )
+    if buffer_view_bytes is None:
+        return None
+    return buffer_view_bytes.tobytes()
+
+
+def read_accessor_as_ndarray(
+    accessor_dict: dict[str, Json],
+    buffer_view_dicts: list[Json],
+    buffer_dicts: list[Json],
+    buffer0_bytes: Union[bytes, memoryview, None],
+    *,
+    normalize: bool = True,
+) -> "Optional[AccessorArray]":
+    """Decode an accessor into a read-only NumPy array.
+
+    The result has the shape (count, *ACCESSOR_TYPE_TO_SHAPE[type]) and shares
+    memory with the buffer. byteOffset, byteStride and the column alignment of
+    matrices are expressed as strides, so no element is copied. Only normalized
+    integer accessors are copied, because they are converted to float32.
+    """
+    accessor_type = accessor_dict.get("type")
+    if not isinstance(accessor_type, str):
+        return None
+    element_shape = ACCESSOR_TYPE_TO_SHAPE.get(accessor_type)
+    if element_shape is None:
+        return None
     component_type = accessor_dict.get("componentType")
     if not isinstance(component_type, int):
         return None
+    dtype_str = COMPONENT_TYPE_TO_DTYPE.get(component_type)
+    if dtype_str is None:
+        return None
+    dtype = np.dtype(dtype_str)
+    count = accessor_dict.get("count")
+    if not isinstance(count, int) or count < 0:
+        return None
+    accessor_byte_offset = accessor_dict.get("byteOffset", 0)
+    if not isinstance(accessor_byte_offset, int) or accessor_byte_offset < 0:
+        return None
 
-    raw_bytes = read_accessor_as_bytes(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
+    buffer_view_dict = get_accessor_buffer_view_dict(accessor_dict, buffer_view_dicts)
+    if buffer_view_dict is None:
+        return None
+    buffer_view_bytes = read_buffer_view_as_memoryview(
+        buffer_view_dict, buffer_dicts, buffer0_bytes
     )
-    if not raw_bytes:
+    if buffer_view_bytes is None:
         return None
 
-    return unpack_component(component_type, unpack_count, raw_bytes)
+    component_byte_length = dtype.itemsize
+    element_strides: tuple[int, ...]
+    if len(element_shape) == 2:
+        # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#data-alignment
+        columns, rows = element_shape
+        column_byte_length = (rows * component_byte_length + 3) // 4 * 4
+        element_strides = (column_byte_length, component_byte_length)
+        element_byte_length = columns * column_byte_length
+    elif len(element_shape) == 1:
+        element_strides = (component_byte_length,)
+        element_byte_length = element_shape[0] * component_byte_length
+    else:
+        element_strides = ()
+        element_byte_length = component_byte_length
+
+    byte_stride = buffer_view_dict.get("byteStride", element_byte_length)
+    if not isinstance(byte_stride, int) or byte_stride < element_byte_length:
+        return None
+
+    if count == 0:
+        array: AccessorArray = np.empty((0, *element_shape), dtype=dtype)
+    else:
+        required_byte_length = (
+            accessor_byte_offset + byte_stride * (count - 1) + element_byte_length
+        )
+        if required_byte_length > len(buffer_view_bytes):
+            return None
+        array = np.ndarray(
+            shape=(count, *element_shape),
+            dtype=dtype,
+            buffer=buffer_view_bytes,
+            offset=accessor_byte_offset,
+            strides=(byte_stride, *element_strides),
+        )
+    array.flags.writeable = False
+
+    if (
+        not normalize
+        or accessor_dict.get("normalized") is not True
+        or dtype.kind not in ["i", "u"]
+    ):
+        return array
+
+    # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#animations
+    normalized_array: NDArray[np.float32] = array.astype(np.float32) / np.float32(
+        np.iinfo(dtype).max
+    )
+    if dtype.kind == "i":
+        np.maximum(normalized_array, np.float32(-1), out=normalized_array)
+    normalized_array.flags.writeable = False
+    return normalized_array
+
+
+# The read_*_accessor() functions below are kept for compatibility. They are
+# built on read_accessor_as_ndarray() and convert its result into nested tuples.
 
 
 def read_scalar_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Union[tuple[int, ...], tuple[float, ...], None]:
     accessor_type = accessor_dict.get("type")
     if accessor_type != "SCALAR":
         return None
-    count = accessor_dict.get("count")
-    if not isinstance(count, int):
-        return None
-    return unpack_accessor_as_scalar_components(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
-        count,
+    array = read_accessor_as_ndarray(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes, normalize=False
     )
+    if array is None:
+        return None
+    return tuple(array.tolist())
 
 
 def read_vec2_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Union[tuple[tuple[int, int], ...], tuple[tuple[float, float], ...], None]:
     accessor_type = accessor_dict.get("type")
     if accessor_type != "VEC2":
         return None
-    count = accessor_dict.get("count")
-    if not isinstance(count, int):
-        return None
-    components = unpack_accessor_as_scalar_components(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
-        count * 2,
+    array = read_accessor_as_ndarray(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes, normalize=False
     )
-    if components is None:
+    if array is None:
         return None
-    return tuple(
-        (
-            components[i],
-            components[i + 1],
-        )
-        for i in range(0, count * 2, 2)
-    )
+    return tuple((x, y) for x, y in array.tolist())
 
 
 def read_vec3_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Union[
     tuple[tuple[int, int, int], ...], tuple[tuple[float, float, float], ...], None
 ]:
     accessor_type = accessor_dict.get("type")
     if accessor_type != "VEC3":
         return None
-    count = accessor_dict.get("count")
-    if not isinstance(count, int):
-        return None
-    components = unpack_accessor_as_scalar_components(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
-        count * 3,
+    array = read_accessor_as_ndarray(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes, normalize=False
     )
-    if components is None:
+    if array is None:
         return None
-    return tuple(
-        (
-            components[i],
-            components[i + 1],
-            components[i + 2],
-        )
-        for i in range(0, count * 3, 3)
-    )
+    return tuple((x, y, z) for x, y, z in array.tolist())
 
 
 def read_vec4_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Union[
     tuple[tuple[int, int, int, int], ...],
     tuple[tuple[float, float, float, float], ...],
@@ -356,34 +532,19 @@ def read_vec4_accessor(
     accessor_type = accessor_dict.get("type")
     if accessor_type != "VEC4":
         return None
-    count = accessor_dict.get("count")
-    if not isinstance(count, int):
-        return None
-    components = unpack_accessor_as_scalar_components(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
-        count * 4,
+    array = read_accessor_as_ndarray(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes, normalize=False
     )
-    if components is None:
+    if array is None:
         return None
-    return tuple(
-        (
-            components[i],
-            components[i + 1],
-            components[i + 2],
-            components[i + 3],
-        )
-        for i in range(0, count * 4, 4)
-    )
+    return tuple((x, y, z, w) for x, y, z, w in array.tolist())
 
 
 def read_mat4_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Union[
     tuple[
         tuple[
@@ -408,46 +569,24 @@ def read_mat4_accessor(
     accessor_type = accessor_dict.get("type")
     if accessor_type != "MAT4":
         return None
-    count = accessor_dict.get("count")
-    if not isinstance(count, int):
-        return None
-    components = unpack_accessor_as_scalar_components(
-        accessor_dict,
-        buffer_view_dicts,
-        buffer_dicts,
-        buffer0_bytes,
-        count * 16,
+    array = read_accessor_as_ndarray(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes, normalize=False
     )
-    if components is None:
+    if array is None:
         return None
     return tuple(
         (
-            (
-                components[i],
-                components[i + 1],
-                components[i + 2],
-                components[i + 3],
-            ),
-            (
-                components[i + 4],
-                components[i + 5],
-                components[i + 6],
-                components[i + 7],
-            ),
-            (
-                components[i + 8],
-                components[i + 9],
-                components[i + 10],
-                components[i + 11],
-            ),
-            (
-                components[i + 12],
-                components[i + 13],
-                components[i + 14],
-                components[i + 15],
-            ),
+            (c0x, c0y, c0z, c0w),
+            (c1x, c1y, c1z, c1w),
+            (c2x, c2y, c2z, c2w),
+            (c3x, c3y, c3z, c3w),
         )
-        for i in range(0, count * 16, 16)
+        for (
+            (c0x, c0y, c0z, c0w),
+            (c1x, c1y, c1z, c1w),
+            (c2x, c2y, c2z, c2w),
+            (c3x, c3y, c3z, c3w),
+        ) in array.tolist()
     )
 
 
@@ -455,36 +594,8 @@ def read_accessor(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
-) -> Union[
-    tuple[int, ...],
-    tuple[float, ...],
-    tuple[tuple[int, int], ...],
-    tuple[tuple[float, float], ...],
-    tuple[tuple[int, int, int], ...],
-    tuple[tuple[float, float, float], ...],
-    tuple[tuple[int, int, int, int], ...],
-    tuple[tuple[float, float, float, float], ...],
-    tuple[
-        tuple[
-            tuple[int, int, int, int],
-            tuple[int, int, int, int],
-            tuple[int, int, int, int],
-            tuple[int, int, int, int],
-        ],
-        ...,
-    ],
-    tuple[
-        tuple[
-            tuple[float, float, float, float],
-            tuple[float, float, float, float],
-            tuple[float, float, float, float],
-            tuple[float, float, float, float],
-        ],
-        ...,
-    ],
-    None,
-]:
+    buffer0_bytes: Union[bytes, memoryview],
+) -> Optional[DecodedAccessor]:
     accessor_type = accessor_dict.get("type")
     if accessor_type == "SCALAR":
         return read_scalar_accessor(
@@ -509,40 +620,39 @@ def read_accessor(
     return None
 
 
+@overload
 def read_accessors(
     json_dict: dict[str, Json],
-    buffer0_bytes: bytes,
-) -> tuple[
-    Union[
-        tuple[int, ...],
-        tuple[float, ...],
-        tuple[tuple[int, int], ...],
-        tuple[tuple[float, float], ...],
-        tuple[tuple[int, int, int], ...],
-        tuple[tuple[float, float, float], ...],
-        tuple[tuple[int, int, int, int], ...],
-        tuple[tuple[float, float, float, float], ...],
-        tuple[
-            tuple[
-                tuple[int, int, int, int],
-                tuple[int, int, int, int],
-                tuple[int, int, int, int],
-                tuple[int, int, int, int],
-            ],
-            ...,
-        ],
-        tuple[
-            tuple[
-                tuple[float, float, float, float],
-                tuple[float, float, float, float],
-                tuple[float, float, float, float],
-                tuple[float, float, float, float],
-            ],
-            ...,
-        ],
-        None,
-    ],
-    ...,
+    buffer0_bytes: Union[bytes, memoryview],
+) -> tuple[Optional[DecodedAccessor], ...]: ...
+
+
+@overload
+def read_accessors(
+    json_dict: dict[str, Json],
+    buffer0_bytes: Union[bytes, memoryview],
+    *,
+    as_ndarray: Literal[False],
+) -> tuple[Optional[DecodedAccessor], ...]: ...
+
+
+@overload
+def read_accessors(
+    json_dict: dict[str, Json],
+    buffer0_bytes: Union[bytes, memoryview],
+    *,
+    as_ndarray: Literal[True],
+) -> "tuple[Optional[AccessorArray], ...]": ...
+
+
+def read_accessors(
+    json_dict: dict[str, Json],
+    buffer0_bytes: Union[bytes, memoryview],
+    *,
+    as_ndarray: bool = False,
+) -> Union[
+    tuple[Optional[DecodedAccessor], ...],
+    "tuple[Optional[AccessorArray], ...]",
 ]:
     accessor_dicts = json_dict.get("accessors")
     if not isinstance(accessor_dicts, list):
@@ -556,6 +666,15 @@ def read_accessors(
     if not isinstance(buffer_dicts, list):
         buffer_dicts = []
 
+    if as_ndarray:
+        return tuple(
+            read_accessor_as_ndarray(
+                accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+            )
+            for accessor_dict in accessor_dicts
+            if isinstance(accessor_dict, dict)
+        )
+
     return tuple(
         read_accessor(accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes)
         for accessor_dict in accessor_dicts
@@ -567,39 +686,45 @@ def read_accessor_as_animation_sampler_input(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Optional[list[float]]:
-    scalar_accessor = read_scalar_accessor(
+    if accessor_dict.get("type") != "SCALAR":
+        return None
+    array = read_accessor_as_ndarray(
         accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
     )
-    if scalar_accessor is None:
+    if array is None:
         return None
-    return [float(v) for v in scalar_accessor]
+    return [float(v) for v in array.tolist()]
 
 
 def read_accessor_as_animation_sampler_translation_output(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Optional[list[Vector]]:
-    vec3_accessor = read_vec3_accessor(
+    if accessor_dict.get("type") != "VEC3":
+        return None
+    array = read_accessor_as_ndarray(
         accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
     )
-    if vec3_accessor is None:
+    if array is None:
         return None
-    return [Vector((x, -z, y)) for x, y, z in vec3_accessor]
+    return [Vector((x, -z, y)) for x, y, z in array.tolist()]
 
 
 def read_accessor_as_animation_sampler_rotation_output(
     accessor_dict: dict[str, Json],
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
-    buffer0_bytes: bytes,
+    buffer0_bytes: Union[bytes, memoryview],
 ) -> Optional[list[Quaternion]]:
-    vec4_accessor = read_vec4_accessor(
+    if accessor_dict.get("type") != "VEC4":
+        return None
+    array = read_accessor_as_ndarray(
         accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
     )
-    if vec4_accessor is None:
+    if array is None:
         return None
-    return [Quaternion((w, x, -z, y)).normalized() for x, y, z, w in vec4_accessor]
+    return [Quaternion((w, x, -z, y)).normalized() for x, y, z, w in array.tolist()]
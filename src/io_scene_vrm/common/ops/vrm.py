@@ -225,6 +225,24 @@ def convert_material_to_mtoon1(
     )
 
 
+# This code is auto generated.
+# To regenerate, run the `uv run tools/property_typing.py` command.
+def bake_spring_bone1_animation(
+    execution_context: str = "EXEC_DEFAULT",
+    /,
+    *,
+    armature_name: str = "",
+    frame_start: int = -1048575,
+    frame_end: int = -1048575,
+) -> set[str]:
+    return bpy.ops.vrm.bake_spring_bone1_animation(  # type: ignore[attr-defined, no-any-return]
+        execution_context,
+        armature_name=armature_name,
+        frame_start=frame_start,
+        frame_end=frame_end,
+    )
+
+
 # This code is auto generated.
 # To regenerate, run the `uv run tools/property_typing.py` command.
 def update_spring_bone1_animation(
@@ -253,6 +271,20 @@ def reset_spring_bone1_animation_state(
     )
 
 
+# This code is auto generated.
+# To regenerate, run the `uv run tools/property_typing.py` command.
+def reset_spring_bone1_substep_counts(
+    execution_context: str = "EXEC_DEFAULT",
+    /,
+    *,
+    armature_name: str = "",
+) -> set[str]:
+    return bpy.ops.vrm.reset_spring_bone1_substep_counts(  # type: ignore[attr-defined, no-any-return]
+        execution_context,
+        armature_name=armature_name,
+    )
+
+
 # This code is auto generated.
 # To regenerate, run the `uv run tools/property_typing.py` command.
 def move_down_spring_bone1_joint(
@@ -201,6 +201,12 @@ class VrmAddonPreferences(AddonPreferences):
     export_lights: BoolProperty(  # type: ignore[valid-type]
         name="Export Lights",
     )
+    enable_image_encode_cache: BoolProperty(  # type: ignore[valid-type]
+        name="Cache Encoded Images",
+        description="Reuse the encoded images of previous exports"
+        + " if the pixels and the encode settings are the same",
+        default=True,
+    )
 
     def draw(self, _context: Context) -> None:
         layout = self.layout
@@ -223,6 +229,7 @@ class VrmAddonPreferences(AddonPreferences):
         export_box = layout.box()
         export_box.label(text="Export", icon="EXPORT")
         draw_export_preferences_layout(self, export_box)
+        export_box.prop(self, "enable_image_encode_cache")
 
     if TYPE_CHECKING:
         # This code is auto generated.
@@ -241,6 +248,7 @@ class VrmAddonPreferences(AddonPreferences):
         enable_advanced_preferences: bool  # type: ignore[no-redef]
         export_all_influences: bool  # type: ignore[no-redef]
         export_lights: bool  # type: ignore[no-redef]
+        enable_image_encode_cache: bool  # type: ignore[no-redef]
 
 
 def get_preferences(context: Context) -> VrmAddonPreferences:
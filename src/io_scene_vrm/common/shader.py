@@ -3,7 +3,10 @@ import math
 import random
 import string
 import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from copy import deepcopy
+from dataclasses import dataclass, field
 from pathlib import Path
 from sys import float_info
 from typing import Final, Optional, TypeVar, Union
@@ -279,6 +282,13 @@ def load_mtoon1_node_group(
         logger.error("File not found: %s", blend_file_path)
         return
 
+    if (
+        mtoon1_template_state.scope_depth > 0
+        and node_group_name in mtoon1_template_state.reset_node_group_names
+    ):
+        # use_mtoon1_template()のスコープ内では、リセットは一度だけ行う
+        reset_node_groups = False
+
     if not reset_node_groups:
         checking_node_group = context.blend_data.node_groups.get(node_group_name)
         if checking_node_group:
@@ -294,6 +304,10 @@ def load_mtoon1_node_group(
                 )
                 raise TypeError(message)
 
+    # 使い回しているテンプレートのマテリアルと一緒にアペンドされたノードグループと
+    # 名前が衝突しないよう、先に削除する
+    remove_mtoon1_template_material(context)
+
     backup_suffix = generate_backup_suffix()
 
     template_node_group_name = template_name(node_group_name)
@@ -339,6 +353,8 @@ def load_mtoon1_node_group(
             clear_node_tree(node_group, clear_inputs_outputs=True)
         copy_node_tree(context, template_node_group, node_group)
         get_node_tree_extension(node_group).addon_version = get_addon_version()
+        if mtoon1_template_state.scope_depth > 0:
+            mtoon1_template_state.reset_node_group_names.add(node_group_name)
     finally:
         if template_node_group and template_node_group.users <= 1:
             context.blend_data.node_groups.remove(template_node_group)
@@ -386,29 +402,52 @@ def load_mtoon1_shader_node_groups(
     setup_frame_count_driver(context)
 
 
-def load_mtoon1_shader(
-    context: Context,
-    material: Material,
-    *,
-    reset_node_groups: bool,
-) -> None:
-    from ..editor.extension import get_material_extension
+@dataclass
+class Mtoon1TemplateState:
+    """アペンド済みのMToon 1.0のテンプレートを使い回すための状態.
 
-    if not material.use_nodes:
-        material.use_nodes = True
+    use_mtoon1_template()のスコープ内でのみ有効。
+    """
 
-    load_mtoon1_outline_geometry_node_group(
-        context, reset_node_groups=reset_node_groups
-    )
-    load_mtoon1_shader_node_groups(context, reset_node_groups=reset_node_groups)
+    scope_depth: int = 0
+    template_material_backup_suffix: Optional[str] = None
+    reset_node_group_names: set[str] = field(default_factory=set)
 
-    start_time = time.perf_counter()
+
+mtoon1_template_state: Final = Mtoon1TemplateState()
+
+
+@contextmanager
+def use_mtoon1_template(context: Context) -> Iterator[None]:
+    """MToon 1.0のテンプレートのアペンドとノードグループのリセットを一度だけ行う.
+
+    多数のマテリアルを変換する処理をこのスコープで囲むと、マテリアルごとに
+    .blendファイルからアペンドする代わりに、最初にアペンドしたテンプレートを
+    複製元として使い回す。
+    """
+    mtoon1_template_state.scope_depth += 1
+    try:
+        yield
+    finally:
+        mtoon1_template_state.scope_depth -= 1
+        if mtoon1_template_state.scope_depth == 0:
+            mtoon1_template_state.reset_node_group_names.clear()
+            remove_mtoon1_template_material(context)
+
+
+def append_mtoon1_template_material(context: Context) -> Material:
+    template_material_name = template_name("VRM Add-on MToon 1.0")
+    if mtoon1_template_state.template_material_backup_suffix is not None:
+        template_material = context.blend_data.materials.get(template_material_name)
+        if template_material:
+            return template_material
+        remove_mtoon1_template_material(context)
 
     backup_suffix = generate_backup_suffix()
+    mtoon1_template_state.template_material_backup_suffix = backup_suffix
 
     # アペンドされるマテリアルと同名のものある場合は退避する。
     # 将来的にはappend(do_reuse_local_id=True)で代替する。
-    template_material_name = template_name("VRM Add-on MToon 1.0")
     old_material = context.blend_data.materials.get(template_material_name)
     if old_material:
         logger.error('Material "%s" already exists', template_material_name)
@@ -439,60 +478,109 @@ def load_mtoon1_shader(
             # do_reuse_local_id=True
         )
         if material_append_result != {"FINISHED"}:
+            remove_mtoon1_template_material(context)
             raise RuntimeError(
                 "Failed to append MToon 1.0 template material: "
                 + f"{material_append_result}"
             )
 
-    template_material = None
-    try:
-        template_material = context.blend_data.materials.get(template_material_name)
-        if not template_material:
-            raise ValueError("No " + template_material_name)
-        template_material_node_tree = template_material.node_tree
-        material_node_tree = material.node_tree
-        if template_material_node_tree is None:
-            logger.error("MToon template material node tree is None")
-        elif material_node_tree is None:
-            logger.error("MToon copy target material node tree is None")
-        else:
-            copy_node_tree(context, template_material_node_tree, material_node_tree)
-    finally:
-        if template_material and template_material.users <= 1:
-            context.blend_data.materials.remove(template_material)
-
-        # Materialをアペンドする際に同時にアペンドされたNodeTreeを削除
-        for shader_node_group_name in SHADER_NODE_GROUP_NAMES:
-            shader_node_group_template_name = template_name(shader_node_group_name)
-            template_group = context.blend_data.node_groups.get(
-                shader_node_group_template_name
-            )
-            if template_group and template_group.users <= 1:
-                context.blend_data.node_groups.remove(template_group)
+    template_material = context.blend_data.materials.get(template_material_name)
+    if not template_material:
+        remove_mtoon1_template_material(context)
+        raise ValueError("No " + template_material_name)
+    return template_material
 
-        # プログラムロジック的には既にremoveされている可能性もあるので、取得しなおす
-        old_material = context.blend_data.materials.get(
-            backup_name(template_material_name, backup_suffix)
-        )
-        if old_material:
-            old_material.name = template_material_name
-
-        # 退避していたNodeTreeを復元する
-        for shader_node_group_name in SHADER_NODE_GROUP_NAMES:
-            name = template_name(shader_node_group_name)
-            old_template_group = context.blend_data.node_groups.get(
-                backup_name(name, backup_suffix)
-            )
-            if old_template_group:
-                old_template_group.name = name
 
-    ext = get_material_extension(material)
-    ext.mtoon1.setup_drivers()
+def remove_mtoon1_template_material(context: Context) -> None:
+    backup_suffix = mtoon1_template_state.template_material_backup_suffix
+    if backup_suffix is None:
+        return
+    mtoon1_template_state.template_material_backup_suffix = None
 
-    end_time = time.perf_counter()
-    logger.debug(
-        'Loaded Material "%s": %.9f seconds', material.name, end_time - start_time
+    template_material_name = template_name("VRM Add-on MToon 1.0")
+    template_material = context.blend_data.materials.get(template_material_name)
+    if template_material and template_material.users <= 1:
+        context.blend_data.materials.remove(template_material)
+
+    # Materialをアペンドする際に同時にアペンドされたNodeTreeを削除
+    for shader_node_group_name in SHADER_NODE_GROUP_NAMES:
+        shader_node_group_template_name = template_name(shader_node_group_name)
+        template_group = context.blend_data.node_groups.get(
+            shader_node_group_template_name
+        )
+        if template_group and template_group.users <= 1:
+            context.blend_data.node_groups.remove(template_group)
+
+    # プログラムロジック的には既にremoveされている可能性もあるので、取得しなおす
+    old_material = context.blend_data.materials.get(
+        backup_name(template_material_name, backup_suffix)
     )
+    if old_material:
+        old_material.name = template_material_name
+
+    # 退避していたNodeTreeを復元する
+    for shader_node_group_name in SHADER_NODE_GROUP_NAMES:
+        name = template_name(shader_node_group_name)
+        old_template_group = context.blend_data.node_groups.get(
+            backup_name(name, backup_suffix)
+        )
+        if old_template_group:
+            old_template_group.name = name
+
+
+def load_mtoon1_shader(
+    context: Context,
+    material: Material,
+    *,
+    reset_node_groups: bool,
+) -> None:
+    load_mtoon1_shaders(context, [material], reset_node_groups=reset_node_groups)
+
+
+def load_mtoon1_shaders(
+    context: Context,
+    materials: Sequence[Material],
+    *,
+    reset_node_groups: bool,
+) -> None:
+    """複数のマテリアルを、一度だけアペンドしたテンプレートからMToon 1.0に変換する."""
+    from ..editor.extension import get_material_extension
+
+    if not materials:
+        return
+
+    with use_mtoon1_template(context):
+        load_mtoon1_outline_geometry_node_group(
+            context, reset_node_groups=reset_node_groups
+        )
+        load_mtoon1_shader_node_groups(context, reset_node_groups=reset_node_groups)
+
+        template_material = append_mtoon1_template_material(context)
+        template_material_node_tree = template_material.node_tree
+
+        for material in materials:
+            start_time = time.perf_counter()
+
+            if not material.use_nodes:
+                material.use_nodes = True
+
+            material_node_tree = material.node_tree
+            if template_material_node_tree is None:
+                logger.error("MToon template material node tree is None")
+            elif material_node_tree is None:
+                logger.error("MToon copy target material node tree is None")
+            else:
+                copy_node_tree(context, template_material_node_tree, material_node_tree)
+
+            ext = get_material_extension(material)
+            ext.mtoon1.setup_drivers()
+
+            end_time = time.perf_counter()
+            logger.debug(
+                'Loaded Material "%s": %.9f seconds',
+                material.name,
+                end_time - start_time,
+            )
 
 
 def copy_socket(from_socket: NodeSocket, to_socket: NodeSocket) -> None:
@@ -1382,17 +1470,19 @@ def copy_node_tree(
     for from_node, to_node in from_to.items():
         copy_node(context, from_node, to_node, from_to)
 
+    # リンクごとにソケットを線形探索しないよう、ソケットの位置を事前に求めておく
+    from_socket_pointer_to_index: dict[int, int] = {}
+    for from_node in from_to:
+        for sockets in (from_node.inputs, from_node.outputs):
+            for i, socket in enumerate(sockets):
+                from_socket_pointer_to_index[socket.as_pointer()] = i
+
     for from_link in from_node_tree.links:
         if not from_link.is_valid:
             continue
 
-        input_socket_index = next(
-            (
-                i
-                for i, s in enumerate(from_link.to_node.inputs)
-                if s == from_link.to_socket
-            ),
-            None,
+        input_socket_index = from_socket_pointer_to_index.get(
+            from_link.to_socket.as_pointer()
         )
         if input_socket_index is None:
             continue
@@ -1411,13 +1501,8 @@ def copy_node_tree(
             logger.error("No input socket: %s", from_link.to_socket.name)
             continue
 
-        output_socket_index = next(
-            (
-                i
-                for i, s in enumerate(from_link.from_node.outputs)
-                if s == from_link.from_socket
-            ),
-            None,
+        output_socket_index = from_socket_pointer_to_index.get(
+            from_link.from_socket.as_pointer()
         )
         if output_socket_index is None:
             continue
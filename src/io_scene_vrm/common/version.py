@@ -19,6 +19,7 @@ class Cache:
     last_blender_restart_required: bool
     last_blender_manifest_modification_time: float
     initial_blender_manifest_content: bytes
+    blender_manifest: Optional[BlenderManifest] = None
 
 
 cache = Cache(
@@ -40,15 +41,28 @@ def trigger_clear_addon_version_cache() -> None:
     bpy.app.timers.register(clear_addon_version_cache, first_interval=0.5)
 
 
+def get_blender_manifest() -> BlenderManifest:
+    """パース済みのblender_manifest.tomlを返す.
+
+    パネルの描画のたびに呼ばれるため、ファイルの読み込みは更新時刻が変わった時のみ行う。
+    """
+    blender_restart_required()  # 更新時刻が変わっていたらキャッシュが破棄される
+    blender_manifest = cache.blender_manifest
+    if blender_manifest is None:
+        blender_manifest = BlenderManifest.read()
+        cache.blender_manifest = blender_manifest
+    return blender_manifest
+
+
 def min_unsupported_blender_major_minor_version() -> Optional[tuple[int, int]]:
-    blender_version_max = BlenderManifest.read().blender_version_max
+    blender_version_max = get_blender_manifest().blender_version_max
     if blender_version_max is None:
         return None
     return (blender_version_max[0], blender_version_max[1])
 
 
 def get_addon_version() -> tuple[int, int, int]:
-    return BlenderManifest.read().version
+    return get_blender_manifest().version
 
 
 def blender_restart_required() -> bool:
@@ -72,6 +86,7 @@ def blender_restart_required() -> bool:
         return False
 
     cache.last_blender_manifest_modification_time = blender_manifest_modification_time
+    cache.blender_manifest = None
 
     blender_manifest_content = blender_manifest_path.read_bytes()
     if blender_manifest_content == cache.initial_blender_manifest_content:
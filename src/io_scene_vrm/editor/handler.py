@@ -2,9 +2,42 @@
 from bpy.app.handlers import persistent
 
 from . import migration
+from .mtoon1.handler import clear_outline_update_state
+from .property_group import BonePropertyGroup
+from .spring_bone1.handler import clear_simulation_plans
+from .vrm1.expression_preview import clear_expression_preview_graphs
 
 
 @persistent
 def load_post(_unsed: object) -> None:
+    migration.invalidate_migration_cache()
     migration.state.blend_file_compatibility_warning_shown = False
     migration.state.blend_file_addon_compatibility_warning_shown = False
+    BonePropertyGroup.clear_bone_uuid_index()
+    BonePropertyGroup.clear_owner_index()
+    BonePropertyGroup.clear_node_candidates_cache()
+    clear_simulation_plans()
+    clear_expression_preview_graphs()
+    clear_outline_update_state()
+
+
+@persistent
+def undo_post(_unsed: object) -> None:
+    migration.invalidate_migration_cache()
+    BonePropertyGroup.clear_bone_uuid_index()
+    BonePropertyGroup.clear_owner_index()
+    BonePropertyGroup.clear_node_candidates_cache()
+    clear_simulation_plans()
+    clear_expression_preview_graphs()
+    clear_outline_update_state()
+
+
+@persistent
+def redo_post(_unsed: object) -> None:
+    migration.invalidate_migration_cache()
+    BonePropertyGroup.clear_bone_uuid_index()
+    BonePropertyGroup.clear_owner_index()
+    BonePropertyGroup.clear_node_candidates_cache()
+    clear_simulation_plans()
+    clear_expression_preview_graphs()
+    clear_outline_update_state()
@@ -1,6 +1,6 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import functools
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Final, Optional
 
 import bpy
@@ -36,6 +36,28 @@ class State:
 state: Final = State()
 
 
+@dataclass
+class MigrationCache:
+    """マイグレーションが不要と判定されたアーマチュアのキャッシュ.
+
+    パネルの描画のたびにdefer_migrate()が呼ばれるため、マイグレーション不要の判定結果を
+    アーマチュアごとに世代番号で記録し、定常状態では整数の比較のみで判定する。
+    世代番号はdepsgraphの更新やファイルの読み込み、アンドゥで進める。
+    """
+
+    generation: int = 0
+    armature_data_key_to_unnecessary_generation: dict[int, int] = field(
+        default_factory=dict
+    )
+
+
+migration_cache: Final = MigrationCache()
+
+
+def invalidate_migration_cache() -> None:
+    migration_cache.generation += 1
+
+
 def is_unnecessary(armature_data: Armature) -> bool:
     ext = get_armature_extension(armature_data)
     return (
@@ -54,7 +76,19 @@ def defer_migrate(armature_object_name: str) -> bool:
     armature_data = armature.data
     if not isinstance(armature_data, Armature):
         return False
+
+    armature_data_key = armature_data.as_pointer()
+    if (
+        migration_cache.armature_data_key_to_unnecessary_generation.get(
+            armature_data_key
+        )
+        == migration_cache.generation
+    ):
+        return True
     if is_unnecessary(armature_data):
+        migration_cache.armature_data_key_to_unnecessary_generation[
+            armature_data_key
+        ] = migration_cache.generation
         return True
     bpy.app.timers.register(
         functools.partial(
@@ -304,6 +338,8 @@ def on_change_bpy_object_location() -> None:
 def on_change_bpy_bone_name() -> None:
     context = bpy.context
 
+    BonePropertyGroup.clear_bone_uuid_index()
+
     for armature in context.blend_data.armatures:
         ext = getattr(armature, "vrm_addon_extension", None)
         if not isinstance(ext, VrmAddonArmatureExtensionPropertyGroup):
@@ -5,8 +5,9 @@ from typing import Optional
 
 import bpy
 from bpy.app.handlers import persistent
-from bpy.types import Mesh
+from bpy.types import Collection, Depsgraph, Material, Mesh, Object, Scene
 
+from ...common import shader
 from ...common.logging import get_logger
 from ..extension import get_material_extension
 from . import migration
@@ -15,51 +16,156 @@ from .ops import VRM_OT_refresh_mtoon1_outline
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class OutlineObjectState:
+    mesh_name: str
+    use_auto_smooth: bool
+    material_names: tuple[Optional[str], ...]
+
+
 @dataclass
 class OutlineUpdateState:
-    object_state: list[tuple[bool, list[Optional[str]]]] = field(default_factory=list)
-    material_state: list[bool] = field(default_factory=list)
+    object_name_to_state: dict[str, OutlineObjectState] = field(default_factory=dict)
+    material_name_to_enabled: dict[str, bool] = field(default_factory=dict)
+    material_name_to_object_names: dict[str, set[str]] = field(default_factory=dict)
+    mesh_name_to_object_names: dict[str, set[str]] = field(default_factory=dict)
+
+    dirty_object_names: set[str] = field(default_factory=set)
+    dirty_material_names: set[str] = field(default_factory=set)
+    dirty_mesh_names: set[str] = field(default_factory=set)
+    all_dirty: bool = True
+    # 削除されたオブジェクトはdepsgraphの更新に含まれないため、シーンやコレクションの
+    # 更新があった場合に、記録済みのオブジェクトが残っているかを調べる
+    object_removal_dirty: bool = False
+
+    def set_object_state(
+        self, object_name: str, object_state: Optional[OutlineObjectState]
+    ) -> None:
+        old_object_state = self.object_name_to_state.pop(object_name, None)
+        if old_object_state is not None:
+            for material_name in old_object_state.material_names:
+                if material_name is None:
+                    continue
+                object_names = self.material_name_to_object_names.get(material_name)
+                if object_names is None:
+                    continue
+                object_names.discard(object_name)
+                if not object_names:
+                    del self.material_name_to_object_names[material_name]
+                    self.material_name_to_enabled.pop(material_name, None)
+            object_names = self.mesh_name_to_object_names.get(
+                old_object_state.mesh_name
+            )
+            if object_names is not None:
+                object_names.discard(object_name)
+                if not object_names:
+                    del self.mesh_name_to_object_names[old_object_state.mesh_name]
+
+        if object_state is None:
+            return
+
+        self.object_name_to_state[object_name] = object_state
+        for material_name in object_state.material_names:
+            if material_name is None:
+                continue
+            self.material_name_to_object_names.setdefault(material_name, set()).add(
+                object_name
+            )
+        self.mesh_name_to_object_names.setdefault(object_state.mesh_name, set()).add(
+            object_name
+        )
+
+    def clear(self) -> None:
+        self.object_name_to_state.clear()
+        self.material_name_to_enabled.clear()
+        self.material_name_to_object_names.clear()
+        self.mesh_name_to_object_names.clear()
+        self.dirty_object_names.clear()
+        self.dirty_material_names.clear()
+        self.dirty_mesh_names.clear()
+        self.all_dirty = True
+        self.object_removal_dirty = False
 
 
 outline_update_state = OutlineUpdateState()
 
 
+def clear_outline_update_state() -> None:
+    """保存済みの状態を破棄し、次回の更新時に全てのオブジェクトを調べ直す."""
+    outline_update_state.clear()
+
+
 def update_mtoon1_outline() -> Optional[float]:
     context = bpy.context
 
     compare_start_time = time.perf_counter()
 
-    # Optimize appropriately.
+    state = outline_update_state
+    if state.all_dirty:
+        state.all_dirty = False
+        state.dirty_object_names.update(state.object_name_to_state)
+        state.dirty_object_names.update(
+            obj.name for obj in context.blend_data.objects if obj.type == "MESH"
+        )
+        state.dirty_material_names.update(state.material_name_to_enabled)
+    elif state.object_removal_dirty:
+        existing_object_names = set(context.blend_data.objects.keys())
+        state.dirty_object_names.update(
+            object_name
+            for object_name in state.object_name_to_state
+            if object_name not in existing_object_names
+        )
+    state.object_removal_dirty = False
+
+    for mesh_name in state.dirty_mesh_names:
+        state.dirty_object_names.update(
+            state.mesh_name_to_object_names.get(mesh_name, ())
+        )
+    dirty_object_names = state.dirty_object_names
+    dirty_material_names = state.dirty_material_names
+    state.dirty_object_names = set()
+    state.dirty_material_names = set()
+    state.dirty_mesh_names = set()
+
+    # 変更のあったオブジェクトとマテリアルのみ調べ、状態が変わったものを記録する
     has_auto_smooth = tuple(bpy.app.version) < (4, 1)
-    object_state = [
-        (
-            has_auto_smooth and obj.data.use_auto_smooth,
-            [
+    refresh_object_names: set[str] = set()
+    for object_name in dirty_object_names:
+        obj = context.blend_data.objects.get(object_name)
+        if obj is None or not isinstance(mesh := obj.data, Mesh):
+            state.set_object_state(object_name, None)
+            continue
+        object_state = OutlineObjectState(
+            mesh_name=mesh.name,
+            use_auto_smooth=has_auto_smooth and mesh.use_auto_smooth,
+            material_names=tuple(
                 material_ref.name if (material_ref := material_slot.material) else None
                 for material_slot in obj.material_slots
-            ],
+            ),
         )
-        for obj in context.blend_data.objects
-        if isinstance(obj.data, Mesh)
-    ]
-    material_state = [
-        get_material_extension(material).mtoon1.get_enabled_in_material(material)
-        for material in [
-            context.blend_data.materials.get(material_name)
-            for material_name in {
-                material_name
-                for _, material_names in object_state
-                for material_name in material_names
-                if material_name is not None
-            }
-        ]
-        if material is not None
-    ]
-
-    not_changed = (
-        outline_update_state.object_state,
-        outline_update_state.material_state,
-    ) == (object_state, material_state)
+        if state.object_name_to_state.get(object_name) == object_state:
+            continue
+        state.set_object_state(object_name, object_state)
+        refresh_object_names.add(object_name)
+        for material_name in object_state.material_names:
+            if material_name is not None:
+                dirty_material_names.add(material_name)
+
+    for material_name in dirty_material_names:
+        object_names = state.material_name_to_object_names.get(material_name)
+        if not object_names:
+            state.material_name_to_enabled.pop(material_name, None)
+            continue
+        material = context.blend_data.materials.get(material_name)
+        enabled = material is not None and get_material_extension(
+            material
+        ).mtoon1.get_enabled_in_material(material)
+        old_enabled = state.material_name_to_enabled.get(material_name)
+        if old_enabled == enabled:
+            continue
+        state.material_name_to_enabled[material_name] = enabled
+        if old_enabled is not None:
+            refresh_object_names.update(object_names)
 
     compare_end_time = time.perf_counter()
 
@@ -68,13 +174,14 @@ def update_mtoon1_outline() -> Optional[float]:
         compare_end_time - compare_start_time,
     )
 
-    if not_changed:
-        return None
-
-    outline_update_state.object_state = object_state
-    outline_update_state.material_state = material_state
-
-    VRM_OT_refresh_mtoon1_outline.refresh(bpy.context, create_modifier=False)
+    with shader.use_mtoon1_template(context):
+        for object_name in sorted(refresh_object_names):
+            obj = context.blend_data.objects.get(object_name)
+            if obj is None:
+                continue
+            VRM_OT_refresh_mtoon1_outline.refresh_mesh_object(
+                context, obj, create_modifier=False
+            )
     return None
 
 
@@ -92,7 +199,23 @@ def save_pre(_unused: object) -> None:
 
 
 @persistent
-def depsgraph_update_pre(_unused: object) -> None:
+def depsgraph_update_post(
+    _unused: object, depsgraph: Optional[Depsgraph] = None
+) -> None:
+    if depsgraph is None:
+        outline_update_state.all_dirty = True
+    else:
+        for update in depsgraph.updates:
+            updated_id = update.id.original
+            if isinstance(updated_id, Object):
+                if updated_id.type == "MESH":
+                    outline_update_state.dirty_object_names.add(updated_id.name)
+            elif isinstance(updated_id, Material):
+                outline_update_state.dirty_material_names.add(updated_id.name)
+            elif isinstance(updated_id, Mesh):
+                outline_update_state.dirty_mesh_names.add(updated_id.name)
+            elif isinstance(updated_id, (Scene, Collection)):
+                outline_update_state.object_removal_dirty = True
     trigger_update_mtoon1_outline()
 
 
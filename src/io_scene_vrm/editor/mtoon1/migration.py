@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import functools
 from dataclasses import dataclass
-from typing import Final, Optional
+from typing import Callable, Final, Optional
 
 import bpy
 from bpy.types import (
@@ -28,7 +28,7 @@ from .property_group import (
     Mtoon1SamplerPropertyGroup,
     Mtoon1TextureInfoPropertyGroup,
     Mtoon1VrmcMaterialsMtoonPropertyGroup,
-    reset_shader_node_group,
+    reset_shader_node_groups,
 )
 
 TextureInfoBackup = Mtoon1TextureInfoPropertyGroup.TextureInfoBackup
@@ -54,12 +54,36 @@ def show_material_blender_4_2_warning_delay(material_name_lines: str) -> None:
 def migrate(context: Context, *, show_progress: bool = False) -> None:
     blender_4_2_migrated_material_names: list[str] = []
 
-    with create_progress(context, show_progress=show_progress) as progress:
-        for material_index, material in enumerate(context.blend_data.materials):
+    # テンプレートのマテリアルが途中で追加されるため、事前にリストを作成する
+    materials = list(context.blend_data.materials)
+    with (
+        create_progress(context, show_progress=show_progress) as progress,
+        shader.use_mtoon1_template(context),
+    ):
+        material_migrations: list[tuple[Material, bool, Callable[[], None]]] = []
+        for material_index, material in enumerate(materials):
             if not material:
                 continue
-            migrate_material(context, material, blender_4_2_migrated_material_names)
-            progress.update(float(material_index) / len(context.blend_data.materials))
+            material_migration = migrate_material(
+                context, material, blender_4_2_migrated_material_names
+            )
+            if material_migration:
+                material_migrations.append((material, *material_migration))
+            progress.update(float(material_index) / len(materials))
+
+        # テンプレートは一度だけアペンドし、リセットが必要な全てのマテリアルにコピーする
+        reset_shader_node_groups(
+            context,
+            [
+                material
+                for material, reset_material_node_tree, _ in material_migrations
+                if reset_material_node_tree
+            ],
+            reset_material_node_tree=True,
+            reset_node_groups=False,
+        )
+        for _, _, restore in material_migrations:
+            restore()
         progress.update(1)
 
     if (
@@ -89,41 +113,46 @@ def migrate_material(
     context: Context,
     material: Material,
     blender_4_2_migrated_material_names: list[str],
-) -> None:
+) -> Optional[tuple[bool, Callable[[], None]]]:
+    """マテリアルのマイグレーションを準備する.
+
+    ノードのリセットが必要かどうかと、リセットの後に設定値を書き戻す関数を返す。
+    マイグレーションが不要な場合はNoneを返す。
+    """
     _, legacy_legacy_shader_name = search.legacy_shader_node(material)
     if legacy_legacy_shader_name in search.LEGACY_SHADER_NAMES:
         # 古いシェーダーノードグループはそのままではBlender 4.2に未対応なので、
         # Blender 4.2以降へのバージョンアップ時は必ず警告する
         blender_4_2_migrated_material_names.append(material.name)
-        return
+        return None
 
     if not material.use_nodes:
-        return
+        return None
     node_tree = material.node_tree
     if not node_tree:
-        return
+        return None
 
     vrm_addon_extension = material.get("vrm_addon_extension")
     if not isinstance(vrm_addon_extension, IDPropertyGroup):
-        return
+        return None
 
     mtoon1 = vrm_addon_extension.get("mtoon1")
     if not isinstance(mtoon1, IDPropertyGroup):
-        return
+        return None
 
     if not mtoon1.get("enabled"):
-        return
+        return None
 
     extensions = mtoon1.get("extensions")
     if not isinstance(extensions, IDPropertyGroup):
-        return
+        return None
 
     vrmc_materials_mtoon = extensions.get("vrmc_materials_mtoon")
     if not isinstance(vrmc_materials_mtoon, IDPropertyGroup):
-        return
+        return None
 
     if vrmc_materials_mtoon.get("is_outline_material"):
-        return
+        return None
 
     addon_version = convert.float3_or(mtoon1.get("addon_version"), (0, 0, 0))
     if addon_version < (2, 16, 4):
@@ -131,7 +160,7 @@ def migrate_material(
         surface_node_name = "Mtoon1Material.MaterialOutputSurfaceIn"
         surface_node = node_tree.nodes.get(surface_node_name)
         if not isinstance(surface_node, NodeReroute):
-            return
+            return None
 
         connected = False
         surface_socket = surface_node.outputs[0]
@@ -145,16 +174,16 @@ def migrate_material(
                 connected = True
                 break
         if not connected:
-            return
+            return None
     else:
         # https://github.com/saturday06/VRM-Addon-for-Blender/blob/2_16_4/io_scene_vrm/editor/mtoon1/property_group.py#L1913-L1929
         group_node = node_tree.nodes.get("Mtoon1Material.Mtoon1Output")
         if not isinstance(group_node, ShaderNodeGroup):
-            return
+            return None
         if not group_node.node_tree:
-            return
+            return None
         if group_node.node_tree.name != "VRM Add-on MToon 1.0 Output Revision 1":
-            return
+            return None
 
     if addon_version < (2, 20, 50):
         migrate_sampler_filter_node(material)
@@ -318,124 +347,127 @@ def migrate_material(
             vrmc_materials_mtoon.get("uv_animation_rotation_speed_factor")
         )
 
-    if (
+    reset_material_node_tree = (
         addon_version < shader.LAST_MODIFIED_VERSION
         # Blender 4.2からノードの仕様変更があるので強制的にリセットする
         or (bpy.app.version >= (4, 2) and tuple(context.blend_data.version) < (4, 2))
-    ):
-        reset_shader_node_group(
-            context, material, reset_material_node_tree=True, reset_node_groups=False
-        )
+    )
 
-    # ここから先は、シェーダーノードが最新の状態になっている想定のコードを書ける
-    typed_mtoon1 = get_material_extension(material).mtoon1
-    typed_vrmc_materials_mtoon = typed_mtoon1.extensions.vrmc_materials_mtoon
-    if alpha_mode is not None:
-        typed_mtoon1.alpha_mode = alpha_mode
-    if alpha_cutoff is not None:
-        typed_mtoon1.alpha_cutoff = alpha_cutoff
-    if base_color_factor is not None:
-        typed_mtoon1.pbr_metallic_roughness.base_color_factor = base_color_factor
-    if base_color_texture_backup is not None:
-        typed_mtoon1.pbr_metallic_roughness.base_color_texture.restore(
-            base_color_texture_backup
-        )
-    if normal_texture_backup is not None:
-        typed_mtoon1.normal_texture.restore(normal_texture_backup)
-    if normal_texture_scale is not None:
-        typed_mtoon1.normal_texture.scale = normal_texture_scale
-    if emissive_texture_backup is not None:
-        typed_mtoon1.emissive_texture.restore(emissive_texture_backup)
-    if emissive_factor is not None:
-        typed_mtoon1.emissive_factor = emissive_factor
-    if emissive_strength is not None:
-        typed_mtoon1.extensions.khr_materials_emissive_strength.emissive_strength = (
-            emissive_strength
-        )
+    def restore() -> None:
+        # ここから先は、シェーダーノードが最新の状態になっている想定のコードを書ける
+        typed_mtoon1 = get_material_extension(material).mtoon1
+        typed_vrmc_materials_mtoon = typed_mtoon1.extensions.vrmc_materials_mtoon
+        if alpha_mode is not None:
+            typed_mtoon1.alpha_mode = alpha_mode
+        if alpha_cutoff is not None:
+            typed_mtoon1.alpha_cutoff = alpha_cutoff
+        if base_color_factor is not None:
+            typed_mtoon1.pbr_metallic_roughness.base_color_factor = base_color_factor
+        if base_color_texture_backup is not None:
+            typed_mtoon1.pbr_metallic_roughness.base_color_texture.restore(
+                base_color_texture_backup
+            )
+        if normal_texture_backup is not None:
+            typed_mtoon1.normal_texture.restore(normal_texture_backup)
+        if normal_texture_scale is not None:
+            typed_mtoon1.normal_texture.scale = normal_texture_scale
+        if emissive_texture_backup is not None:
+            typed_mtoon1.emissive_texture.restore(emissive_texture_backup)
+        if emissive_factor is not None:
+            typed_mtoon1.emissive_factor = emissive_factor
+        if emissive_strength is not None:
+            khr_materials_emissive_strength = (
+                typed_mtoon1.extensions.khr_materials_emissive_strength
+            )
+            khr_materials_emissive_strength.emissive_strength = emissive_strength
 
-    if transparent_with_z_write is not None:
-        typed_vrmc_materials_mtoon.transparent_with_z_write = transparent_with_z_write
-    if render_queue_offset_number is not None:
-        typed_vrmc_materials_mtoon.render_queue_offset_number = (
-            render_queue_offset_number
-        )
-    if shade_multiply_texture_backup is not None:
-        typed_vrmc_materials_mtoon.shade_multiply_texture.restore(
-            shade_multiply_texture_backup
-        )
-    if shade_color_factor is not None:
-        typed_vrmc_materials_mtoon.shade_color_factor = shade_color_factor
-    if shading_shift_texture_backup is not None:
-        typed_vrmc_materials_mtoon.shading_shift_texture.restore(
-            shading_shift_texture_backup
-        )
-    if shading_shift_factor is not None:
-        typed_vrmc_materials_mtoon.shading_shift_factor = shading_shift_factor
-    if shading_shift_texture_scale is not None:
-        typed_vrmc_materials_mtoon.shading_shift_texture.scale = (
-            shading_shift_texture_scale
-        )
-    if shading_toony_factor is not None:
-        typed_vrmc_materials_mtoon.shading_toony_factor = shading_toony_factor
-    if gi_equalization_factor is not None:
-        typed_vrmc_materials_mtoon.gi_equalization_factor = gi_equalization_factor
-    if matcap_factor is not None:
-        typed_vrmc_materials_mtoon.matcap_factor = matcap_factor
-    if matcap_texture_backup is not None:
-        typed_vrmc_materials_mtoon.matcap_texture.restore(matcap_texture_backup)
-    if parametric_rim_color_factor is not None:
-        typed_vrmc_materials_mtoon.parametric_rim_color_factor = (
-            parametric_rim_color_factor
-        )
-    if rim_multiply_texture_backup is not None:
-        typed_vrmc_materials_mtoon.rim_multiply_texture.restore(
-            rim_multiply_texture_backup
-        )
-    if rim_lighting_mix_factor is not None:
-        typed_vrmc_materials_mtoon.rim_lighting_mix_factor = rim_lighting_mix_factor
-    if parametric_rim_fresnel_power_factor is not None:
-        typed_vrmc_materials_mtoon.parametric_rim_fresnel_power_factor = (
-            parametric_rim_fresnel_power_factor
-        )
-    if parametric_rim_lift_factor is not None:
-        typed_vrmc_materials_mtoon.parametric_rim_lift_factor = (
-            parametric_rim_lift_factor
-        )
-    if outline_width_mode is not None:
-        typed_vrmc_materials_mtoon.outline_width_mode = outline_width_mode
-    if outline_width_factor is not None:
-        typed_vrmc_materials_mtoon.outline_width_factor = outline_width_factor
-    if outline_width_multiply_texture_backup is not None:
-        typed_vrmc_materials_mtoon.outline_width_multiply_texture.restore(
-            outline_width_multiply_texture_backup
-        )
-    if outline_color_factor is not None:
-        typed_vrmc_materials_mtoon.outline_color_factor = outline_color_factor
-    if outline_lighting_mix_factor is not None:
-        typed_vrmc_materials_mtoon.outline_lighting_mix_factor = (
-            outline_lighting_mix_factor
-        )
-    if uv_animation_mask_texture_backup is not None:
-        typed_vrmc_materials_mtoon.uv_animation_mask_texture.restore(
-            uv_animation_mask_texture_backup
-        )
-    if uv_animation_scroll_x_speed_factor is not None:
-        typed_vrmc_materials_mtoon.uv_animation_scroll_x_speed_factor = (
-            uv_animation_scroll_x_speed_factor
-        )
-    if uv_animation_scroll_y_speed_factor is not None:
-        typed_vrmc_materials_mtoon.uv_animation_scroll_y_speed_factor = (
-            uv_animation_scroll_y_speed_factor
-        )
-    if uv_animation_rotation_speed_factor is not None:
-        typed_vrmc_materials_mtoon.uv_animation_rotation_speed_factor = (
-            uv_animation_rotation_speed_factor
-        )
+        if transparent_with_z_write is not None:
+            typed_vrmc_materials_mtoon.transparent_with_z_write = (
+                transparent_with_z_write
+            )
+        if render_queue_offset_number is not None:
+            typed_vrmc_materials_mtoon.render_queue_offset_number = (
+                render_queue_offset_number
+            )
+        if shade_multiply_texture_backup is not None:
+            typed_vrmc_materials_mtoon.shade_multiply_texture.restore(
+                shade_multiply_texture_backup
+            )
+        if shade_color_factor is not None:
+            typed_vrmc_materials_mtoon.shade_color_factor = shade_color_factor
+        if shading_shift_texture_backup is not None:
+            typed_vrmc_materials_mtoon.shading_shift_texture.restore(
+                shading_shift_texture_backup
+            )
+        if shading_shift_factor is not None:
+            typed_vrmc_materials_mtoon.shading_shift_factor = shading_shift_factor
+        if shading_shift_texture_scale is not None:
+            typed_vrmc_materials_mtoon.shading_shift_texture.scale = (
+                shading_shift_texture_scale
+            )
+        if shading_toony_factor is not None:
+            typed_vrmc_materials_mtoon.shading_toony_factor = shading_toony_factor
+        if gi_equalization_factor is not None:
+            typed_vrmc_materials_mtoon.gi_equalization_factor = gi_equalization_factor
+        if matcap_factor is not None:
+            typed_vrmc_materials_mtoon.matcap_factor = matcap_factor
+        if matcap_texture_backup is not None:
+            typed_vrmc_materials_mtoon.matcap_texture.restore(matcap_texture_backup)
+        if parametric_rim_color_factor is not None:
+            typed_vrmc_materials_mtoon.parametric_rim_color_factor = (
+                parametric_rim_color_factor
+            )
+        if rim_multiply_texture_backup is not None:
+            typed_vrmc_materials_mtoon.rim_multiply_texture.restore(
+                rim_multiply_texture_backup
+            )
+        if rim_lighting_mix_factor is not None:
+            typed_vrmc_materials_mtoon.rim_lighting_mix_factor = rim_lighting_mix_factor
+        if parametric_rim_fresnel_power_factor is not None:
+            typed_vrmc_materials_mtoon.parametric_rim_fresnel_power_factor = (
+                parametric_rim_fresnel_power_factor
+            )
+        if parametric_rim_lift_factor is not None:
+            typed_vrmc_materials_mtoon.parametric_rim_lift_factor = (
+                parametric_rim_lift_factor
+            )
+        if outline_width_mode is not None:
+            typed_vrmc_materials_mtoon.outline_width_mode = outline_width_mode
+        if outline_width_factor is not None:
+            typed_vrmc_materials_mtoon.outline_width_factor = outline_width_factor
+        if outline_width_multiply_texture_backup is not None:
+            typed_vrmc_materials_mtoon.outline_width_multiply_texture.restore(
+                outline_width_multiply_texture_backup
+            )
+        if outline_color_factor is not None:
+            typed_vrmc_materials_mtoon.outline_color_factor = outline_color_factor
+        if outline_lighting_mix_factor is not None:
+            typed_vrmc_materials_mtoon.outline_lighting_mix_factor = (
+                outline_lighting_mix_factor
+            )
+        if uv_animation_mask_texture_backup is not None:
+            typed_vrmc_materials_mtoon.uv_animation_mask_texture.restore(
+                uv_animation_mask_texture_backup
+            )
+        if uv_animation_scroll_x_speed_factor is not None:
+            typed_vrmc_materials_mtoon.uv_animation_scroll_x_speed_factor = (
+                uv_animation_scroll_x_speed_factor
+            )
+        if uv_animation_scroll_y_speed_factor is not None:
+            typed_vrmc_materials_mtoon.uv_animation_scroll_y_speed_factor = (
+                uv_animation_scroll_y_speed_factor
+            )
+        if uv_animation_rotation_speed_factor is not None:
+            typed_vrmc_materials_mtoon.uv_animation_rotation_speed_factor = (
+                uv_animation_rotation_speed_factor
+            )
+
+        typed_mtoon1.setup_drivers()
+        updated_addon_version = version.get_addon_version()
+        if tuple(typed_mtoon1.addon_version) != updated_addon_version:
+            typed_mtoon1.addon_version = updated_addon_version
 
-    typed_mtoon1.setup_drivers()
-    updated_addon_version = version.get_addon_version()
-    if tuple(typed_mtoon1.addon_version) != updated_addon_version:
-        typed_mtoon1.addon_version = updated_addon_version
+    return reset_material_node_tree, restore
 
 
 def backup_texture_info(texture_info: object) -> Optional[TextureInfoBackup]:
@@ -1016,57 +1016,72 @@ class VRM_OT_refresh_mtoon1_outline(Operator):
     ) -> None:
         if bpy.app.version < (3, 3):
             return
-        for obj in context.blend_data.objects:
-            if obj.type != "MESH":
-                continue
-            outline_material_names: list[str] = []
-            for material_slot in obj.material_slots:
-                material_ref = material_slot.material
-                if not material_ref:
-                    continue
+        with shader.use_mtoon1_template(context):
+            for obj in context.blend_data.objects:
+                VRM_OT_refresh_mtoon1_outline.refresh_mesh_object(
+                    context, obj, material_name, create_modifier=create_modifier
+                )
 
-                if material_name is not None and material_name != material_ref.name:
-                    continue
+    @staticmethod
+    def refresh_mesh_object(
+        context: Context,
+        obj: Object,
+        material_name: Optional[str] = None,
+        *,
+        create_modifier: bool,
+    ) -> None:
+        if bpy.app.version < (3, 3):
+            return
+        if obj.type != "MESH":
+            return
+        outline_material_names: list[str] = []
+        for material_slot in obj.material_slots:
+            material_ref = material_slot.material
+            if not material_ref:
+                continue
 
-                material = context.blend_data.materials.get(material_ref.name)
-                if not material:
-                    continue
+            if material_name is not None and material_name != material_ref.name:
+                continue
 
-                mtoon1 = get_material_extension(material).mtoon1
-                if not mtoon1.enabled or mtoon1.is_outline_material:
-                    continue
+            material = context.blend_data.materials.get(material_ref.name)
+            if not material:
+                continue
 
-                VRM_OT_refresh_mtoon1_outline.assign(
-                    context, material, obj, create_modifier=create_modifier
-                )
-                outline_material_names.append(material.name)
-            if material_name is not None:
+            mtoon1 = get_material_extension(material).mtoon1
+            if not mtoon1.enabled or mtoon1.is_outline_material:
                 continue
 
-            # Remove unnecessary outline modifiers if no material name is specified.
-            for search_modifier_name in list(obj.modifiers.keys()):
-                search_modifier = obj.modifiers.get(search_modifier_name)
-                if not search_modifier:
-                    continue
-                if search_modifier.type != "NODES":
-                    continue
-                if not isinstance(search_modifier, NodesModifier):
-                    continue
-                node_group = search_modifier.node_group
-                if not node_group:
-                    continue
-                if node_group.name != shader.OUTLINE_GEOMETRY_GROUP_NAME:
-                    continue
-                input_key = get_nodes_modifier_input_key(search_modifier)
-                if input_key is None:
-                    continue
-                search_material = search_modifier.get(input_key.material_key)
-                if (
-                    isinstance(search_material, Material)
-                    and search_material.name in outline_material_names
-                ):
-                    continue
-                obj.modifiers.remove(search_modifier)
+            VRM_OT_refresh_mtoon1_outline.assign(
+                context, material, obj, create_modifier=create_modifier
+            )
+            outline_material_names.append(material.name)
+        if material_name is not None:
+            return
+
+        # Remove unnecessary outline modifiers if no material name is specified.
+        for search_modifier_name in list(obj.modifiers.keys()):
+            search_modifier = obj.modifiers.get(search_modifier_name)
+            if not search_modifier:
+                continue
+            if search_modifier.type != "NODES":
+                continue
+            if not isinstance(search_modifier, NodesModifier):
+                continue
+            node_group = search_modifier.node_group
+            if not node_group:
+                continue
+            if node_group.name != shader.OUTLINE_GEOMETRY_GROUP_NAME:
+                continue
+            input_key = get_nodes_modifier_input_key(search_modifier)
+            if input_key is None:
+                continue
+            search_material = search_modifier.get(input_key.material_key)
+            if (
+                isinstance(search_material, Material)
+                and search_material.name in outline_material_names
+            ):
+                continue
+            obj.modifiers.remove(search_modifier)
 
     def execute(self, context: Context) -> set[str]:
         material_name: Optional[str] = self.material_name
@@ -24,8 +24,10 @@ from bpy.types import (
     Material,
     Node,
     NodeReroute,
+    NodeSocket,
     NodeSocketColor,
     NodeSocketFloat,
+    NodeTree,
     PropertyGroup,
     ShaderNodeBsdfPrincipled,
     ShaderNodeEmission,
@@ -219,6 +221,23 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
     キャッシュにした。
     """
 
+    SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE_MAX_SIZE: Final = 65536
+
+    NODE_GROUP_INPUT_SOCKET_INDEX_CACHE: Final[
+        dict[tuple[int, str, str], tuple[int, int, str, int]]
+    ] = {}
+    """ノードツリーとノードグループ名とソケット名から、ソケットの位置を引くキャッシュ.
+
+    キーはノードツリーを示す数値、ノードグループ名、ソケット名。値はキャッシュ作成時の
+    ノード数、ノードのインデックス、ノード名、ソケットのインデックス。ソケットが存在しない
+    場合はソケットのインデックスが-1になる。ノード数をノードツリーの構造のバージョンとして
+    扱い、それが変化していたり、インデックスの指す先のノード名が一致しない場合は再探索する。
+    ノード名はノードツリー内で一意なので、同じノード数のままノードが追加や削除されても
+    別のノードを返さない。
+    """
+
+    NODE_GROUP_INPUT_SOCKET_INDEX_CACHE_MAX_SIZE: Final = 65536
+
     def match_material(
         self, material: Material, material_property_chain: Sequence[str]
     ) -> bool:
@@ -263,9 +282,10 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
             ):
                 # キャッシュが有効だった場合はキャッシュから取得したマテリアルを返す
                 return cached_material
-            # キャッシュが無効な場合、その他全てのキャッシュも無効になっている可能性が
-            # 高いので全てのキャッシュを削除する。
-            self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE.clear()
+            # キャッシュが無効な場合、そのキャッシュのみ削除する。その他のキャッシュも
+            # 無効になっている可能性はあるが、それらは利用時に個別に検証される。
+            # 全て削除すると、全てのマテリアルでリニアサーチが連鎖的に発生してしまう。
+            del self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE[self_key_number]
 
         # キャッシュが存在しなかった場合は、全てのマテリアルのリストの先頭からselfに
         # 対応するものを探す。発見したらキャッシュにマテリアルのインデックスを保存。
@@ -275,6 +295,11 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
             if cached_material_index == material_index:
                 continue
             if self.match_material(material, material_property_chain):
+                if (
+                    len(self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE)
+                    >= self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE_MAX_SIZE
+                ):
+                    self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE.clear()
                 self.SELF_KEY_NUMBER_TO_MATERIAL_INDEX_CACHE[self_key_number] = (
                     material_index
                 )
@@ -283,6 +308,72 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
         message = f"No matching material: {type(self)} {material_property_chain}"
         raise AssertionError(message)
 
+    @classmethod
+    def find_node_group_input_socket(
+        cls,
+        node_tree: NodeTree,
+        node_group_name: str,
+        group_label: str,
+    ) -> tuple[Optional[ShaderNodeGroup], Optional[NodeSocket]]:
+        """ノードグループのノードと、その入力ソケットを取得する.
+
+        このメソッドは利用頻度が高いので、プロファイルの結果に気をつける。
+        """
+        nodes = node_tree.nodes
+        node_count = len(nodes)
+        cache_key = (node_tree.as_pointer(), node_group_name, group_label)
+        cached_indices = cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE.get(cache_key)
+        if cached_indices is not None:
+            (
+                cached_node_count,
+                cached_node_index,
+                cached_node_name,
+                cached_socket_index,
+            ) = cached_indices
+            if (
+                cached_node_count == node_count
+                and 0 <= cached_node_index < node_count
+                and isinstance(cached_node := nodes[cached_node_index], ShaderNodeGroup)
+                and cached_node.name == cached_node_name
+                and (cached_node_tree := cached_node.node_tree)
+                and cached_node_tree.name == node_group_name
+            ):
+                if cached_socket_index < 0:
+                    if group_label not in cached_node.inputs:
+                        return cached_node, None
+                elif (
+                    cached_socket_index < len(cached_node.inputs)
+                    and (cached_socket := cached_node.inputs[cached_socket_index]).name
+                    == group_label
+                ):
+                    return cached_node, cached_socket
+
+        # キャッシュが無効な場合は、ノードの先頭から探索してキャッシュを作り直す
+        for node_index, node in enumerate(nodes):
+            if not isinstance(node, ShaderNodeGroup):
+                continue
+            group_node_tree = node.node_tree
+            if not group_node_tree or group_node_tree.name != node_group_name:
+                continue
+            socket_index = node.inputs.find(group_label)
+            if (
+                len(cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE)
+                >= cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE_MAX_SIZE
+            ):
+                cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE.clear()
+            cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE[cache_key] = (
+                node_count,
+                node_index,
+                node.name,
+                socket_index,
+            )
+            if socket_index < 0:
+                return node, None
+            return node, node.inputs[socket_index]
+
+        cls.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE.pop(cache_key, None)
+        return None, None
+
     @classmethod
     def get_material_property_chain(cls) -> list[str]:
         chain = convert.sequence_or_none(getattr(cls, "material_property_chain", None))
@@ -375,20 +466,12 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
         if not node_tree:
             return default_value
 
-        node = next(
-            (
-                node
-                for node in node_tree.nodes
-                if isinstance(node, ShaderNodeGroup)
-                and node.node_tree
-                and node.node_tree.name == node_group_name
-            ),
-            None,
+        node, socket = self.find_node_group_input_socket(
+            node_tree, node_group_name, group_label
         )
         if not node:
             return default_value
 
-        socket = node.inputs.get(group_label)
         if isinstance(
             socket,
             (
@@ -413,20 +496,12 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
         if not node_tree:
             return default_value
 
-        node = next(
-            (
-                node
-                for node in node_tree.nodes
-                if isinstance(node, ShaderNodeGroup)
-                and node.node_tree
-                and node.node_tree.name == node_group_name
-            ),
-            None,
+        node, socket = self.find_node_group_input_socket(
+            node_tree, node_group_name, group_label
         )
         if not node:
             return default_value
 
-        socket = node.inputs.get(group_label)
         if isinstance(socket, shader.COLOR_SOCKET_CLASSES):
             return (
                 socket.default_value[0],
@@ -454,21 +529,13 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
         if not node_tree:
             return
 
-        node = next(
-            (
-                node
-                for node in node_tree.nodes
-                if isinstance(node, ShaderNodeGroup)
-                and node.node_tree
-                and node.node_tree.name == node_group_name
-            ),
-            None,
+        node, socket = self.find_node_group_input_socket(
+            node_tree, node_group_name, group_label
         )
         if not node:
             logger.warning('No group node "%s"', node_group_name)
             return
 
-        socket = node.inputs.get(group_label)
         if isinstance(socket, shader.BOOL_SOCKET_CLASSES):
             socket.default_value = bool(value)
         elif isinstance(socket, shader.FLOAT_SOCKET_CLASSES):
@@ -518,21 +585,13 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
 
         rgba = shader.rgba_or_none(value) or default_value
 
-        node = next(
-            (
-                node
-                for node in node_tree.nodes
-                if isinstance(node, ShaderNodeGroup)
-                and node.node_tree
-                and node.node_tree.name == node_group_name
-            ),
-            None,
+        node, socket = self.find_node_group_input_socket(
+            node_tree, node_group_name, group_label
         )
         if not node:
             logger.warning('No group node "%s"', node_group_name)
             return
 
-        socket = node.inputs.get(group_label)
         if not isinstance(socket, shader.COLOR_SOCKET_CLASSES):
             logger.warning(
                 'No "%s" in shader node group "%s"', group_label, node_group_name
@@ -563,21 +622,13 @@ class MaterialTraceablePropertyGroup(PropertyGroup):
 
         rgb = shader.rgb_or_none(value) or default_value
 
-        node = next(
-            (
-                node
-                for node in node_tree.nodes
-                if isinstance(node, ShaderNodeGroup)
-                and node.node_tree
-                and node.node_tree.name == node_group_name
-            ),
-            None,
+        node, socket = self.find_node_group_input_socket(
+            node_tree, node_group_name, group_label
         )
         if not node:
             logger.warning('No group node "%s"', node_group_name)
             return
 
-        socket = node.inputs.get(group_label)
         if not isinstance(socket, shader.COLOR_SOCKET_CLASSES):
             logger.warning(
                 'No "%s" in shader node group "%s"', group_label, node_group_name
@@ -3616,6 +3667,13 @@ class Mtoon1MaterialPropertyGroup(MaterialTraceablePropertyGroup):
         if self.is_outline_material:
             return False
 
+        if not self.has_output_group_node(material):
+            return False
+
+        return bool(self.get("enabled"))
+
+    @staticmethod
+    def has_output_group_node(material: Material) -> bool:
         if not material.use_nodes:
             return False
 
@@ -3631,10 +3689,7 @@ class Mtoon1MaterialPropertyGroup(MaterialTraceablePropertyGroup):
         if not group_node_tree:
             return False
 
-        if group_node_tree.name != shader.OUTPUT_GROUP_NAME:
-            return False
-
-        return bool(self.get("enabled"))
+        return group_node_tree.name == shader.OUTPUT_GROUP_NAME
 
     def get_enabled(self) -> bool:
         return self.get_enabled_in_material(self.find_material())
@@ -3653,6 +3708,12 @@ class Mtoon1MaterialPropertyGroup(MaterialTraceablePropertyGroup):
         if self.get_enabled():
             return
 
+        if not self.is_outline_material and self.has_output_group_node(material):
+            # load_mtoon1_shaders()で読み込み済みのノードは、変換し直さずに使う
+            self["enabled"] = True
+            self.setup_drivers()
+            return
+
         ops.vrm.convert_material_to_mtoon1(material_name=material.name)
         self["enabled"] = True
         self.setup_drivers()
@@ -3872,6 +3933,47 @@ def reset_shader_node_group(
     reset_material_node_tree: bool,
     reset_node_groups: bool,
 ) -> None:
+    reset_shader_node_groups(
+        context,
+        [material],
+        reset_material_node_tree=reset_material_node_tree,
+        reset_node_groups=reset_node_groups,
+    )
+
+
+def reset_shader_node_groups(
+    context: Context,
+    materials: Sequence[Material],
+    *,
+    reset_material_node_tree: bool,
+    reset_node_groups: bool,
+) -> None:
+    """複数のマテリアルのノードを、テンプレートを一度だけアペンドしてリセットする."""
+    unique_materials = list(dict.fromkeys(materials))
+    restore_functions = [
+        backup_shader_node_group(material) for material in unique_materials
+    ]
+    if reset_material_node_tree:
+        outline_materials = [
+            outline_material
+            for material in unique_materials
+            if (
+                outline_material := get_material_mtoon1_extension(
+                    material
+                ).outline_material
+            )
+        ]
+        shader.load_mtoon1_shaders(
+            context,
+            list(dict.fromkeys([*unique_materials, *outline_materials])),
+            reset_node_groups=reset_node_groups,
+        )
+    for restore in restore_functions:
+        restore()
+
+
+def backup_shader_node_group(material: Material) -> Callable[[], None]:
+    """マテリアルの設定値を退避し、ノードのリセット後にそれを書き戻す関数を返す."""
     gltf = get_material_mtoon1_extension(material)
     mtoon = gltf.extensions.vrmc_materials_mtoon
 
@@ -3917,67 +4019,59 @@ def reset_shader_node_group(
     uv_animation_scroll_y_speed_factor = mtoon.uv_animation_scroll_y_speed_factor
     uv_animation_rotation_speed_factor = mtoon.uv_animation_rotation_speed_factor
 
-    if reset_material_node_tree:
-        shader.load_mtoon1_shader(
-            context,
-            material,
-            reset_node_groups=reset_node_groups,
-        )
+    def restore() -> None:
+        gltf.is_outline_material = False
         if gltf.outline_material:
-            shader.load_mtoon1_shader(
-                context,
-                gltf.outline_material,
-                reset_node_groups=reset_node_groups,
-            )
-
-    gltf.is_outline_material = False
-    if gltf.outline_material:
-        get_material_mtoon1_extension(gltf.outline_material).is_outline_material = True
-
-    gltf.pbr_metallic_roughness.base_color_factor = base_color_factor
-    gltf.pbr_metallic_roughness.base_color_texture.restore(base_color_texture)
-    gltf.alpha_mode_blend_method_hashed = alpha_mode_blend_method_hashed
-    gltf.alpha_mode = alpha_mode
-    gltf.double_sided = double_sided
-    gltf.alpha_cutoff = alpha_cutoff
-    gltf.normal_texture.restore(normal_texture)
-    gltf.normal_texture.scale = normal_texture_scale
-    gltf.emissive_texture.restore(emissive_texture)
-    gltf.emissive_factor = emissive_factor
-    gltf.export_shape_key_normals = export_shape_key_normals
-    gltf.extensions.khr_materials_emissive_strength.emissive_strength = (
-        emissive_strength
-    )
-
-    mtoon.transparent_with_z_write = transparent_with_z_write
-    mtoon.render_queue_offset_number = render_queue_offset_number
-    mtoon.shade_multiply_texture.restore(shade_multiply_texture)
-    mtoon.shade_color_factor = shade_color_factor
-    mtoon.shading_shift_texture.restore(shading_shift_texture)
-    mtoon.shading_shift_texture.scale = shading_shift_texture_scale
-    mtoon.shading_shift_factor = shading_shift_factor
-    mtoon.shading_toony_factor = shading_toony_factor
-    mtoon.gi_equalization_factor = gi_equalization_factor
-    mtoon.matcap_factor = matcap_factor
-    mtoon.matcap_texture.restore(matcap_texture)
-    mtoon.parametric_rim_color_factor = parametric_rim_color_factor
-    mtoon.rim_multiply_texture.restore(rim_multiply_texture)
-    mtoon.rim_lighting_mix_factor = rim_lighting_mix_factor
-    mtoon.parametric_rim_fresnel_power_factor = parametric_rim_fresnel_power_factor
-    mtoon.parametric_rim_lift_factor = parametric_rim_lift_factor
-    mtoon.enable_outline_preview = enable_outline_preview
-    mtoon.outline_width_mode = outline_width_mode
-    mtoon.outline_width_factor = outline_width_factor
-    mtoon.outline_width_multiply_texture.restore(outline_width_multiply_texture)
-    mtoon.outline_color_factor = outline_color_factor
-    mtoon.outline_lighting_mix_factor = outline_lighting_mix_factor
-    mtoon.uv_animation_mask_texture.restore(uv_animation_mask_texture)
-    mtoon.uv_animation_scroll_x_speed_factor = uv_animation_scroll_x_speed_factor
-    mtoon.uv_animation_scroll_y_speed_factor = uv_animation_scroll_y_speed_factor
-    mtoon.uv_animation_rotation_speed_factor = uv_animation_rotation_speed_factor
-
-    gltf.setup_drivers()
-    gltf.addon_version = get_addon_version()
+            get_material_mtoon1_extension(
+                gltf.outline_material
+            ).is_outline_material = True
+
+        gltf.pbr_metallic_roughness.base_color_factor = base_color_factor
+        gltf.pbr_metallic_roughness.base_color_texture.restore(base_color_texture)
+        gltf.alpha_mode_blend_method_hashed = alpha_mode_blend_method_hashed
+        gltf.alpha_mode = alpha_mode
+        gltf.double_sided = double_sided
+        gltf.alpha_cutoff = alpha_cutoff
+        gltf.normal_texture.restore(normal_texture)
+        gltf.normal_texture.scale = normal_texture_scale
+        gltf.emissive_texture.restore(emissive_texture)
+        gltf.emissive_factor = emissive_factor
+        gltf.export_shape_key_normals = export_shape_key_normals
+        gltf.extensions.khr_materials_emissive_strength.emissive_strength = (
+            emissive_strength
+        )
+
+        mtoon.transparent_with_z_write = transparent_with_z_write
+        mtoon.render_queue_offset_number = render_queue_offset_number
+        mtoon.shade_multiply_texture.restore(shade_multiply_texture)
+        mtoon.shade_color_factor = shade_color_factor
+        mtoon.shading_shift_texture.restore(shading_shift_texture)
+        mtoon.shading_shift_texture.scale = shading_shift_texture_scale
+        mtoon.shading_shift_factor = shading_shift_factor
+        mtoon.shading_toony_factor = shading_toony_factor
+        mtoon.gi_equalization_factor = gi_equalization_factor
+        mtoon.matcap_factor = matcap_factor
+        mtoon.matcap_texture.restore(matcap_texture)
+        mtoon.parametric_rim_color_factor = parametric_rim_color_factor
+        mtoon.rim_multiply_texture.restore(rim_multiply_texture)
+        mtoon.rim_lighting_mix_factor = rim_lighting_mix_factor
+        mtoon.parametric_rim_fresnel_power_factor = parametric_rim_fresnel_power_factor
+        mtoon.parametric_rim_lift_factor = parametric_rim_lift_factor
+        mtoon.enable_outline_preview = enable_outline_preview
+        mtoon.outline_width_mode = outline_width_mode
+        mtoon.outline_width_factor = outline_width_factor
+        mtoon.outline_width_multiply_texture.restore(outline_width_multiply_texture)
+        mtoon.outline_color_factor = outline_color_factor
+        mtoon.outline_lighting_mix_factor = outline_lighting_mix_factor
+        mtoon.uv_animation_mask_texture.restore(uv_animation_mask_texture)
+        mtoon.uv_animation_scroll_x_speed_factor = uv_animation_scroll_x_speed_factor
+        mtoon.uv_animation_scroll_y_speed_factor = uv_animation_scroll_y_speed_factor
+        mtoon.uv_animation_rotation_speed_factor = uv_animation_rotation_speed_factor
+
+        gltf.setup_drivers()
+        gltf.addon_version = get_addon_version()
+
+    return restore
 
 
 def get_material_mtoon1_extension(material: Material) -> Mtoon1MaterialPropertyGroup:
@@ -2,11 +2,11 @@
 import uuid
 from collections.abc import Iterator, ValuesView
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional, Protocol, TypeVar, overload
+from typing import TYPE_CHECKING, Final, Optional, Protocol, TypeVar, overload
 
 import bpy
 from bpy.props import FloatProperty, PointerProperty, StringProperty
-from bpy.types import Armature, Bone, Material, Object, PropertyGroup
+from bpy.types import Armature, Context, Material, Object, PropertyGroup
 
 from ..common.logging import get_logger
 from ..common.vrm0 import human_bone as vrm0_human_bone
@@ -189,9 +189,16 @@ class MeshObjectPropertyGroup(PropertyGroup):
     def poll_bpy_object(self, obj: object) -> bool:
         return isinstance(obj, Object) and obj.type == "MESH"
 
+    def update_bpy_object(self, _context: Context) -> None:
+        # Expressionのプレビューはバインド先のオブジェクトを解決済みで保持している
+        from .vrm1.expression_preview import clear_expression_preview_graphs
+
+        clear_expression_preview_graphs()
+
     bpy_object: PointerProperty(  # type: ignore[valid-type]
         type=Object,
         poll=poll_bpy_object,
+        update=update_bpy_object,
     )
 
     if TYPE_CHECKING:
@@ -213,7 +220,184 @@ class MaterialPropertyGroup(PropertyGroup):
         material: Optional[Material]  # type: ignore[no-redef]
 
 
+@dataclass
+class BoneUuidIndex:
+    bone_count: int
+    bone_uuid_to_bone_name: dict[str, str]
+
+
+# Armature data name to its bone UUID index. The index is validated on every
+# lookup, so stale entries only cost a rebuild.
+armature_data_name_to_bone_uuid_index: Final[dict[str, BoneUuidIndex]] = {}
+
+
+# Armature data name to the armature object that uses it. Entries are validated
+# on every lookup and only the missing armature data is searched again.
+armature_data_name_to_armature_object_name: Final[dict[str, str]] = {}
+
+
+@dataclass(frozen=True)
+class BoneTreeIndex:
+    """Pre-order (Euler tour) index of the bone tree.
+
+    A bone is in the subtree of another bone if its enter index is between
+    the enter and exit indices of the other bone, so ancestor checks are O(1).
+    """
+
+    bone_names: tuple[str, ...]
+    parent_indices: tuple[int, ...]
+    bone_name_to_index: dict[str, int]
+    enter_indices: tuple[int, ...]
+    exit_indices: tuple[int, ...]
+
+    @staticmethod
+    def create(armature_data: Armature) -> "BoneTreeIndex":
+        bones = armature_data.bones
+        bone_names = tuple(bones.keys())
+        bone_name_to_index = {
+            bone_name: index for index, bone_name in enumerate(bone_names)
+        }
+        parent_indices = tuple(
+            -1 if bone.parent is None else bone_name_to_index[bone.parent.name]
+            for bone in bones.values()
+        )
+
+        children_indices: list[list[int]] = [[] for _ in bone_names]
+        root_indices: list[int] = []
+        for index, parent_index in enumerate(parent_indices):
+            if parent_index < 0:
+                root_indices.append(index)
+            else:
+                children_indices[parent_index].append(index)
+
+        enter_indices = [0] * len(bone_names)
+        exit_indices = [0] * len(bone_names)
+        order = 0
+        # (bone index, whether children are already visited)
+        stack = [(index, False) for index in reversed(root_indices)]
+        while stack:
+            index, visited = stack.pop()
+            if visited:
+                exit_indices[index] = order - 1
+                continue
+            enter_indices[index] = order
+            order += 1
+            stack.append((index, True))
+            stack.extend(
+                (child_index, False)
+                for child_index in reversed(children_indices[index])
+            )
+
+        return BoneTreeIndex(
+            bone_names=bone_names,
+            parent_indices=parent_indices,
+            bone_name_to_index=bone_name_to_index,
+            enter_indices=tuple(enter_indices),
+            exit_indices=tuple(exit_indices),
+        )
+
+
+# Relations of an assigned human bone to the target human bone, used by
+# BonePropertyGroup.find_bone_candidates().
+HUMAN_BONE_RELATION_ANCESTOR: Final = 0
+HUMAN_BONE_RELATION_DESCENDANT: Final = 1
+HUMAN_BONE_RELATION_UNRELATED: Final = 2
+
+
+@dataclass(frozen=True)
+class NodeCandidatesInput:
+    bone_names: tuple[str, ...]
+    parent_indices: tuple[int, ...]
+    bone_index_and_relations: tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class NodeCandidatesCache:
+    node_candidates_input: NodeCandidatesInput
+    candidates: list[str]
+
+
+# (Specification type, human bone name) to the names of its ancestor human bones.
+human_bone_specification_key_to_ancestor_names: Final[
+    dict[tuple[type, object], frozenset[object]]
+] = {}
+
+
+# (Armature data name, specification type, human bone name) to the input and the
+# result of the last node_candidates update. Human bones whose input is unchanged
+# are skipped if the collection still holds the result.
+node_candidates_key_to_cache: Final[
+    dict[tuple[str, type, str], NodeCandidatesCache]
+] = {}
+
+
 class BonePropertyGroup(PropertyGroup):
+    @staticmethod
+    def clear_bone_uuid_index(armature_data_name: Optional[str] = None) -> None:
+        if armature_data_name is None:
+            armature_data_name_to_bone_uuid_index.clear()
+        else:
+            armature_data_name_to_bone_uuid_index.pop(armature_data_name, None)
+
+    @staticmethod
+    def clear_owner_index() -> None:
+        armature_data_name_to_armature_object_name.clear()
+
+    def find_owner_armature(self) -> Optional[Object]:
+        # BonePropertyGroup is always stored in the armature data extension.
+        armature_data = self.id_data
+        if not isinstance(armature_data, Armature):
+            return None
+
+        objects = bpy.context.blend_data.objects
+        armature_object_name = armature_data_name_to_armature_object_name.get(
+            armature_data.name
+        )
+        if armature_object_name is not None:
+            armature = objects.get(armature_object_name)
+            # The object may have been renamed, removed or assigned other data.
+            if armature and armature.data == armature_data:
+                return armature
+
+        for armature in objects:
+            # Keep the first armature if the armature data is shared, as before.
+            if armature.type == "ARMATURE" and armature.data == armature_data:
+                armature_data_name_to_armature_object_name[armature_data.name] = (
+                    armature.name
+                )
+                return armature
+
+        armature_data_name_to_armature_object_name.pop(armature_data.name, None)
+        return None
+
+    @staticmethod
+    def find_bone_name_by_uuid(armature_data: Armature, bone_uuid: str) -> str:
+        from .extension import get_bone_extension
+
+        bones = armature_data.bones
+        bone_uuid_index = armature_data_name_to_bone_uuid_index.get(armature_data.name)
+        if bone_uuid_index is not None:
+            bone_name = bone_uuid_index.bone_uuid_to_bone_name.get(bone_uuid)
+            if bone_name is None:
+                # A new UUID cannot appear without adding a bone or an explicit
+                # invalidation, so a miss is trusted while the count is the same.
+                if bone_uuid_index.bone_count == len(bones):
+                    return ""
+            else:
+                bone = bones.get(bone_name)
+                if bone and get_bone_extension(bone).uuid == bone_uuid:
+                    return bone_name
+
+        bone_uuid_to_bone_name: dict[str, str] = {}
+        for bone in bones:
+            # Keep the first bone if the UUIDs are duplicated, as before.
+            bone_uuid_to_bone_name.setdefault(get_bone_extension(bone).uuid, bone.name)
+        armature_data_name_to_bone_uuid_index[armature_data.name] = BoneUuidIndex(
+            bone_count=len(bones),
+            bone_uuid_to_bone_name=bone_uuid_to_bone_name,
+        )
+        return bone_uuid_to_bone_name.get(bone_uuid, "")
+
     @staticmethod
     def get_all_bone_property_groups(
         armature: Object,
@@ -244,68 +428,201 @@ class BonePropertyGroup(PropertyGroup):
                 yield joint.node
 
     @staticmethod
-    def find_bone_candidates(
-        armature_data: Armature,
+    def clear_node_candidates_cache() -> None:
+        node_candidates_key_to_cache.clear()
+
+    @staticmethod
+    def find_human_bone_ancestor_names(
+        human_bone_specification: HumanBoneSpecification,
+    ) -> frozenset[object]:
+        key = (type(human_bone_specification), human_bone_specification.name)
+        ancestor_names = human_bone_specification_key_to_ancestor_names.get(key)
+        if ancestor_names is None:
+            names: set[object] = set()
+            parent = human_bone_specification.parent()
+            while parent:
+                names.add(parent.name)
+                parent = parent.parent()
+            ancestor_names = frozenset(names)
+            human_bone_specification_key_to_ancestor_names[key] = ancestor_names
+        return ancestor_names
+
+    @staticmethod
+    def find_bone_index_and_relations(
+        bone_tree_index: BoneTreeIndex,
         target: HumanBoneSpecification,
         bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
-    ) -> set[str]:
-        bones = armature_data.bones
-        root_bones = [bone for bone in bones.values() if not bone.parent]
-        result: set[str] = set(bones.keys())
-        remove_bones_tree: set[Bone] = set()
-
+    ) -> tuple[tuple[int, int], ...]:
+        target_ancestor_names = BonePropertyGroup.find_human_bone_ancestor_names(target)
+        bone_index_and_relations: list[tuple[int, int]] = []
         for (
             bpy_bone_name,
             human_bone_specification,
         ) in bpy_bone_name_to_human_bone_specification.items():
-            if human_bone_specification == target:
+            if human_bone_specification.name == target.name:
                 continue
 
-            parent = bones.get(bpy_bone_name)
-            if not parent:
+            bone_index = bone_tree_index.bone_name_to_index.get(bpy_bone_name)
+            if bone_index is None:
                 continue
 
-            if human_bone_specification.is_ancestor_of(target):
-                remove_ancestors = True
-                remove_ancestor_branches = True
-            elif target.is_ancestor_of(human_bone_specification):
-                remove_bones_tree.add(parent)
-                remove_ancestors = False
-                remove_ancestor_branches = True
+            if human_bone_specification.name in target_ancestor_names:
+                relation = HUMAN_BONE_RELATION_ANCESTOR
+            elif target.name in BonePropertyGroup.find_human_bone_ancestor_names(
+                human_bone_specification
+            ):
+                relation = HUMAN_BONE_RELATION_DESCENDANT
             else:
-                remove_bones_tree.add(parent)
-                remove_ancestors = True
-                remove_ancestor_branches = False
-
-            while True:
-                if remove_ancestors and parent.name in result:
-                    result.remove(parent.name)
-                grand_parent = parent.parent
-                if not grand_parent:
-                    if remove_ancestor_branches:
-                        remove_bones_tree.update(
-                            root_bone for root_bone in root_bones if root_bone != parent
-                        )
-                    break
-
-                if remove_ancestor_branches:
-                    for grand_parent_child in grand_parent.children:
-                        if grand_parent_child != parent:
-                            remove_bones_tree.add(grand_parent_child)
-
-                parent = grand_parent
-
-        while remove_bones_tree:
-            child = remove_bones_tree.pop()
-            if child.name in result:
-                result.remove(child.name)
-            remove_bones_tree.update(child.children)
-
-        return result
+                relation = HUMAN_BONE_RELATION_UNRELATED
+            bone_index_and_relations.append((bone_index, relation))
+        return tuple(sorted(bone_index_and_relations))
 
-    def get_bone_name(self) -> str:
-        from .extension import get_bone_extension
+    @staticmethod
+    def find_bone_candidate_indices(
+        bone_tree_index: BoneTreeIndex,
+        bone_index_and_relations: tuple[tuple[int, int], ...],
+    ) -> list[int]:
+        """Return the indices of the candidate bones in the order of the bones."""
+        enter_indices = bone_tree_index.enter_indices
+        exit_indices = bone_tree_index.exit_indices
+        parent_indices = bone_tree_index.parent_indices
+        bone_count = len(bone_tree_index.bone_names)
+
+        # Candidates must be in the subtrees of the human bones assigned to
+        # the ancestors of the target.
+        min_enter_index = 0
+        max_enter_index = bone_count - 1
+        # Candidates must be the ancestors of the human bones assigned to the
+        # descendants of the target.
+        descendant_min_enter_index = bone_count
+        descendant_max_enter_index = -1
+        excluded = bytearray(bone_count)
+        ancestor_excluded = bytearray(bone_count)
+        # Candidates must not be in the subtrees of the human bones assigned to
+        # the unrelated human bones. Counted by the pre-order index.
+        unrelated_subtree_depth_diff = [0] * (bone_count + 1)
+
+        for bone_index, relation in bone_index_and_relations:
+            enter_index = enter_indices[bone_index]
+            if relation == HUMAN_BONE_RELATION_ANCESTOR:
+                min_enter_index = max(min_enter_index, enter_index + 1)
+                max_enter_index = min(max_enter_index, exit_indices[bone_index])
+            elif relation == HUMAN_BONE_RELATION_DESCENDANT:
+                excluded[bone_index] = 1
+                descendant_min_enter_index = min(
+                    descendant_min_enter_index, enter_index
+                )
+                descendant_max_enter_index = max(
+                    descendant_max_enter_index, enter_index
+                )
+            else:
+                unrelated_subtree_depth_diff[enter_index] += 1
+                unrelated_subtree_depth_diff[exit_indices[bone_index] + 1] -= 1
+                # Ancestors are marked separately so that the walk can stop at a
+                # bone whose ancestors are already marked.
+                parent_index = parent_indices[bone_index]
+                while parent_index >= 0 and not ancestor_excluded[parent_index]:
+                    ancestor_excluded[parent_index] = 1
+                    parent_index = parent_indices[parent_index]
+
+        unrelated_subtree_depths = [0] * bone_count
+        depth = 0
+        for enter_index in range(bone_count):
+            depth += unrelated_subtree_depth_diff[enter_index]
+            unrelated_subtree_depths[enter_index] = depth
+
+        has_descendant = descendant_max_enter_index >= 0
+        candidate_indices: list[int] = []
+        for bone_index in range(bone_count):
+            if excluded[bone_index] or ancestor_excluded[bone_index]:
+                continue
+            enter_index = enter_indices[bone_index]
+            if not min_enter_index <= enter_index <= max_enter_index:
+                continue
+            if unrelated_subtree_depths[enter_index]:
+                continue
+            if has_descendant and not (
+                enter_index <= descendant_min_enter_index
+                and descendant_max_enter_index <= exit_indices[bone_index]
+            ):
+                continue
+            candidate_indices.append(bone_index)
+        return candidate_indices
 
+    @staticmethod
+    def find_bone_candidates(
+        armature_data: Armature,
+        target: HumanBoneSpecification,
+        bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
+    ) -> set[str]:
+        if bone_tree_index is None:
+            bone_tree_index = BoneTreeIndex.create(armature_data)
+        bone_index_and_relations = BonePropertyGroup.find_bone_index_and_relations(
+            bone_tree_index, target, bpy_bone_name_to_human_bone_specification
+        )
+        return {
+            bone_tree_index.bone_names[bone_index]
+            for bone_index in BonePropertyGroup.find_bone_candidate_indices(
+                bone_tree_index, bone_index_and_relations
+            )
+        }
+
+    @staticmethod
+    def update_node_candidates(
+        node_candidates: "CollectionPropertyProtocol[StringPropertyGroup]",
+        armature_data: Armature,
+        target: HumanBoneSpecification,
+        bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
+    ) -> None:
+        if bone_tree_index is None:
+            bone_tree_index = BoneTreeIndex.create(armature_data)
+        node_candidates_input = NodeCandidatesInput(
+            bone_names=bone_tree_index.bone_names,
+            parent_indices=bone_tree_index.parent_indices,
+            bone_index_and_relations=BonePropertyGroup.find_bone_index_and_relations(
+                bone_tree_index, target, bpy_bone_name_to_human_bone_specification
+            ),
+        )
+        key = (armature_data.name, type(target), str(target.name))
+        # StringPropertyGroup keeps its name same as its value, so keys() is a
+        # fast way to read the values.
+        old_candidates = node_candidates.keys()
+        cache = node_candidates_key_to_cache.get(key)
+        if (
+            cache is not None
+            and cache.node_candidates_input == node_candidates_input
+            and cache.candidates == old_candidates
+        ):
+            return
+
+        # Preserving list order
+        new_candidates = [
+            bone_tree_index.bone_names[bone_index]
+            for bone_index in BonePropertyGroup.find_bone_candidate_indices(
+                bone_tree_index, node_candidates_input.bone_index_and_relations
+            )
+        ]
+
+        # Rewrite only the changed items instead of clearing the collection.
+        for index, bone_name in enumerate(new_candidates):
+            if index < len(old_candidates):
+                if old_candidates[index] == bone_name:
+                    continue
+                candidate = node_candidates[index]
+            else:
+                candidate = node_candidates.add()
+            candidate.value = bone_name
+        for index in reversed(range(len(new_candidates), len(old_candidates))):
+            node_candidates.remove(index)
+
+        node_candidates_key_to_cache[key] = NodeCandidatesCache(
+            node_candidates_input=node_candidates_input,
+            candidates=new_candidates,
+        )
+
+    def get_bone_name(self) -> str:
         context = bpy.context
 
         if not self.bone_uuid:
@@ -316,12 +633,40 @@ class BonePropertyGroup(PropertyGroup):
         if not armature_data:
             return ""
 
-        # TODO: Optimization
+        return BonePropertyGroup.find_bone_name_by_uuid(armature_data, self.bone_uuid)
+
+    @staticmethod
+    def create_bone_name_to_uuid(armature_data: Armature) -> dict[str, str]:
+        """ボーン名からUUIDへの対応表を作成する.
+
+        set_bone_name()と同様に、空や重複したUUIDは振り直す。
+        """
+        from .extension import get_bone_extension
+
+        bone_name_to_uuid: dict[str, str] = {}
+        found_uuids: set[str] = set()
         for bone in armature_data.bones:
-            if get_bone_extension(bone).uuid == self.bone_uuid:
-                return bone.name
+            bone_extension = get_bone_extension(bone)
+            found_uuid = bone_extension.uuid
+            if not found_uuid or found_uuid in found_uuids:
+                found_uuid = uuid.uuid4().hex
+                bone_extension.uuid = found_uuid
+                BonePropertyGroup.clear_bone_uuid_index(armature_data.name)
+            found_uuids.add(found_uuid)
+            bone_name_to_uuid[bone.name] = found_uuid
+        return bone_name_to_uuid
 
-        return ""
+    def assign_bone_uuid(self, armature_data: Armature, bone_uuid: str) -> None:
+        """set_bone_name()の検索や更新処理を行わずにボーンを割り当てる.
+
+        bone_uuidにはcreate_bone_name_to_uuid()で得たUUIDを渡す。多数のボーンを
+        一括で割り当てる際に使い、VRM 0.xのコライダーグループの更新は呼び出し元で行う。
+        """
+        from .spring_bone1.handler import invalidate_simulation_plans
+
+        self.armature_data_name = armature_data.name
+        self.bone_uuid = bone_uuid
+        invalidate_simulation_plans(armature_data.name)
 
     def set_bone_name_and_refresh_node_candidates(self, value: object) -> None:
         self.set_bone_name(
@@ -332,25 +677,10 @@ class BonePropertyGroup(PropertyGroup):
         self, value: Optional[str], *, refresh_node_candidates: bool = False
     ) -> None:
         from .extension import get_armature_extension, get_bone_extension
-
-        context = bpy.context
-
-        armature: Optional[Object] = None
+        from .spring_bone1.handler import invalidate_simulation_plans
 
         # Reassign self.armature_data_name in case of armature duplication.
-        self.search_one_time_uuid = uuid.uuid4().hex
-        for found_armature in context.blend_data.objects:
-            if found_armature.type != "ARMATURE":
-                continue
-            if all(
-                bone_property_group.search_one_time_uuid != self.search_one_time_uuid
-                for bone_property_group in (
-                    BonePropertyGroup.get_all_bone_property_groups(found_armature)
-                )
-            ):
-                continue
-            armature = found_armature
-            break
+        armature = self.find_owner_armature()
         if not armature:
             self.armature_data_name = ""
             self.bone_uuid = ""
@@ -370,6 +700,7 @@ class BonePropertyGroup(PropertyGroup):
             found_uuid = get_bone_extension(bone).uuid
             if not found_uuid or found_uuid in found_uuids:
                 get_bone_extension(bone).uuid = uuid.uuid4().hex
+                BonePropertyGroup.clear_bone_uuid_index(armature_data.name)
             found_uuids.add(get_bone_extension(bone).uuid)
 
         if not value or value not in armature_data.bones:
@@ -385,9 +716,15 @@ class BonePropertyGroup(PropertyGroup):
             bone = armature_data.bones[value]
             self.bone_uuid = get_bone_extension(bone).uuid
 
+        # スプリングボーンのジョイントやコライダーのボーンが変わった可能性がある
+        invalidate_simulation_plans(armature_data.name)
+
+        # コライダーグループの名前はノードのボーン名を含むため、
+        # このノードを持つコライダーグループだけを更新する
         ext = get_armature_extension(armature_data)
         for collider_group in ext.vrm0.secondary_animation.collider_groups:
-            collider_group.refresh(armature)
+            if collider_group.node == self:
+                collider_group.refresh(armature)
 
         if not refresh_node_candidates:
             return
@@ -403,10 +740,13 @@ class BonePropertyGroup(PropertyGroup):
             and vrm0_human_bone.HumanBoneName.from_str(human_bone.bone) is not None
         }
 
+        bone_tree_index = BoneTreeIndex.create(armature_data)
+
         for human_bone in ext.vrm0.humanoid.human_bones:
             human_bone.update_node_candidates(
                 armature_data,
                 vrm0_bpy_bone_name_to_human_bone_specification,
+                bone_tree_index,
             )
 
         human_bone_name_to_human_bone = (
@@ -430,6 +770,7 @@ class BonePropertyGroup(PropertyGroup):
                 armature_data,
                 vrm1_human_bone.HumanBoneSpecifications.get(human_bone_name),
                 vrm1_bpy_bone_name_to_human_bone_specification,
+                bone_tree_index,
             )
 
     bone_name: StringProperty(  # type: ignore[valid-type]
@@ -492,8 +833,14 @@ class CollectionPropertyProtocol(Protocol[T_co]):
 
     def remove(self, index: int) -> None: ...  # TODO: undocumented
 
+    def keys(self) -> list[str]: ...  # TODO: undocumented
+
     def values(self) -> ValuesView[T_co]: ...  # TODO: undocumented
 
     def __contains__(self, value: str) -> bool: ...  # TODO: undocumented
 
     def move(self, from_index: int, to_index: int) -> None: ...  # TODO: undocumented
+
+    def foreach_get(self, attr: str, seq: object) -> None: ...  # TODO: undocumented
+
+    def foreach_set(self, attr: str, seq: object) -> None: ...  # TODO: undocumented
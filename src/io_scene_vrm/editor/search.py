@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Final, Optional, Union
+from typing import Final, Optional
 
 from bpy.app.translations import pgettext
 from bpy.types import (
@@ -14,13 +15,14 @@ from bpy.types import (
     DampedTrackConstraint,
     Material,
     Mesh,
+    Modifier,
+    NodesModifier,
     Object,
-    ObjectConstraints,
-    PoseBoneConstraints,
     ShaderNodeGroup,
     ShaderNodeOutputMaterial,
 )
 
+from ..common import shader
 from ..common.logging import get_logger
 from .extension import get_armature_extension
 
@@ -35,6 +37,17 @@ MESH_CONVERTIBLE_OBJECT_TYPES = [
 ]
 
 
+def is_armature_or_outline_modifier(modifier: Modifier) -> bool:
+    if modifier.type == "ARMATURE":
+        return True
+    return (
+        modifier.type == "NODES"
+        and isinstance(modifier, NodesModifier)
+        and modifier.node_group is not None
+        and modifier.node_group.name == shader.OUTLINE_GEOMETRY_GROUP_NAME
+    )
+
+
 def export_materials(context: Context, objects: Sequence[Object]) -> Sequence[Material]:
     result: list[Material] = []
     for obj in objects:
@@ -550,139 +563,255 @@ def export_bone_constraints(
     )
 
 
-def export_constraints(
-    objs: Sequence[Object],
-    armature: Object,
-) -> tuple[ExportConstraint, ExportConstraint, Sequence[str]]:
-    messages: list[str] = []
-    object_constraints = export_object_constraints(objs, armature)
-    bone_constraints = export_bone_constraints(objs, armature)
+CONSTRAINT_OWNER_TYPE_OBJECT: Final = "OBJECT"
+CONSTRAINT_OWNER_TYPE_BONE: Final = "BONE"
+CONSTRAINT_AXIS_COUNT: Final = 3
 
-    all_roll_constraints: list[CopyRotationConstraint] = list(
-        object_constraints.roll_constraints.values()
-    ) + list(bone_constraints.roll_constraints.values())
-    all_rotation_constraints: list[CopyRotationConstraint] = list(
-        object_constraints.rotation_constraints.values()
-    ) + list(bone_constraints.rotation_constraints.values())
-
-    # TODO: Aim Constraint's circular dependency detection
-    # + list(object_constraints.aim_constraints.values())
-    # + list(bone_constraints.aim_constraints.values())
-    all_constraints: list[Constraint] = []
-    all_constraints.extend(all_roll_constraints)
-    all_constraints.extend(all_rotation_constraints)
-
-    excluded_constraints: list[
-        Union[
-            CopyRotationConstraint,
-            DampedTrackConstraint,
-        ]
-    ] = []
 
-    for search_constraint in all_constraints:
-        if not isinstance(search_constraint, CopyRotationConstraint):
-            continue
-        current_constraints = [
-            (
-                search_constraint,
-                (
-                    search_constraint.use_x,
-                    search_constraint.use_y,
-                    search_constraint.use_z,
-                ),
-            )
+@dataclass(frozen=True)
+class ConstraintGraph:
+    """Copy Rotationコンストレイントの依存グラフ.
+
+    頂点はコンストレイントで、コンストレイントからターゲットのコンストレイントへ辺を張る。
+    Blenderのオブジェクトへの参照を持たないため、同一操作内の再利用の判定に使える。
+    """
+
+    owner_types: tuple[str, ...]
+    owner_names: tuple[str, ...]
+    constraint_names: tuple[str, ...]
+    axis_masks: tuple[int, ...]
+    edges: tuple[tuple[int, ...], ...]
+
+    @staticmethod
+    def create(
+        object_constraints: ExportConstraint, bone_constraints: ExportConstraint
+    ) -> "ConstraintGraph":
+        # TODO: Aim Constraint's circular dependency detection
+        owner_type_and_constraints: list[
+            tuple[str, dict[str, CopyRotationConstraint]]
+        ] = [
+            (CONSTRAINT_OWNER_TYPE_OBJECT, object_constraints.roll_constraints),
+            (CONSTRAINT_OWNER_TYPE_BONE, bone_constraints.roll_constraints),
+            (CONSTRAINT_OWNER_TYPE_OBJECT, object_constraints.rotation_constraints),
+            (CONSTRAINT_OWNER_TYPE_BONE, bone_constraints.rotation_constraints),
         ]
-        iterated_constraints: set[Constraint] = set()
-        while current_constraints:
-            current_constraint, current_axis = current_constraints.pop()
-
-            if current_constraint in iterated_constraints:
-                break
-            iterated_constraints.add(current_constraint)
-
-            found = False
 
-            target = current_constraint.target
+        owner_types: list[str] = []
+        owner_names: list[str] = []
+        constraints: list[CopyRotationConstraint] = []
+        owner_to_index: dict[tuple[str, str], int] = {}
+        for owner_type, owner_name_to_constraint in owner_type_and_constraints:
+            for owner_name, constraint in owner_name_to_constraint.items():
+                # 一つの所有者から出力されるコンストレイントは一つだけ
+                owner_to_index[(owner_type, owner_name)] = len(constraints)
+                owner_types.append(owner_type)
+                owner_names.append(owner_name)
+                constraints.append(constraint)
+
+        edges: list[tuple[int, ...]] = []
+        for constraint in constraints:
+            target = constraint.target
             if not target:
+                edges.append(())
                 continue
-
             if target.type == "ARMATURE":
-                bone = target.pose.bones[current_constraint.subtarget]
-                owner_name = bone.name
-                target_constraints: Union[ObjectConstraints, PoseBoneConstraints] = (
-                    bone.constraints
-                )
+                target_owner = (CONSTRAINT_OWNER_TYPE_BONE, constraint.subtarget)
             else:
-                owner_name = target.name
-                target_constraints = target.constraints
+                target_owner = (CONSTRAINT_OWNER_TYPE_OBJECT, target.name)
+            target_index = owner_to_index.get(target_owner)
+            edges.append(() if target_index is None else (target_index,))
+
+        return ConstraintGraph(
+            owner_types=tuple(owner_types),
+            owner_names=tuple(owner_names),
+            constraint_names=tuple(constraint.name for constraint in constraints),
+            axis_masks=tuple(
+                int(constraint.use_x)
+                | int(constraint.use_y) << 1
+                | int(constraint.use_z) << 2
+                for constraint in constraints
+            ),
+            edges=tuple(edges),
+        )
 
-            for target_constraint in target_constraints:
-                if not isinstance(target_constraint, CopyRotationConstraint):
+    def find_circular_dependency_indices(self) -> list[int]:
+        """循環依存を持つコンストレイントの番号を昇順で返す.
+
+        コンストレイントと軸の組を頂点とするグラフを一度だけ強連結成分分解する。
+        同じ軸を使うコンストレイントだけを辿って自身に戻れる場合、循環依存とみなす。
+        """
+        adjacency: list[list[int]] = []
+        for index, target_indices in enumerate(self.edges):
+            for axis in range(CONSTRAINT_AXIS_COUNT):
+                axis_bit = 1 << axis
+                if not self.axis_masks[index] & axis_bit:
+                    adjacency.append([])
                     continue
-                if target_constraint not in all_constraints:
-                    continue
-
-                next_target_axis = (
-                    current_axis[0] and target_constraint.use_x,
-                    current_axis[1] and target_constraint.use_y,
-                    current_axis[2] and target_constraint.use_z,
+                adjacency.append(
+                    [
+                        target_index * CONSTRAINT_AXIS_COUNT + axis
+                        for target_index in target_indices
+                        if self.axis_masks[target_index] & axis_bit
+                    ]
                 )
-                if next_target_axis == (False, False, False):
-                    continue
 
-                if target_constraint != search_constraint:
-                    current_constraints.append((target_constraint, next_target_axis))
-                    continue
+        circular_dependency_indices: set[int] = set()
+        for component in find_strongly_connected_components(adjacency):
+            vertex = component[0]
+            if len(component) == 1 and vertex not in adjacency[vertex]:
+                continue
+            circular_dependency_indices.update(
+                vertex // CONSTRAINT_AXIS_COUNT for vertex in component
+            )
+        return sorted(circular_dependency_indices)
+
+
+def find_strongly_connected_components(
+    adjacency: Sequence[Sequence[int]],
+) -> list[list[int]]:
+    """Tarjanのアルゴリズムで強連結成分を列挙する.
+
+    深いグラフで再帰の上限に達しないよう、明示的なスタックで実装する。
+    """
+    vertex_count = len(adjacency)
+    orders = [-1] * vertex_count
+    low_links = [0] * vertex_count
+    on_stack = [False] * vertex_count
+    stack: list[int] = []
+    components: list[list[int]] = []
+    next_order = 0
+
+    for root in range(vertex_count):
+        if orders[root] >= 0:
+            continue
+        work_stack: list[tuple[int, int]] = [(root, 0)]
+        while work_stack:
+            vertex, edge_index = work_stack.pop()
+            if edge_index == 0:
+                orders[vertex] = low_links[vertex] = next_order
+                next_order += 1
+                stack.append(vertex)
+                on_stack[vertex] = True
+
+            edges = adjacency[vertex]
+            descended = False
+            while edge_index < len(edges):
+                next_vertex = edges[edge_index]
+                edge_index += 1
+                if orders[next_vertex] < 0:
+                    work_stack.append((vertex, edge_index))
+                    work_stack.append((next_vertex, 0))
+                    descended = True
+                    break
+                if on_stack[next_vertex]:
+                    low_links[vertex] = min(low_links[vertex], orders[next_vertex])
+            if descended:
+                continue
 
-                excluded_constraints.append(search_constraint)
-                messages.append(
-                    pgettext(
-                        'Node Constraint "{owner_name} / {constraint_name}" has'
-                        + " a circular dependency"
-                    ).format(
-                        owner_name=owner_name,
-                        constraint_name=search_constraint.name,
-                    )
+            if low_links[vertex] == orders[vertex]:
+                component: list[int] = []
+                while True:
+                    component_vertex = stack.pop()
+                    on_stack[component_vertex] = False
+                    component.append(component_vertex)
+                    if component_vertex == vertex:
+                        break
+                components.append(component)
+
+            if work_stack:
+                parent_vertex = work_stack[-1][0]
+                low_links[parent_vertex] = min(
+                    low_links[parent_vertex], low_links[vertex]
                 )
-                found = True
-                break
 
-            if found:
-                break
+    return components
+
+
+@dataclass
+class ExportConstraintsCache:
+    scope_depth: int = 0
+    graph: Optional[ConstraintGraph] = None
+    circular_dependency_indices: Sequence[int] = ()
+
+
+export_constraints_cache: Final = ExportConstraintsCache()
+
+
+@contextmanager
+def use_export_constraints_cache() -> Iterator[None]:
+    """スコープ内では、依存グラフが同一であれば循環依存の検出結果を再利用する.
+
+    検証とエクスポートで、同じ検出を繰り返さないようにするために使う。
+    """
+    cache = export_constraints_cache
+    cache.scope_depth += 1
+    try:
+        yield
+    finally:
+        cache.scope_depth -= 1
+        if cache.scope_depth == 0:
+            cache.graph = None
+            cache.circular_dependency_indices = ()
+
+
+def find_circular_dependency_indices(graph: ConstraintGraph) -> Sequence[int]:
+    cache = export_constraints_cache
+    if cache.scope_depth == 0:
+        return graph.find_circular_dependency_indices()
+    if cache.graph != graph:
+        cache.graph = graph
+        cache.circular_dependency_indices = graph.find_circular_dependency_indices()
+    return cache.circular_dependency_indices
+
+
+def export_constraints(
+    objs: Sequence[Object],
+    armature: Object,
+) -> tuple[ExportConstraint, ExportConstraint, Sequence[str]]:
+    object_constraints = export_object_constraints(objs, armature)
+    bone_constraints = export_bone_constraints(objs, armature)
+
+    graph = ConstraintGraph.create(object_constraints, bone_constraints)
+    messages: list[str] = []
+    excluded_owners: set[tuple[str, str]] = set()
+    for index in find_circular_dependency_indices(graph):
+        owner_name = graph.owner_names[index]
+        excluded_owners.add((graph.owner_types[index], owner_name))
+        messages.append(
+            pgettext(
+                'Node Constraint "{owner_name} / {constraint_name}" has'
+                + " a circular dependency"
+            ).format(
+                owner_name=owner_name,
+                constraint_name=graph.constraint_names[index],
+            )
+        )
 
     return (
         ExportConstraint(
             roll_constraints={
                 k: v
                 for k, v in object_constraints.roll_constraints.items()
-                if v not in excluded_constraints
-            },
-            aim_constraints={
-                k: v
-                for k, v in object_constraints.aim_constraints.items()
-                if v not in excluded_constraints
+                if (CONSTRAINT_OWNER_TYPE_OBJECT, k) not in excluded_owners
             },
+            aim_constraints=object_constraints.aim_constraints,
             rotation_constraints={
                 k: v
                 for k, v in object_constraints.rotation_constraints.items()
-                if v not in excluded_constraints
+                if (CONSTRAINT_OWNER_TYPE_OBJECT, k) not in excluded_owners
             },
         ),
         ExportConstraint(
             roll_constraints={
                 k: v
                 for k, v in bone_constraints.roll_constraints.items()
-                if v not in excluded_constraints
-            },
-            aim_constraints={
-                k: v
-                for k, v in bone_constraints.aim_constraints.items()
-                if v not in excluded_constraints
+                if (CONSTRAINT_OWNER_TYPE_BONE, k) not in excluded_owners
             },
+            aim_constraints=bone_constraints.aim_constraints,
             rotation_constraints={
                 k: v
                 for k, v in bone_constraints.rotation_constraints.items()
-                if v not in excluded_constraints
+                if (CONSTRAINT_OWNER_TYPE_BONE, k) not in excluded_owners
             },
         ),
         messages,
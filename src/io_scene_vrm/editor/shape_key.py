@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from array import array
+from collections.abc import Mapping
+
+from bpy.types import Context
+
+
+def apply_key_block_values(
+    context: Context,
+    shape_key_name_and_key_block_name_to_value: Mapping[tuple[str, str], float],
+) -> None:
+    """シェイプキーのキーブロックの値を、シェイプキーごとにまとめて設定する.
+
+    値が変化しないシェイプキーには書き込まない。
+    """
+    shape_key_name_to_key_block_name_to_value: dict[str, dict[str, float]] = {}
+    for (
+        shape_key_name,
+        key_block_name,
+    ), value in shape_key_name_and_key_block_name_to_value.items():
+        shape_key_name_to_key_block_name_to_value.setdefault(shape_key_name, {})[
+            key_block_name
+        ] = value
+
+    for (
+        shape_key_name,
+        key_block_name_to_value,
+    ) in shape_key_name_to_key_block_name_to_value.items():
+        shape_key = context.blend_data.shape_keys.get(shape_key_name)
+        if not shape_key:
+            continue
+        key_blocks = shape_key.key_blocks
+        if not key_blocks:
+            continue
+
+        values = array("f", [0.0]) * len(key_blocks)
+        key_blocks.foreach_get("value", values)
+        new_values = array("f", values)
+        for key_block_name, value in key_block_name_to_value.items():
+            key_block_index = key_blocks.find(key_block_name)
+            if key_block_index < 0:
+                continue
+            new_values[key_block_index] = value
+
+        # 保存される値と同じ単精度浮動小数点数で比較する
+        if new_values == values:
+            continue
+
+        # foreach_set()は値の範囲の制限はするが、更新の通知はしない
+        key_blocks.foreach_set("value", new_values)
+        shape_key.update_tag()
@@ -1,20 +1,30 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 from decimal import Decimal
 from sys import float_info
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Final, Optional, Union
 
 import bpy
+import numpy as np
 from bpy.app.handlers import persistent
-from bpy.types import Armature, Context, Object, PoseBone
+from bpy.types import Action, Armature, Context, Depsgraph, Object, PoseBone
 from mathutils import Matrix, Quaternion, Vector
 
 from ..extension import get_armature_extension
 from .property_group import (
+    SpringBone1ColliderPropertyGroup,
     SpringBone1JointPropertyGroup,
+    SpringBone1SpringBonePropertyGroup,
     SpringBone1SpringPropertyGroup,
 )
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+SUBSTEP_COUNT_HISTORY_SIZE: Final = 600
+
 
 @dataclass
 class State:
@@ -22,6 +32,12 @@ class State:
     spring_bone_60_fps_update_count: Decimal = Decimal()
     last_fps: Optional[Decimal] = None
     last_fps_base: Optional[Decimal] = None
+    baking: bool = False
+
+    # ステップが進んだフレームごとに、アーマチュアのオブジェクトごとに計算した
+    # ステップ数の記録。resetでは消さない
+    object_name_to_substep_counts: dict[str, deque[int]] = field(default_factory=dict)
+    object_name_to_max_substep_count: dict[str, int] = field(default_factory=dict)
 
     def reset(self, context: Context) -> None:
         self.frame_count = Decimal()
@@ -29,6 +45,24 @@ class State:
         self.last_fps_base = Decimal(context.scene.render.fps_base)
         self.last_fps = Decimal(context.scene.render.fps)
 
+    def append_substep_count(self, object_name: str, substep_count: int) -> None:
+        substep_counts = self.object_name_to_substep_counts.get(object_name)
+        if substep_counts is None:
+            substep_counts = deque(maxlen=SUBSTEP_COUNT_HISTORY_SIZE)
+            self.object_name_to_substep_counts[object_name] = substep_counts
+        substep_counts.append(substep_count)
+        self.object_name_to_max_substep_count[object_name] = max(
+            self.object_name_to_max_substep_count.get(object_name, 0), substep_count
+        )
+
+    def reset_substep_counts(self, object_name: Optional[str] = None) -> None:
+        if object_name is None:
+            self.object_name_to_substep_counts.clear()
+            self.object_name_to_max_substep_count.clear()
+            return
+        self.object_name_to_substep_counts.pop(object_name, None)
+        self.object_name_to_max_substep_count.pop(object_name, None)
+
 
 state = State()
 
@@ -37,6 +71,10 @@ def reset_state(context: Context) -> None:
     state.reset(context)
 
 
+def reset_substep_counts(object_name: Optional[str] = None) -> None:
+    state.reset_substep_counts(object_name)
+
+
 @dataclass(frozen=True)
 class SphereWorldCollider:
     offset: Vector
@@ -157,11 +195,599 @@ class PlaneWorldCollider:
         return self.normal, distance
 
 
+WorldCollider = Union[
+    SphereWorldCollider,
+    CapsuleWorldCollider,
+    SphereInsideWorldCollider,
+    CapsuleInsideWorldCollider,
+    PlaneWorldCollider,
+]
+
+
+@dataclass(frozen=True)
+class SphereCollider:
+    bone_name: str
+    offset: Vector
+    radius: float
+    inside: bool
+
+    def to_world_collider(self, pose_bone_world_matrix: Matrix) -> WorldCollider:
+        offset = pose_bone_world_matrix @ self.offset
+        if self.inside:
+            return SphereInsideWorldCollider(offset=offset, radius=self.radius)
+        return SphereWorldCollider(offset=offset, radius=self.radius)
+
+
+@dataclass(frozen=True)
+class CapsuleCollider:
+    bone_name: str
+    offset: Vector
+    tail: Vector
+    radius: float
+    inside: bool
+
+    def to_world_collider(self, pose_bone_world_matrix: Matrix) -> WorldCollider:
+        offset = pose_bone_world_matrix @ self.offset
+        tail = pose_bone_world_matrix @ self.tail
+        offset_to_tail_diff = tail - offset
+        offset_to_tail_diff_length_squared = offset_to_tail_diff.length_squared
+        if offset_to_tail_diff_length_squared < float_info.epsilon:
+            # offsetとtailの位置が同じ場合はスフィアコライダーにする
+            if self.inside:
+                return SphereInsideWorldCollider(offset=offset, radius=self.radius)
+            return SphereWorldCollider(offset=offset, radius=self.radius)
+        if self.inside:
+            return CapsuleInsideWorldCollider(
+                offset=offset,
+                radius=self.radius,
+                tail=tail,
+                offset_to_tail_diff=offset_to_tail_diff,
+                offset_to_tail_diff_length_squared=offset_to_tail_diff_length_squared,
+            )
+        return CapsuleWorldCollider(
+            offset=offset,
+            radius=self.radius,
+            tail=tail,
+            offset_to_tail_diff=offset_to_tail_diff,
+            offset_to_tail_diff_length_squared=offset_to_tail_diff_length_squared,
+        )
+
+
+@dataclass(frozen=True)
+class PlaneCollider:
+    bone_name: str
+    offset: Vector
+    normal: Vector
+
+    def to_world_collider(self, pose_bone_world_matrix: Matrix) -> WorldCollider:
+        return PlaneWorldCollider(
+            offset=pose_bone_world_matrix @ self.offset,
+            normal=pose_bone_world_matrix.to_quaternion() @ self.normal,
+        )
+
+
+@dataclass(frozen=True)
+class JointPairPlan:
+    head_joint_index: int
+    head_bone_name: str
+    head_rest_object_matrix: Matrix
+    head_use_inherit_rotation: bool
+    tail_joint_index: int
+    tail_bone_name: str
+    head_rest_to_tail_rest_object_matrix: Matrix
+    head_rotation_start_target_local_translation: Vector
+
+
+@dataclass(frozen=True)
+class SpringPlan:
+    spring_index: int
+    center_bone_name: Optional[str]
+    head_parent_bone_name: Optional[str]
+    head_parent_rest_to_head_rest_object_matrix: Matrix
+    joint_pairs: tuple[JointPairPlan, ...]
+    collider_indices: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SimulationPlan:
+    """Spring bone setup resolved for the simulation of an armature.
+
+    Changes to the spring bone settings do not reach the depsgraph, so the
+    property update callbacks and the operators that edit the collections
+    invalidate the plan. Rest matrices and collider shapes are invalidated by
+    depsgraph updates. Bones are kept by name, not by PoseBone, since holding
+    native objects across frames is unsafe.
+    """
+
+    armature_data_name: str
+    collection_lengths: tuple[int, int, int]
+    collider_object_names: frozenset[str]
+    colliders: tuple[Union[SphereCollider, CapsuleCollider, PlaneCollider], ...]
+    springs: tuple[SpringPlan, ...]
+
+
+object_name_to_simulation_plan: dict[str, SimulationPlan] = {}
+
+
+def clear_simulation_plans() -> None:
+    # numpy_solverはこのモジュールに依存しているので、ここで読み込む
+    from .numpy_solver import object_name_to_batch_plan
+
+    object_name_to_simulation_plan.clear()
+    object_name_to_batch_plan.clear()
+    object_name_to_animation_state.clear()
+
+
+def invalidate_simulation_plans(armature_data_name: str) -> None:
+    """Make the armatures using the data compile their plans again."""
+    for object_name, simulation_plan in list(object_name_to_simulation_plan.items()):
+        if simulation_plan.armature_data_name == armature_data_name:
+            del object_name_to_simulation_plan[object_name]
+
+
+@dataclass(frozen=True)
+class AnimationState:
+    """Live animation state of the springs and joints of an armature.
+
+    Writing the state to the property groups on every step is slow, so it is
+    kept in arrays ordered like the springs and joint pairs of the simulation
+    plan, and written back when the file is saved, when the playback stops
+    and when the state is reset. The arrays belong to the tail joint of each
+    joint pair.
+
+    Springs have no UUIDs, so each spring is identified by the bone UUIDs of
+    all of its joints.
+    """
+
+    simulation_plan: SimulationPlan
+    spring_first_pair_indices: tuple[int, ...]
+    spring_joint_bone_uuids: tuple[tuple[str, ...], ...]
+
+    use_center_spaces: "NDArray[np.bool_]"
+    previous_center_world_translations: "NDArray[np.float64]"
+
+    initialized_as_tails: "NDArray[np.bool_]"
+    previous_world_translations: "NDArray[np.float64]"
+    current_world_translations: "NDArray[np.float64]"
+
+
+object_name_to_animation_state: dict[str, AnimationState] = {}
+
+
+def get_joint_bone_uuids(spring: SpringBone1SpringPropertyGroup) -> tuple[str, ...]:
+    return tuple(joint.node.bone_uuid for joint in spring.joints)
+
+
+def load_animation_state(
+    spring_bone1: SpringBone1SpringBonePropertyGroup, simulation_plan: SimulationPlan
+) -> AnimationState:
+    springs = spring_bone1.springs
+    spring_first_pair_indices: list[int] = []
+    spring_joint_bone_uuids: list[tuple[str, ...]] = []
+    use_center_spaces: list[bool] = []
+    previous_center_world_translations: list[Sequence[float]] = []
+    initialized_as_tails: list[bool] = []
+    previous_world_translations: list[Sequence[float]] = []
+    current_world_translations: list[Sequence[float]] = []
+    for spring_plan in simulation_plan.springs:
+        spring = springs[spring_plan.spring_index]
+        spring_first_pair_indices.append(len(initialized_as_tails))
+        spring_joint_bone_uuids.append(get_joint_bone_uuids(spring))
+        use_center_spaces.append(spring.animation_state.use_center_space)
+        previous_center_world_translations.append(
+            spring.animation_state.previous_center_world_translation
+        )
+        joints = spring.joints
+        for joint_pair in spring_plan.joint_pairs:
+            tail_joint = joints[joint_pair.tail_joint_index]
+            initialized_as_tails.append(tail_joint.animation_state.initialized_as_tail)
+            previous_world_translations.append(
+                tail_joint.animation_state.previous_world_translation
+            )
+            current_world_translations.append(
+                tail_joint.animation_state.current_world_translation
+            )
+
+    return AnimationState(
+        simulation_plan=simulation_plan,
+        spring_first_pair_indices=tuple(spring_first_pair_indices),
+        spring_joint_bone_uuids=tuple(spring_joint_bone_uuids),
+        use_center_spaces=np.array(use_center_spaces, dtype=np.bool_),
+        previous_center_world_translations=np.array(
+            previous_center_world_translations, dtype=np.float64
+        ).reshape(-1, 3),
+        initialized_as_tails=np.array(initialized_as_tails, dtype=np.bool_),
+        previous_world_translations=np.array(
+            previous_world_translations, dtype=np.float64
+        ).reshape(-1, 3),
+        current_world_translations=np.array(
+            current_world_translations, dtype=np.float64
+        ).reshape(-1, 3),
+    )
+
+
+def save_animation_state(
+    spring_bone1: SpringBone1SpringBonePropertyGroup, animation_state: AnimationState
+) -> None:
+    springs = spring_bone1.springs
+    joint_bone_uuids_to_spring: Optional[
+        dict[tuple[str, ...], SpringBone1SpringPropertyGroup]
+    ] = None
+    for (
+        spring_plan,
+        joint_bone_uuids,
+        first_pair_index,
+        use_center_space,
+        previous_center,
+    ) in zip(
+        animation_state.simulation_plan.springs,
+        animation_state.spring_joint_bone_uuids,
+        animation_state.spring_first_pair_indices,
+        animation_state.use_center_spaces.tolist(),
+        animation_state.previous_center_world_translations.tolist(),
+    ):
+        # 保存されていた状態を読み込んだ後にスプリングが編集されている場合がある。
+        # その場合は、ジョイントの数とボーンが一致するスプリングに書き戻す
+        spring: Optional[SpringBone1SpringPropertyGroup] = None
+        if spring_plan.spring_index < len(springs):
+            spring = springs[spring_plan.spring_index]
+        if spring is None or get_joint_bone_uuids(spring) != joint_bone_uuids:
+            if joint_bone_uuids_to_spring is None:
+                joint_bone_uuids_to_spring = {}
+                for candidate_spring in springs:
+                    joint_bone_uuids_to_spring.setdefault(
+                        get_joint_bone_uuids(candidate_spring), candidate_spring
+                    )
+            spring = joint_bone_uuids_to_spring.get(joint_bone_uuids)
+            if spring is None:
+                continue
+
+        spring.animation_state.use_center_space = use_center_space
+        spring.animation_state.previous_center_world_translation = previous_center
+
+        joints = spring.joints
+        for pair_index, joint_pair in enumerate(
+            spring_plan.joint_pairs, first_pair_index
+        ):
+            tail_joint = joints[joint_pair.tail_joint_index]
+            tail_joint.animation_state.initialized_as_tail = bool(
+                animation_state.initialized_as_tails[pair_index]
+            )
+            tail_joint.animation_state.previous_world_translation = (
+                animation_state.previous_world_translations[pair_index].tolist()
+            )
+            tail_joint.animation_state.current_world_translation = (
+                animation_state.current_world_translations[pair_index].tolist()
+            )
+
+
+def get_animation_state(
+    obj: Object,
+    spring_bone1: SpringBone1SpringBonePropertyGroup,
+    simulation_plan: SimulationPlan,
+) -> AnimationState:
+    animation_state = object_name_to_animation_state.get(obj.name)
+    if animation_state is not None:
+        if animation_state.simulation_plan is simulation_plan:
+            return animation_state
+        # 作り直されたSimulationPlanに合わせて、状態を一旦書き戻してから読み直す
+        save_animation_state(spring_bone1, animation_state)
+    animation_state = load_animation_state(spring_bone1, simulation_plan)
+    object_name_to_animation_state[obj.name] = animation_state
+    return animation_state
+
+
+def flush_animation_states(context: Context) -> None:
+    """Write the live animation state to the property groups."""
+    for object_name, animation_state in object_name_to_animation_state.items():
+        obj = context.blend_data.objects.get(object_name)
+        if obj is None:
+            continue
+        armature_data = obj.data
+        if (
+            not isinstance(armature_data, Armature)
+            or armature_data.name != animation_state.simulation_plan.armature_data_name
+        ):
+            continue
+        save_animation_state(
+            get_armature_extension(armature_data).spring_bone1, animation_state
+        )
+
+
+def reset_animation_state(armature_data: Armature) -> None:
+    discard_animation_state(armature_data)
+    for spring in get_armature_extension(armature_data).spring_bone1.springs:
+        for joint in spring.joints:
+            joint.animation_state.initialized_as_tail = False
+
+
+def discard_animation_state(armature_data: Armature) -> None:
+    """Discard the live animation state so that it is read again."""
+    for object_name, animation_state in list(object_name_to_animation_state.items()):
+        if animation_state.simulation_plan.armature_data_name == armature_data.name:
+            del object_name_to_animation_state[object_name]
+
+
+def get_rest_object_matrix(pose_bone: PoseBone) -> Matrix:
+    return pose_bone.bone.convert_local_to_pose(Matrix(), pose_bone.bone.matrix_local)
+
+
+def get_collection_lengths(
+    spring_bone1: SpringBone1SpringBonePropertyGroup,
+) -> tuple[int, int, int]:
+    # スクリプトから直接コレクションの要素が削除された場合に備えて、要素数だけ比較する
+    return (
+        len(spring_bone1.colliders),
+        len(spring_bone1.collider_groups),
+        len(spring_bone1.springs),
+    )
+
+
+def compile_collider(
+    obj: Object, collider: SpringBone1ColliderPropertyGroup
+) -> Optional[Union[SphereCollider, CapsuleCollider, PlaneCollider]]:
+    bone_name = collider.node.bone_name
+    if not obj.pose.bones.get(bone_name):
+        return None
+
+    extended_collider = collider.extensions.vrmc_spring_bone_extended_collider
+    if extended_collider.enabled:
+        if (
+            extended_collider.shape_type
+            == extended_collider.SHAPE_TYPE_EXTENDED_SPHERE.identifier
+        ):
+            return SphereCollider(
+                bone_name=bone_name,
+                offset=Vector(extended_collider.shape.sphere.offset),
+                radius=extended_collider.shape.sphere.radius,
+                inside=extended_collider.shape.sphere.inside,
+            )
+        if (
+            extended_collider.shape_type
+            == extended_collider.SHAPE_TYPE_EXTENDED_CAPSULE.identifier
+        ):
+            return CapsuleCollider(
+                bone_name=bone_name,
+                offset=Vector(extended_collider.shape.capsule.offset),
+                tail=Vector(extended_collider.shape.capsule.tail),
+                radius=extended_collider.shape.sphere.radius,
+                inside=extended_collider.shape.capsule.inside,
+            )
+        if (
+            extended_collider.shape_type
+            == extended_collider.SHAPE_TYPE_EXTENDED_PLANE.identifier
+        ):
+            return PlaneCollider(
+                bone_name=bone_name,
+                offset=Vector(extended_collider.shape.plane.offset),
+                normal=Vector(extended_collider.shape.plane.normal),
+            )
+        return None
+
+    if collider.shape_type == collider.SHAPE_TYPE_SPHERE.identifier:
+        return SphereCollider(
+            bone_name=bone_name,
+            offset=Vector(collider.shape.sphere.offset),
+            radius=collider.shape.sphere.radius,
+            inside=False,
+        )
+    if collider.shape_type == collider.SHAPE_TYPE_CAPSULE.identifier:
+        return CapsuleCollider(
+            bone_name=bone_name,
+            offset=Vector(collider.shape.capsule.offset),
+            tail=Vector(collider.shape.capsule.tail),
+            radius=collider.shape.sphere.radius,
+            inside=False,
+        )
+    return None
+
+
+def compile_spring(
+    obj: Object,
+    spring_index: int,
+    spring: SpringBone1SpringPropertyGroup,
+    collider_group_uuid_to_collider_indices: dict[str, list[int]],
+) -> Optional[SpringPlan]:
+    joints = spring.joints
+    if not joints:
+        return None
+    first_joint = joints[0]
+    first_pose_bone = obj.pose.bones.get(first_joint.node.bone_name)
+    if not first_pose_bone:
+        return None
+
+    center_pose_bone = obj.pose.bones.get(spring.center.bone_name)
+
+    # https://github.com/vrm-c/vrm-specification/blob/7279e169ac0dcf37e7d81b2adcad9107101d7e25/specification/VRMC_springBone-1.0/README.md#center-space
+    center_bone_name: Optional[str] = None
+    ancestor_of_first_pose_bone: Optional[PoseBone] = first_pose_bone
+    while ancestor_of_first_pose_bone:
+        if center_pose_bone == ancestor_of_first_pose_bone:
+            center_bone_name = ancestor_of_first_pose_bone.name
+            break
+        ancestor_of_first_pose_bone = ancestor_of_first_pose_bone.parent
+
+    joint_index_and_pose_bones: list[tuple[int, PoseBone]] = []
+    for joint_index, joint in enumerate(joints):
+        pose_bone = obj.pose.bones.get(joint.node.bone_name)
+        if not pose_bone:
+            continue
+        joint_index_and_pose_bones.append((joint_index, pose_bone))
+
+    bone_name_to_rest_object_matrix: dict[str, Matrix] = {}
+    joint_pairs: list[JointPairPlan] = []
+    for (head_joint_index, head_pose_bone), (
+        tail_joint_index,
+        tail_pose_bone,
+    ) in zip(joint_index_and_pose_bones, joint_index_and_pose_bones[1:]):
+        head_tail_parented = False
+        searching_tail_parent = tail_pose_bone.parent
+        while searching_tail_parent:
+            if searching_tail_parent.name == head_pose_bone.name:
+                head_tail_parented = True
+                break
+            searching_tail_parent = searching_tail_parent.parent
+        if not head_tail_parented:
+            joint_pairs.clear()
+            break
+
+        head_rest_object_matrix = bone_name_to_rest_object_matrix.get(
+            head_pose_bone.name
+        )
+        if head_rest_object_matrix is None:
+            head_rest_object_matrix = get_rest_object_matrix(head_pose_bone)
+        tail_rest_object_matrix = get_rest_object_matrix(tail_pose_bone)
+        bone_name_to_rest_object_matrix[tail_pose_bone.name] = tail_rest_object_matrix
+
+        head_rest_object_matrix_inverted = head_rest_object_matrix.inverted_safe()
+        joint_pairs.append(
+            JointPairPlan(
+                head_joint_index=head_joint_index,
+                head_bone_name=head_pose_bone.name,
+                head_rest_object_matrix=head_rest_object_matrix,
+                head_use_inherit_rotation=head_pose_bone.bone.use_inherit_rotation,
+                tail_joint_index=tail_joint_index,
+                tail_bone_name=tail_pose_bone.name,
+                head_rest_to_tail_rest_object_matrix=(
+                    head_rest_object_matrix_inverted @ tail_rest_object_matrix
+                ),
+                head_rotation_start_target_local_translation=(
+                    head_rest_object_matrix_inverted
+                    @ tail_rest_object_matrix.to_translation()
+                ),
+            )
+        )
+
+    head_parent_bone_name: Optional[str] = None
+    head_parent_rest_to_head_rest_object_matrix = Matrix()
+    if joint_pairs:
+        first_joint_pair = joint_pairs[0]
+        head_pose_bone = obj.pose.bones[first_joint_pair.head_bone_name]
+        head_parent_pose_bone = head_pose_bone.parent
+        if head_parent_pose_bone:
+            head_parent_bone_name = head_parent_pose_bone.name
+            head_parent_rest_to_head_rest_object_matrix = (
+                get_rest_object_matrix(head_parent_pose_bone).inverted_safe()
+                @ first_joint_pair.head_rest_object_matrix
+            )
+        else:
+            head_parent_rest_to_head_rest_object_matrix = (
+                first_joint_pair.head_rest_object_matrix.copy()
+            )
+
+    collider_indices: list[int] = []
+    for collider_group_reference in spring.collider_groups:
+        collider_indices.extend(
+            collider_group_uuid_to_collider_indices.get(
+                collider_group_reference.collider_group_uuid, []
+            )
+        )
+
+    return SpringPlan(
+        spring_index=spring_index,
+        center_bone_name=center_bone_name,
+        head_parent_bone_name=head_parent_bone_name,
+        head_parent_rest_to_head_rest_object_matrix=(
+            head_parent_rest_to_head_rest_object_matrix
+        ),
+        joint_pairs=tuple(joint_pairs),
+        collider_indices=tuple(collider_indices),
+    )
+
+
+def compile_simulation_plan(obj: Object, armature_data: Armature) -> SimulationPlan:
+    spring_bone1 = get_armature_extension(armature_data).spring_bone1
+
+    colliders: list[Union[SphereCollider, CapsuleCollider, PlaneCollider]] = []
+    collider_uuid_to_collider_index: dict[str, int] = {}
+    collider_object_names: set[str] = set()
+    for collider in spring_bone1.colliders:
+        bpy_object = collider.bpy_object
+        if bpy_object:
+            collider_object_names.add(bpy_object.name)
+            collider_object_names.update(child.name for child in bpy_object.children)
+        compiled_collider = compile_collider(obj, collider)
+        if compiled_collider is None:
+            continue
+        collider_uuid_to_collider_index[collider.uuid] = len(colliders)
+        colliders.append(compiled_collider)
+
+    collider_group_uuid_to_collider_indices: dict[str, list[int]] = {}
+    for collider_group in spring_bone1.collider_groups:
+        for collider_reference in collider_group.colliders:
+            collider_index = collider_uuid_to_collider_index.get(
+                collider_reference.collider_uuid
+            )
+            if collider_index is None:
+                continue
+            collider_group_uuid_to_collider_indices.setdefault(
+                collider_group.uuid, []
+            ).append(collider_index)
+
+    springs: list[SpringPlan] = []
+    for spring_index, spring in enumerate(spring_bone1.springs):
+        spring_plan = compile_spring(
+            obj, spring_index, spring, collider_group_uuid_to_collider_indices
+        )
+        if spring_plan is not None:
+            springs.append(spring_plan)
+
+    return SimulationPlan(
+        armature_data_name=armature_data.name,
+        collection_lengths=get_collection_lengths(spring_bone1),
+        collider_object_names=frozenset(collider_object_names),
+        colliders=tuple(colliders),
+        springs=tuple(springs),
+    )
+
+
+def get_simulation_plan(obj: Object, armature_data: Armature) -> SimulationPlan:
+    simulation_plan = object_name_to_simulation_plan.get(obj.name)
+    if (
+        simulation_plan is None
+        or simulation_plan.armature_data_name != armature_data.name
+        or simulation_plan.collection_lengths
+        != get_collection_lengths(get_armature_extension(armature_data).spring_bone1)
+    ):
+        simulation_plan = compile_simulation_plan(obj, armature_data)
+        object_name_to_simulation_plan[obj.name] = simulation_plan
+    return simulation_plan
+
+
+def resolve_simulation_plan_pose_bones(
+    obj: Object, simulation_plan: SimulationPlan
+) -> Optional[dict[str, PoseBone]]:
+    pose_bones = obj.pose.bones
+    bone_names: set[str] = {
+        collider.bone_name for collider in simulation_plan.colliders
+    }
+    for spring_plan in simulation_plan.springs:
+        if spring_plan.center_bone_name is not None:
+            bone_names.add(spring_plan.center_bone_name)
+        if spring_plan.head_parent_bone_name is not None:
+            bone_names.add(spring_plan.head_parent_bone_name)
+        for joint_pair in spring_plan.joint_pairs:
+            bone_names.add(joint_pair.head_bone_name)
+            bone_names.add(joint_pair.tail_bone_name)
+
+    bone_name_to_pose_bone: dict[str, PoseBone] = {}
+    for bone_name in bone_names:
+        pose_bone = pose_bones.get(bone_name)
+        if pose_bone is None:
+            return None
+        bone_name_to_pose_bone[bone_name] = pose_bone
+    return bone_name_to_pose_bone
+
+
 # https://github.com/vrm-c/vrm-specification/tree/993a90a5bda9025f3d9e2923ad6dea7506f88553/specification/VRMC_springBone-1.0#update-procedure
-def update_pose_bone_rotations(context: Context, delta_time: float) -> None:
+def update_pose_bone_rotations(
+    context: Context, delta_time: float, objects: Optional[Iterable[Object]] = None
+) -> None:
     pose_bone_and_rotations: list[tuple[PoseBone, Quaternion]] = []
 
-    for obj in context.blend_data.objects:
+    if objects is None:
+        objects = context.blend_data.objects
+    for obj in objects:
         calculate_object_pose_bone_rotations(delta_time, obj, pose_bone_and_rotations)
 
     for pose_bone, pose_bone_rotation in pose_bone_and_rotations:
@@ -194,327 +820,135 @@ def calculate_object_pose_bone_rotations(
     if not spring_bone1.enable_animation:
         return
 
-    collider_uuid_to_world_collider: dict[
-        str,
-        Union[
-            SphereWorldCollider,
-            CapsuleWorldCollider,
-            SphereInsideWorldCollider,
-            CapsuleInsideWorldCollider,
-            PlaneWorldCollider,
-        ],
-    ] = {}
-    for collider in spring_bone1.colliders:
-        pose_bone = obj.pose.bones.get(collider.node.bone_name)
-        if not pose_bone:
-            continue
-        pose_bone_world_matrix = obj.matrix_world @ pose_bone.matrix
-
-        extended_collider = collider.extensions.vrmc_spring_bone_extended_collider
-        world_collider: Union[
-            None,
-            SphereWorldCollider,
-            CapsuleWorldCollider,
-            SphereInsideWorldCollider,
-            CapsuleInsideWorldCollider,
-            PlaneWorldCollider,
-        ] = None
-        if extended_collider.enabled:
-            if (
-                extended_collider.shape_type
-                == extended_collider.SHAPE_TYPE_EXTENDED_SPHERE.identifier
-            ):
-                offset = pose_bone_world_matrix @ Vector(
-                    extended_collider.shape.sphere.offset
-                )
-                radius = extended_collider.shape.sphere.radius
-                if extended_collider.shape.sphere.inside:
-                    world_collider = SphereInsideWorldCollider(
-                        offset=offset, radius=radius
-                    )
-                else:
-                    world_collider = SphereWorldCollider(offset=offset, radius=radius)
-            elif (
-                extended_collider.shape_type
-                == extended_collider.SHAPE_TYPE_EXTENDED_CAPSULE.identifier
-            ):
-                offset = pose_bone_world_matrix @ Vector(
-                    extended_collider.shape.capsule.offset
-                )
-                tail = pose_bone_world_matrix @ Vector(
-                    extended_collider.shape.capsule.tail
-                )
-                radius = extended_collider.shape.sphere.radius
-                offset_to_tail_diff = tail - offset
-                offset_to_tail_diff_length_squared = offset_to_tail_diff.length_squared
-                if offset_to_tail_diff_length_squared < float_info.epsilon:
-                    # offsetとtailの位置が同じ場合はスフィアコライダーにする
-                    if extended_collider.shape.capsule.inside:
-                        world_collider = SphereInsideWorldCollider(
-                            offset=offset, radius=radius
-                        )
-                    else:
-                        world_collider = SphereWorldCollider(
-                            offset=offset, radius=radius
-                        )
-                elif extended_collider.shape.capsule.inside:
-                    world_collider = CapsuleInsideWorldCollider(
-                        offset=offset,
-                        radius=radius,
-                        tail=tail,
-                        offset_to_tail_diff=offset_to_tail_diff,
-                        offset_to_tail_diff_length_squared=offset_to_tail_diff_length_squared,
-                    )
-                else:
-                    world_collider = CapsuleWorldCollider(
-                        offset=offset,
-                        radius=radius,
-                        tail=tail,
-                        offset_to_tail_diff=offset_to_tail_diff,
-                        offset_to_tail_diff_length_squared=offset_to_tail_diff_length_squared,
-                    )
-            elif (
-                extended_collider.shape_type
-                == extended_collider.SHAPE_TYPE_EXTENDED_PLANE.identifier
-            ):
-                offset = pose_bone_world_matrix @ Vector(
-                    extended_collider.shape.plane.offset
-                )
-                normal = pose_bone_world_matrix.to_quaternion() @ Vector(
-                    extended_collider.shape.plane.normal
-                )
-                world_collider = PlaneWorldCollider(
-                    offset=offset,
-                    normal=normal,
-                )
-        elif collider.shape_type == collider.SHAPE_TYPE_SPHERE.identifier:
-            offset = pose_bone_world_matrix @ Vector(collider.shape.sphere.offset)
-            radius = collider.shape.sphere.radius
-            world_collider = SphereWorldCollider(
-                offset=offset,
-                radius=radius,
-            )
-        elif collider.shape_type == collider.SHAPE_TYPE_CAPSULE.identifier:
-            offset = pose_bone_world_matrix @ Vector(collider.shape.capsule.offset)
-            tail = pose_bone_world_matrix @ Vector(collider.shape.capsule.tail)
-            radius = collider.shape.sphere.radius
-            offset_to_tail_diff = tail - offset
-            offset_to_tail_diff_length_squared = offset_to_tail_diff.length_squared
-            if offset_to_tail_diff_length_squared < float_info.epsilon:
-                # offsetとtailの位置が同じ場合はスフィアコライダーにする
-                world_collider = SphereWorldCollider(
-                    offset=offset,
-                    radius=radius,
-                )
-            else:
-                world_collider = CapsuleWorldCollider(
-                    offset=offset,
-                    radius=radius,
-                    tail=tail,
-                    offset_to_tail_diff=offset_to_tail_diff,
-                    offset_to_tail_diff_length_squared=offset_to_tail_diff_length_squared,
-                )
-
-        if world_collider:
-            collider_uuid_to_world_collider[collider.uuid] = world_collider
-
-    collider_group_uuid_to_world_colliders: dict[
-        str,
-        list[
-            Union[
-                SphereWorldCollider,
-                CapsuleWorldCollider,
-                SphereInsideWorldCollider,
-                CapsuleInsideWorldCollider,
-                PlaneWorldCollider,
-            ]
-        ],
-    ] = {}
-    for collider_group in spring_bone1.collider_groups:
-        for collider_reference in collider_group.colliders:
-            world_collider = collider_uuid_to_world_collider.get(
-                collider_reference.collider_uuid
-            )
-            if world_collider is None:
-                continue
-            world_colliders = collider_group_uuid_to_world_colliders.get(
-                collider_group.uuid
-            )
-            if world_colliders is None:
-                world_colliders = []
-                collider_group_uuid_to_world_colliders[collider_group.uuid] = (
-                    world_colliders
-                )
-            world_colliders.append(world_collider)
-
-    for spring in spring_bone1.springs:
-        joints = spring.joints
-        if not joints:
-            continue
-        first_joint = joints[0]
-        first_pose_bone = obj.pose.bones.get(first_joint.node.bone_name)
-        if not first_pose_bone:
-            continue
+    simulation_plan = get_simulation_plan(obj, armature_data)
+    bone_name_to_pose_bone = resolve_simulation_plan_pose_bones(obj, simulation_plan)
+    if bone_name_to_pose_bone is None:
+        # ボーンの名前変更や削除が反映されていないので作り直す
+        simulation_plan = compile_simulation_plan(obj, armature_data)
+        object_name_to_simulation_plan[obj.name] = simulation_plan
+        bone_name_to_pose_bone = resolve_simulation_plan_pose_bones(
+            obj, simulation_plan
+        )
+        if bone_name_to_pose_bone is None:
+            return
 
-        center_pose_bone = obj.pose.bones.get(spring.center.bone_name)
+    animation_state = get_animation_state(obj, spring_bone1, simulation_plan)
 
-        # https://github.com/vrm-c/vrm-specification/blob/7279e169ac0dcf37e7d81b2adcad9107101d7e25/specification/VRMC_springBone-1.0/README.md#center-space
-        center_pose_bone_is_ancestor_of_first_pose_bone = False
-        ancestor_of_first_pose_bone: Optional[PoseBone] = first_pose_bone
-        while ancestor_of_first_pose_bone:
-            if center_pose_bone == ancestor_of_first_pose_bone:
-                center_pose_bone_is_ancestor_of_first_pose_bone = True
-                break
-            ancestor_of_first_pose_bone = ancestor_of_first_pose_bone.parent
-        if not center_pose_bone_is_ancestor_of_first_pose_bone:
-            center_pose_bone = None
+    springs = spring_bone1.springs
+    spring_and_center_translations: list[
+        tuple[SpringBone1SpringPropertyGroup, Vector]
+    ] = []
+    for spring_plan_index, spring_plan in enumerate(simulation_plan.springs):
+        spring = springs[spring_plan.spring_index]
 
-        if center_pose_bone:
+        if spring_plan.center_bone_name is not None:
+            center_pose_bone = bone_name_to_pose_bone[spring_plan.center_bone_name]
             current_center_world_translation = (
                 obj.matrix_world @ center_pose_bone.matrix
             ).to_translation()
             previous_center_world_translation = Vector(
-                spring.animation_state.previous_center_world_translation
+                animation_state.previous_center_world_translations[spring_plan_index]
             )
             previous_to_current_center_world_translation = (
                 current_center_world_translation - previous_center_world_translation
             )
-            if not spring.animation_state.use_center_space:
-                spring.animation_state.previous_center_world_translation = (
-                    current_center_world_translation.copy()
-                )
-                spring.animation_state.use_center_space = True
+            animation_state.use_center_spaces[spring_plan_index] = True
         else:
             current_center_world_translation = Vector((0, 0, 0))
             previous_to_current_center_world_translation = Vector((0, 0, 0))
-            if spring.animation_state.use_center_space:
-                spring.animation_state.use_center_space = False
+            animation_state.use_center_spaces[spring_plan_index] = False
 
+        animation_state.previous_center_world_translations[spring_plan_index] = (
+            current_center_world_translation
+        )
+        spring_and_center_translations.append(
+            (spring, previous_to_current_center_world_translation)
+        )
+
+    if spring_bone1.solver == spring_bone1.SOLVER_NUMPY.identifier:
+        # numpy_solverはこのモジュールに依存しているので、ここで読み込む
+        from .numpy_solver import calculate_simulation_plan_pose_bone_rotations
+
+        calculate_simulation_plan_pose_bone_rotations(
+            delta_time,
+            obj,
+            simulation_plan,
+            animation_state,
+            bone_name_to_pose_bone,
+            spring_and_center_translations,
+            pose_bone_and_rotations,
+        )
+        return
+
+    world_colliders: list[WorldCollider] = [
+        collider.to_world_collider(
+            obj.matrix_world @ bone_name_to_pose_bone[collider.bone_name].matrix
+        )
+        for collider in simulation_plan.colliders
+    ]
+
+    for spring_plan, first_pair_index, (
+        spring,
+        previous_to_current_center_world_translation,
+    ) in zip(
+        simulation_plan.springs,
+        animation_state.spring_first_pair_indices,
+        spring_and_center_translations,
+    ):
         calculate_spring_pose_bone_rotations(
             delta_time,
             obj,
             spring,
+            spring_plan,
+            animation_state,
+            first_pair_index,
+            bone_name_to_pose_bone,
             pose_bone_and_rotations,
-            collider_group_uuid_to_world_colliders,
+            [world_colliders[i] for i in spring_plan.collider_indices],
             previous_to_current_center_world_translation,
         )
 
-        spring.animation_state.previous_center_world_translation = (
-            current_center_world_translation
-        )
-
 
 def calculate_spring_pose_bone_rotations(
     delta_time: float,
     obj: Object,
     spring: SpringBone1SpringPropertyGroup,
+    spring_plan: SpringPlan,
+    animation_state: AnimationState,
+    first_pair_index: int,
+    bone_name_to_pose_bone: dict[str, PoseBone],
     pose_bone_and_rotations: list[tuple[PoseBone, Quaternion]],
-    collider_group_uuid_to_world_colliders: dict[
-        str,
-        list[
-            Union[
-                SphereWorldCollider,
-                CapsuleWorldCollider,
-                SphereInsideWorldCollider,
-                CapsuleInsideWorldCollider,
-                PlaneWorldCollider,
-            ]
-        ],
-    ],
+    world_colliders: list[WorldCollider],
     previous_to_current_center_world_translation: Vector,
 ) -> None:
-    inputs: list[
-        tuple[
-            SpringBone1JointPropertyGroup,
-            PoseBone,
-            Matrix,
-            SpringBone1JointPropertyGroup,
-            PoseBone,
-            Matrix,
-        ]
-    ] = []
-
-    joints: list[
-        tuple[
-            SpringBone1JointPropertyGroup,
-            PoseBone,
-            Matrix,
-        ]
-    ] = []
-    for joint in spring.joints:
-        bone_name = joint.node.bone_name
-        pose_bone = obj.pose.bones.get(bone_name)
-        if not pose_bone:
-            continue
-        rest_object_matrix = pose_bone.bone.convert_local_to_pose(
-            Matrix(), pose_bone.bone.matrix_local
-        )
-        joints.append((joint, pose_bone, rest_object_matrix))
-
-    for (head_joint, head_pose_bone, head_rest_object_matrix), (
-        tail_joint,
-        tail_pose_bone,
-        tail_rest_object_matrix,
-    ) in zip(joints, joints[1:]):
-        head_tail_parented = False
-        searching_tail_parent = tail_pose_bone.parent
-        while searching_tail_parent:
-            if searching_tail_parent.name == head_pose_bone.name:
-                head_tail_parented = True
-                break
-            searching_tail_parent = searching_tail_parent.parent
-        if not head_tail_parented:
-            return
+    if not spring_plan.joint_pairs:
+        return
 
-        inputs.append(
-            (
-                head_joint,
-                head_pose_bone,
-                head_rest_object_matrix,
-                tail_joint,
-                tail_pose_bone,
-                tail_rest_object_matrix,
-            )
-        )
+    joints = spring.joints
 
-    world_colliders: list[
-        Union[
-            SphereWorldCollider,
-            CapsuleWorldCollider,
-            SphereInsideWorldCollider,
-            CapsuleInsideWorldCollider,
-            PlaneWorldCollider,
-        ]
-    ] = []
-    for collider_group_reference in spring.collider_groups:
-        collider_group_world_colliders = collider_group_uuid_to_world_colliders.get(
-            collider_group_reference.collider_group_uuid
-        )
-        if not collider_group_world_colliders:
-            continue
-        world_colliders.extend(collider_group_world_colliders)
+    head_parent_matrix = Matrix()
+    if spring_plan.head_parent_bone_name is not None:
+        head_parent_matrix = bone_name_to_pose_bone[
+            spring_plan.head_parent_bone_name
+        ].matrix
+    next_head_pose_bone_before_rotation_matrix = (
+        head_parent_matrix @ spring_plan.head_parent_rest_to_head_rest_object_matrix
+    )
 
-    next_head_pose_bone_before_rotation_matrix = None
-    for (
-        head_joint,
-        head_pose_bone,
-        head_rest_object_matrix,
-        tail_joint,
-        tail_pose_bone,
-        tail_rest_object_matrix,
-    ) in inputs:
+    for pair_index, joint_pair in enumerate(spring_plan.joint_pairs, first_pair_index):
+        head_pose_bone = bone_name_to_pose_bone[joint_pair.head_bone_name]
         (
             head_pose_bone_rotation,
             next_head_pose_bone_before_rotation_matrix,
         ) = calculate_joint_pair_head_pose_bone_rotations(
             delta_time,
             obj,
-            head_joint,
+            joints[joint_pair.head_joint_index],
             head_pose_bone,
-            head_rest_object_matrix,
-            tail_joint,
-            tail_pose_bone,
-            tail_rest_object_matrix,
+            bone_name_to_pose_bone[joint_pair.tail_bone_name],
+            joint_pair,
+            animation_state,
+            pair_index,
             next_head_pose_bone_before_rotation_matrix,
             world_colliders,
             previous_to_current_center_world_translation,
@@ -527,63 +961,39 @@ def calculate_joint_pair_head_pose_bone_rotations(
     obj: Object,
     head_joint: SpringBone1JointPropertyGroup,
     head_pose_bone: PoseBone,
-    current_head_rest_object_matrix: Matrix,
-    tail_joint: SpringBone1JointPropertyGroup,
     tail_pose_bone: PoseBone,
-    current_tail_rest_object_matrix: Matrix,
-    next_head_pose_bone_before_rotation_matrix: Optional[Matrix],
-    world_colliders: list[
-        Union[
-            SphereWorldCollider,
-            CapsuleWorldCollider,
-            SphereInsideWorldCollider,
-            CapsuleInsideWorldCollider,
-            PlaneWorldCollider,
-        ]
-    ],
+    joint_pair: JointPairPlan,
+    animation_state: AnimationState,
+    pair_index: int,
+    next_head_pose_bone_before_rotation_matrix: Matrix,
+    world_colliders: list[WorldCollider],
     previous_to_current_center_world_translation: Vector,
 ) -> tuple[Quaternion, Matrix]:
     current_head_pose_bone_matrix = head_pose_bone.matrix
     current_tail_pose_bone_matrix = tail_pose_bone.matrix
 
-    if next_head_pose_bone_before_rotation_matrix is None:
-        if head_pose_bone.parent:
-            current_head_parent_matrix = head_pose_bone.parent.matrix
-            current_head_parent_rest_object_matrix = (
-                head_pose_bone.parent.bone.convert_local_to_pose(
-                    Matrix(), head_pose_bone.parent.bone.matrix_local
-                )
-            )
-        else:
-            current_head_parent_matrix = Matrix()
-            current_head_parent_rest_object_matrix = Matrix()
-        next_head_pose_bone_before_rotation_matrix = current_head_parent_matrix @ (
-            current_head_parent_rest_object_matrix.inverted_safe()
-            @ current_head_rest_object_matrix
-        )
-
     next_head_world_translation = (
         obj.matrix_world @ next_head_pose_bone_before_rotation_matrix.to_translation()
     )
 
-    if not tail_joint.animation_state.initialized_as_tail:
+    if not animation_state.initialized_as_tails[pair_index]:
         initial_tail_world_translation = (
             obj.matrix_world @ current_tail_pose_bone_matrix
         ).to_translation()
-        tail_joint.animation_state.initialized_as_tail = True
-        tail_joint.animation_state.previous_world_translation = list(
+        animation_state.initialized_as_tails[pair_index] = True
+        animation_state.previous_world_translations[pair_index] = (
             initial_tail_world_translation
         )
-        tail_joint.animation_state.current_world_translation = list(
+        animation_state.current_world_translations[pair_index] = (
             initial_tail_world_translation
         )
 
     previous_tail_world_translation = (
-        Vector(tail_joint.animation_state.previous_world_translation)
+        Vector(animation_state.previous_world_translations[pair_index])
         + previous_to_current_center_world_translation
     )
     current_tail_world_translation = (
-        Vector(tail_joint.animation_state.current_world_translation)
+        Vector(animation_state.current_world_translations[pair_index])
         + previous_to_current_center_world_translation
     )
 
@@ -592,8 +1002,7 @@ def calculate_joint_pair_head_pose_bone_rotations(
     )
 
     next_head_rotation_start_target_local_translation = (
-        current_head_rest_object_matrix.inverted_safe()
-        @ current_tail_rest_object_matrix.to_translation()
+        joint_pair.head_rotation_start_target_local_translation
     )
     stiffness_direction = (
         obj.matrix_world.to_quaternion()
@@ -667,21 +1076,17 @@ def calculate_joint_pair_head_pose_bone_rotations(
     )
 
     next_tail_pose_bone_before_rotation_matrix = (
-        next_head_pose_bone_matrix
-        @ current_head_rest_object_matrix.inverted_safe()
-        @ current_tail_rest_object_matrix
+        next_head_pose_bone_matrix @ joint_pair.head_rest_to_tail_rest_object_matrix
     )
 
-    tail_joint.animation_state.previous_world_translation = list(
+    animation_state.previous_world_translations[pair_index] = (
         current_tail_world_translation
     )
-    tail_joint.animation_state.current_world_translation = list(
-        next_tail_world_translation
-    )
+    animation_state.current_world_translations[pair_index] = next_tail_world_translation
 
     return (
         next_head_pose_bone_rotation
-        if head_pose_bone.bone.use_inherit_rotation
+        if joint_pair.head_use_inherit_rotation
         else next_head_pose_bone_object_rotation,
         next_tail_pose_bone_before_rotation_matrix,
     )
@@ -694,30 +1099,75 @@ def depsgraph_update_pre(_unused: object) -> None:
     state.reset(context)
 
 
+@persistent
+def depsgraph_update_post(
+    _unused: object, depsgraph: Optional[Depsgraph] = None
+) -> None:
+    # ボーンの編集やコライダーのオブジェクトの移動があったらSimulationPlanを破棄する
+    if depsgraph is None:
+        clear_simulation_plans()
+        return
+
+    armature_data_names: set[str] = set()
+    object_names: set[str] = set()
+    for update in depsgraph.updates:
+        updated_id = update.id.original
+        if isinstance(updated_id, Armature):
+            armature_data_names.add(updated_id.name)
+        elif isinstance(updated_id, Object):
+            object_names.add(updated_id.name)
+
+    for object_name, simulation_plan in list(object_name_to_simulation_plan.items()):
+        if (
+            simulation_plan.armature_data_name in armature_data_names
+            or not simulation_plan.collider_object_names.isdisjoint(object_names)
+        ):
+            del object_name_to_simulation_plan[object_name]
+
+
+@persistent
+def save_pre(_unused: object) -> None:
+    flush_animation_states(bpy.context)
+
+
+@persistent
+def animation_playback_post(_unused: object) -> None:
+    # 再生を止めたときに、状態をプロパティで確認できるようにする
+    flush_animation_states(bpy.context)
+
+
 @persistent
 def frame_change_pre(_unused: object) -> None:
-    context = bpy.context
+    if state.baking:
+        return
+    update_frame(bpy.context, state)
 
+
+def update_frame(
+    context: Context, frame_state: State, objects: Optional[Iterable[Object]] = None
+) -> None:
+    """Advance the frame and run the spring bone steps that fall into it."""
     fps = Decimal(context.scene.render.fps)
-    last_fps = state.last_fps
+    last_fps = frame_state.last_fps
     fps_base = Decimal(context.scene.render.fps_base)
-    last_fps_base = state.last_fps_base
+    last_fps_base = frame_state.last_fps_base
     if (
         last_fps_base is None
         or (fps_base - last_fps_base).copy_abs() > 0.00001
         or fps != last_fps
     ):
-        state.reset(context)
+        frame_state.reset(context)
 
-    state.frame_count += 1
+    frame_state.frame_count += 1
 
     # 現在時刻が次回のSpringBoneの計算時刻よりも未来なら、SpringBoneを動かす
     # 浮動小数点の丸め誤差を最小限にするため、共通の分母を分子に掛け算することで
     # 少数の扱いを最小限にしている
-    frame_time_x_60_x_fps = state.frame_count * Decimal(60) * fps_base
+    frame_time_x_60_x_fps = frame_state.frame_count * Decimal(60) * fps_base
+    delta_times: list[float] = []
     while True:
         next_spring_bone_60_fps_update_count = (
-            state.spring_bone_60_fps_update_count + Decimal(1)
+            frame_state.spring_bone_60_fps_update_count + Decimal(1)
         )
 
         next_spring_bone_update_time_x_60_x_fps = (
@@ -732,11 +1182,166 @@ def frame_change_pre(_unused: object) -> None:
             60.0
         )
         current_spring_bone_update_time = (
-            state.spring_bone_60_fps_update_count / Decimal(60.0)
+            frame_state.spring_bone_60_fps_update_count / Decimal(60.0)
         )
         delta_time = float(next_spring_bone_update_time) - float(
             current_spring_bone_update_time
         )
-        update_pose_bone_rotations(context, delta_time)
+        delta_times.append(delta_time)
+
+        frame_state.spring_bone_60_fps_update_count += 1
+
+    if not delta_times:
+        return
 
-        state.spring_bone_60_fps_update_count += 1
+    if objects is None:
+        objects = context.blend_data.objects
+    for obj in objects:
+        armature_data = obj.data
+        if not isinstance(armature_data, Armature):
+            continue
+        object_delta_times = apply_substep_policy(armature_data, delta_times)
+        for object_delta_time in object_delta_times:
+            update_pose_bone_rotations(context, object_delta_time, [obj])
+        if get_armature_extension(armature_data).spring_bone1.enable_animation:
+            frame_state.append_substep_count(obj.name, len(object_delta_times))
+
+
+def apply_substep_policy(
+    armature_data: Armature, delta_times: list[float]
+) -> list[float]:
+    """Fit the elapsed steps of a frame into the substep policy of the armature.
+
+    With the skip policy, the animation state of the armature is reset so that
+    the single remaining step starts from the current pose.
+    """
+    spring_bone1 = get_armature_extension(armature_data).spring_bone1
+    if not spring_bone1.enable_animation:
+        return []
+    substep_policy = spring_bone1.substep_policy
+    max_substeps = spring_bone1.max_substeps
+    if (
+        substep_policy == spring_bone1.SUBSTEP_POLICY_CATCH_UP.identifier
+        or len(delta_times) <= max_substeps
+    ):
+        return delta_times
+    if substep_policy == spring_bone1.SUBSTEP_POLICY_LIMIT.identifier:
+        return delta_times[-max_substeps:]
+    if substep_policy == spring_bone1.SUBSTEP_POLICY_MERGE.identifier:
+        merged_count = len(delta_times) - max_substeps + 1
+        return [sum(delta_times[:merged_count]), *delta_times[merged_count:]]
+    if substep_policy == spring_bone1.SUBSTEP_POLICY_SKIP.identifier:
+        # 溜まったステップを捨て、現在の姿勢から計算し直す
+        reset_animation_state(armature_data)
+        return delta_times[-1:]
+    return delta_times
+
+
+# Keyframe.interpolationの"LINEAR"の値
+KEYFRAME_INTERPOLATION_LINEAR: Final = 1
+
+
+def bake_pose_bone_rotations(
+    context: Context, obj: Object, frame_start: int, frame_end: int
+) -> dict[str, list[Quaternion]]:
+    """Simulate the frames and return the rotations of the joint bones per frame.
+
+    Rotation keyframes of the joint bones in the action would override the
+    simulation, so they are removed before simulating.
+    """
+    armature_data = obj.data
+    if not isinstance(armature_data, Armature):
+        return {}
+    spring_bone1 = get_armature_extension(armature_data).spring_bone1
+    scene = context.scene
+    frame_current = scene.frame_current
+    enable_animation = spring_bone1.enable_animation
+    baking = state.baking
+    state.baking = True
+    try:
+        # 状態を初期化し、ジョイントのボーンにシミュレーションさせる
+        spring_bone1.enable_animation = False
+        spring_bone1.enable_animation = True
+
+        scene.frame_set(frame_start)
+        bone_names = get_joint_bone_names(obj, armature_data)
+
+        animation_data = obj.animation_data
+        action = animation_data.action if animation_data else None
+        if action:
+            remove_rotation_fcurves(obj, action, bone_names)
+            scene.frame_set(frame_start)
+
+        bone_name_to_rotations: dict[str, list[Quaternion]] = {
+            bone_name: [] for bone_name in bone_names
+        }
+        frame_state = State()
+        for frame in range(frame_start, frame_end + 1):
+            if frame != frame_start:
+                scene.frame_set(frame)
+            update_frame(context, frame_state, [obj])
+            for bone_name, rotations in bone_name_to_rotations.items():
+                rotations.append(obj.pose.bones[bone_name].rotation_quaternion.copy())
+        return bone_name_to_rotations
+    finally:
+        spring_bone1.enable_animation = enable_animation
+        scene.frame_set(frame_current)
+        state.baking = baking
+
+
+def get_joint_bone_names(obj: Object, armature_data: Armature) -> list[str]:
+    bone_names: list[str] = []
+    for spring_plan in get_simulation_plan(obj, armature_data).springs:
+        for joint_pair in spring_plan.joint_pairs:
+            if joint_pair.head_bone_name not in bone_names:
+                bone_names.append(joint_pair.head_bone_name)
+    return bone_names
+
+
+def find_rotation_fcurve_bone_names(
+    obj: Object, action: Action, bone_names: list[str]
+) -> list[str]:
+    """Return the bones that have rotation keyframes in the action."""
+    result: list[str] = []
+    for bone_name in bone_names:
+        data_path = obj.pose.bones[bone_name].path_from_id("rotation_quaternion")
+        if any(action.fcurves.find(data_path, index=index) for index in range(4)):
+            result.append(bone_name)
+    return result
+
+
+def remove_rotation_fcurves(obj: Object, action: Action, bone_names: list[str]) -> None:
+    for bone_name in bone_names:
+        data_path = obj.pose.bones[bone_name].path_from_id("rotation_quaternion")
+        for index in range(4):
+            fcurve = action.fcurves.find(data_path, index=index)
+            if fcurve:
+                action.fcurves.remove(fcurve)
+
+
+def write_rotation_fcurves(
+    obj: Object,
+    action: Action,
+    frame_start: int,
+    bone_name_to_rotations: dict[str, list[Quaternion]],
+) -> None:
+    """Write the rotations to the action at once, one keyframe per frame."""
+    remove_rotation_fcurves(obj, action, list(bone_name_to_rotations))
+    for bone_name, rotations in bone_name_to_rotations.items():
+        if not rotations:
+            continue
+        data_path = obj.pose.bones[bone_name].path_from_id("rotation_quaternion")
+        values = np.array(rotations, dtype=np.float32).reshape(-1, 4)
+        keyframe_cos = np.empty((len(rotations), 2), dtype=np.float32)
+        keyframe_cos[:, 0] = np.arange(frame_start, frame_start + len(rotations))
+        for index in range(4):
+            fcurve = action.fcurves.new(data_path, index=index, action_group=bone_name)
+            keyframe_points = fcurve.keyframe_points
+            keyframe_points.add(len(rotations))
+            keyframe_cos[:, 1] = values[:, index]
+            keyframe_points.foreach_set("co", keyframe_cos.ravel())
+            keyframe_points.foreach_set(
+                "interpolation",
+                np.full(len(rotations), KEYFRAME_INTERPOLATION_LINEAR, dtype=np.int32),
+            )
+            fcurve.update()
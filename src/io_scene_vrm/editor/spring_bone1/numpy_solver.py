@@ -0,0 +1,629 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+"""SpringBoneの計算を、同じ深さのジョイントごとにNumPyでまとめて行う."""
+
+from dataclasses import dataclass
+from sys import float_info
+from typing import TYPE_CHECKING, Final
+
+import numpy as np
+from bpy.types import Object, PoseBone
+from mathutils import Matrix, Quaternion, Vector
+
+from .handler import (
+    AnimationState,
+    CapsuleCollider,
+    PlaneCollider,
+    SimulationPlan,
+    SphereCollider,
+)
+from .property_group import SpringBone1SpringPropertyGroup
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+COLLIDER_TYPE_OUTSIDE: Final = 0
+COLLIDER_TYPE_INSIDE: Final = 1
+COLLIDER_TYPE_PLANE: Final = 2
+
+
+@dataclass(frozen=True)
+class BatchLevel:
+    pair_indices: "NDArray[np.intp]"
+    spring_indices: "NDArray[np.intp]"
+    # 衝突判定をするコライダーのインデックス。足りない部分は-1で埋める
+    collider_indices: "NDArray[np.intp]"
+
+
+@dataclass(frozen=True)
+class BatchPlan:
+    simulation_plan: SimulationPlan
+    pose_bone_count: int
+
+    head_parent_pose_bone_indices: "NDArray[np.intp]"
+    head_parent_rest_to_head_rest_object_matrices: "NDArray[np.float64]"
+
+    pair_spring_indices: "NDArray[np.intp]"
+    pair_head_pose_bone_indices: "NDArray[np.intp]"
+    pair_tail_pose_bone_indices: "NDArray[np.intp]"
+    pair_head_rest_to_tail_rest_object_matrices: "NDArray[np.float64]"
+    pair_head_rotation_start_target_local_translations: "NDArray[np.float64]"
+    levels: tuple[BatchLevel, ...]
+
+    collider_types: "NDArray[np.intp]"
+    collider_pose_bone_indices: "NDArray[np.intp]"
+    collider_offsets: "NDArray[np.float64]"
+    collider_tails: "NDArray[np.float64]"
+    collider_radii: "NDArray[np.float64]"
+    collider_normals: "NDArray[np.float64]"
+
+
+object_name_to_batch_plan: dict[str, BatchPlan] = {}
+
+
+def compile_batch_plan(obj: Object, simulation_plan: SimulationPlan) -> BatchPlan:
+    pose_bone_names = list(obj.pose.bones.keys())
+    bone_name_to_index = {name: index for index, name in enumerate(pose_bone_names)}
+
+    head_parent_pose_bone_indices: list[int] = []
+    head_parent_rest_to_head_rest_object_matrices: list[Matrix] = []
+    pair_spring_indices: list[int] = []
+    pair_head_pose_bone_indices: list[int] = []
+    pair_tail_pose_bone_indices: list[int] = []
+    pair_head_rest_to_tail_rest_object_matrices: list[Matrix] = []
+    pair_head_rotation_start_target_local_translations: list[Vector] = []
+    spring_first_pair_indices: list[int] = []
+    for spring_index, spring_plan in enumerate(simulation_plan.springs):
+        head_parent_pose_bone_indices.append(
+            -1
+            if spring_plan.head_parent_bone_name is None
+            else bone_name_to_index[spring_plan.head_parent_bone_name]
+        )
+        head_parent_rest_to_head_rest_object_matrices.append(
+            spring_plan.head_parent_rest_to_head_rest_object_matrix
+        )
+        spring_first_pair_indices.append(len(pair_spring_indices))
+        for joint_pair in spring_plan.joint_pairs:
+            pair_spring_indices.append(spring_index)
+            pair_head_pose_bone_indices.append(
+                bone_name_to_index[joint_pair.head_bone_name]
+            )
+            pair_tail_pose_bone_indices.append(
+                bone_name_to_index[joint_pair.tail_bone_name]
+            )
+            pair_head_rest_to_tail_rest_object_matrices.append(
+                joint_pair.head_rest_to_tail_rest_object_matrix
+            )
+            pair_head_rotation_start_target_local_translations.append(
+                joint_pair.head_rotation_start_target_local_translation
+            )
+
+    levels: list[BatchLevel] = []
+    depth = max(
+        (len(spring_plan.joint_pairs) for spring_plan in simulation_plan.springs),
+        default=0,
+    )
+    for level in range(depth):
+        spring_indices = [
+            spring_index
+            for spring_index, spring_plan in enumerate(simulation_plan.springs)
+            if len(spring_plan.joint_pairs) > level
+        ]
+        collider_count = max(
+            len(simulation_plan.springs[spring_index].collider_indices)
+            for spring_index in spring_indices
+        )
+        collider_indices = np.full(
+            (len(spring_indices), collider_count), -1, dtype=np.intp
+        )
+        for row, spring_index in enumerate(spring_indices):
+            spring_collider_indices = simulation_plan.springs[
+                spring_index
+            ].collider_indices
+            collider_indices[row, : len(spring_collider_indices)] = (
+                spring_collider_indices
+            )
+        levels.append(
+            BatchLevel(
+                pair_indices=np.array(
+                    [
+                        spring_first_pair_indices[spring_index] + level
+                        for spring_index in spring_indices
+                    ],
+                    dtype=np.intp,
+                ),
+                spring_indices=np.array(spring_indices, dtype=np.intp),
+                collider_indices=collider_indices,
+            )
+        )
+
+    collider_types: list[int] = []
+    collider_offsets: list[Vector] = []
+    collider_tails: list[Vector] = []
+    collider_radii: list[float] = []
+    collider_normals: list[Vector] = []
+    for collider in simulation_plan.colliders:
+        if isinstance(collider, SphereCollider):
+            collider_types.append(
+                COLLIDER_TYPE_INSIDE if collider.inside else COLLIDER_TYPE_OUTSIDE
+            )
+            collider_offsets.append(collider.offset)
+            collider_tails.append(collider.offset)
+            collider_radii.append(collider.radius)
+            collider_normals.append(Vector((0, 0, 0)))
+        elif isinstance(collider, CapsuleCollider):
+            collider_types.append(
+                COLLIDER_TYPE_INSIDE if collider.inside else COLLIDER_TYPE_OUTSIDE
+            )
+            collider_offsets.append(collider.offset)
+            collider_tails.append(collider.tail)
+            collider_radii.append(collider.radius)
+            collider_normals.append(Vector((0, 0, 0)))
+        elif isinstance(collider, PlaneCollider):
+            collider_types.append(COLLIDER_TYPE_PLANE)
+            collider_offsets.append(collider.offset)
+            collider_tails.append(collider.offset)
+            collider_radii.append(0.0)
+            collider_normals.append(collider.normal)
+
+    return BatchPlan(
+        simulation_plan=simulation_plan,
+        pose_bone_count=len(pose_bone_names),
+        head_parent_pose_bone_indices=np.array(
+            head_parent_pose_bone_indices, dtype=np.intp
+        ),
+        head_parent_rest_to_head_rest_object_matrices=np.array(
+            head_parent_rest_to_head_rest_object_matrices, dtype=np.float64
+        ).reshape(-1, 4, 4),
+        pair_spring_indices=np.array(pair_spring_indices, dtype=np.intp),
+        pair_head_pose_bone_indices=np.array(
+            pair_head_pose_bone_indices, dtype=np.intp
+        ),
+        pair_tail_pose_bone_indices=np.array(
+            pair_tail_pose_bone_indices, dtype=np.intp
+        ),
+        pair_head_rest_to_tail_rest_object_matrices=np.array(
+            pair_head_rest_to_tail_rest_object_matrices, dtype=np.float64
+        ).reshape(-1, 4, 4),
+        pair_head_rotation_start_target_local_translations=np.array(
+            pair_head_rotation_start_target_local_translations, dtype=np.float64
+        ).reshape(-1, 3),
+        levels=tuple(levels),
+        collider_types=np.array(collider_types, dtype=np.intp),
+        collider_pose_bone_indices=np.array(
+            [
+                bone_name_to_index[collider.bone_name]
+                for collider in simulation_plan.colliders
+            ],
+            dtype=np.intp,
+        ),
+        collider_offsets=np.array(collider_offsets, dtype=np.float64).reshape(-1, 3),
+        collider_tails=np.array(collider_tails, dtype=np.float64).reshape(-1, 3),
+        collider_radii=np.array(collider_radii, dtype=np.float64),
+        collider_normals=np.array(collider_normals, dtype=np.float64).reshape(-1, 3),
+    )
+
+
+def get_batch_plan(obj: Object, simulation_plan: SimulationPlan) -> BatchPlan:
+    batch_plan = object_name_to_batch_plan.get(obj.name)
+    if (
+        batch_plan is None
+        or batch_plan.simulation_plan is not simulation_plan
+        or batch_plan.pose_bone_count != len(obj.pose.bones)
+    ):
+        batch_plan = compile_batch_plan(obj, simulation_plan)
+        object_name_to_batch_plan[obj.name] = batch_plan
+    return batch_plan
+
+
+def transform_points(
+    matrices: "NDArray[np.float64]", points: "NDArray[np.float64]"
+) -> "NDArray[np.float64]":
+    transformed_points: NDArray[np.float64] = (
+        np.einsum("nij,nj->ni", matrices[:, :3, :3], points) + matrices[:, :3, 3]
+    )
+    return transformed_points
+
+
+def rotate_vectors(
+    matrices: "NDArray[np.float64]", vectors: "NDArray[np.float64]"
+) -> "NDArray[np.float64]":
+    rotated_vectors: NDArray[np.float64] = np.einsum("nij,nj->ni", matrices, vectors)
+    return rotated_vectors
+
+
+def normalize_vectors(vectors: "NDArray[np.float64]") -> "NDArray[np.float64]":
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    normalized_vectors: NDArray[np.float64] = np.divide(
+        vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0
+    )
+    return normalized_vectors
+
+
+def normalize_rotation_matrices(
+    matrices: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    # Matrix.to_quaternion()と同様に、各軸の長さを1にする
+    lengths = np.linalg.norm(matrices[:, :3, :3], axis=1, keepdims=True)
+    normalized_matrices: NDArray[np.float64] = np.divide(
+        matrices[:, :3, :3],
+        lengths,
+        out=np.zeros_like(matrices[:, :3, :3]),
+        where=lengths > 0,
+    )
+    return normalized_matrices
+
+
+def apply_length_constraints(
+    head_translations: "NDArray[np.float64]",
+    tail_translations: "NDArray[np.float64]",
+    lengths: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    return (
+        head_translations
+        + normalize_vectors(tail_translations - head_translations) * lengths[:, None]
+    )
+
+
+def calculate_collisions(
+    targets: "NDArray[np.float64]",
+    target_radii: "NDArray[np.float64]",
+    collider_types: "NDArray[np.intp]",
+    offsets: "NDArray[np.float64]",
+    tails: "NDArray[np.float64]",
+    radii: "NDArray[np.float64]",
+    normals: "NDArray[np.float64]",
+) -> "tuple[NDArray[np.float64], NDArray[np.float64]]":
+    """コライダーとの衝突方向と距離を、各Handlerの実装と同じ式でまとめて求める."""
+    # スフィアはoffsetとtailが同じカプセルとして扱う
+    offset_to_tail_diffs = tails - offsets
+    offset_to_tail_diff_length_squareds = np.einsum(
+        "ni,ni->n", offset_to_tail_diffs, offset_to_tail_diffs
+    )
+    offset_to_target_diffs = targets - offsets
+    ratios = np.zeros(len(targets))
+    capsule = offset_to_tail_diff_length_squareds >= float_info.epsilon
+    ratios[capsule] = np.clip(
+        np.einsum(
+            "ni,ni->n", offset_to_tail_diffs[capsule], offset_to_target_diffs[capsule]
+        )
+        / offset_to_tail_diff_length_squareds[capsule],
+        0,
+        1,
+    )
+    nearests = offsets + offset_to_tail_diffs * ratios[:, None]
+
+    inside = collider_types == COLLIDER_TYPE_INSIDE
+    diffs = np.where(inside[:, None], nearests - targets, targets - nearests)
+    diff_lengths = np.linalg.norm(diffs, axis=-1)
+    degenerated = diff_lengths < float_info.epsilon
+    directions = np.divide(
+        diffs,
+        diff_lengths[:, None],
+        out=np.tile(np.array([0.0, 0.0, -1.0]), (len(targets), 1)),
+        where=~degenerated[:, None],
+    )
+    distances = np.where(
+        inside,
+        -diff_lengths - target_radii + radii,
+        diff_lengths - target_radii - radii,
+    )
+    distances[degenerated] = -0.01
+
+    plane = collider_types == COLLIDER_TYPE_PLANE
+    directions[plane] = normals[plane]
+    distances[plane] = (
+        np.einsum("ni,ni->n", offset_to_target_diffs[plane], normals[plane])
+        - target_radii[plane]
+    )
+    return directions, distances
+
+
+def quaternions_to_matrices(
+    quaternions: "NDArray[np.float64]",
+) -> "NDArray[np.float64]":
+    w, x, y, z = quaternions.T
+    return np.stack(
+        [
+            np.stack(
+                [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+                axis=-1,
+            ),
+            np.stack(
+                [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+                axis=-1,
+            ),
+            np.stack(
+                [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+                axis=-1,
+            ),
+        ],
+        axis=1,
+    )
+
+
+def calculate_rotations_between(
+    starts: "NDArray[np.float64]", ends: "NDArray[np.float64]"
+) -> "NDArray[np.float64]":
+    """Quaternion(start.cross(end), start.angle(end, 0))をまとめて求める."""
+    start_length_squareds = np.einsum("ni,ni->n", starts, starts)
+    end_length_squareds = np.einsum("ni,ni->n", ends, ends)
+    denominators = np.sqrt(start_length_squareds * end_length_squareds)
+    cosines = np.divide(
+        np.einsum("ni,ni->n", starts, ends),
+        denominators,
+        out=np.ones_like(denominators),
+        where=denominators > 0,
+    )
+    half_angles = np.arccos(np.clip(cosines, -1, 1)) / 2
+
+    axes = np.cross(starts, ends)
+    axis_lengths = np.linalg.norm(axes, axis=-1)
+    quaternions = np.zeros((len(starts), 4))
+    quaternions[:, 0] = 1
+    # 回転軸が求まらない場合は単位クォータニオンになる
+    rotatable = axis_lengths > 0
+    quaternions[rotatable, 0] = np.cos(half_angles[rotatable])
+    quaternions[rotatable, 1:] = (
+        axes[rotatable]
+        / axis_lengths[rotatable, None]
+        * np.sin(half_angles[rotatable])[:, None]
+    )
+    return quaternions
+
+
+def read_pose_bone_matrices(obj: Object, pose_bone_count: int) -> "NDArray[np.float64]":
+    values = np.empty(pose_bone_count * 16, dtype=np.float32)
+    obj.pose.bones.foreach_get("matrix", values)
+    # 列優先で格納されているので転置する
+    matrices: NDArray[np.float64] = (
+        values.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+    )
+    return matrices
+
+
+def read_joint_values(
+    spring: SpringBone1SpringPropertyGroup, name: str, size: int = 1
+) -> "NDArray[np.float64]":
+    values = np.empty(len(spring.joints) * size, dtype=np.float64)
+    spring.joints.foreach_get(name, values)
+    if size == 1:
+        return values
+    return values.reshape(-1, size)
+
+
+def calculate_simulation_plan_pose_bone_rotations(
+    delta_time: float,
+    obj: Object,
+    simulation_plan: SimulationPlan,
+    animation_state: AnimationState,
+    bone_name_to_pose_bone: dict[str, PoseBone],
+    spring_and_center_translations: list[tuple[SpringBone1SpringPropertyGroup, Vector]],
+    pose_bone_and_rotations: list[tuple[PoseBone, Quaternion]],
+) -> None:
+    batch_plan = get_batch_plan(obj, simulation_plan)
+    pair_count = len(batch_plan.pair_spring_indices)
+    if not pair_count:
+        return
+
+    world_matrix = np.array(obj.matrix_world, dtype=np.float64)
+    world_matrix_inverted = np.linalg.pinv(world_matrix)
+    world_rotation_matrix = normalize_rotation_matrices(world_matrix[None])[0]
+    pose_bone_matrices = read_pose_bone_matrices(obj, batch_plan.pose_bone_count)
+
+    # コライダーのワールド座標での形状
+    collider_world_matrices = world_matrix @ pose_bone_matrices[
+        batch_plan.collider_pose_bone_indices
+    ].reshape(-1, 4, 4)
+    collider_offsets = transform_points(
+        collider_world_matrices, batch_plan.collider_offsets
+    )
+    collider_tails = transform_points(
+        collider_world_matrices, batch_plan.collider_tails
+    )
+    collider_normals = rotate_vectors(
+        normalize_rotation_matrices(collider_world_matrices),
+        batch_plan.collider_normals,
+    )
+
+    # ジョイントの設定と状態を集める
+    spring_center_translations = np.array(
+        [
+            previous_to_current_center_world_translation
+            for _, previous_to_current_center_world_translation in (
+                spring_and_center_translations
+            )
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    drag_forces = np.empty(pair_count)
+    stiffnesses = np.empty(pair_count)
+    gravity_powers = np.empty(pair_count)
+    gravity_dirs = np.empty((pair_count, 3))
+    hit_radii = np.empty(pair_count)
+    pair_index = 0
+    for spring_plan, (spring, _) in zip(
+        simulation_plan.springs, spring_and_center_translations
+    ):
+        if not spring_plan.joint_pairs:
+            continue
+        head_joint_indices = [
+            joint_pair.head_joint_index for joint_pair in spring_plan.joint_pairs
+        ]
+        end_pair_index = pair_index + len(spring_plan.joint_pairs)
+        drag_forces[pair_index:end_pair_index] = read_joint_values(
+            spring, "drag_force"
+        )[head_joint_indices]
+        stiffnesses[pair_index:end_pair_index] = read_joint_values(spring, "stiffness")[
+            head_joint_indices
+        ]
+        gravity_powers[pair_index:end_pair_index] = read_joint_values(
+            spring, "gravity_power"
+        )[head_joint_indices]
+        gravity_dirs[pair_index:end_pair_index] = read_joint_values(
+            spring, "gravity_dir", 3
+        )[head_joint_indices]
+        hit_radii[pair_index:end_pair_index] = read_joint_values(spring, "hit_radius")[
+            head_joint_indices
+        ]
+        pair_index = end_pair_index
+
+    head_translations = transform_points(
+        np.broadcast_to(world_matrix, (pair_count, 4, 4)),
+        pose_bone_matrices[batch_plan.pair_head_pose_bone_indices, :3, 3],
+    )
+    tail_translations = transform_points(
+        np.broadcast_to(world_matrix, (pair_count, 4, 4)),
+        pose_bone_matrices[batch_plan.pair_tail_pose_bone_indices, :3, 3],
+    )
+    head_to_tail_world_distances = np.linalg.norm(
+        head_translations - tail_translations, axis=-1
+    )
+    uninitialized = ~animation_state.initialized_as_tails
+    animation_state.previous_world_translations[uninitialized] = tail_translations[
+        uninitialized
+    ]
+    animation_state.current_world_translations[uninitialized] = tail_translations[
+        uninitialized
+    ]
+
+    pair_center_translations = spring_center_translations[
+        batch_plan.pair_spring_indices
+    ]
+    previous_tail_world_translations = (
+        animation_state.previous_world_translations + pair_center_translations
+    )
+    current_tail_world_translations = (
+        animation_state.current_world_translations + pair_center_translations
+    )
+
+    # 各スプリングの、回転前の次のHeadのボーン行列
+    head_parent_matrices = np.tile(
+        np.identity(4), (len(batch_plan.head_parent_pose_bone_indices), 1, 1)
+    )
+    has_head_parent = batch_plan.head_parent_pose_bone_indices >= 0
+    head_parent_matrices[has_head_parent] = pose_bone_matrices[
+        batch_plan.head_parent_pose_bone_indices[has_head_parent]
+    ]
+    next_head_pose_bone_before_rotation_matrices = (
+        head_parent_matrices @ batch_plan.head_parent_rest_to_head_rest_object_matrices
+    )
+
+    next_tail_world_translations = np.empty((pair_count, 3))
+    rotations = np.empty((pair_count, 4))
+    parent_rotation_matrices = np.empty((pair_count, 3, 3))
+    for level in batch_plan.levels:
+        pair_indices = level.pair_indices
+        before_rotation_matrices = next_head_pose_bone_before_rotation_matrices[
+            level.spring_indices
+        ]
+
+        next_head_world_translations = transform_points(
+            np.broadcast_to(world_matrix, (len(pair_indices), 4, 4)),
+            before_rotation_matrices[:, :3, 3],
+        )
+        current_tail = current_tail_world_translations[pair_indices]
+        inertia = (current_tail - previous_tail_world_translations[pair_indices]) * (
+            1.0 - drag_forces[pair_indices, None]
+        )
+        start_targets = batch_plan.pair_head_rotation_start_target_local_translations[
+            pair_indices
+        ]
+        stiffness_directions = normalize_vectors(
+            rotate_vectors(
+                world_rotation_matrix
+                @ normalize_rotation_matrices(before_rotation_matrices),
+                start_targets,
+            )
+        )
+        stiffness = stiffness_directions * delta_time * stiffnesses[pair_indices, None]
+        external = (
+            gravity_dirs[pair_indices] * delta_time * gravity_powers[pair_indices, None]
+        )
+        next_tail = current_tail + inertia + stiffness + external
+
+        lengths = head_to_tail_world_distances[pair_indices]
+        next_tail = apply_length_constraints(
+            next_head_world_translations, next_tail, lengths
+        )
+
+        # コライダーの衝突を、ジョイントごとに登録順で計算する
+        target_radii = hit_radii[pair_indices]
+        for collider_indices in level.collider_indices.T:
+            enabled = collider_indices >= 0
+            if not enabled.any():
+                continue
+            indices = collider_indices[enabled]
+            directions, distances = calculate_collisions(
+                next_tail[enabled],
+                target_radii[enabled],
+                batch_plan.collider_types[indices],
+                collider_offsets[indices],
+                collider_tails[indices],
+                batch_plan.collider_radii[indices],
+                collider_normals[indices],
+            )
+            hit = np.zeros(len(pair_indices), dtype=bool)
+            hit[enabled] = distances < 0
+            if not hit.any():
+                continue
+            # 押しのけてから、次のTailに距離の制約を適用
+            next_tail[hit] -= directions[distances < 0] * distances[distances < 0, None]
+            next_tail[hit] = apply_length_constraints(
+                next_head_world_translations[hit], next_tail[hit], lengths[hit]
+            )
+
+        next_tail_object_local_translations = transform_points(
+            np.broadcast_to(world_matrix_inverted, (len(pair_indices), 4, 4)),
+            next_tail,
+        )
+        end_targets = transform_points(
+            np.linalg.pinv(before_rotation_matrices).astype(np.float64),
+            next_tail_object_local_translations,
+        )
+        level_rotations = calculate_rotations_between(start_targets, end_targets)
+
+        # Matrix.decompose()と同様に分解し、回転を適用して組み立て直す
+        before_rotation_matrices_3x3 = before_rotation_matrices[:, :3, :3]
+        scales = np.linalg.norm(before_rotation_matrices_3x3, axis=1)
+        scales[np.linalg.det(before_rotation_matrices_3x3) < 0] *= -1
+        level_parent_rotation_matrices = np.divide(
+            before_rotation_matrices_3x3,
+            scales[:, None, :],
+            out=np.zeros_like(before_rotation_matrices_3x3),
+            where=scales[:, None, :] != 0,
+        )
+        next_head_pose_bone_matrices = np.tile(
+            np.identity(4), (len(pair_indices), 1, 1)
+        )
+        next_head_pose_bone_matrices[:, :3, :3] = (
+            level_parent_rotation_matrices @ quaternions_to_matrices(level_rotations)
+        ) * scales[:, None, :]
+        next_head_pose_bone_matrices[:, :3, 3] = before_rotation_matrices[:, :3, 3]
+        next_head_pose_bone_before_rotation_matrices[level.spring_indices] = (
+            next_head_pose_bone_matrices
+            @ batch_plan.pair_head_rest_to_tail_rest_object_matrices[pair_indices]
+        )
+
+        next_tail_world_translations[pair_indices] = next_tail
+        rotations[pair_indices] = level_rotations
+        parent_rotation_matrices[pair_indices] = level_parent_rotation_matrices
+
+    animation_state.initialized_as_tails[:] = True
+    animation_state.previous_world_translations[:] = current_tail_world_translations
+    animation_state.current_world_translations[:] = next_tail_world_translations
+
+    pair_index = 0
+    for spring_plan in simulation_plan.springs:
+        for joint_pair in spring_plan.joint_pairs:
+            rotation = Quaternion(rotations[pair_index].tolist())
+            if not joint_pair.head_use_inherit_rotation:
+                rotation = (
+                    Matrix(
+                        parent_rotation_matrices[pair_index].tolist()
+                    ).to_quaternion()
+                    @ rotation
+                )
+            pose_bone_and_rotations.append(
+                (bone_name_to_pose_bone[joint_pair.head_bone_name], rotation)
+            )
+            pair_index += 1
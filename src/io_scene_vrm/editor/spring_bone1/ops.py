@@ -1,14 +1,24 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
-import uuid
 from collections.abc import Set as AbstractSet
 from sys import float_info
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Final
 
+from bpy.app.translations import pgettext
 from bpy.props import BoolProperty, FloatProperty, IntProperty, StringProperty
 from bpy.types import Armature, Context, Operator
 
 from ..extension import get_armature_extension
-from .handler import reset_state, update_pose_bone_rotations
+from .handler import (
+    bake_pose_bone_rotations,
+    find_rotation_fcurve_bone_names,
+    get_joint_bone_names,
+    invalidate_simulation_plans,
+    reset_animation_state,
+    reset_state,
+    reset_substep_counts,
+    update_pose_bone_rotations,
+    write_rotation_fcurves,
+)
 
 
 class VRM_OT_add_spring_bone1_collider(Operator):
@@ -29,10 +39,7 @@ class VRM_OT_add_spring_bone1_collider(Operator):
         if not isinstance(armature_data, Armature):
             return {"CANCELLED"}
         spring_bone = get_armature_extension(armature_data).spring_bone1
-        collider = spring_bone.colliders.add()
-        collider.uuid = uuid.uuid4().hex
-        collider.shape.sphere.radius = 0.125
-        collider.reset_bpy_object(context, armature)
+        spring_bone.add_collider(context, armature)
         spring_bone.active_collider_index = len(spring_bone.colliders) - 1
         return {"FINISHED"}
 
@@ -98,6 +105,7 @@ class VRM_OT_remove_spring_bone1_collider(Operator):
             max(0, len(spring_bone.colliders) - 1),
         )
 
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -136,6 +144,7 @@ class VRM_OT_move_up_spring_bone1_collider_group(Operator):
         spring_bone.active_collider_group_index = new_index
         for collider_group in spring_bone.collider_groups:
             collider_group.fix_index(context)
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -174,6 +183,7 @@ class VRM_OT_move_down_spring_bone1_collider_group(Operator):
         spring_bone.active_collider_group_index = new_index
         for collider_group in spring_bone.collider_groups:
             collider_group.fix_index(context)
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -201,8 +211,7 @@ class VRM_OT_add_spring_bone1_spring(Operator):
         if not isinstance(armature_data, Armature):
             return {"CANCELLED"}
         spring_bone1 = get_armature_extension(armature_data).spring_bone1
-        spring = spring_bone1.springs.add()
-        spring.vrm_name = "Spring"
+        spring_bone1.add_spring()
         spring_bone1.active_spring_index = len(spring_bone1.springs) - 1
         return {"FINISHED"}
 
@@ -241,6 +250,7 @@ class VRM_OT_remove_spring_bone1_spring(Operator):
             spring_bone1.active_spring_index, max(0, len(spring_bone1.springs) - 1)
         )
 
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -278,6 +288,7 @@ class VRM_OT_move_up_spring_bone1_spring(Operator):
         new_spring_index = (self.spring_index - 1) % len(springs)
         springs.move(self.spring_index, new_spring_index)
         spring_bone1.active_spring_index = new_spring_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -315,6 +326,7 @@ class VRM_OT_move_down_spring_bone1_spring(Operator):
         new_spring_index = (self.spring_index + 1) % len(springs)
         springs.move(self.spring_index, new_spring_index)
         spring_bone1.active_spring_index = new_spring_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -342,9 +354,7 @@ class VRM_OT_add_spring_bone1_collider_group(Operator):
         if not isinstance(armature_data, Armature):
             return {"CANCELLED"}
         spring_bone = get_armature_extension(armature_data).spring_bone1
-        collider_group = spring_bone.collider_groups.add()
-        collider_group.uuid = uuid.uuid4().hex
-        collider_group.vrm_name = "Collider Group"
+        spring_bone.add_collider_group()
         spring_bone.active_collider_group_index = len(spring_bone.collider_groups) - 1
         return {"FINISHED"}
 
@@ -400,6 +410,7 @@ class VRM_OT_remove_spring_bone1_collider_group(Operator):
             max(0, len(spring_bone.collider_groups) - 1),
         )
 
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -437,6 +448,7 @@ class VRM_OT_move_up_spring_bone1_collider(Operator):
         new_collider_index = (self.collider_index - 1) % len(colliders)
         colliders.move(self.collider_index, new_collider_index)
         spring_bone1.active_collider_index = new_collider_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -474,6 +486,7 @@ class VRM_OT_move_down_spring_bone1_collider(Operator):
         new_collider_index = (self.collider_index + 1) % len(colliders)
         colliders.move(self.collider_index, new_collider_index)
         spring_bone1.active_collider_index = new_collider_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -559,6 +572,7 @@ class VRM_OT_remove_spring_bone1_collider_group_collider(Operator):
             collider_group.active_collider_index,
             max(0, len(collider_group.colliders) - 1),
         )
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -603,6 +617,7 @@ class VRM_OT_move_up_spring_bone1_collider_group_collider(Operator):
         new_collider_index = (self.collider_index - 1) % len(collider_group.colliders)
         collider_group.colliders.move(self.collider_index, new_collider_index)
         collider_group.active_collider_index = new_collider_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -647,6 +662,7 @@ class VRM_OT_move_down_spring_bone1_collider_group_collider(Operator):
         new_collider_index = (self.collider_index + 1) % len(collider_group.colliders)
         collider_group.colliders.move(self.collider_index, new_collider_index)
         collider_group.active_collider_index = new_collider_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -728,6 +744,7 @@ class VRM_OT_remove_spring_bone1_spring_collider_group(Operator):
         spring.active_collider_group_index = min(
             spring.active_collider_group_index, max(0, len(spring.collider_groups) - 1)
         )
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -775,6 +792,7 @@ class VRM_OT_move_up_spring_bone1_spring_collider_group(Operator):
         )
         spring.collider_groups.move(self.collider_group_index, new_collider_group_index)
         spring.active_collider_group_index = new_collider_group_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -822,6 +840,7 @@ class VRM_OT_move_down_spring_bone1_spring_collider_group(Operator):
         )
         spring.collider_groups.move(self.collider_group_index, new_collider_group_index)
         spring.active_collider_group_index = new_collider_group_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -921,6 +940,7 @@ class VRM_OT_remove_spring_bone1_joint(Operator):
         spring.active_joint_index = min(
             spring.active_joint_index, max(0, len(spring.joints) - 1)
         )
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -966,6 +986,7 @@ class VRM_OT_move_up_spring_bone1_joint(Operator):
         new_joint_index = (self.joint_index - 1) % len(spring.joints)
         spring.joints.move(self.joint_index, new_joint_index)
         spring.active_joint_index = new_joint_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -1011,6 +1032,7 @@ class VRM_OT_move_down_spring_bone1_joint(Operator):
         new_joint_index = (self.joint_index + 1) % len(spring.joints)
         spring.joints.move(self.joint_index, new_joint_index)
         spring.active_joint_index = new_joint_index
+        invalidate_simulation_plans(armature_data.name)
         return {"FINISHED"}
 
     if TYPE_CHECKING:
@@ -1038,9 +1060,7 @@ class VRM_OT_reset_spring_bone1_animation_state(Operator):
         armature_data = armature.data
         if not isinstance(armature_data, Armature):
             return {"CANCELLED"}
-        for spring in get_armature_extension(armature_data).spring_bone1.springs:
-            for joint in spring.joints:
-                joint.animation_state.initialized_as_tail = False
+        reset_animation_state(armature_data)
         reset_state(context)
         return {"FINISHED"}
 
@@ -1071,3 +1091,119 @@ class VRM_OT_update_spring_bone1_animation(Operator):
         # This code is auto generated.
         # To regenerate, run the `uv run tools/property_typing.py` command.
         delta_time: float  # type: ignore[no-redef]
+
+
+class VRM_OT_reset_spring_bone1_substep_counts(Operator):
+    bl_idname = "vrm.reset_spring_bone1_substep_counts"
+    bl_label = "Reset Substep Counts"
+    bl_description = "Clear the recorded number of substeps calculated in each frame"
+    bl_options: AbstractSet[str] = {"REGISTER"}
+
+    armature_name: StringProperty(  # type: ignore[valid-type]
+        options={"HIDDEN"},
+    )
+
+    def execute(self, _context: Context) -> set[str]:
+        # アーマチュアの指定が無い場合は、全てのアーマチュアの記録を消す
+        reset_substep_counts(self.armature_name or None)
+        return {"FINISHED"}
+
+    if TYPE_CHECKING:
+        # This code is auto generated.
+        # To regenerate, run the `uv run tools/property_typing.py` command.
+        armature_name: str  # type: ignore[no-redef]
+
+
+# ベイクする範囲が指定されていないことを表す値。Blenderのフレームの範囲外にする
+BAKE_FRAME_UNSPECIFIED: Final = -1048575
+
+
+class VRM_OT_bake_spring_bone1_animation(Operator):
+    bl_idname = "vrm.bake_spring_bone1_animation"
+    bl_label = "Bake SpringBone Animation"
+    bl_description = (
+        "Simulate SpringBone over the frames, write it as keyframes"
+        + " and disable the animation"
+    )
+    bl_options: AbstractSet[str] = {"REGISTER", "UNDO"}
+
+    armature_name: StringProperty(  # type: ignore[valid-type]
+        options={"HIDDEN"},
+    )
+    frame_start: IntProperty(  # type: ignore[valid-type]
+        name="Start Frame",
+        default=BAKE_FRAME_UNSPECIFIED,
+        options={"SKIP_SAVE"},
+    )
+    frame_end: IntProperty(  # type: ignore[valid-type]
+        name="End Frame",
+        default=BAKE_FRAME_UNSPECIFIED,
+        options={"SKIP_SAVE"},
+    )
+
+    def execute(self, context: Context) -> set[str]:
+        armature = context.blend_data.objects.get(self.armature_name)
+        if armature is None or armature.type != "ARMATURE":
+            return {"CANCELLED"}
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            return {"CANCELLED"}
+        if not get_armature_extension(armature_data).is_vrm1():
+            return {"CANCELLED"}
+        # 範囲が指定されていない場合は、シーンの範囲を使う
+        if self.frame_start == BAKE_FRAME_UNSPECIFIED:
+            self.frame_start = context.scene.frame_start
+        if self.frame_end == BAKE_FRAME_UNSPECIFIED:
+            self.frame_end = context.scene.frame_end
+        if self.frame_end < self.frame_start:
+            return {"CANCELLED"}
+
+        # ジョイントのボーンに既存の回転のキーフレームがある場合は置き換えるため、
+        # そのことを報告する
+        animation_data = armature.animation_data
+        replaced_bone_names = (
+            find_rotation_fcurve_bone_names(
+                armature,
+                animation_data.action,
+                get_joint_bone_names(armature, armature_data),
+            )
+            if animation_data and animation_data.action
+            else []
+        )
+
+        bone_name_to_rotations = bake_pose_bone_rotations(
+            context, armature, self.frame_start, self.frame_end
+        )
+
+        if not armature.animation_data:
+            armature.animation_data_create()
+        if not armature.animation_data:
+            message = "armature.animation_data is None"
+            raise ValueError(message)
+        action = armature.animation_data.action
+        if not action:
+            action = context.blend_data.actions.new(name=armature.name + "Action")
+            armature.animation_data.action = action
+        write_rotation_fcurves(
+            armature, action, self.frame_start, bone_name_to_rotations
+        )
+
+        # ベイクしたキーフレームの上でシミュレーションが重ならないよう、
+        # アニメーションを無効にする
+        get_armature_extension(armature_data).spring_bone1.enable_animation = False
+
+        if replaced_bone_names:
+            self.report(
+                {"WARNING"},
+                pgettext(
+                    "Replaced the existing rotation keyframes of {bone_names}"
+                ).format(bone_names=", ".join(replaced_bone_names)),
+            )
+        return {"FINISHED"}
+
+    if TYPE_CHECKING:
+        # This code is auto generated.
+        # To regenerate, run the `uv run tools/property_typing.py` command.
+        armature_name: str  # type: ignore[no-redef]
+        frame_start: int  # type: ignore[no-redef]
+        frame_end: int  # type: ignore[no-redef]
@@ -2,14 +2,16 @@
 from collections.abc import Set as AbstractSet
 from typing import Optional
 
+from bpy.app.translations import pgettext
 from bpy.types import Armature, Context, Object, Panel, UILayout
 
 from .. import search
 from ..extension import get_armature_extension
 from ..migration import defer_migrate
+from ..ops import layout_operator
 from ..panel import VRM_PT_vrm_armature_object_property, draw_template_list
 from ..search import active_object_is_vrm1_armature
-from . import ops
+from . import handler, ops
 from .property_group import (
     SpringBone1ColliderGroupPropertyGroup,
     SpringBone1ColliderPropertyGroup,
@@ -199,7 +201,27 @@ def draw_spring_bone1_spring_bone_layout(
     defer_migrate(armature.name)
 
     layout.prop(spring_bone, "enable_animation")
+    layout.prop(spring_bone, "solver")
+    layout.prop(spring_bone, "substep_policy")
+    if spring_bone.substep_policy != spring_bone.SUBSTEP_POLICY_CATCH_UP.identifier:
+        layout.prop(spring_bone, "max_substeps")
+    if spring_bone.enable_animation:
+        substep_count_row = layout.row()
+        substep_count_row.label(
+            text=pgettext("Max Substeps in a Frame: {count}").format(
+                count=handler.state.object_name_to_max_substep_count.get(
+                    armature.name, 0
+                )
+            ),
+            translate=False,
+        )
+        layout_operator(
+            substep_count_row, ops.VRM_OT_reset_spring_bone1_substep_counts
+        ).armature_name = armature.name
     # layout.operator(ops.VRM_OT_reset_spring_bone1_animation_state.bl_idname)
+    layout_operator(
+        layout, ops.VRM_OT_bake_spring_bone1_animation, icon="ACTION"
+    ).armature_name = armature.name
 
     draw_spring_bone1_colliders_layout(armature, layout, spring_bone)
     draw_spring_bone1_collider_groups_layout(armature, layout, spring_bone)
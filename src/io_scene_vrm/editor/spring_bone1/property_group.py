@@ -29,6 +29,15 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+def update_simulation_plan(property_group: PropertyGroup, _context: Context) -> None:
+    """シミュレーションの計画に影響する設定が変更されたら、計画を作り直させる."""
+    from .handler import invalidate_simulation_plans
+
+    armature_data = property_group.id_data
+    if isinstance(armature_data, Armature):
+        invalidate_simulation_plans(armature_data.name)
+
+
 def find_armature_and_collider(
     context: Context,
     match_collider: Callable[["SpringBone1ColliderPropertyGroup"], bool],
@@ -403,7 +412,9 @@ class SpringBone1ExtendedColliderShapeSpherePropertyGroup(
             ),
         )
 
-    inside: BoolProperty()  # type: ignore[valid-type]
+    inside: BoolProperty(  # type: ignore[valid-type]
+        update=update_simulation_plan,
+    )
 
     if TYPE_CHECKING:
         # This code is auto generated.
@@ -427,7 +438,9 @@ class SpringBone1ExtendedColliderShapeCapsulePropertyGroup(
             ),
         )
 
-    inside: BoolProperty()  # type: ignore[valid-type]
+    inside: BoolProperty(  # type: ignore[valid-type]
+        update=update_simulation_plan,
+    )
 
     if TYPE_CHECKING:
         # This code is auto generated.
@@ -605,6 +618,7 @@ class SpringBone1VrmcSpringBoneExtendedColliderPropertyGroup(PropertyGroup):
             ),
         )
         collider.reset_bpy_object(context, armature)
+        update_simulation_plan(self, context)
 
     enabled: BoolProperty(  # type: ignore[valid-type]
         name="Extended Collider",
@@ -792,6 +806,7 @@ class SpringBone1ColliderPropertyGroup(PropertyGroup):
             and self.bpy_object.parent.type == "ARMATURE"
         ):
             self.reset_bpy_object(context, self.bpy_object.parent)
+        update_simulation_plan(self, context)
 
     shape_type: EnumProperty(  # type: ignore[valid-type]
         items=shape_type_enum.items(),
@@ -808,7 +823,8 @@ class SpringBone1ColliderPropertyGroup(PropertyGroup):
 
     # for View3D
     bpy_object: PointerProperty(  # type: ignore[valid-type]
-        type=Object
+        type=Object,
+        update=update_simulation_plan,
     )
 
     # for references
@@ -949,7 +965,9 @@ class SpringBone1ColliderReferencePropertyGroup(PropertyGroup):
     collider_name: StringProperty(  # type: ignore[valid-type]
         get=get_collider_name, set=set_collider_name
     )
-    collider_uuid: StringProperty()  # type: ignore[valid-type]
+    collider_uuid: StringProperty(  # type: ignore[valid-type]
+        update=update_simulation_plan,
+    )
     search_one_time_uuid: StringProperty()  # type: ignore[valid-type]
 
     if TYPE_CHECKING:
@@ -1149,7 +1167,9 @@ class SpringBone1ColliderGroupReferencePropertyGroup(PropertyGroup):
     collider_group_name: StringProperty(  # type: ignore[valid-type]
         get=get_collider_group_name, set=set_collider_group_name
     )
-    collider_group_uuid: StringProperty()  # type: ignore[valid-type]
+    collider_group_uuid: StringProperty(  # type: ignore[valid-type]
+        update=update_simulation_plan,
+    )
     search_one_time_uuid: StringProperty()  # type: ignore[valid-type]
 
     if TYPE_CHECKING:
@@ -1237,6 +1257,11 @@ class SpringBone1SpringBonePropertyGroup(PropertyGroup):
     )
 
     def update_enable_animation(self, _context: Context) -> None:
+        from .handler import discard_animation_state
+
+        armature_data = self.id_data
+        if isinstance(armature_data, Armature):
+            discard_animation_state(armature_data)
         for spring in self.springs:
             for joint in spring.joints:
                 joint.animation_state.initialized_as_tail = False
@@ -1246,6 +1271,67 @@ class SpringBone1SpringBonePropertyGroup(PropertyGroup):
         update=update_enable_animation,
     )
 
+    (
+        solver_enum,
+        (
+            SOLVER_SCALAR,
+            SOLVER_NUMPY,
+        ),
+    ) = property_group_enum(
+        ("scalar", "Scalar", "Calculate joints one by one", "NONE", 0),
+        ("numpy", "NumPy", "Calculate joints of the same depth at once", "NONE", 1),
+    )
+
+    solver: EnumProperty(  # type: ignore[valid-type]
+        items=solver_enum.items(),
+        name="Solver",
+    )
+
+    (
+        substep_policy_enum,
+        (
+            SUBSTEP_POLICY_CATCH_UP,
+            SUBSTEP_POLICY_LIMIT,
+            SUBSTEP_POLICY_MERGE,
+            SUBSTEP_POLICY_SKIP,
+        ),
+    ) = property_group_enum(
+        ("catch_up", "Catch Up", "Calculate every elapsed step", "NONE", 0),
+        (
+            "limit",
+            "Limit",
+            "Calculate up to the max substeps and drop older steps",
+            "NONE",
+            1,
+        ),
+        (
+            "merge",
+            "Merge",
+            "Merge older steps into one large step to fit in the max substeps",
+            "NONE",
+            2,
+        ),
+        (
+            "skip",
+            "Skip",
+            "Drop the elapsed steps and restart the simulation from the current pose"
+            + " when the max substeps is exceeded",
+            "NONE",
+            3,
+        ),
+    )
+
+    substep_policy: EnumProperty(  # type: ignore[valid-type]
+        items=substep_policy_enum.items(),
+        name="Substep Policy",
+    )
+    max_substeps: IntProperty(  # type: ignore[valid-type]
+        name="Max Substeps",
+        description="Maximum number of steps calculated in a frame",
+        min=1,
+        default=8,
+    )
+
     # for UI
     show_expanded_colliders: BoolProperty(  # type: ignore[valid-type]
         name="Spring Bone Colliders"
@@ -1261,6 +1347,28 @@ class SpringBone1SpringBonePropertyGroup(PropertyGroup):
     active_collider_group_index: IntProperty(min=0)  # type: ignore[valid-type]
     active_spring_index: IntProperty(min=0)  # type: ignore[valid-type]
 
+    def add_collider(
+        self, context: Context, armature: Object
+    ) -> SpringBone1ColliderPropertyGroup:
+        collider: SpringBone1ColliderPropertyGroup = self.colliders.add()
+        collider.uuid = uuid.uuid4().hex
+        collider.shape.sphere.radius = 0.125
+        collider.reset_bpy_object(context, armature)
+        return collider
+
+    def add_collider_group(self) -> SpringBone1ColliderGroupPropertyGroup:
+        collider_group: SpringBone1ColliderGroupPropertyGroup = (
+            self.collider_groups.add()
+        )
+        collider_group.uuid = uuid.uuid4().hex
+        collider_group.vrm_name = "Collider Group"
+        return collider_group
+
+    def add_spring(self) -> SpringBone1SpringPropertyGroup:
+        spring: SpringBone1SpringPropertyGroup = self.springs.add()
+        spring.vrm_name = "Spring"
+        return spring
+
     if TYPE_CHECKING:
         # This code is auto generated.
         # To regenerate, run the `uv run tools/property_typing.py` command.
@@ -1274,6 +1382,9 @@ class SpringBone1SpringBonePropertyGroup(PropertyGroup):
             SpringBone1SpringPropertyGroup
         ]
         enable_animation: bool  # type: ignore[no-redef]
+        solver: str  # type: ignore[no-redef]
+        substep_policy: str  # type: ignore[no-redef]
+        max_substeps: int  # type: ignore[no-redef]
         show_expanded_colliders: bool  # type: ignore[no-redef]
         show_expanded_collider_groups: bool  # type: ignore[no-redef]
         show_expanded_springs: bool  # type: ignore[no-redef]
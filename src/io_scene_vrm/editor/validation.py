@@ -13,7 +13,6 @@ from bpy.types import (
     Image,
     Material,
     Mesh,
-    NodesModifier,
     Object,
     Operator,
     PropertyGroup,
@@ -23,7 +22,7 @@ from bpy.types import (
 )
 from mathutils import Vector
 
-from ..common import shader, version
+from ..common import version
 from ..common.legacy_gltf import RGBA_INPUT_NAMES, TEXTURE_INPUT_NAMES, VAL_INPUT_NAMES
 from ..common.logging import get_logger
 from ..common.mtoon_unversioned import MtoonUnversioned
@@ -283,14 +282,7 @@ class WM_OT_vrm_validator(Operator):
                 and len(obj.data.shape_keys.key_blocks)
                 >= 2  # Exclude a "Basis" shape key
                 and any(
-                    modifier.type != "ARMATURE"
-                    and not (
-                        modifier.type == "NODES"
-                        and isinstance(modifier, NodesModifier)
-                        and modifier.node_group
-                        and modifier.node_group.name
-                        == shader.OUTLINE_GEOMETRY_GROUP_NAME
-                    )
+                    not search.is_armature_or_outline_modifier(modifier)
                     for modifier in obj.modifiers
                 )
             ):
@@ -20,6 +20,7 @@ from .property_group import (
     Vrm0MetaPropertyGroup,
     Vrm0PropertyGroup,
     Vrm0SecondaryAnimationPropertyGroup,
+    defer_bone_group_refresh,
 )
 
 
@@ -525,6 +526,7 @@ def migrate_link_to_bone_object(
         bone_extension = get_bone_extension(bone)
         if not bone_extension.uuid:
             bone_extension.uuid = uuid.uuid4().hex
+            BonePropertyGroup.clear_bone_uuid_index(parent_data.name)
         bone_property_group.bone_uuid = bone_extension.uuid
 
     for bone_property_group in BonePropertyGroup.get_all_bone_property_groups(armature):
@@ -673,24 +675,27 @@ def migrate(context: Context, vrm0: Vrm0PropertyGroup, armature: Object) -> None
     if not isinstance(armature_data, Armature):
         return
 
-    migrate_blender_object(armature_data)
-    migrate_link_to_bone_object(context, armature, armature_data)
-    Vrm0HumanoidPropertyGroup.fixup_human_bones(armature)
+    # コライダーグループの更新に伴うボーングループの更新をまとめて行う
+    with defer_bone_group_refresh(context):
+        migrate_blender_object(armature_data)
+        migrate_link_to_bone_object(context, armature, armature_data)
+        Vrm0HumanoidPropertyGroup.fixup_human_bones(armature)
 
-    for collider_group in vrm0.secondary_animation.collider_groups:
-        collider_group.refresh(armature)
-    for bone_group in vrm0.secondary_animation.bone_groups:
-        bone_group.refresh(armature)
+        for collider_group in vrm0.secondary_animation.collider_groups:
+            collider_group.refresh(armature)
+        for bone_group in vrm0.secondary_animation.bone_groups:
+            bone_group.refresh(armature)
 
-    if not vrm0.first_person.first_person_bone.bone_name:
-        for human_bone in vrm0.humanoid.human_bones:
-            if human_bone.bone == "head":
-                vrm0.first_person.first_person_bone.set_bone_name(
-                    human_bone.node.bone_name
-                )
-                break
+        if not vrm0.first_person.first_person_bone.bone_name:
+            for human_bone in vrm0.humanoid.human_bones:
+                if human_bone.bone == "head":
+                    vrm0.first_person.first_person_bone.set_bone_name(
+                        human_bone.node.bone_name
+                    )
+                    break
+
+        migrate_legacy_custom_properties(context, armature, armature_data)
 
-    migrate_legacy_custom_properties(context, armature, armature_data)
     migrate_link_to_mesh_object(armature_data)
     remove_link_to_mesh_object(armature_data)
     fixup_gravity_dir(armature_data)
@@ -1,8 +1,11 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import functools
-from collections.abc import Sequence
+from collections.abc import Iterator, Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from sys import float_info
-from typing import TYPE_CHECKING, ClassVar, Optional
+from typing import TYPE_CHECKING, ClassVar, Final, Optional
 
 import bpy
 from bpy.props import (
@@ -35,6 +38,7 @@ from ...common.vrm0.human_bone import (
 )
 from ..property_group import (
     BonePropertyGroup,
+    BoneTreeIndex,
     FloatPropertyGroup,
     MeshObjectPropertyGroup,
     StringPropertyGroup,
@@ -87,27 +91,20 @@ class Vrm0HumanoidBonePropertyGroup(PropertyGroup):
         self,
         armature_data: Armature,
         bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
     ) -> None:
         human_bone_name = HumanBoneName.from_str(self.bone)
         if human_bone_name is None:
             logger.warning("Bone name '%s' is invalid", self.bone)
             return
         target = HumanBoneSpecifications.get(human_bone_name)
-        new_candidates = BonePropertyGroup.find_bone_candidates(
+        BonePropertyGroup.update_node_candidates(
+            self.node_candidates,
             armature_data,
             target,
             bpy_bone_name_to_human_bone_specification,
+            bone_tree_index,
         )
-        if {n.value for n in self.node_candidates} == new_candidates:
-            return
-
-        self.node_candidates.clear()
-        # Preserving list order
-        for bone_name in armature_data.bones.keys():
-            if bone_name not in new_candidates:
-                continue
-            candidate = self.node_candidates.add()
-            candidate.value = bone_name
 
     def specification(self) -> HumanBoneSpecification:
         name = HumanBoneName.from_str(self.bone)
@@ -276,10 +273,12 @@ class Vrm0HumanoidPropertyGroup(PropertyGroup):
             and HumanBoneName.from_str(human_bone.bone) is not None
         }
 
+        bone_tree_index = BoneTreeIndex.create(armature_data)
         for human_bone in humanoid.human_bones:
             human_bone.update_node_candidates(
                 armature_data,
                 bpy_bone_name_to_human_bone_specification,
+                bone_tree_index,
             )
 
     @staticmethod
@@ -718,6 +717,88 @@ class Vrm0SecondaryAnimationColliderPropertyGroup(PropertyGroup):
         bpy_object: Optional[Object]  # type: ignore[no-redef]
 
 
+@dataclass
+class BoneGroupRefreshState:
+    """defer_bone_group_refresh()のスコープ内で、更新が必要なボーングループを記録する."""
+
+    scope_depth: int = 0
+    armature_object_name_to_collider_group_uuids: dict[str, set[str]] = field(
+        default_factory=dict
+    )
+
+
+bone_group_refresh_state: Final = BoneGroupRefreshState()
+
+
+@contextmanager
+def defer_bone_group_refresh(context: Context) -> Iterator[None]:
+    """コライダーグループの更新に伴うボーングループの更新を、スコープの終了時にまとめて行う.
+
+    多数のコライダーグループを更新する処理をこのスコープで囲むと、コライダーグループごとに
+    ボーングループを更新する代わりに、影響を受けるボーングループを一度だけ更新する。
+    """
+    state = bone_group_refresh_state
+    state.scope_depth += 1
+    try:
+        yield
+        if state.scope_depth == 1:
+            armature_object_name_to_collider_group_uuids = (
+                state.armature_object_name_to_collider_group_uuids
+            )
+            state.armature_object_name_to_collider_group_uuids = {}
+            for (
+                armature_object_name,
+                collider_group_uuids,
+            ) in armature_object_name_to_collider_group_uuids.items():
+                armature = context.blend_data.objects.get(armature_object_name)
+                if not armature or armature.type != "ARMATURE":
+                    continue
+                refresh_bone_groups(armature, collider_group_uuids)
+    finally:
+        state.scope_depth -= 1
+        if state.scope_depth == 0:
+            state.armature_object_name_to_collider_group_uuids.clear()
+
+
+def schedule_bone_group_refresh(armature: Object, collider_group_uuid: str) -> None:
+    """コライダーグループを参照しているボーングループを更新する.
+
+    defer_bone_group_refresh()のスコープ内では、スコープの終了時まで更新を遅延する。
+    """
+    state = bone_group_refresh_state
+    if state.scope_depth == 0:
+        refresh_bone_groups(armature, {collider_group_uuid})
+        return
+    state.armature_object_name_to_collider_group_uuids.setdefault(
+        armature.name, set()
+    ).add(collider_group_uuid)
+
+
+def refresh_bone_groups(
+    armature: Object, collider_group_uuids: AbstractSet[str]
+) -> None:
+    """指定したUUIDのコライダーグループを参照しているボーングループだけを更新する."""
+    from ..extension import get_armature_extension
+
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        return
+    secondary_animation = get_armature_extension(armature_data).vrm0.secondary_animation
+    collider_group_uuid_to_name: Optional[dict[str, str]] = None
+    for bone_group in secondary_animation.bone_groups:
+        if not any(
+            collider_group.value.split("#")[-1:][0] in collider_group_uuids
+            for collider_group in bone_group.collider_groups
+        ):
+            continue
+        if collider_group_uuid_to_name is None:
+            collider_group_uuid_to_name = {
+                collider_group.uuid: collider_group.name
+                for collider_group in secondary_animation.collider_groups
+            }
+        bone_group.refresh(armature, collider_group_uuid_to_name)
+
+
 # https://github.com/vrm-c/vrm-specification/blob/f2d8f158297fc883aef9c3071ca68fbe46b03f45/specification/0.0/schema/vrm.secondaryanimation.collidergroup.schema.json
 # https://github.com/vrm-c/UniVRM/blob/v0.91.1/Assets/VRM/Runtime/Format/glTF_VRM_SecondaryAnimation.cs#L21-L29
 class Vrm0SecondaryAnimationColliderGroupPropertyGroup(PropertyGroup):
@@ -732,11 +813,11 @@ class Vrm0SecondaryAnimationColliderGroupPropertyGroup(PropertyGroup):
     )
 
     def refresh(self, armature: Object) -> None:
-        from ..extension import get_armature_extension
-
-        self.name = (
+        name = (
             str(self.node.bone_name) if self.node and self.node.bone_name else ""
         ) + f"#{self.uuid}"
+        if self.name != name:
+            self.name = name
         for index, collider in reversed(
             tuple((index, collider) for index, collider in enumerate(self.colliders))
         ):
@@ -744,13 +825,8 @@ class Vrm0SecondaryAnimationColliderGroupPropertyGroup(PropertyGroup):
                 self.colliders.remove(index)
             else:
                 collider.refresh(armature, self.node.bone_name)
-        armature_data = armature.data
-        if not isinstance(armature_data, Armature):
-            return
-        for bone_group in get_armature_extension(
-            armature_data
-        ).vrm0.secondary_animation.bone_groups:
-            bone_group.refresh(armature)
+        # 名前が変わった可能性があるため、参照しているボーングループも更新する
+        schedule_bone_group_refresh(armature, self.uuid)
 
     # for UI
     show_expanded: BoolProperty()  # type: ignore[valid-type]
@@ -856,17 +932,22 @@ class Vrm0SecondaryAnimationGroupPropertyGroup(PropertyGroup):
     active_bone_index: IntProperty(min=0)  # type: ignore[valid-type]
     active_collider_group_index: IntProperty(min=0)  # type: ignore[valid-type]
 
-    def refresh(self, armature: Object) -> None:
+    def refresh(
+        self,
+        armature: Object,
+        collider_group_uuid_to_name: Optional[Mapping[str, str]] = None,
+    ) -> None:
         from ..extension import get_armature_extension
 
         armature_data = armature.data
         if not isinstance(armature_data, Armature):
             return
-        ext = get_armature_extension(armature_data)
-        collider_group_uuid_to_name = {
-            collider_group.uuid: collider_group.name
-            for collider_group in ext.vrm0.secondary_animation.collider_groups
-        }
+        if collider_group_uuid_to_name is None:
+            ext = get_armature_extension(armature_data)
+            collider_group_uuid_to_name = {
+                collider_group.uuid: collider_group.name
+                for collider_group in ext.vrm0.secondary_animation.collider_groups
+            }
         for index, collider_group in reversed(list(enumerate(self.collider_groups))):
             uuid_str = collider_group.value.split("#")[-1:][0]
             if not uuid_str:
@@ -878,7 +959,8 @@ class Vrm0SecondaryAnimationGroupPropertyGroup(PropertyGroup):
                 self.collider_groups.remove(index)
                 continue
 
-            collider_group.value = name
+            if collider_group.value != name:
+                collider_group.value = name
 
     if TYPE_CHECKING:
         # This code is auto generated.
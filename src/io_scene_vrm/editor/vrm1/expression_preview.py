@@ -0,0 +1,372 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+"""Expressionのプレビュー値の変更を、影響を受けるシェイプキーのみに反映する."""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from sys import float_info
+from typing import TYPE_CHECKING, Optional
+
+from bpy.types import Armature, Context, Mesh, ShapeKey
+
+from ...common.logging import get_logger
+
+if TYPE_CHECKING:
+    from .property_group import (
+        Vrm1ExpressionPropertyGroup,
+        Vrm1ExpressionsPropertyGroup,
+    )
+
+logger = get_logger(__name__)
+
+GROUP_NONE = ""
+GROUP_MOUTH = "mouth"
+GROUP_BLINK = "blink"
+GROUP_LOOK_AT = "look_at"
+
+
+@dataclass(frozen=True)
+class ExpressionState:
+    """グラフの構築に使った値. 変わっていればグラフを作り直す."""
+
+    pointer: int
+    is_binary: bool
+    override_mouth: str
+    override_blink: str
+    override_look_at: str
+    morph_target_bind_count: int
+
+
+@dataclass(frozen=True)
+class ExpressionNode:
+    state: ExpressionState
+    group: str
+    morph_target_bind_mesh_object_names: tuple[str, ...]
+    has_unresolved_morph_target_binds: bool
+    target_indices: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class KeyBlockTarget:
+    shape_key_name: str
+    key_block_name: str
+    key_block_index: int
+
+
+@dataclass
+class ExpressionPreviewGraph:
+    expression_nodes: tuple[ExpressionNode, ...]
+    targets: tuple[KeyBlockTarget, ...]
+    # ターゲットごとの(Expressionのインデックス, ウエイト)の列。全体を再計算していた
+    # ときと同じ結果になるよう、Expressionとバインドの順序で並べる
+    target_contributions: tuple[tuple[tuple[int, float], ...], ...]
+    effective_previews: Optional[list[float]] = None
+    target_values: dict[tuple[str, str], float] = field(default_factory=dict)
+
+
+expression_pointer_to_armature_name: dict[int, str] = {}
+armature_name_to_expression_preview_graph: dict[str, ExpressionPreviewGraph] = {}
+
+
+def clear_expression_preview_graphs() -> None:
+    expression_pointer_to_armature_name.clear()
+    armature_name_to_expression_preview_graph.clear()
+
+
+def read_expression_state(expression: "Vrm1ExpressionPropertyGroup") -> ExpressionState:
+    return ExpressionState(
+        pointer=expression.as_pointer(),
+        is_binary=expression.is_binary,
+        override_mouth=expression.override_mouth,
+        override_blink=expression.override_blink,
+        override_look_at=expression.override_look_at,
+        morph_target_bind_count=len(expression.morph_target_binds),
+    )
+
+
+def find_key_block_target(
+    context: Context, mesh_object_name: str, key_block_name: str
+) -> Optional[KeyBlockTarget]:
+    mesh_object = context.blend_data.objects.get(mesh_object_name)
+    if not mesh_object or mesh_object.type != "MESH":
+        return None
+    mesh = mesh_object.data
+    if not isinstance(mesh, Mesh):
+        return None
+    mesh_shape_keys = mesh.shape_keys
+    if not mesh_shape_keys:
+        return None
+    shape_key = context.blend_data.shape_keys.get(mesh_shape_keys.name)
+    if not shape_key:
+        return None
+    key_blocks = shape_key.key_blocks
+    if not key_blocks:
+        return None
+    key_block_index = key_blocks.find(key_block_name)
+    if key_block_index < 0:
+        return None
+    return KeyBlockTarget(
+        shape_key_name=shape_key.name,
+        key_block_name=key_blocks[key_block_index].name,
+        key_block_index=key_block_index,
+    )
+
+
+def find_key_block(context: Context, target: KeyBlockTarget) -> Optional[ShapeKey]:
+    shape_key = context.blend_data.shape_keys.get(target.shape_key_name)
+    if not shape_key:
+        return None
+    key_blocks = shape_key.key_blocks
+    if not key_blocks:
+        return None
+    if 0 <= target.key_block_index < len(key_blocks):
+        key_block = key_blocks[target.key_block_index]
+        if key_block.name == target.key_block_name:
+            return key_block
+    return key_blocks.get(target.key_block_name)
+
+
+def compile_expression_preview_graph(
+    context: Context,
+    expressions: "Vrm1ExpressionsPropertyGroup",
+    name_to_expression: Mapping[str, "Vrm1ExpressionPropertyGroup"],
+) -> ExpressionPreviewGraph:
+    targets: list[KeyBlockTarget] = []
+    target_name_to_index: dict[tuple[str, str], int] = {}
+    target_contributions: list[list[tuple[int, float]]] = []
+    expression_nodes: list[ExpressionNode] = []
+    for expression_index, (name, expression) in enumerate(name_to_expression.items()):
+        if expressions.preset.is_mouth_expression(name):
+            group = GROUP_MOUTH
+        elif expressions.preset.is_blink_expression(name):
+            group = GROUP_BLINK
+        elif expressions.preset.is_look_at_expression(name):
+            group = GROUP_LOOK_AT
+        else:
+            group = GROUP_NONE
+
+        mesh_object_names: list[str] = []
+        has_unresolved_morph_target_binds = False
+        target_indices: list[int] = []
+        for morph_target_bind in expression.morph_target_binds:
+            mesh_object_name = morph_target_bind.node.mesh_object_name
+            mesh_object_names.append(mesh_object_name)
+            target = find_key_block_target(
+                context, mesh_object_name, morph_target_bind.index
+            )
+            if target is None:
+                has_unresolved_morph_target_binds = True
+                continue
+            target_name = (target.shape_key_name, target.key_block_name)
+            target_index = target_name_to_index.get(target_name)
+            if target_index is None:
+                target_index = len(targets)
+                target_name_to_index[target_name] = target_index
+                targets.append(target)
+                target_contributions.append([])
+            target_contributions[target_index].append(
+                (expression_index, morph_target_bind.weight)
+            )
+            target_indices.append(target_index)
+
+        expression_nodes.append(
+            ExpressionNode(
+                state=read_expression_state(expression),
+                group=group,
+                morph_target_bind_mesh_object_names=tuple(mesh_object_names),
+                has_unresolved_morph_target_binds=has_unresolved_morph_target_binds,
+                target_indices=tuple(dict.fromkeys(target_indices)),
+            )
+        )
+
+    return ExpressionPreviewGraph(
+        expression_nodes=tuple(expression_nodes),
+        targets=tuple(targets),
+        target_contributions=tuple(
+            tuple(contributions) for contributions in target_contributions
+        ),
+    )
+
+
+def is_expression_preview_graph_outdated(
+    context: Context,
+    graph: ExpressionPreviewGraph,
+    expressions: Sequence["Vrm1ExpressionPropertyGroup"],
+    triggered_pointer: int,
+) -> bool:
+    if len(graph.expression_nodes) != len(expressions):
+        return True
+    for expression_node, expression in zip(graph.expression_nodes, expressions):
+        if expression_node.state != read_expression_state(expression):
+            return True
+        if expression_node.state.pointer != triggered_pointer:
+            continue
+        # 変更されたExpressionについてのみ、バインド先のオブジェクトが変わっていないか
+        # と、解決できなかったバインドが解決できるようになっていないかを確認する
+        for mesh_object_name, morph_target_bind in zip(
+            expression_node.morph_target_bind_mesh_object_names,
+            expression.morph_target_binds,
+        ):
+            if mesh_object_name != morph_target_bind.node.mesh_object_name:
+                return True
+            if (
+                expression_node.has_unresolved_morph_target_binds
+                and find_key_block_target(
+                    context, mesh_object_name, morph_target_bind.index
+                )
+            ):
+                return True
+    return False
+
+
+def compute_effective_previews(
+    graph: ExpressionPreviewGraph,
+    expressions: Sequence["Vrm1ExpressionPropertyGroup"],
+) -> list[float]:
+    previews = [expression.preview for expression in expressions]
+
+    mouth_block_rate = 0.0
+    blink_block_rate = 0.0
+    look_at_block_rate = 0.0
+    for expression_node, preview in zip(graph.expression_nodes, previews):
+        if preview < float_info.epsilon:
+            continue
+
+        state = expression_node.state
+        if state.override_mouth == "blend":
+            mouth_block_rate += preview
+        if state.override_blink == "blend":
+            blink_block_rate += preview
+        if state.override_look_at == "blend":
+            look_at_block_rate += preview
+
+        if state.override_mouth == "block":
+            mouth_block_rate = 1.0
+        if state.override_blink == "block":
+            blink_block_rate = 1.0
+        if state.override_look_at == "block":
+            look_at_block_rate = 1.0
+
+    group_to_blend_factor: dict[str, float] = {
+        GROUP_MOUTH: max(0, min(1 - mouth_block_rate, 1)),
+        GROUP_BLINK: max(0, min(1 - blink_block_rate, 1)),
+        GROUP_LOOK_AT: max(0, min(1 - look_at_block_rate, 1)),
+    }
+
+    effective_previews: list[float] = []
+    for expression_node, preview in zip(graph.expression_nodes, previews):
+        if expression_node.state.is_binary:
+            effective_preview = 0.0 if preview < float_info.epsilon else 1.0
+        else:
+            effective_preview = preview
+        blend_factor = group_to_blend_factor.get(expression_node.group)
+        if blend_factor is not None:
+            effective_preview *= blend_factor
+        effective_previews.append(effective_preview)
+    return effective_previews
+
+
+def find_owner_armature(
+    context: Context, triggered_expression: "Vrm1ExpressionPropertyGroup"
+) -> Optional[tuple[Armature, Mapping[str, "Vrm1ExpressionPropertyGroup"]]]:
+    from .property_group import get_armature_vrm1_extension
+
+    pointer = triggered_expression.as_pointer()
+    for rebuild in [False, True]:
+        if rebuild:
+            expression_pointer_to_armature_name.clear()
+            for search_armature in context.blend_data.armatures:
+                expressions = get_armature_vrm1_extension(search_armature).expressions
+                for expression in expressions.all_name_to_expression_dict().values():
+                    expression_pointer_to_armature_name[expression.as_pointer()] = (
+                        search_armature.name
+                    )
+
+        armature_name = expression_pointer_to_armature_name.get(pointer)
+        if armature_name is None:
+            continue
+        armature = context.blend_data.armatures.get(armature_name)
+        if armature is None:
+            continue
+        # アンドゥなどでポインタが再利用されていないか確認する
+        name_to_expression = get_armature_vrm1_extension(
+            armature
+        ).expressions.all_name_to_expression_dict()
+        if any(
+            expression.as_pointer() == pointer
+            for expression in name_to_expression.values()
+        ):
+            return armature, name_to_expression
+    return None
+
+
+def update_expression_previews(
+    context: Context, triggered_expression: "Vrm1ExpressionPropertyGroup"
+) -> None:
+    """プレビュー値が変わったExpressionの影響を受けるシェイプキーのみを更新する.
+
+    Armatureごとにバインド先のキーブロックを解決済みのグラフを保持しておき、
+    実効値が変化したExpressionのバインド先のみを再計算する。
+    """
+    from .property_group import (
+        Vrm1ExpressionPropertyGroup,
+        get_armature_vrm1_extension,
+    )
+
+    owner = find_owner_armature(context, triggered_expression)
+    if owner is None:  # This is getting triggered after importing VRMA files
+        logger.error("No armature for %s", triggered_expression.name)
+        return
+    armature, name_to_expression = owner
+    expressions = list(name_to_expression.values())
+
+    graph = armature_name_to_expression_preview_graph.get(armature.name)
+    if graph is None or is_expression_preview_graph_outdated(
+        context, graph, expressions, triggered_expression.as_pointer()
+    ):
+        graph = compile_expression_preview_graph(
+            context,
+            get_armature_vrm1_extension(armature).expressions,
+            name_to_expression,
+        )
+        armature_name_to_expression_preview_graph[armature.name] = graph
+
+    effective_previews = compute_effective_previews(graph, expressions)
+    previous_effective_previews = graph.effective_previews
+    graph.effective_previews = effective_previews
+    if previous_effective_previews is None:
+        target_indices: Sequence[int] = range(len(graph.targets))
+    else:
+        target_indices = sorted(
+            {
+                target_index
+                for expression_node, effective_preview, previous_effective_preview in (
+                    zip(
+                        graph.expression_nodes,
+                        effective_previews,
+                        previous_effective_previews,
+                    )
+                )
+                if effective_preview != previous_effective_preview
+                for target_index in expression_node.target_indices
+            }
+        )
+
+    for target_index in target_indices:
+        value = 0.0
+        for expression_index, weight in graph.target_contributions[target_index]:
+            value += weight * effective_previews[expression_index]
+
+        target = graph.targets[target_index]
+        target_name = (target.shape_key_name, target.key_block_name)
+        key_block = find_key_block(context, target)
+        if not key_block:
+            # 次回はグラフを作り直す
+            graph.target_values.pop(target_name, None)
+            armature_name_to_expression_preview_graph.pop(armature.name, None)
+            continue
+        key_block.value = value
+        graph.target_values[target_name] = value
+
+    Vrm1ExpressionPropertyGroup.frame_change_post_shape_key_updates.update(
+        graph.target_values
+    )
@@ -8,6 +8,7 @@ from mathutils import Vector
 
 from ...common.logging import get_logger
 from ..extension import get_armature_extension
+from ..shape_key import apply_key_block_values
 from .property_group import Vrm1ExpressionPropertyGroup, Vrm1LookAtPropertyGroup
 
 logger = get_logger(__name__)
@@ -22,20 +23,9 @@ def frame_change_pre(_unused: object) -> None:
 def frame_change_post(_unused: object) -> None:
     context = bpy.context
 
-    for (
-        shape_key_name,
-        key_block_name,
-    ), value in Vrm1ExpressionPropertyGroup.frame_change_post_shape_key_updates.items():
-        shape_key = context.blend_data.shape_keys.get(shape_key_name)
-        if not shape_key:
-            continue
-        key_blocks = shape_key.key_blocks
-        if not key_blocks:
-            continue
-        key_block = key_blocks.get(key_block_name)
-        if not key_block:
-            continue
-        key_block.value = value
+    apply_key_block_values(
+        context, Vrm1ExpressionPropertyGroup.frame_change_post_shape_key_updates
+    )
     Vrm1ExpressionPropertyGroup.frame_change_post_shape_key_updates.clear()
 
     # Update materials
@@ -25,7 +25,6 @@ from bpy.types import (
     Context,
     Image,
     Material,
-    Mesh,
     Object,
     PropertyGroup,
 )
@@ -40,11 +39,16 @@ from ...common.vrm1.human_bone import (
 )
 from ..property_group import (
     BonePropertyGroup,
+    BoneTreeIndex,
     MaterialPropertyGroup,
     MeshObjectPropertyGroup,
     StringPropertyGroup,
     property_group_enum,
 )
+from .expression_preview import (
+    clear_expression_preview_graphs,
+    update_expression_previews,
+)
 
 if TYPE_CHECKING:
     from ..property_group import CollectionPropertyProtocol
@@ -69,22 +73,15 @@ class Vrm1HumanBonePropertyGroup(PropertyGroup):
         armature_data: Armature,
         target: HumanBoneSpecification,
         bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
     ) -> None:
-        new_candidates = BonePropertyGroup.find_bone_candidates(
+        BonePropertyGroup.update_node_candidates(
+            self.node_candidates,
             armature_data,
             target,
             bpy_bone_name_to_human_bone_specification,
+            bone_tree_index,
         )
-        if {n.value for n in self.node_candidates} == new_candidates:
-            return
-
-        self.node_candidates.clear()
-        # Preserving list order
-        for bone_name in armature_data.bones.keys():
-            if bone_name not in new_candidates:
-                continue
-            candidate = self.node_candidates.add()
-            candidate.value = bone_name
 
     if TYPE_CHECKING:
         # This code is auto generated.
@@ -467,6 +464,7 @@ class Vrm1HumanBonesPropertyGroup(PropertyGroup):
             if human_bone.node.bone_name
         }
 
+        bone_tree_index = BoneTreeIndex.create(armature_data)
         for (
             human_bone_name,
             human_bone,
@@ -475,6 +473,7 @@ class Vrm1HumanBonesPropertyGroup(PropertyGroup):
                 armature_data,
                 HumanBoneSpecifications.get(human_bone_name),
                 bpy_bone_name_to_human_bone_specification,
+                bone_tree_index,
             )
 
     if TYPE_CHECKING:
@@ -1001,15 +1000,20 @@ class Vrm1FirstPersonPropertyGroup(PropertyGroup):
 
 # https://github.com/vrm-c/vrm-specification/blob/6fb6baaf9b9095a84fb82c8384db36e1afeb3558/specification/VRMC_vrm-1.0-beta/schema/VRMC_vrm.expressions.expression.morphTargetBind.schema.json
 class Vrm1MorphTargetBindPropertyGroup(PropertyGroup):
+    def update_expression_preview_graphs(self, _context: Context) -> None:
+        clear_expression_preview_graphs()
+
     node: PointerProperty(  # type: ignore[valid-type]
         type=MeshObjectPropertyGroup
     )
     index: StringProperty(  # type: ignore[valid-type]
+        update=update_expression_preview_graphs,
     )
     weight: FloatProperty(  # type: ignore[valid-type]
         min=0,
         default=1,
         max=1,
+        update=update_expression_preview_graphs,
     )
 
     if TYPE_CHECKING:
@@ -1144,125 +1148,7 @@ class Vrm1ExpressionPropertyGroup(PropertyGroup):
             logger.debug("Unnamed expression: %s", type(triggered_expression))
             return
 
-        armature: Optional[Armature] = None
-        for search_armature in context.blend_data.armatures:
-            ext = get_armature_vrm1_extension(search_armature)
-            if (
-                triggered_expression
-                == ext.expressions.all_name_to_expression_dict().get(
-                    triggered_expression.name
-                )
-            ):
-                armature = search_armature
-                break
-
-        if not armature:  # This is getting triggered after importing VRMA files
-            logger.error("No armature for %s", triggered_expression.name)
-            return
-
-        expressions = get_armature_vrm1_extension(armature).expressions
-        name_to_expression_dict = expressions.all_name_to_expression_dict()
-
-        mouth_block_rate = 0.0
-        blink_block_rate = 0.0
-        look_at_block_rate = 0.0
-        for expression in name_to_expression_dict.values():
-            if expression.preview < float_info.epsilon:
-                continue
-
-            if expression.override_mouth == "blend":
-                mouth_block_rate += expression.preview
-            if expression.override_blink == "blend":
-                blink_block_rate += expression.preview
-            if expression.override_look_at == "blend":
-                look_at_block_rate += expression.preview
-
-            if expression.override_mouth == "block":
-                mouth_block_rate = 1.0
-            if expression.override_blink == "block":
-                blink_block_rate = 1.0
-            if expression.override_look_at == "block":
-                look_at_block_rate = 1.0
-
-        mouth_blend_factor = max(0, min(1 - mouth_block_rate, 1))
-        blink_blend_factor = max(0, min(1 - blink_block_rate, 1))
-        look_at_blend_factor = max(0, min(1 - look_at_block_rate, 1))
-
-        shape_key_name_and_key_block_name_to_value: dict[tuple[str, str], float] = {}
-        for name, expression in name_to_expression_dict.items():
-            if expression.is_binary:
-                preview = 0.0 if expression.preview < float_info.epsilon else 1.0
-            else:
-                preview = expression.preview
-
-            if expressions.preset.is_mouth_expression(name):
-                preview *= mouth_blend_factor
-            elif expressions.preset.is_blink_expression(name):
-                preview *= blink_blend_factor
-            elif expressions.preset.is_look_at_expression(name):
-                preview *= look_at_blend_factor
-
-            for texture_transform_bind in expression.texture_transform_binds:
-                material = texture_transform_bind.material
-                if not material:
-                    continue
-
-            for material_color_bind in expression.material_color_binds:
-                material = material_color_bind.material
-                if not material:
-                    continue
-
-            for morph_target_bind in expression.morph_target_binds:
-                mesh_object = context.blend_data.objects.get(
-                    morph_target_bind.node.mesh_object_name
-                )
-                if not mesh_object or mesh_object.type != "MESH":
-                    continue
-                mesh = mesh_object.data
-                if not isinstance(mesh, Mesh):
-                    continue
-                mesh_shape_keys = mesh.shape_keys
-                if not mesh_shape_keys:
-                    continue
-                shape_key = context.blend_data.shape_keys.get(mesh_shape_keys.name)
-                if not shape_key:
-                    continue
-                key_blocks = shape_key.key_blocks
-                if not key_blocks:
-                    continue
-                key_block = key_blocks.get(morph_target_bind.index)
-                if not key_block:
-                    continue
-
-                value = morph_target_bind.weight * preview
-                shape_key_name_and_key_block_name = (shape_key.name, key_block.name)
-                shape_key_name_and_key_block_name_to_value[
-                    shape_key_name_and_key_block_name
-                ] = (
-                    shape_key_name_and_key_block_name_to_value.get(
-                        shape_key_name_and_key_block_name, 0.0
-                    )
-                    + value
-                )
-
-        for (
-            shape_key_name,
-            key_block_name,
-        ), value in shape_key_name_and_key_block_name_to_value.items():
-            shape_key = context.blend_data.shape_keys.get(shape_key_name)
-            if not shape_key:
-                continue
-            key_blocks = shape_key.key_blocks
-            if not key_blocks:
-                continue
-            key_block = key_blocks.get(key_block_name)
-            if not key_block:
-                continue
-            key_block.value = value
-
-        Vrm1ExpressionPropertyGroup.frame_change_post_shape_key_updates.update(
-            shape_key_name_and_key_block_name_to_value
-        )
+        update_expression_previews(context, triggered_expression)
 
     override_blink: EnumProperty(  # type: ignore[valid-type]
         name="Override Blink",
@@ -12,6 +12,7 @@ from bpy.types import Armature, Context, Mesh, NodesModifier, Object
 from ..common import shader
 from ..common.convert import Json
 from ..common.deep import make_json
+from ..common.gltf import Glb
 from ..common.logging import get_logger
 from ..editor.extension import get_armature_extension, get_material_extension
 from ..editor.search import MESH_CONVERTIBLE_OBJECT_TYPES
@@ -43,7 +44,7 @@ class AbstractBaseVrmExporter(ABC):
             raise TypeError(message)
 
     @abstractmethod
-    def export_vrm(self) -> Optional[bytes]:
+    def export_vrm(self) -> Optional[Glb]:
         pass
 
     @contextmanager
@@ -19,6 +19,7 @@ from bpy.types import (
 from bpy_extras.io_utils import ExportHelper
 
 from ..common import ops, version
+from ..common.gltf import write_glb
 from ..common.logging import get_logger
 from ..common.preferences import (
     ExportPreferencesProtocol,
@@ -248,66 +249,68 @@ def export_vrm(
     *,
     armature_object_name: str,
 ) -> set[str]:
-    if ops.vrm.model_validate(
-        "INVOKE_DEFAULT",
-        show_successful_message=False,
-        armature_object_name=armature_object_name,
-    ) != {"FINISHED"}:
-        return {"CANCELLED"}
-
-    export_objects = search.export_objects(
-        context,
-        armature_object_name,
-        export_invisibles=export_preferences.export_invisibles,
-        export_only_selections=export_preferences.export_only_selections,
-        export_lights=export_preferences.export_lights,
-    )
-
-    armature_object: Optional[Object] = next(
-        (obj for obj in export_objects if obj.type == "ARMATURE"), None
-    )
-    is_vrm1 = False
+    with search.use_export_constraints_cache():
+        if ops.vrm.model_validate(
+            "INVOKE_DEFAULT",
+            show_successful_message=False,
+            armature_object_name=armature_object_name,
+        ) != {"FINISHED"}:
+            return {"CANCELLED"}
 
-    with save_workspace(
-        context,
-        # アクティブオブジェクト変更しても元に戻せるようにする
-        armature_object,
-    ):
-        if armature_object:
-            armature_object_is_temporary = False
-            armature_data = armature_object.data
-            if isinstance(armature_data, Armature):
-                is_vrm1 = get_armature_extension(armature_data).is_vrm1()
-        else:
-            armature_object_is_temporary = True
-            ops.icyp.make_basic_armature("EXEC_DEFAULT")
-            armature_object = context.view_layer.objects.active
-            if not armature_object or armature_object.type != "ARMATURE":
-                message = "Failed to generate temporary armature"
-                raise RuntimeError(message)
+        export_objects = search.export_objects(
+            context,
+            armature_object_name,
+            export_invisibles=export_preferences.export_invisibles,
+            export_only_selections=export_preferences.export_only_selections,
+            export_lights=export_preferences.export_lights,
+        )
 
-        migration.migrate(context, armature_object.name)
+        armature_object: Optional[Object] = next(
+            (obj for obj in export_objects if obj.type == "ARMATURE"), None
+        )
+        is_vrm1 = False
 
-        if is_vrm1:
-            vrm_exporter: AbstractBaseVrmExporter = Vrm1Exporter(
-                context,
-                export_objects,
-                armature_object,
-                export_all_influences=export_preferences.export_all_influences,
-                export_lights=export_preferences.export_lights,
-            )
-        else:
-            vrm_exporter = Vrm0Exporter(
-                context,
-                export_objects,
-                armature_object,
-            )
+        with save_workspace(
+            context,
+            # アクティブオブジェクト変更しても元に戻せるようにする
+            armature_object,
+        ):
+            if armature_object:
+                armature_object_is_temporary = False
+                armature_data = armature_object.data
+                if isinstance(armature_data, Armature):
+                    is_vrm1 = get_armature_extension(armature_data).is_vrm1()
+            else:
+                armature_object_is_temporary = True
+                ops.icyp.make_basic_armature("EXEC_DEFAULT")
+                armature_object = context.view_layer.objects.active
+                if not armature_object or armature_object.type != "ARMATURE":
+                    message = "Failed to generate temporary armature"
+                    raise RuntimeError(message)
+
+            migration.migrate(context, armature_object.name)
+
+            if is_vrm1:
+                vrm_exporter: AbstractBaseVrmExporter = Vrm1Exporter(
+                    context,
+                    export_objects,
+                    armature_object,
+                    export_all_influences=export_preferences.export_all_influences,
+                    export_lights=export_preferences.export_lights,
+                )
+            else:
+                vrm_exporter = Vrm0Exporter(
+                    context,
+                    export_objects,
+                    armature_object,
+                )
 
-        vrm_bytes = vrm_exporter.export_vrm()
-        if vrm_bytes is None:
-            return {"CANCELLED"}
+            vrm_glb = vrm_exporter.export_vrm()
+            if vrm_glb is None:
+                return {"CANCELLED"}
 
-    Path(filepath).write_bytes(vrm_bytes)
+    with Path(filepath).open("wb") as file:
+        write_glb(file, vrm_glb.json_dict, vrm_glb.bin_chunk_segments)
 
     if armature_object_is_temporary:
         if armature_object.users <= 1:
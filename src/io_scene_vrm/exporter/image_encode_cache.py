@@ -0,0 +1,261 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+"""エクスポート時の画像のエンコード結果を、ディスク上にキャッシュする.
+
+画像のエンコードはBlenderのAPIを利用するためメインスレッドで行う必要がある。
+そのためスレッドプールでは、画素のハッシュ値の計算とキャッシュファイルの読み書きを行う。
+"""
+
+import hashlib
+import os
+import secrets
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Optional
+
+import bpy
+import numpy as np
+from bpy.types import Context, Image
+
+from ..common.logging import get_logger
+from ..common.preferences import addon_package_name, get_preferences
+from ..external import io_scene_gltf2_support
+from ..external.io_scene_gltf2_support import (
+    get_image_mime_type,
+    image_to_image_bytes,
+)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+logger = get_logger(__name__)
+
+CACHE_FORMAT_VERSION: Final = 1
+CACHE_FILE_SUFFIX: Final = ".bin"
+MAX_CACHE_SIZE: Final = 512 * 1024 * 1024
+MAX_WORKERS: Final = 4
+
+
+def get_cache_dir() -> Optional[Path]:
+    try:
+        if bpy.app.version >= (4, 2) and addon_package_name.startswith("bl_ext."):
+            return Path(
+                bpy.utils.extension_path_user(
+                    addon_package_name, path="image_encode_cache", create=True
+                )
+            )
+        return Path(
+            bpy.utils.user_resource(
+                "DATAFILES",
+                path=str(Path("io_scene_vrm") / "image_encode_cache"),
+                create=True,
+            )
+        )
+    except (OSError, ValueError):
+        logger.exception("Failed to create the image encode cache directory")
+        return None
+
+
+def can_use_original_file(image: Image) -> bool:
+    """glTFアドオンがエンコードせずに元のファイルを使う条件かどうかを調べる."""
+    if image.source not in ["FILE", "SEQUENCE"] or image.is_dirty:
+        return False
+    if image.packed_file is not None:
+        return True
+    return Path(bpy.path.abspath(image.filepath_raw)).is_file()
+
+
+def create_cache_key_prefix(
+    image: Image, mime_type: str, export_settings: dict[str, object]
+) -> bytes:
+    """画素以外でエンコード結果に影響する設定を、キャッシュのキーに含める."""
+    return repr(
+        (
+            CACHE_FORMAT_VERSION,
+            tuple(bpy.app.version),
+            io_scene_gltf2_support.get_addon_version(),
+            image.name,
+            tuple(image.size),
+            image.channels,
+            image.is_float,
+            image.alpha_mode,
+            image.colorspace_settings.name,
+            mime_type,
+            export_settings.get("gltf_image_quality"),
+            export_settings.get("gltf_jpeg_quality"),
+        )
+    ).encode()
+
+
+def read_pixels(image: Image) -> "Optional[NDArray[np.float32]]":
+    width, height = image.size
+    pixel_count = int(width) * int(height) * image.channels
+    if pixel_count <= 0:
+        return None
+    pixels = np.empty(pixel_count, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels
+
+
+def find_cache(
+    cache_dir: Path, key_prefix: bytes, pixels: "NDArray[np.float32]"
+) -> tuple[Path, Optional[bytes]]:
+    """キャッシュファイルのパスと、キャッシュされたバイト列を返す.
+
+    スレッドプールで実行される。hashlibは大きなバッファのハッシュ値計算中にGILを解放する。
+    """
+    hash_object = hashlib.blake2b(key_prefix, digest_size=32)
+    hash_object.update(pixels.data)
+    path = cache_dir / (hash_object.hexdigest() + CACHE_FILE_SUFFIX)
+    try:
+        image_bytes = path.read_bytes()
+    except OSError:
+        return path, None
+    try:
+        # LRUで削除するため、最終利用日時として更新日時を更新する
+        os.utime(path)
+    except OSError:
+        logger.exception("Failed to update the modification time of %s", path)
+    return path, image_bytes
+
+
+def write_cache(path: Path, image_bytes: bytes) -> None:
+    temp_path = path.with_name(path.name + "." + secrets.token_hex(8) + ".tmp")
+    try:
+        temp_path.write_bytes(image_bytes)
+        temp_path.replace(path)
+    except OSError:
+        logger.exception("Failed to write the image encode cache %s", path)
+        temp_path.unlink(missing_ok=True)
+
+
+def evict_cache(cache_dir: Path, max_cache_size: int) -> None:
+    """最終利用日時が古い順にキャッシュファイルを削除し、合計サイズを制限内に収める."""
+    try:
+        entries: list[tuple[float, int, Path]] = []
+        for path in cache_dir.iterdir():
+            if path.suffix != CACHE_FILE_SUFFIX:
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        logger.exception("Failed to list the image encode cache %s", cache_dir)
+        return
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_cache_size:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            logger.exception("Failed to remove the image encode cache %s", path)
+            continue
+        total_size -= size
+
+
+class ImageEncodeSession:
+    """エクスポート1回分の、スレッドプールとキャッシュの書き込み状況を保持する."""
+
+    def __init__(self, executor: ThreadPoolExecutor, cache_dir: Optional[Path]) -> None:
+        self.executor = executor
+        self.cache_dir = cache_dir
+        self.write_futures: list[Future[None]] = []
+
+    def encode_images(
+        self, images: Sequence[Image], export_settings: dict[str, object]
+    ) -> list[tuple[bytes, str]]:
+        results: list[Optional[tuple[bytes, str]]] = [None] * len(images)
+        cache_dir = self.cache_dir
+        pending: deque[tuple[int, Future[tuple[Path, Optional[bytes]]]]] = deque()
+
+        def resolve(index: int, future: Future[tuple[Path, Optional[bytes]]]) -> None:
+            image = images[index]
+            mime_type = get_image_mime_type(image)
+            path, image_bytes = future.result()
+            if image_bytes is None:
+                image_bytes, mime_type = image_to_image_bytes(image, export_settings)
+                self.write_futures.append(
+                    self.executor.submit(write_cache, path, image_bytes)
+                )
+            results[index] = (image_bytes, mime_type)
+
+        for index, image in enumerate(images):
+            if cache_dir is None or can_use_original_file(image):
+                results[index] = image_to_image_bytes(image, export_settings)
+                continue
+            pixels = read_pixels(image)
+            if pixels is None:
+                results[index] = image_to_image_bytes(image, export_settings)
+                continue
+            key_prefix = create_cache_key_prefix(
+                image, get_image_mime_type(image), export_settings
+            )
+            pending.append(
+                (index, self.executor.submit(find_cache, cache_dir, key_prefix, pixels))
+            )
+            # 画素のバッファを保持しすぎないよう、同時に処理する数を制限する
+            while len(pending) > MAX_WORKERS:
+                resolve(*pending.popleft())
+
+        while pending:
+            resolve(*pending.popleft())
+
+        encoded_images: list[tuple[bytes, str]] = []
+        for image, result in zip(images, results):
+            if result is None:
+                message = f"Image {image.name} is not encoded"
+                raise AssertionError(message)
+            encoded_images.append(result)
+        return encoded_images
+
+
+@dataclass
+class State:
+    session: Optional[ImageEncodeSession] = None
+
+
+state = State()
+
+
+@contextmanager
+def image_encode_session(context: Context) -> Iterator[ImageEncodeSession]:
+    """エクスポート中のencode_images()で、スレッドプールを共有する.
+
+    キャッシュの削除はセッションの終了時に一度だけ行う。
+    """
+    if state.session is not None:
+        yield state.session
+        return
+
+    cache_dir = None
+    if get_preferences(context).enable_image_encode_cache:
+        cache_dir = get_cache_dir()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        session = ImageEncodeSession(executor, cache_dir)
+        state.session = session
+        try:
+            yield session
+        finally:
+            state.session = None
+            for write_future in session.write_futures:
+                write_future.result()
+
+    if cache_dir is not None and session.write_futures:
+        evict_cache(cache_dir, MAX_CACHE_SIZE)
+
+
+def encode_images(
+    images: Sequence[Image], export_settings: dict[str, object]
+) -> list[tuple[bytes, str]]:
+    """画像をエンコードし、(バイト列, MIMEタイプ)のリストを画像と同じ順番で返す.
+
+    画素とエンコード設定が同一であれば、以前のエクスポート時のエンコード結果を再利用する。
+    image_encode_session()の外で呼ばれた場合は、呼び出しごとにセッションを作る。
+    """
+    with image_encode_session(bpy.context) as session:
+        return session.encode_images(images, export_settings)
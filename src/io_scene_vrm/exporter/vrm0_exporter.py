@@ -3,26 +3,28 @@
 
 import importlib
 import itertools
+import json
 import re
 import statistics
 import struct
 from collections.abc import Iterator, Mapping, MutableSequence, Sequence
 from contextlib import contextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from os import environ
 from sys import float_info
-from typing import Final, Optional, Union
+from typing import TYPE_CHECKING, Optional, TypeVar, Union
 
 import bpy
+import numpy as np
 from bpy.types import (
     Armature,
+    ArmatureModifier,
     Context,
     Curve,
     Image,
     Key,
     Material,
     Mesh,
-    MeshUVLoopLayer,
     Node,
     Object,
     PoseBone,
@@ -47,10 +49,6 @@ from ..common.gl import (
     GL_UNSIGNED_INT,
     GL_UNSIGNED_SHORT,
 )
-from ..common.gltf import (
-    FLOAT_NEGATIVE_MAX,
-    FLOAT_POSITIVE_MAX,
-)
 from ..common.legacy_gltf import TEXTURE_INPUT_NAMES
 from ..common.logging import get_logger
 from ..common.mtoon_unversioned import MtoonUnversioned
@@ -70,19 +68,58 @@ from ..editor.mtoon1.property_group import (
 from ..editor.search import MESH_CONVERTIBLE_OBJECT_TYPES
 from ..editor.t_pose import setup_humanoid_t_pose
 from ..editor.vrm0.property_group import Vrm0BlendShapeGroupPropertyGroup
-from ..external import io_scene_gltf2_support
-from ..external.io_scene_gltf2_support import (
-    image_to_image_bytes,
-    init_extras_export,
-)
+from ..external.io_scene_gltf2_support import init_extras_export
 from .abstract_base_vrm_exporter import (
     AbstractBaseVrmExporter,
     assign_dict,
     force_apply_modifiers,
 )
+from .image_encode_cache import encode_images, image_encode_session
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 logger = get_logger(__name__)
 
+FloatNDArray = TypeVar("FloatNDArray", "NDArray[np.float32]", "NDArray[np.float64]")
+
+
+def axis_blender_to_gltf_vectors(vectors: FloatNDArray) -> FloatNDArray:
+    gltf_vectors = vectors[:, (0, 2, 1)]
+    gltf_vectors[:, 0] = -gltf_vectors[:, 0]
+    return gltf_vectors
+
+
+def read_loop_triangle_normals(
+    mesh_data: Mesh,
+) -> "tuple[NDArray[np.int32], NDArray[np.float32]]":
+    """Read vertex indices and split normals of all triangle corners."""
+    loop_triangles = mesh_data.loop_triangles
+    vertex_indices = np.empty(len(loop_triangles) * 3, dtype=np.int32)
+    loop_triangles.foreach_get("vertices", vertex_indices)
+    normals = np.empty(len(loop_triangles) * 9, dtype=np.float32)
+    loop_triangles.foreach_get("split_normals", normals)
+    return vertex_indices, normals.reshape(-1, 3)
+
+
+def find_or_append_dict(
+    dicts: list[dict[str, Json]],
+    dict_key_to_index: dict[str, int],
+    dict_to_find: dict[str, Json],
+) -> int:
+    """dictsからdict_to_findと等しい要素のインデックスを返す。無ければ末尾に追加する.
+
+    dict_key_to_indexはdictsの要素のJSON文字列からインデックスを引くためのもの。
+    """
+    dict_key = json.dumps(dict_to_find, sort_keys=True)
+    index = dict_key_to_index.get(dict_key)
+    if index is not None and 0 <= index < len(dicts) and dicts[index] == dict_to_find:
+        return index
+    index = len(dicts)
+    dicts.append(dict_to_find)
+    dict_key_to_index[dict_key] = index
+    return index
+
 
 class Vrm0Exporter(AbstractBaseVrmExporter):
     @dataclass(frozen=True)
@@ -92,144 +129,38 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         image_bytes: bytes
         export_image_index: int
 
-    @dataclass
+    @dataclass(frozen=True)
     class PrimitiveTarget:
         name: str
+        position: "NDArray[np.float32]"
+        position_min: list[float]
+        position_max: list[float]
+        normal: "NDArray[np.float32]"
 
-        position: bytearray = field(default_factory=bytearray)
-        position_max_x = FLOAT_NEGATIVE_MAX
-        position_min_x = FLOAT_POSITIVE_MAX
-        position_max_y = FLOAT_NEGATIVE_MAX
-        position_min_y = FLOAT_POSITIVE_MAX
-        position_max_z = FLOAT_NEGATIVE_MAX
-        position_min_z = FLOAT_POSITIVE_MAX
-
-        normal: bytearray = field(default_factory=bytearray)
-
+    @dataclass(frozen=True)
     class VertexAttributeAndTargets:
-        POSITION_STRUCT: Final = struct.Struct("<fff")
-        NORMAL_STRUCT: Final = struct.Struct("<fff")
-        TEXCOORD_STRUCT: Final = struct.Struct("<ff")
-        WEIGHTS_STRUCT: Final = struct.Struct("<ffff")
-        JOINTS_STRUCT: Final = struct.Struct("<HHHH")
-
-        IndexSearchKey = tuple[
-            int, tuple[float, float, float], Optional[tuple[float, float]]
-        ]
-
-        def __init__(self, target_names: Sequence[str]) -> None:
-            self.targets = [
-                Vrm0Exporter.PrimitiveTarget(name=target_name)
-                for target_name in target_names
-            ]
-
-            self.count = 0
-
-            self.position = bytearray()
-            self.position_max_x = FLOAT_NEGATIVE_MAX
-            self.position_min_x = FLOAT_POSITIVE_MAX
-            self.position_max_y = FLOAT_NEGATIVE_MAX
-            self.position_min_y = FLOAT_POSITIVE_MAX
-            self.position_max_z = FLOAT_NEGATIVE_MAX
-            self.position_min_z = FLOAT_POSITIVE_MAX
-
-            self.normal = bytearray()
-            self.texcoord = bytearray()
-            self.weights = bytearray()
-            self.joints = bytearray()
-
-            self.index_search_dict: dict[
-                tuple[int, tuple[float, float, float], Optional[tuple[float, float]]],
-                int,
-            ] = {}
-
-        @staticmethod
-        def create_index_search_key(
-            *,
-            blender_vertex_index: int,
-            normal: tuple[float, float, float],
-            texcoord: Optional[tuple[float, float]],
-        ) -> IndexSearchKey:
-            return (
-                # TODO: 旧エクスポーターと互換性のある形式
-                blender_vertex_index,
-                normal,
-                texcoord,
-            )
-
-        def find_added_vertex_index(
-            self,
-            blender_vertex_index: int,
-            normal: tuple[float, float, float],
-            texcoord: Optional[tuple[float, float]],
-        ) -> Optional[int]:
-            index_search_key = self.create_index_search_key(
-                blender_vertex_index=blender_vertex_index,
-                normal=normal,
-                texcoord=texcoord,
-            )
-            return self.index_search_dict.get(index_search_key)
-
-        def add_vertex(
-            self,
-            *,
-            blender_vertex_index: int,
-            position: tuple[float, float, float],
-            normal: tuple[float, float, float],
-            texcoord: Optional[tuple[float, float]],
-            weights: Optional[tuple[float, float, float, float]],
-            joints: Optional[tuple[int, int, int, int]],
-            targets_position: Sequence[tuple[float, float, float]],
-            targets_normal: Sequence[tuple[float, float, float]],
-        ) -> int:
-            index = self.count
-            self.count += 1
-
-            index_search_key = self.create_index_search_key(
-                blender_vertex_index=blender_vertex_index,
-                normal=normal,
-                texcoord=texcoord,
-            )
-            self.index_search_dict[index_search_key] = index
-
-            self.position.extend(self.POSITION_STRUCT.pack(*position))
-            position_x, position_y, position_z = position
-            self.position_max_x = max(self.position_max_x, position_x)
-            self.position_min_x = min(self.position_min_x, position_x)
-            self.position_max_y = max(self.position_max_y, position_y)
-            self.position_min_y = min(self.position_min_y, position_y)
-            self.position_max_z = max(self.position_max_z, position_z)
-            self.position_min_z = min(self.position_min_z, position_z)
-
-            self.normal.extend(self.NORMAL_STRUCT.pack(*normal))
-            if texcoord is not None:
-                self.texcoord.extend(self.TEXCOORD_STRUCT.pack(*texcoord))
-            if weights is not None:
-                self.weights.extend(self.WEIGHTS_STRUCT.pack(*weights))
-            if joints is not None:
-                self.joints.extend(self.JOINTS_STRUCT.pack(*joints))
-
-            for i, target in enumerate(self.targets):
-                target_position_x, target_position_y, target_position_z = (
-                    targets_position[i]
-                )
-                target.position.extend(
-                    self.POSITION_STRUCT.pack(
-                        target_position_x, target_position_y, target_position_z
-                    )
-                )
-                target.position_max_x = max(target.position_max_x, target_position_x)
-                target.position_min_x = min(target.position_min_x, target_position_x)
-                target.position_max_y = max(target.position_max_y, target_position_y)
-                target.position_min_y = min(target.position_min_y, target_position_y)
-                target.position_max_z = max(target.position_max_z, target_position_z)
-                target.position_min_z = min(target.position_min_z, target_position_z)
-
-                target.normal.extend(self.NORMAL_STRUCT.pack(*targets_normal[i]))
+        count: int
+        position: "NDArray[np.float32]"
+        normal: "NDArray[np.float32]"
+        texcoord: "Optional[NDArray[np.float32]]"
+        weights: "Optional[NDArray[np.float32]]"
+        joints: "Optional[NDArray[np.uint16]]"
+        targets: Sequence["Vrm0Exporter.PrimitiveTarget"]
+        material_index_to_vertex_indices: "Mapping[int, NDArray[np.uint32]]"
+
+    def __init__(
+        self,
+        context: Context,
+        export_objects: Sequence[Object],
+        armature: Object,
+    ) -> None:
+        super().__init__(context, export_objects, armature)
 
-            return index
+        # samplersとtexturesの重複を、線形探索をせずに検出するためのインデックス
+        self.sampler_dict_key_to_sampler_index: dict[str, int] = {}
+        self.texture_dict_key_to_texture_index: dict[str, int] = {}
 
-    def export_vrm(self) -> Optional[bytes]:
+    def export_vrm(self) -> Optional[gltf.Glb]:
         init_extras_export()
 
         with (
@@ -237,12 +168,14 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             self.clear_blend_shape_proxy_previews(self.armature_data),
             setup_humanoid_t_pose(self.context, self.armature),
             self.hide_mtoon1_outline_geometry_nodes(self.context),
+            image_encode_session(self.context),
             create_progress(self.context) as progress,
         ):
             json_dict: dict[str, Json] = {}
             buffer0 = bytearray()
-            self.write_glb_structure(progress, json_dict, buffer0)
-            return gltf.pack_glb(json_dict, buffer0)
+            image_segments: list[bytes] = []
+            self.write_glb_structure(progress, json_dict, buffer0, image_segments)
+            return gltf.Glb(json_dict, [buffer0, *image_segments])
 
     def write_images(
         self,
@@ -251,10 +184,9 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         image_name_to_image_index: dict[str, int],
         image_index_to_lazy_bytes: dict[int, bytes],
     ) -> None:
-        for image in self.get_images():
-            image_bytes, mime_type = io_scene_gltf2_support.image_to_image_bytes(
-                image, self.gltf2_addon_export_settings
-            )
+        images = self.get_images()
+        encoded_images = encode_images(images, self.gltf2_addon_export_settings)
+        for image, (image_bytes, mime_type) in zip(images, encoded_images):
             image_index = len(image_dicts)
             image_dicts.append(
                 {
@@ -272,16 +204,19 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         buffer_view_dicts: list[dict[str, Json]],
         buffer0: bytearray,
         image_index_to_lazy_bytes: dict[int, bytes],
+        image_segments: list[bytes],
     ) -> None:
         # TODO: 自然な方式で再実装
         # 旧エクスポーターは画像のバイト列を保持しておき、最後にbufferViewに追加する
         # 方式になっていた。互換性のため、画像のバイト列のみ特別に同様の遅延追加をする
+        # 画像のバイト列はbuffer0にはコピーせず、BINチャンクの後続セグメントとして
+        # そのまま書き出す
+        byte_offset = len(buffer0)
         for image_index, lazy_bytes in image_index_to_lazy_bytes.items():
             if not (0 <= image_index < len(image_dicts)):
                 continue
             image_dict = image_dicts[image_index]
-            byte_offset = len(buffer0)
-            buffer0.extend(lazy_bytes)
+            image_segments.append(lazy_bytes)
             # TODO: byteOffsetにアラインメント要求が無かったか確認
             # while len(buffer0) % 4 != 0:
             #     buffer0.append(0)
@@ -294,12 +229,20 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                 }
             )
             image_dict["bufferView"] = buffer_view_index
+            byte_offset += len(lazy_bytes)
 
     def write_glb_structure(
-        self, progress: Progress, json_dict: dict[str, Json], buffer0: bytearray
+        self,
+        progress: Progress,
+        json_dict: dict[str, Json],
+        buffer0: bytearray,
+        image_segments: list[bytes],
     ) -> None:
         json_dict["asset"] = {"generator": self.get_asset_generator(), "version": "2.0"}
 
+        self.sampler_dict_key_to_sampler_index.clear()
+        self.texture_dict_key_to_texture_index.clear()
+
         scene_dicts: list[dict[str, Json]] = []
         node_dicts: list[dict[str, Json]] = []
         mesh_dicts: list[dict[str, Json]] = []
@@ -379,6 +322,7 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             buffer_view_dicts,
             buffer0,
             image_index_to_lazy_bytes,
+            image_segments,
         )
 
         if scene_dicts:
@@ -407,7 +351,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         json_dict["extensions"] = make_json({"VRM": extensions_vrm_dict})
         json_dict["buffers"] = [
             {
-                "byteLength": len(buffer0),
+                "byteLength": len(buffer0)
+                + sum(len(image_segment) for image_segment in image_segments),
             }
         ]
 
@@ -1324,8 +1269,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         # while len(buffer0) % 32 == 0:
         #    buffer0.append(0)
 
-        image_bytes, mime = image_to_image_bytes(
-            image, self.gltf2_addon_export_settings
+        ((image_bytes, mime),) = encode_images(
+            [image], self.gltf2_addon_export_settings
         )
         # image_buffer_view_index = len(buffer_view_dicts)
         # buffer_view_dicts.append(
@@ -1452,22 +1397,18 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             "wrapS": wrap_type,
             "wrapT": wrap_type,
         }
-        if sampler_dict in sampler_dicts:
-            sampler_index = sampler_dicts.index(sampler_dict)
-        else:
-            sampler_index = len(sampler_dicts)
-            sampler_dicts.append(sampler_dict)
+        sampler_index = find_or_append_dict(
+            sampler_dicts, self.sampler_dict_key_to_sampler_index, sampler_dict
+        )
 
         texture_dict: dict[str, Json] = {
             "sampler": sampler_index,
             "source": image_index,
         }
 
-        if texture_dict in texture_dicts:
-            texture_index = texture_dicts.index(texture_dict)
-        else:
-            texture_index = len(texture_dicts)
-            texture_dicts.append(texture_dict)
+        texture_index = find_or_append_dict(
+            texture_dicts, self.texture_dict_key_to_texture_index, texture_dict
+        )
 
         khr_texture_transform_dict, vector_property = (
             self.create_mtoon0_khr_texture_transform(node, texture_input_name)
@@ -2625,195 +2566,269 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         )
         return new_missing_material_index
 
-    def collect_vertex(
+    def find_fallback_skin_joint(
+        self,
+        obj: Object,
+        bone_name_to_node_index: Mapping[str, int],
+        skin_joints: Sequence[int],
+    ) -> int:
+        mesh_parent: Optional[Object] = obj
+        while mesh_parent:
+            if mesh_parent.parent_type == "BONE":
+                if (
+                    mesh_parent.parent == self.armature
+                    and (
+                        bone_index := bone_name_to_node_index.get(
+                            mesh_parent.parent_bone
+                        )
+                    )
+                    is not None
+                    and bone_index in skin_joints
+                ):
+                    return skin_joints.index(bone_index)
+                break
+            if mesh_parent.parent_type == "OBJECT":
+                mesh_parent = mesh_parent.parent
+            else:
+                break
+
+        # TODO: たぶんhipsよりはhipsから辿ったルートボーンの方が良い
+        joint = None
+        ext = get_armature_extension(self.armature_data)
+        for human_bone in ext.vrm0.humanoid.human_bones:
+            if human_bone.bone != "hips":
+                continue
+            if (
+                bone_index := bone_name_to_node_index.get(human_bone.node.bone_name)
+            ) is not None and bone_index in skin_joints:
+                joint = skin_joints.index(bone_index)
+
+        if joint is None:
+            message = "No fallback bone index found"
+            raise ValueError(message)
+        return joint
+
+    def collect_skin_weights_and_joints(
         self,
         obj: Object,
         main_mesh_data: Mesh,
-        vertex_index: int,
-        uv_layer: Optional[MeshUVLoopLayer],
-        loop_index: int,
+        vertex_indices: "NDArray[np.int32]",
         vertex_group_index_to_joint: Mapping[int, int],
         bone_name_to_node_index: Mapping[str, int],
         skin_joints: Sequence[int],
-        shape_key_name_to_mesh_data: Mapping[str, Mesh],
-        shape_key_name_to_vertex_index_to_morph_normal_diffs: Optional[
-            Mapping[str, tuple[tuple[float, float, float], ...]]
-        ],
-        vertex_attributes_and_targets: VertexAttributeAndTargets,
+    ) -> "tuple[NDArray[np.float32], NDArray[np.uint16]]":
+        """Collect the four most influential joints of each sorted unique vertex."""
+        vertices = main_mesh_data.vertices
+        element_vertex_indices: list[int] = []
+        element_weights: list[float] = []
+        element_joints: list[int] = []
+        # 頂点グループのウエイトはforeach_getで一括取得できないため、頂点ごとに集める
+        for vertex_index in vertex_indices.tolist():
+            for vertex_group_element in vertices[vertex_index].groups:
+                joint = vertex_group_index_to_joint.get(vertex_group_element.group)
+                if joint is None:
+                    continue
+                # ウエイトがゼロの場合ジョイントもゼロにする
+                # https://github.com/KhronosGroup/glTF/tree/f33f90ad9439a228bf90cde8319d851a52a3f470/specification/2.0#skinned-mesh-attributes
+                weight = vertex_group_element.weight
+                if weight < float_info.epsilon:
+                    continue
+                element_vertex_indices.append(vertex_index)
+                element_weights.append(weight)
+                element_joints.append(joint)
+
+        element_vertex_index_array = np.array(element_vertex_indices, dtype=np.int32)
+        element_weight_array = np.array(element_weights, dtype=np.float64)
+        element_joint_array = np.array(element_joints, dtype=np.int64)
+
+        # 頂点ごとに、ウエイトとジョイントの降順に並べる
+        order = np.lexsort(
+            (-element_joint_array, -element_weight_array, element_vertex_index_array)
+        )
+        element_vertex_index_array = element_vertex_index_array[order]
+        element_weight_array = element_weight_array[order]
+        element_joint_array = element_joint_array[order]
+
+        rows = np.searchsorted(vertex_indices, element_vertex_index_array)
+        group_starts = np.searchsorted(
+            element_vertex_index_array, element_vertex_index_array
+        )
+        ranks = np.arange(len(order)) - group_starts
+        top4 = ranks < 4
+
+        weights = np.zeros((len(vertex_indices), 4), dtype=np.float64)
+        joints = np.zeros((len(vertex_indices), 4), dtype=np.int64)
+        weights[rows[top4], ranks[top4]] = element_weight_array[top4]
+        joints[rows[top4], ranks[top4]] = element_joint_array[top4]
+
+        total_weights = weights[:, 0] + weights[:, 1] + weights[:, 2] + weights[:, 3]
+        no_weight = total_weights < float_info.epsilon
+        if no_weight.any():
+            logger.debug(
+                "No weight on %d vertices mesh=%s",
+                np.count_nonzero(no_weight),
+                main_mesh_data.name,
+            )
+            # Attach near bone
+            joint = self.find_fallback_skin_joint(
+                obj, bone_name_to_node_index, skin_joints
+            )
+            weights[no_weight] = (1.0, 0.0, 0.0, 0.0)
+            joints[no_weight] = (joint, 0, 0, 0)
+            total_weights[no_weight] = 1.0
+        weights /= total_weights[:, np.newaxis]
+
+        return weights.astype(np.float32), joints.astype(np.uint16)
+
+    def collect_vertex_attributes_and_targets(
+        self,
+        obj: Object,
+        main_mesh_data: Mesh,
+        loop_triangle_material_indices: "NDArray[np.int32]",
+        vertex_group_index_to_joint: Mapping[int, int],
+        bone_name_to_node_index: Mapping[str, int],
+        skin_joints: Sequence[int],
+        shape_key_name_to_vertex_positions: "Mapping[str, NDArray[np.float32]]",
+        shape_key_name_to_vertex_index_to_morph_normal_diffs: (
+            "Optional[Mapping[str, NDArray[np.float64]]]"
+        ),
+        no_morph_normal_export_material_indices: set[int],
         *,
         have_skin: bool,
-        no_morph_normal_export: bool,
-    ) -> int:
-        texcoord = None
-        if uv_layer:
-            texcoord_u, texcoord_v = uv_layer.data[loop_index].uv
-            texcoord = (texcoord_u, 1 - texcoord_v)
-
+    ) -> VertexAttributeAndTargets:
+        loop_triangles = main_mesh_data.loop_triangles
+        loop_indices = np.empty(len(loop_triangles) * 3, dtype=np.int32)
+        loop_triangles.foreach_get("loops", loop_indices)
+
+        loops = main_mesh_data.loops
+        loop_vertex_indices = np.empty(len(loops), dtype=np.int32)
+        loops.foreach_get("vertex_index", loop_vertex_indices)
         # 頂点のノーマルではなくloopのノーマルを使う。これで失うものはあると
         # 思うが、glTF 2.0アドオンと同一にしておくのが無難だろうと判断。
         # https://github.com/KhronosGroup/glTF-Blender-IO/pull/1127
         # TODO: この実装は本来はループを回った3つの法線を平均にするべき
-        normal = main_mesh_data.loops[loop_index].normal
+        loop_normals = np.empty(len(loops) * 3, dtype=np.float32)
+        loops.foreach_get("normal", loop_normals)
 
-        already_added_vertex_index = (
-            vertex_attributes_and_targets.find_added_vertex_index(
-                blender_vertex_index=vertex_index,
-                normal=convert.axis_blender_to_gltf(normal),
-                texcoord=texcoord,
-            )
+        vertex_indices = loop_vertex_indices[loop_indices]
+        normals = loop_normals.reshape(-1, 3)[loop_indices]
+
+        texcoords = None
+        uv_layer = main_mesh_data.uv_layers.active
+        if uv_layer:
+            loop_uvs = np.empty(len(loops) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", loop_uvs)
+            texcoords = loop_uvs.reshape(-1, 2)[loop_indices]
+
+        # 頂点インデックス、法線、UVが一致するものを同一の頂点として扱う。
+        # 頂点の順番は、それぞれの頂点が最初に出現した順番にする。
+        # -0.0と0.0を同一視するため0.0を足す
+        index_search_keys = [vertex_indices[:, np.newaxis], normals + 0.0]
+        if texcoords is not None:
+            index_search_keys.append(texcoords + 0.0)
+        _, first_indices, inverse_indices = np.unique(
+            np.hstack([key.astype(np.float64) for key in index_search_keys]),
+            axis=0,
+            return_index=True,
+            return_inverse=True,
         )
-        if isinstance(already_added_vertex_index, int):
-            return already_added_vertex_index
+        unique_order = np.argsort(first_indices)
+        unique_index_to_vertex_index = np.empty_like(unique_order)
+        unique_index_to_vertex_index[unique_order] = np.arange(len(unique_order))
+        loop_output_vertex_indices = unique_index_to_vertex_index[
+            inverse_indices.reshape(-1)
+        ].astype(np.uint32)
+        added_indices = first_indices[unique_order]
+        added_vertex_indices = vertex_indices[added_indices]
+
+        material_index_to_vertex_indices: dict[int, NDArray[np.uint32]] = {}
+        triangle_output_vertex_indices = loop_output_vertex_indices.reshape(-1, 3)
+        material_indices, material_first_indices = np.unique(
+            loop_triangle_material_indices, return_index=True
+        )
+        for material_index in material_indices[
+            np.argsort(material_first_indices)
+        ].tolist():
+            material_index_to_vertex_indices[material_index] = (
+                triangle_output_vertex_indices[
+                    loop_triangle_material_indices == material_index
+                ].reshape(-1)
+            )
 
-        vertex = main_mesh_data.vertices[vertex_index]
-        position_x, position_y, position_z = vertex.co
+        vertex_positions = np.empty(len(main_mesh_data.vertices) * 3, dtype=np.float32)
+        main_mesh_data.vertices.foreach_get("co", vertex_positions)
+        positions = vertex_positions.reshape(-1, 3)[added_vertex_indices]
 
-        joints: Optional[tuple[int, int, int, int]] = None
-        weights: Optional[tuple[float, float, float, float]] = None
-        if have_skin:
-            weight_and_joint_list: list[tuple[float, int]] = [
-                (weight, joint)
-                for vertex_group_element in vertex.groups
-                if (
-                    (
-                        joint := vertex_group_index_to_joint.get(
-                            vertex_group_element.group
-                        )
-                    )
-                    is not None
-                )
-                # ウエイトがゼロの場合ジョイントもゼロにする
-                # https://github.com/KhronosGroup/glTF/tree/f33f90ad9439a228bf90cde8319d851a52a3f470/specification/2.0#skinned-mesh-attributes
-                and not ((weight := vertex_group_element.weight) < float_info.epsilon)
-            ]
-            weight_and_joint_list.sort(reverse=True)
-            while len(weight_and_joint_list) < 4:
-                weight_and_joint_list.append((0.0, 0))
-
-            weights = (
-                weight_and_joint_list[0][0],
-                weight_and_joint_list[1][0],
-                weight_and_joint_list[2][0],
-                weight_and_joint_list[3][0],
-            )
-            joints = (
-                weight_and_joint_list[0][1],
-                weight_and_joint_list[1][1],
-                weight_and_joint_list[2][1],
-                weight_and_joint_list[3][1],
-            )
-
-            total_weight = sum(weights)
-            if total_weight < float_info.epsilon:
-                logger.debug(
-                    "No weight on vertex index=%d mesh=%s",
-                    vertex_index,
-                    main_mesh_data.name,
-                )
-
-                # Attach near bone
-                joint = None
-                mesh_parent: Optional[Object] = obj
-                while mesh_parent:
-                    if mesh_parent.parent_type == "BONE":
-                        if (
-                            mesh_parent.parent == self.armature
-                            and (
-                                bone_index := bone_name_to_node_index.get(
-                                    mesh_parent.parent_bone
-                                )
-                            )
-                            is not None
-                            and bone_index in skin_joints
-                        ):
-                            joint = skin_joints.index(bone_index)
-                        break
-                    if mesh_parent.parent_type == "OBJECT":
-                        mesh_parent = mesh_parent.parent
-                    else:
-                        break
+        texcoord = None
+        if texcoords is not None:
+            texcoord = texcoords[added_indices]
+            texcoord[:, 1] = 1 - texcoord[:, 1].astype(np.float64)
 
-                if joint is None:
-                    # TODO: たぶんhipsよりはhipsから辿ったルートボーンの方が良い
-                    ext = get_armature_extension(self.armature_data)
-                    for human_bone in ext.vrm0.humanoid.human_bones:
-                        if human_bone.bone != "hips":
-                            continue
-                        if (
-                            bone_index := bone_name_to_node_index.get(
-                                human_bone.node.bone_name
-                            )
-                        ) is not None and bone_index in skin_joints:
-                            joint = skin_joints.index(bone_index)
+        weights = None
+        joints = None
+        if have_skin:
+            skin_vertex_indices = np.unique(added_vertex_indices)
+            skin_weights, skin_joints_array = self.collect_skin_weights_and_joints(
+                obj,
+                main_mesh_data,
+                skin_vertex_indices,
+                vertex_group_index_to_joint,
+                bone_name_to_node_index,
+                skin_joints,
+            )
+            skin_rows = np.searchsorted(skin_vertex_indices, added_vertex_indices)
+            weights = skin_weights[skin_rows]
+            joints = skin_joints_array[skin_rows]
 
-                if joint is None:
-                    message = "No fallback bone index found"
-                    raise ValueError(message)
-                weights = (1.0, 0, 0, 0)
-                joints = (joint, 0, 0, 0)
-            else:
-                weights = (
-                    weights[0] / total_weight,
-                    weights[1] / total_weight,
-                    weights[2] / total_weight,
-                    weights[3] / total_weight,
-                )
+        no_morph_normal_exports = np.isin(
+            loop_triangle_material_indices,
+            list(no_morph_normal_export_material_indices),
+        ).repeat(3)[added_indices]
 
-        targets_position: list[tuple[float, float, float]] = []
-        targets_normal: list[tuple[float, float, float]] = []
+        targets: list[Vrm0Exporter.PrimitiveTarget] = []
         for (
             shape_key_name,
-            shape_key_mesh_data,
-        ) in shape_key_name_to_mesh_data.items():
-            (
-                shape_key_position_x,
-                shape_key_position_y,
-                shape_key_position_z,
-            ) = shape_key_mesh_data.vertices[vertex_index].co
-            targets_position.append(
-                convert.axis_blender_to_gltf(
-                    (
-                        shape_key_position_x - position_x,
-                        shape_key_position_y - position_y,
-                        shape_key_position_z - position_z,
-                    )
-                )
+            shape_key_vertex_positions,
+        ) in shape_key_name_to_vertex_positions.items():
+            target_positions = axis_blender_to_gltf_vectors(
+                shape_key_vertex_positions[added_vertex_indices].astype(np.float64)
+                - positions.astype(np.float64)
             )
-            if no_morph_normal_export:
-                targets_normal.append((0, 0, 0))
-                continue
 
+            target_normals = np.zeros((len(added_indices), 3), dtype=np.float64)
             if not shape_key_name_to_vertex_index_to_morph_normal_diffs:
-                targets_normal.append((0, 0, 0))
-                logger.error(
-                    "BUG: shape key name to vertex index to morph normal diffs"
-                    " are not created"
+                if not no_morph_normal_exports.all():
+                    logger.error(
+                        "BUG: shape key name to vertex index to morph normal diffs"
+                        " are not created"
+                    )
+            else:
+                target_normals = axis_blender_to_gltf_vectors(
+                    shape_key_name_to_vertex_index_to_morph_normal_diffs[
+                        shape_key_name
+                    ][added_vertex_indices]
                 )
-                continue
-
-            morph_normal_diff = shape_key_name_to_vertex_index_to_morph_normal_diffs[
-                shape_key_name
-            ][vertex_index]
-            # logger.error(
-            #     "MORPH_NORMAL_DIFF: %s %s", vertex_index, morph_normal_diff
-            # )
-            targets_normal.append(convert.axis_blender_to_gltf(morph_normal_diff))
-
-        return vertex_attributes_and_targets.add_vertex(
-            blender_vertex_index=vertex_index,
-            position=convert.axis_blender_to_gltf(
-                (
-                    position_x,
-                    position_y,
-                    position_z,
+                target_normals[no_morph_normal_exports] = 0
+
+            targets.append(
+                Vrm0Exporter.PrimitiveTarget(
+                    name=shape_key_name,
+                    position=target_positions.astype(np.float32),
+                    position_min=target_positions.min(axis=0).tolist(),
+                    position_max=target_positions.max(axis=0).tolist(),
+                    normal=target_normals.astype(np.float32),
                 )
-            ),
-            normal=convert.axis_blender_to_gltf(normal),
+            )
+
+        return Vrm0Exporter.VertexAttributeAndTargets(
+            count=len(added_indices),
+            position=axis_blender_to_gltf_vectors(positions),
+            normal=axis_blender_to_gltf_vectors(normals[added_indices]),
             texcoord=texcoord,
-            joints=joints,
             weights=weights,
-            targets_position=targets_position,
-            targets_normal=targets_normal,
+            joints=joints,
+            targets=targets,
+            material_index_to_vertex_indices=material_index_to_vertex_indices,
         )
 
     def write_mesh_node(
@@ -2913,13 +2928,18 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             original_mesh_convertible.calc_loop_triangles()
             original_shape_keys = original_mesh_convertible.shape_keys
 
+        read_shape_key_blocks = (
+            original_shape_keys is not None
+            and self.can_read_shape_key_blocks(obj, original_shape_keys)
+        )
+
         with save_workspace(self.context):
             main_mesh_data = force_apply_modifiers(self.context, obj, persistent=False)
             if not main_mesh_data:
                 return scene_node_index
 
             shape_key_name_to_mesh_data: dict[str, Mesh] = {}
-            if original_shape_keys:
+            if original_shape_keys and not read_shape_key_blocks:
                 # シェイプキーごとにモディファイアを適用したメッシュを作成する。
                 # これは、VRM 0.x用にglTF Nodeの回転やスケールを正規化するが、
                 # ポーズモードで回転やスケールをつけた場合、その正規化のウエイト
@@ -2960,6 +2980,40 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             mesh_data.transform(mesh_data_transform)
             if bpy.app.version < (4, 1):
                 mesh_data.calc_normals_split()
+            mesh_data.calc_loop_triangles()
+
+        shape_key_name_to_vertex_positions: dict[str, NDArray[np.float32]] = {}
+        shape_key_name_to_triangle_normals: dict[
+            str, tuple[NDArray[np.int32], NDArray[np.float32]]
+        ] = {}
+        if original_shape_keys and read_shape_key_blocks:
+            shape_key_name_to_vertex_positions = (
+                self.read_shape_key_name_to_vertex_positions(
+                    main_mesh_data, original_shape_keys, mesh_data_transform
+                )
+            )
+            shape_key_name_to_triangle_normals = (
+                self.create_shape_key_name_to_triangle_normals(
+                    self.context, main_mesh_data, shape_key_name_to_vertex_positions
+                )
+            )
+        else:
+            for (
+                shape_key_name,
+                shape_key_mesh_data,
+            ) in shape_key_name_to_mesh_data.items():
+                shape_key_vertex_positions = np.empty(
+                    len(shape_key_mesh_data.vertices) * 3, dtype=np.float32
+                )
+                shape_key_mesh_data.vertices.foreach_get(
+                    "co", shape_key_vertex_positions
+                )
+                shape_key_name_to_vertex_positions[shape_key_name] = (
+                    shape_key_vertex_positions.reshape(-1, 3)
+                )
+                shape_key_name_to_triangle_normals[shape_key_name] = (
+                    read_loop_triangle_normals(shape_key_mesh_data)
+                )
 
         material_slot_index_to_material_name: Mapping[int, str] = {
             material_index: material_ref.name
@@ -2988,21 +3042,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                 no_morph_normal_export_material_indices.add(material_index)
 
         shape_key_name_to_vertex_index_to_morph_normal_diffs = None
-        if shape_key_name_to_mesh_data:
+        if shape_key_name_to_triangle_normals:
             shape_key_name_to_vertex_index_to_morph_normal_diffs = (
                 self.create_shape_key_name_to_vertex_index_to_morph_normal_diffs(
                     self.context,
                     main_mesh_data,
-                    shape_key_name_to_mesh_data,
+                    shape_key_name_to_triangle_normals,
                 )
             )
 
-        vertex_attributes_and_targets = Vrm0Exporter.VertexAttributeAndTargets(
-            list(shape_key_name_to_mesh_data.keys())
-        )
-        material_index_to_vertex_indices: dict[int, bytearray] = {}
-        vertex_indices_struct = struct.Struct("<I")
-
         vertex_group_index_to_joint: Mapping[int, int] = {
             vertex_group_index: skin_joints.index(vertex_group_node_index)
             for vertex_group_index, vertex_group in enumerate(obj.vertex_groups)
@@ -3015,11 +3063,22 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             and vertex_group_node_index in skin_joints
         }
 
-        uv_layers = main_mesh_data.uv_layers
-        uv_layer = uv_layers.active
-        main_mesh_data.calc_loop_triangles()
-        for loop_triangle in main_mesh_data.loop_triangles:
-            material_slot_index = loop_triangle.material_index
+        loop_triangles = main_mesh_data.loop_triangles
+        if not loop_triangles:
+            return scene_node_index
+
+        loop_triangle_material_slot_indices = np.empty(
+            len(loop_triangles), dtype=np.int32
+        )
+        loop_triangles.foreach_get(
+            "material_index", loop_triangle_material_slot_indices
+        )
+        loop_triangle_material_indices = np.empty_like(
+            loop_triangle_material_slot_indices
+        )
+        for material_slot_index in np.unique(
+            loop_triangle_material_slot_indices
+        ).tolist():
             material_name = material_slot_index_to_material_name.get(
                 material_slot_index
             )
@@ -3030,35 +3089,25 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                 material_index = self.get_or_write_cluster_empty_material(
                     material_dicts, extensions_vrm_material_property_dicts
                 )
-
-            no_morph_normal_export = (
-                material_index in no_morph_normal_export_material_indices
-            )
-            vertex_indices = material_index_to_vertex_indices.get(material_index)
-            if vertex_indices is None:
-                vertex_indices = bytearray()
-                material_index_to_vertex_indices[material_index] = vertex_indices
-
-            for loop_index in loop_triangle.loops:
-                loop = main_mesh_data.loops[loop_index]
-                original_vertex_index = loop.vertex_index
-                vertex_index = self.collect_vertex(
-                    obj,
-                    main_mesh_data,
-                    original_vertex_index,
-                    uv_layer,
-                    loop_index,
-                    vertex_group_index_to_joint,
-                    bone_name_to_node_index,
-                    skin_joints,
-                    shape_key_name_to_mesh_data,
-                    shape_key_name_to_vertex_index_to_morph_normal_diffs,
-                    vertex_attributes_and_targets,
-                    have_skin=have_skin,
-                    no_morph_normal_export=no_morph_normal_export,
-                )
-
-                vertex_indices.extend(vertex_indices_struct.pack(vertex_index))
+            loop_triangle_material_indices[
+                loop_triangle_material_slot_indices == material_slot_index
+            ] = material_index
+
+        vertex_attributes_and_targets = self.collect_vertex_attributes_and_targets(
+            obj,
+            main_mesh_data,
+            loop_triangle_material_indices,
+            vertex_group_index_to_joint,
+            bone_name_to_node_index,
+            skin_joints,
+            shape_key_name_to_vertex_positions,
+            shape_key_name_to_vertex_index_to_morph_normal_diffs,
+            no_morph_normal_export_material_indices,
+            have_skin=have_skin,
+        )
+        material_index_to_vertex_indices = (
+            vertex_attributes_and_targets.material_index_to_vertex_indices
+        )
 
         if not material_index_to_vertex_indices:
             return scene_node_index
@@ -3077,14 +3126,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             primitive_material_index,
             vertex_indices,
         ) in material_index_to_vertex_indices.items():
+            indices_bytes = vertex_indices.astype("<u4").tobytes()
             indices_buffer_offset = len(buffer0)
-            buffer0.extend(vertex_indices)
+            buffer0.extend(indices_bytes)
             indices_buffer_view_index = len(buffer_view_dicts)
             buffer_view_dicts.append(
                 {
                     "buffer": 0,
                     "byteOffset": indices_buffer_offset,
-                    "byteLength": len(vertex_indices),
+                    "byteLength": len(indices_bytes),
                 }
             )
             indices_accessor_index = len(accessor_dicts)
@@ -3094,8 +3144,7 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                     "byteOffset": 0,
                     "type": "SCALAR",
                     "componentType": GL_UNSIGNED_INT,
-                    # TODO: 割り算はミスを誘うので避ける
-                    "count": int(len(vertex_indices) / 4),
+                    "count": len(vertex_indices),
                     "normalized": False,
                 }
             )
@@ -3112,14 +3161,16 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         for primitive_dict in primitive_dicts:
             primitive_dict["attributes"] = primitive_attribute_dict
 
+        primitive_position = vertex_attributes_and_targets.position
+        position_bytes = primitive_position.astype("<f4").tobytes()
         position_buffer_offset = len(buffer0)
-        buffer0.extend(vertex_attributes_and_targets.position)
+        buffer0.extend(position_bytes)
         position_buffer_view_index = len(buffer_view_dicts)
         buffer_view_dicts.append(
             {
                 "buffer": 0,
                 "byteOffset": position_buffer_offset,
-                "byteLength": len(vertex_attributes_and_targets.position),
+                "byteLength": len(position_bytes),
             }
         )
         position_accessor_index = len(accessor_dicts)
@@ -3132,28 +3183,21 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                 "componentType": GL_FLOAT,
                 "count": vertex_attributes_and_targets.count,
                 "normalized": False,
-                "min": [
-                    vertex_attributes_and_targets.position_min_x,
-                    vertex_attributes_and_targets.position_min_y,
-                    vertex_attributes_and_targets.position_min_z,
-                ],
-                "max": [
-                    vertex_attributes_and_targets.position_max_x,
-                    vertex_attributes_and_targets.position_max_y,
-                    vertex_attributes_and_targets.position_max_z,
-                ],
+                "min": primitive_position.min(axis=0).tolist(),
+                "max": primitive_position.max(axis=0).tolist(),
             }
         )
         primitive_attribute_dict["POSITION"] = position_accessor_index
 
+        normal_bytes = vertex_attributes_and_targets.normal.astype("<f4").tobytes()
         normal_buffer_offset = len(buffer0)
-        buffer0.extend(vertex_attributes_and_targets.normal)
+        buffer0.extend(normal_bytes)
         normal_buffer_view_index = len(buffer_view_dicts)
         buffer_view_dicts.append(
             {
                 "buffer": 0,
                 "byteOffset": normal_buffer_offset,
-                "byteLength": len(vertex_attributes_and_targets.normal),
+                "byteLength": len(normal_bytes),
             }
         )
         normal_accessor_index = len(accessor_dicts)
@@ -3170,15 +3214,16 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         primitive_attribute_dict["NORMAL"] = normal_accessor_index
 
         primitive_texcoord = vertex_attributes_and_targets.texcoord
-        if primitive_texcoord:
+        if primitive_texcoord is not None:
+            texcoord_bytes = primitive_texcoord.astype("<f4").tobytes()
             texcoord_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_texcoord)
+            buffer0.extend(texcoord_bytes)
             texcoord_buffer_view_index = len(buffer_view_dicts)
             buffer_view_dicts.append(
                 {
                     "buffer": 0,
                     "byteOffset": texcoord_buffer_offset,
-                    "byteLength": len(primitive_texcoord),
+                    "byteLength": len(texcoord_bytes),
                 }
             )
             texcoord_accessor_index = len(accessor_dicts)
@@ -3195,15 +3240,16 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             primitive_attribute_dict["TEXCOORD_0"] = texcoord_accessor_index
 
         primitive_joints = vertex_attributes_and_targets.joints
-        if primitive_joints:
+        if primitive_joints is not None:
+            joints_bytes = primitive_joints.astype("<u2").tobytes()
             joints_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_joints)
+            buffer0.extend(joints_bytes)
             joints_buffer_view_index = len(buffer_view_dicts)
             buffer_view_dicts.append(
                 {
                     "buffer": 0,
                     "byteOffset": joints_buffer_offset,
-                    "byteLength": len(primitive_joints),
+                    "byteLength": len(joints_bytes),
                 }
             )
             joints_accessor_index = len(accessor_dicts)
@@ -3220,18 +3266,19 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             primitive_attribute_dict["JOINTS_0"] = joints_accessor_index
 
         primitive_weights = vertex_attributes_and_targets.weights
-        if primitive_weights:
+        if primitive_weights is not None:
+            weights_bytes = primitive_weights.astype("<f4").tobytes()
             while len(buffer0) % 4:
                 buffer0.append(0)
 
             weights_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_weights)
+            buffer0.extend(weights_bytes)
             weights_buffer_view_index = len(buffer_view_dicts)
             buffer_view_dicts.append(
                 {
                     "buffer": 0,
                     "byteOffset": weights_buffer_offset,
-                    "byteLength": len(primitive_weights),
+                    "byteLength": len(weights_bytes),
                 }
             )
             weights_accessor_index = len(accessor_dicts)
@@ -3255,14 +3302,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
             primitive_target_dicts: list[dict[str, Json]] = []
             for target in primitive_targets:
+                target_position_bytes = target.position.astype("<f4").tobytes()
                 target_position_buffer_offset = len(buffer0)
-                buffer0.extend(target.position)
+                buffer0.extend(target_position_bytes)
                 target_position_buffer_view_index = len(buffer_view_dicts)
                 buffer_view_dicts.append(
                     {
                         "buffer": 0,
                         "byteOffset": target_position_buffer_offset,
-                        "byteLength": len(target.position),
+                        "byteLength": len(target_position_bytes),
                     }
                 )
                 target_position_accessor_index = len(accessor_dicts)
@@ -3275,16 +3323,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                         "componentType": GL_FLOAT,
                         "count": vertex_attributes_and_targets.count,
                         "normalized": False,
-                        "min": [
-                            target.position_min_x,
-                            target.position_min_y,
-                            target.position_min_z,
-                        ],
-                        "max": [
-                            target.position_max_x,
-                            target.position_max_y,
-                            target.position_max_z,
-                        ],
+                        "min": make_json(target.position_min),
+                        "max": make_json(target.position_max),
                     }
                 )
                 primitive_target_dicts.append(
@@ -3297,14 +3337,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             for target, primitive_target_dict in zip(
                 primitive_targets, primitive_target_dicts
             ):
+                target_normal_bytes = target.normal.astype("<f4").tobytes()
                 target_normal_buffer_offset = len(buffer0)
-                buffer0.extend(target.normal)
+                buffer0.extend(target_normal_bytes)
                 target_normal_buffer_view_index = len(buffer_view_dicts)
                 buffer_view_dicts.append(
                     {
                         "buffer": 0,
                         "byteOffset": target_normal_buffer_offset,
-                        "byteLength": len(target.normal),
+                        "byteLength": len(target_normal_bytes),
                     }
                 )
                 target_normal_accessor_index = len(accessor_dicts)
@@ -3599,8 +3640,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                 downgrade_to_mtoon0=True
             ):
                 source = texture.get_connected_node_image()
-                if source and source not in images:
-                    images.append(source)
+                if source:
+                    images.append(source)  # 重複は最後にまとめて削除する
 
         # Non MToon 1.0 materials
         for non_mtoon1_material in non_mtoon1_materials:
@@ -3660,12 +3701,11 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
             # 旧エクスポーターとの互換性のため、重複した命名を避ける
             image_name = image_base_name
+            image_names = {image_dict.get("name") for image_dict in image_dicts}
             for count in range(100000):
                 if count:
                     image_name = image_base_name + "." + str(count)
-                if not any(
-                    image_name == image_dict.get("name") for image_dict in image_dicts
-                ):
+                if image_name not in image_names:
                     break
 
             export_image_index = len(image_dicts)
@@ -3721,22 +3761,18 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             "wrapS": wrap_s,
             "wrapT": wrap_t,
         }
-        if sampler_dict in sampler_dicts:
-            sampler_index = sampler_dicts.index(sampler_dict)
-        else:
-            sampler_index = len(sampler_dicts)
-            sampler_dicts.append(sampler_dict)
+        sampler_index = find_or_append_dict(
+            sampler_dicts, self.sampler_dict_key_to_sampler_index, sampler_dict
+        )
 
         texture_dict: dict[str, Json] = {
             "sampler": sampler_index,
             "source": export_image_index,
         }
 
-        if texture_dict in texture_dicts:
-            texture_index = texture_dicts.index(texture_dict)
-        else:
-            texture_index = len(texture_dicts)
-            texture_dicts.append(texture_dict)
+        texture_index = find_or_append_dict(
+            texture_dicts, self.texture_dict_key_to_texture_index, texture_dict
+        )
 
         texture_info: dict[str, Json] = {
             "index": texture_index,
@@ -3798,11 +3834,9 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             "wrapS": wrap_s,
             "wrapT": wrap_t,
         }
-        if sampler_dict in sampler_dicts:
-            sampler_index = sampler_dicts.index(sampler_dict)
-        else:
-            sampler_index = len(sampler_dicts)
-            sampler_dicts.append(sampler_dict)
+        sampler_index = find_or_append_dict(
+            sampler_dicts, self.sampler_dict_key_to_sampler_index, sampler_dict
+        )
 
         image_index = self.find_or_create_image(
             image_dicts,
@@ -3817,11 +3851,9 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             "sampler": sampler_index,
             "source": image_index,
         }
-        if texture_dict in texture_dicts:
-            texture_index = texture_dicts.index(texture_dict)
-        else:
-            texture_index = len(texture_dicts)
-            texture_dicts.append(texture_dict)
+        texture_index = find_or_append_dict(
+            texture_dicts, self.texture_dict_key_to_texture_index, texture_dict
+        )
 
         texture_properties[texture_properties_key] = texture_index
         vector_properties[texture_properties_key] = [0, 0, 1, 1]
@@ -3872,19 +3904,124 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             }
         return texture_info_dict
 
+    def can_read_shape_key_blocks(self, obj: Object, shape_keys: Key) -> bool:
+        """Return whether shape keys can be exported without evaluating each one.
+
+        That is the case when the only deformation is an armature in the rest pose,
+        which does not change shape key offsets.
+        """
+        if not shape_keys.use_relative:
+            return False
+        if any(key_block.vertex_group for key_block in shape_keys.key_blocks):
+            return False
+        for modifier in obj.modifiers:
+            if not modifier.show_viewport:
+                continue
+            if not search.is_armature_or_outline_modifier(modifier):
+                return False
+            if not isinstance(modifier, ArmatureModifier):
+                continue
+            armature = modifier.object
+            if not armature:
+                continue
+            armature_data = armature.data
+            if not isinstance(armature_data, Armature):
+                continue
+            if armature_data.pose_position == "REST":
+                continue
+            # ポーズによる変形はシェイプキーの差分も変形させるため、
+            # レストポーズと一致している場合のみ差分をそのまま使える
+            pose_bone_matrices = np.empty(len(armature.pose.bones) * 16)
+            armature.pose.bones.foreach_get("matrix", pose_bone_matrices)
+            bone_matrices = np.empty(len(armature_data.bones) * 16)
+            armature_data.bones.foreach_get("matrix_local", bone_matrices)
+            if not np.allclose(pose_bone_matrices, bone_matrices, rtol=0, atol=1e-6):
+                return False
+        return True
+
+    @staticmethod
+    def read_shape_key_name_to_vertex_positions(
+        mesh_data: Mesh,
+        shape_keys: Key,
+        mesh_data_transform: Matrix,
+    ) -> "dict[str, NDArray[np.float32]]":
+        """Calculate vertex positions of mesh_data with each shape key applied."""
+        vertex_positions = np.empty(len(mesh_data.vertices) * 3, dtype=np.float32)
+        mesh_data.vertices.foreach_get("co", vertex_positions)
+        base_vertex_positions = vertex_positions.reshape(-1, 3).astype(np.float64)
+        transform: NDArray[np.float64] = np.array(
+            mesh_data_transform, dtype=np.float64
+        )[:3, :3]
+
+        key_block_name_to_cos: dict[str, NDArray[np.float32]] = {}
+        for key_block in shape_keys.key_blocks:
+            cos = np.empty(len(key_block.data) * 3, dtype=np.float32)
+            key_block.data.foreach_get("co", cos)
+            key_block_name_to_cos[key_block.name] = cos.reshape(-1, 3)
+
+        shape_key_name_to_vertex_positions: dict[str, NDArray[np.float32]] = {}
+        for key_block in shape_keys.key_blocks:
+            if shape_keys.reference_key.name == key_block.name:
+                continue
+            if key_block.mute:
+                shape_key_name_to_vertex_positions[key_block.name] = (
+                    base_vertex_positions.astype(np.float32)
+                )
+                continue
+            # 値を1.0にしてメッシュを評価した場合と同じ差分を計算する
+            value = min(max(1.0, key_block.slider_min), key_block.slider_max)
+            offsets = (
+                key_block_name_to_cos[key_block.name]
+                - key_block_name_to_cos[key_block.relative_key.name]
+            ).astype(np.float64) * value
+            shape_key_name_to_vertex_positions[key_block.name] = (
+                base_vertex_positions + offsets @ transform.T
+            ).astype(np.float32)
+        return shape_key_name_to_vertex_positions
+
+    @staticmethod
+    def create_shape_key_name_to_triangle_normals(
+        context: Context,
+        mesh_data: Mesh,
+        shape_key_name_to_vertex_positions: "Mapping[str, NDArray[np.float32]]",
+    ) -> "dict[str, tuple[NDArray[np.int32], NDArray[np.float32]]]":
+        """Calculate split normals of each shape key using a scratch copy of a mesh."""
+        shape_key_name_to_triangle_normals: dict[
+            str, tuple[NDArray[np.int32], NDArray[np.float32]]
+        ] = {}
+        scratch_mesh_data = mesh_data.copy()
+        try:
+            for (
+                shape_key_name,
+                vertex_positions,
+            ) in shape_key_name_to_vertex_positions.items():
+                scratch_mesh_data.vertices.foreach_set(
+                    "co", vertex_positions.reshape(-1)
+                )
+                scratch_mesh_data.update()
+                if bpy.app.version < (4, 1):
+                    scratch_mesh_data.calc_normals_split()
+                scratch_mesh_data.calc_loop_triangles()
+                shape_key_name_to_triangle_normals[shape_key_name] = (
+                    read_loop_triangle_normals(scratch_mesh_data)
+                )
+        finally:
+            context.blend_data.meshes.remove(scratch_mesh_data)
+        return shape_key_name_to_triangle_normals
+
     @staticmethod
     def create_shape_key_name_to_vertex_index_to_morph_normal_diffs(
         context: Context,
         mesh_data: Mesh,
-        shape_key_name_to_mesh_data: Mapping[str, Mesh],
-    ) -> Mapping[str, tuple[tuple[float, float, float], ...]]:
-        # logger.error("CREATE UNIQ:")
+        shape_key_name_to_triangle_normals: (
+            "Mapping[str, tuple[NDArray[np.int32], NDArray[np.float32]]]"
+        ),
+    ) -> "Mapping[str, NDArray[np.float64]]":
+        vertex_count = len(mesh_data.vertices)
+
         # 法線の差分を強制的にゼロにする設定が有効な頂点インデックスを集める
-        exclusion_vertex_indices: set[int] = set()
-        for polygon in mesh_data.polygons:
-            if not (0 <= polygon.material_index < len(mesh_data.materials)):
-                continue
-            material_ref = mesh_data.materials[polygon.material_index]
+        exclusion_material_indices: list[int] = []
+        for material_index, material_ref in enumerate(mesh_data.materials):
             if material_ref is None:
                 continue
             # Use non-evaluated material
@@ -3895,113 +4032,74 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             if material_extension.mtoon1.export_shape_key_normals:
                 continue
             if material_extension.mtoon1.enabled:
-                exclusion_vertex_indices.update(polygon.vertices)
+                exclusion_material_indices.append(material_index)
                 continue
             node, legacy_shader_name = search.legacy_shader_node(material)
             if not node:
                 continue
             if legacy_shader_name == "MToon_unversioned":
-                exclusion_vertex_indices.update(polygon.vertices)
-
-        # logger.error("  exc=%s", exclusion_vertex_indices)
-
-        # logger.error("KEY DIFF:")
+                exclusion_material_indices.append(material_index)
+
+        exclusion_vertices = np.zeros(vertex_count, dtype=bool)
+        if exclusion_material_indices:
+            # 三角形はポリゴンの全ての頂点を含むので、三角形の頂点を除外すればよい
+            loop_triangles = mesh_data.loop_triangles
+            triangle_material_indices = np.empty(len(loop_triangles), dtype=np.int32)
+            loop_triangles.foreach_get("material_index", triangle_material_indices)
+            triangle_vertex_indices = np.empty(len(loop_triangles) * 3, dtype=np.int32)
+            loop_triangles.foreach_get("vertices", triangle_vertex_indices)
+            exclusion_triangles = np.isin(
+                triangle_material_indices, exclusion_material_indices
+            )
+            exclusion_vertices[
+                triangle_vertex_indices.reshape(-1, 3)[exclusion_triangles]
+            ] = True
 
         # シェイプキーごとの法線の値を集める
-        shape_key_name_to_vertex_normal_vectors: dict[str, list[Vector]] = {}
-        if not mesh_data.shape_keys:
-            message = "mesh_data.shape_keys is None"
-            raise AssertionError(message)
-        reference_key_name = mesh_data.shape_keys.reference_key.name
-        for shape_key_name, shape_key_mesh_data in [
-            (reference_key_name, mesh_data),
-            *shape_key_name_to_mesh_data.items(),
-        ]:
-            # logger.error("  refkey=%s key=%s", reference_key_name, shape_key_name)
-            # 頂点のノーマルではなくsplit(loop)のノーマルを使う
-            # https://github.com/KhronosGroup/glTF-Blender-IO/pull/1129
-            vertex_normal_sum_vectors = [Vector([0.0, 0.0, 0.0])] * len(
-                mesh_data.vertices
-            )
-            for loop_triangle in shape_key_mesh_data.loop_triangles:
-                # logger.error("    loop_triangle mat=%s", loop_triangle.material_index)
-                for vertex_index, normal in zip(
-                    loop_triangle.vertices, loop_triangle.split_normals
-                ):
-                    # logger.error(
-                    #     "      vindex=%s normal=%s",
-                    #     vertex_index,
-                    #     normal,
-                    # )
-                    if vertex_index in exclusion_vertex_indices:
-                        # logger.error("      EXCLUDE")
-                        continue
-                    if not (0 <= vertex_index < len(vertex_normal_sum_vectors)):
-                        # logger.error("      OUT OF RANGE")
-                        continue
-                    vertex_normal_sum_vectors[vertex_index] = (
-                        # 普通は += 演算子を使うが、なぜか結果が変わるので使わない
-                        vertex_normal_sum_vectors[vertex_index] + Vector(normal)
-                    )
-                    # logger.error(
-                    #     "      => %s:%s",
-                    #     vertex_normal_sum_vectors[vertex_index],
-                    #     list(vertex_normal_sum_vectors[vertex_index]),
-                    # )
-            shape_key_name_to_vertex_normal_vectors[shape_key_name] = [
-                Vector((0, 0, 0))
-                if vector.length_squared < float_info.epsilon
-                else vector.normalized()
-                for vector in vertex_normal_sum_vectors
+        # 頂点のノーマルではなくsplit(loop)のノーマルを使う
+        # https://github.com/KhronosGroup/glTF-Blender-IO/pull/1129
+        def create_vertex_normals(
+            triangle_normals: "tuple[NDArray[np.int32], NDArray[np.float32]]",
+        ) -> "NDArray[np.float64]":
+            corner_vertex_indices, corner_normals = triangle_normals
+            valid_corners = (corner_vertex_indices >= 0) & (
+                corner_vertex_indices < vertex_count
+            )
+            valid_corners[valid_corners] = ~exclusion_vertices[
+                corner_vertex_indices[valid_corners]
             ]
-
-        reference_vertex_normal_vectors = shape_key_name_to_vertex_normal_vectors[
-            reference_key_name
-        ]
+            corner_vertex_indices = corner_vertex_indices[valid_corners]
+            corner_normals = corner_normals[valid_corners]
+            vertex_normals: NDArray[np.float64] = np.stack(
+                [
+                    np.bincount(
+                        corner_vertex_indices,
+                        weights=corner_normals[:, axis],
+                        minlength=vertex_count,
+                    )
+                    for axis in range(3)
+                ],
+                axis=1,
+            ).astype(np.float64)
+            lengths = np.linalg.norm(vertex_normals, axis=1)
+            zero_lengths = lengths**2 < float_info.epsilon
+            lengths[zero_lengths] = 1
+            vertex_normals /= lengths[:, np.newaxis]
+            vertex_normals[zero_lengths] = 0
+            return vertex_normals
+
+        reference_vertex_normals = create_vertex_normals(
+            read_loop_triangle_normals(mesh_data)
+        )
 
         # シェイプキーごとに、リファレンスキーとの法線の差分を集める
-        shape_key_name_to_vertex_index_to_morph_normal_diffs: dict[
-            str, tuple[tuple[float, float, float], ...]
-        ] = {}
-
-        # logger.error("REFERENCE_KEY: %s", mesh_data.shape_keys.reference_key.name)
-        # for v in reference_vertex_normal_vectors:
-        #     logger.error("  %s", v)
-
-        # for n, vv in shape_key_name_to_vertex_normal_vectors.items():
-        #     logger.error("KEY: %s", n)
-        #     for v in vv:
-        #         logger.error("  %s", v)
-
-        # logger.error("RESULT:")
-        for (
-            shape_key_name,
-            vertex_normal_vectors,
-        ) in shape_key_name_to_vertex_normal_vectors.items():
-            if shape_key_name == reference_key_name:
-                continue
-            vertex_index_to_morph_normal_diffs: tuple[
-                tuple[float, float, float], ...
-            ] = tuple(
-                (
-                    vertex_normal_vector.x - reference_vertex_normal_vector.x,
-                    vertex_normal_vector.y - reference_vertex_normal_vector.y,
-                    vertex_normal_vector.z - reference_vertex_normal_vector.z,
-                )
-                for vertex_normal_vector, reference_vertex_normal_vector in zip(
-                    vertex_normal_vectors,
-                    reference_vertex_normal_vectors,
-                )
-            )
-            # logger.error(
-            #     "  %s:%s",
-            #     shape_key_name,
-            #     vertex_index_to_morph_normal_diffs,
-            # )
-            shape_key_name_to_vertex_index_to_morph_normal_diffs[shape_key_name] = (
-                vertex_index_to_morph_normal_diffs
+        return {
+            shape_key_name: create_vertex_normals(triangle_normals)
+            - reference_vertex_normals
+            for shape_key_name, triangle_normals in (
+                shape_key_name_to_triangle_normals.items()
             )
-        return shape_key_name_to_vertex_index_to_morph_normal_diffs
+        }
 
     def have_skin(self, mesh: Object) -> bool:
         # TODO: このメソッドは誤判定があるが互換性のためにそのままになっている。
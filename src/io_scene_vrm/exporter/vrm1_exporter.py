@@ -33,7 +33,7 @@ from ..common import convert, shader
 from ..common.char import INTERNAL_NAME_PREFIX
 from ..common.convert import Json
 from ..common.deep import make_json
-from ..common.gltf import pack_glb, parse_glb
+from ..common.gltf import Glb, parse_glb
 from ..common.logging import get_logger
 from ..common.version import get_addon_version
 from ..common.vrm1.human_bone import HumanBoneName
@@ -57,8 +57,8 @@ from ..editor.vrm1.property_group import (
 )
 from ..external.io_scene_gltf2_support import (
     ExportSceneGltfArguments,
+    capture_exported_glb,
     export_scene_gltf,
-    image_to_image_bytes,
     init_extras_export,
 )
 from .abstract_base_vrm_exporter import (
@@ -66,6 +66,7 @@ from .abstract_base_vrm_exporter import (
     assign_dict,
     force_apply_modifiers,
 )
+from .image_encode_cache import encode_images, image_encode_session
 
 logger = get_logger(__name__)
 
@@ -900,7 +901,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
         while len(buffer0) % 32 == 0:
             buffer0.append(0)
 
-        image_bytes, mime = image_to_image_bytes(image, gltf2_addon_export_settings)
+        ((image_bytes, mime),) = encode_images([image], gltf2_addon_export_settings)
         buffer_view_dicts = json_dict.get("bufferViews")
         if not isinstance(buffer_view_dicts, list):
             buffer_view_dicts = []
@@ -2196,7 +2197,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
                     return False
         return True
 
-    def export_vrm(self) -> Optional[bytes]:
+    def export_vrm(self) -> Optional[Glb]:
         init_extras_export()
 
         armature_data = self.armature.data
@@ -2212,6 +2213,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             self.clear_blend_shape_proxy_previews(armature_data),
             setup_humanoid_t_pose(self.context, self.armature),
             self.overwrite_object_visibility_and_selection(),
+            image_encode_session(self.context),
         ):
             with (
                 self.hide_mtoon1_outline_geometry_nodes(self.context),
@@ -2220,6 +2222,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
                 self.save_selected_mesh_compat_objects() as mesh_compat_object_names,
                 self.assign_export_custom_properties(armature_data),
                 tempfile.TemporaryDirectory() as temp_dir,
+                capture_exported_glb() as exported_glb,
             ):
                 force_apply_modifiers_to_objects(self.context, mesh_compat_object_names)
 
@@ -2257,12 +2260,17 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
                         f" but {export_scene_gltf_result}"
                     )
                     raise AssertionError(message)
-                extra_name_assigned_glb = filepath.read_bytes()
-            vrm_bytes = self.add_vrm_extension_to_glb(extra_name_assigned_glb)
-            if vrm_bytes is None:
+                if exported_glb and exported_glb.json_dict is not None:
+                    json_dict = exported_glb.json_dict
+                    buffer0 = exported_glb.buffer0
+                else:
+                    json_dict, buffer0_bytes = parse_glb(filepath.read_bytes())
+                    buffer0 = bytearray(buffer0_bytes)
+            vrm_glb = self.add_vrm_extension_to_gltf(json_dict, buffer0)
+            if vrm_glb is None:
                 return None
-            logger.info("Generated VRM size: %s bytes", len(vrm_bytes))
-        return vrm_bytes
+            logger.info("Generated VRM BIN chunk size: %s bytes", len(buffer0))
+        return vrm_glb
 
     def remove_exported_armature_object_before_4_2(
         self,
@@ -2384,9 +2392,9 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             armature_node_dict.pop("children", None)
             armature_node_dict["name"] = "secondary"  # Assign dummy name
 
-    def add_vrm_extension_to_glb(
-        self, extra_name_assigned_glb: bytes
-    ) -> Optional[bytes]:
+    def add_vrm_extension_to_gltf(
+        self, json_dict: dict[str, Json], buffer0: bytearray
+    ) -> Optional[Glb]:
         armature_data = self.armature.data
         if not isinstance(armature_data, Armature):
             message = f"{type(armature_data)} is not an Armature"
@@ -2394,9 +2402,6 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
 
         vrm = get_armature_extension(armature_data).vrm1
 
-        json_dict, buffer0_bytes = parse_glb(extra_name_assigned_glb)
-        buffer0 = bytearray(buffer0_bytes)
-
         bone_name_to_index_dict: dict[str, int] = {}
         object_name_to_index_dict: dict[str, int] = {}
         image_name_to_index_dict: dict[str, int] = {}
@@ -2686,7 +2691,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             if not json_dict.get(key):
                 json_dict.pop(key, None)
 
-        return pack_glb(json_dict, buffer0)
+        return Glb(json_dict, [buffer0])
 
 
 def find_node_world_matrix(
@@ -13,7 +13,7 @@ from ..common import version
 from ..common.convert import Json
 from ..common.deep import make_json
 from ..common.gl import GL_FLOAT
-from ..common.gltf import pack_glb
+from ..common.gltf import Glb, write_glb
 from ..common.logging import get_logger
 from ..common.vrm1.human_bone import (
     HumanBoneName,
@@ -61,7 +61,7 @@ def connect_humanoid_node_dicts(
         )
 
 
-def work_in_progress_2(context: Context, armature: Object) -> bytes:
+def work_in_progress_2(context: Context, armature: Object) -> Glb:
     armature_data = armature.data
     if not isinstance(armature_data, Armature):
         message = "Armature data is not an Armature"
@@ -890,7 +890,7 @@ def work_in_progress_2(context: Context, armature: Object) -> bytes:
         message = "vrma_dict is not dict"
         raise TypeError(message)
 
-    return pack_glb(vrma_dict, buffer0_bytearray)
+    return Glb(vrma_dict, [buffer0_bytearray])
 
 
 def work_in_progress(context: Context, path: Path, armature: Object) -> set[str]:
@@ -905,7 +905,7 @@ def work_in_progress(context: Context, path: Path, armature: Object) -> set[str]
     # saved_current_pose_matrix_dict = {}
     saved_pose_position = armature_data.pose_position
     # vrm1 = get_armature_extension(armature.data).vrm1
-    output_bytes = None
+    output_glb = None
 
     # TODO: 現状restがTポーズの時しか動作しない
     # TODO: 自動でTポーズを作成する
@@ -945,7 +945,7 @@ def work_in_progress(context: Context, path: Path, armature: Object) -> set[str]
 
             context.view_layer.update()
 
-            output_bytes = work_in_progress_2(context, armature)
+            output_glb = work_in_progress_2(context, armature)
         finally:
             # TODO: リストア処理、共通化
             if armature_data.pose_position != saved_pose_position:
@@ -968,5 +968,6 @@ def work_in_progress(context: Context, path: Path, armature: Object) -> set[str]
         #         bone.matrix = matrix
         #     bones.extend(bone.children)
 
-    path.write_bytes(output_bytes)
+    with path.open("wb") as file:
+        write_glb(file, output_glb.json_dict, output_glb.bin_chunk_segments)
     return {"FINISHED"}
@@ -2,12 +2,18 @@
 import dataclasses
 import datetime
 import importlib
+import json
 import logging
+from collections.abc import Iterator
 from collections.abc import Set as AbstractSet
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
 
 import bpy
 from bpy.types import Context, Event, Image, Operator
 
+from ..common.convert import Json
 from ..common.logging import get_logger
 
 #
@@ -35,6 +41,24 @@ class WM_OT_vrm_io_scene_gltf2_disabled_warning(Operator):
         )
 
 
+def get_image_mime_type(image: Image) -> str:
+    return "image/jpeg" if image.file_format == "JPEG" else "image/png"
+
+
+def get_addon_version() -> Optional[tuple[int, ...]]:
+    try:
+        io_scene_gltf2 = importlib.import_module("io_scene_gltf2")
+    except ModuleNotFoundError:
+        return None
+    bl_info = getattr(io_scene_gltf2, "bl_info", None)
+    if not isinstance(bl_info, dict):
+        return None
+    version = bl_info.get("version")
+    if not isinstance(version, tuple):
+        return None
+    return tuple(v for v in version if isinstance(v, int))
+
+
 def image_to_image_bytes(
     image: Image, export_settings: dict[str, object]
 ) -> tuple[bytes, str]:
@@ -52,7 +76,7 @@ def image_to_image_bytes(
         )
     export_image = gltf2_blender_image.ExportImage.from_blender_image(image)
 
-    mime_type = "image/jpeg" if image.file_format == "JPEG" else "image/png"
+    mime_type = get_image_mime_type(image)
 
     if bpy.app.version < (3, 3, 0):
         # https://github.com/KhronosGroup/glTF-Blender-IO/blob/518b6466032534c4be4a4c50ca72d37c169a5ebf/addons/io_scene_gltf2/blender/exp/gltf2_blender_image.py
@@ -181,6 +205,70 @@ def import_scene_gltf(arguments: ImportSceneGltfArguments) -> set[str]:
     )
 
 
+@contextmanager
+def provide_gltf_to_import(
+    filepath: Path,
+    json_dict: dict[str, Json],
+    bin_chunk_bytes: Union[bytes, memoryview],
+) -> Iterator[bool]:
+    """Let the glTF 2.0 add-on import the given glTF without reading the file.
+
+    While active, importing ``filepath`` loads ``json_dict`` and ``bin_chunk_bytes``
+    instead of the file content. If the add-on internals are not compatible, False
+    is yielded and the caller has to write the file as usual.
+    """
+    try:
+        # https://github.com/KhronosGroup/glTF-Blender-IO/blob/709630548cdc184af6ea50b2ff3ddc5450bc0af3/addons/io_scene_gltf2/io/imp/gltf2_io_gltf.py#L145
+        gltf2_io_gltf = importlib.import_module("io_scene_gltf2.io.imp.gltf2_io_gltf")
+    except ModuleNotFoundError:
+        yield False
+        return
+
+    gltf_importer_class = getattr(gltf2_io_gltf, "glTFImporter", None)
+    gltf_from_dict = getattr(gltf2_io_gltf, "gltf_from_dict", None)
+    import_error_class = getattr(gltf2_io_gltf, "ImportError", None)
+    read = getattr(gltf_importer_class, "read", None)
+    check_version = getattr(gltf_importer_class, "check_version", None)
+    if not (
+        isinstance(gltf_importer_class, type)
+        and callable(gltf_from_dict)
+        and isinstance(import_error_class, type)
+        and issubclass(import_error_class, Exception)
+        and callable(read)
+        and callable(check_version)
+    ):
+        yield False
+        return
+
+    # The add-on keeps views of the BIN chunk after importing, so a memoryview such
+    # as the mmap of the original file must not be passed as is.
+    glb_buffer = (
+        bin_chunk_bytes.tobytes()
+        if isinstance(bin_chunk_bytes, memoryview)
+        else bin_chunk_bytes
+    )
+
+    def read_in_memory(gltf_importer: object, *args: object, **kwargs: object) -> None:
+        if getattr(gltf_importer, "filename", None) != str(filepath):
+            read(gltf_importer, *args, **kwargs)
+            return
+
+        check_version(json_dict)
+        gltf_importer.glb_buffer = memoryview(glb_buffer)  # type: ignore[attr-defined]
+        try:
+            data = gltf_from_dict(json_dict)
+        except AssertionError as e:
+            message = "Couldn't parse glTF. Check that the file is valid"
+            raise import_error_class(message) from e
+        gltf_importer.data = data  # type: ignore[attr-defined]
+
+    gltf_importer_class.read = read_in_memory  # type: ignore[attr-defined]
+    try:
+        yield True
+    finally:
+        gltf_importer_class.read = read  # type: ignore[attr-defined]
+
+
 @dataclasses.dataclass
 class ExportSceneGltfArguments:
     filepath: str
@@ -297,3 +385,74 @@ def export_scene_gltf(arguments: ExportSceneGltfArguments) -> set[str]:
 
     arguments.export_animations = False
     return __invoke_export_scene_gltf(arguments)
+
+
+@dataclasses.dataclass
+class ExportedGlb:
+    json_dict: Optional[dict[str, Json]] = None
+    buffer0: bytearray = dataclasses.field(default_factory=bytearray)
+
+
+@contextmanager
+def capture_exported_glb() -> Iterator[Optional[ExportedGlb]]:
+    """Keep the GLB generated by the glTF 2.0 add-on in memory.
+
+    While active, the add-on does not write the GLB file. If the add-on internals are
+    not compatible, None is yielded and the file is written as usual.
+    """
+    gltf2_io_export = None
+    for module_name in [
+        # https://github.com/KhronosGroup/glTF-Blender-IO/blob/709630548cdc184af6ea50b2ff3ddc5450bc0af3/addons/io_scene_gltf2/io/exp/gltf2_io_export.py#L31
+        "io_scene_gltf2.io.exp.gltf2_io_export",
+        "io_scene_gltf2.io.exp.export",
+    ]:
+        try:
+            gltf2_io_export = importlib.import_module(module_name)
+        except ModuleNotFoundError:
+            continue
+        break
+
+    save_gltf = getattr(gltf2_io_export, "save_gltf", None)
+    if gltf2_io_export is None or not callable(save_gltf):
+        yield None
+        return
+
+    exported_glb = ExportedGlb()
+
+    def save_gltf_in_memory(
+        gltf: object,
+        export_settings: object,
+        encoder: object,
+        glb_buffer: object,
+        *args: object,
+        **kwargs: object,
+    ) -> object:
+        if not (
+            isinstance(export_settings, dict)
+            and export_settings.get("gltf_format") == "GLB"
+            and isinstance(gltf, dict)
+            and isinstance(encoder, type)
+            and issubclass(encoder, json.JSONEncoder)
+            and isinstance(glb_buffer, (bytes, bytearray))
+        ):
+            return save_gltf(
+                gltf, export_settings, encoder, glb_buffer, *args, **kwargs
+            )
+
+        # Blenderのオブジェクトなどが含まれていることがあるため、
+        # GLBに書き込まれるのと同一の内容に変換する
+        json_dict = json.loads(json.dumps(gltf, cls=encoder, allow_nan=False))
+        if not isinstance(json_dict, dict):
+            message = f"Unexpected glTF json type: {type(json_dict)}"
+            raise TypeError(message)
+        buffer0 = bytearray(glb_buffer)
+        buffer0.extend(b"\x00" * (-len(buffer0) % 4))
+        exported_glb.json_dict = json_dict
+        exported_glb.buffer0 = buffer0
+        return True
+
+    gltf2_io_export.save_gltf = save_gltf_in_memory  # type: ignore[attr-defined]
+    try:
+        yield exported_glb
+    finally:
+        gltf2_io_export.save_gltf = save_gltf  # type: ignore[attr-defined]
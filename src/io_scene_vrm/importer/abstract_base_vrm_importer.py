@@ -14,9 +14,10 @@ import struct
 import tempfile
 from abc import ABC, abstractmethod
 from collections.abc import Iterator, Mapping
+from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import bpy
 import mathutils
@@ -40,15 +41,17 @@ from ..common.fs import (
     create_unique_indexed_file_path,
 )
 from ..common.gl import GL_FLOAT, GL_LINEAR, GL_REPEAT, GL_UNSIGNED_SHORT
-from ..common.gltf import FLOAT_NEGATIVE_MAX, FLOAT_POSITIVE_MAX, pack_glb, parse_glb
+from ..common.gltf import FLOAT_NEGATIVE_MAX, FLOAT_POSITIVE_MAX, write_glb
 from ..common.logging import get_logger
 from ..common.preferences import ImportPreferencesProtocol
 from ..common.progress import PartialProgress, create_progress
 from ..common.workspace import save_workspace
 from ..editor.extension import get_armature_extension
+from ..editor.vrm0.property_group import defer_bone_group_refresh
 from ..external.io_scene_gltf2_support import (
     ImportSceneGltfArguments,
     import_scene_gltf,
+    provide_gltf_to_import,
 )
 from .gltf2_addon_importer_user_extension import Gltf2AddonImporterUserExtension
 from .license_validation import validate_license
@@ -60,6 +63,7 @@ logger = get_logger(__name__)
 class ParseResult:
     filepath: Path
     json_dict: Mapping[str, Json]
+    bin_chunk_bytes: Union[bytes, memoryview]
     spec_version_number: tuple[int, int]
     spec_version_str: str
     spec_version_is_stable: bool
@@ -68,6 +72,14 @@ class ParseResult:
     hips_node_index: Optional[int]
 
 
+@dataclass(frozen=True)
+class SyntheticBufferViewIndices:
+    position: int
+    texcoord: int
+    joints: int
+    weights: int
+
+
 class AbstractBaseVrmImporter(ABC):
     def __init__(
         self,
@@ -106,7 +118,10 @@ class AbstractBaseVrmImporter(ABC):
     def import_vrm(self) -> None:
         try:
             with create_progress(self.context) as progress:
-                with save_workspace(self.context):
+                with (
+                    save_workspace(self.context),
+                    defer_bone_group_refresh(self.context),
+                ):
                     progress.update(0.1)
                     self.import_gltf2_with_indices()
                     progress.update(0.3)
@@ -502,8 +517,97 @@ class AbstractBaseVrmImporter(ABC):
             )
         return result
 
+    def import_indexed_gltf(
+        self,
+        json_dict: dict[str, Json],
+        buffer0_bytes: Union[bytes, memoryview],
+        bone_heuristic: str,
+    ) -> None:
+        """インデックスを埋め込んだglTFをglTF 2.0アドオンでインポートする.
+
+        可能であればファイルを経由せず、メモリ上のjsonとBINチャンクを直接渡す。
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            indexed_vrm_filepath = Path(temp_dir, "indexed.vrm")
+            with provide_gltf_to_import(
+                indexed_vrm_filepath, json_dict, buffer0_bytes
+            ) as provided:
+                if not provided:
+                    with indexed_vrm_filepath.open("wb") as file:
+                        write_glb(file, json_dict, [buffer0_bytes])
+                import_scene_gltf(
+                    ImportSceneGltfArguments(
+                        filepath=str(indexed_vrm_filepath),
+                        import_pack_images=True,
+                        bone_heuristic=bone_heuristic,
+                        guess_original_bind_pose=False,
+                        disable_bone_shape=True,
+                    )
+                )
+
+    def append_synthetic_buffer_views(
+        self, json_dict: dict[str, Json]
+    ) -> SyntheticBufferViewIndices:
+        """ダミーのプリミティブ用のバッファを一つだけ追加する."""
+        position_buffer_bytes = struct.pack(
+            "<9f", 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0
+        )
+        texcoord_buffer_bytes = struct.pack("<6f", 0.0, 0.0, 1.0, 0.0, 0.0, 1.0)
+        joints_buffer_bytes = struct.pack("<12H", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        weights_buffer_bytes = struct.pack(
+            "<12f", 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0
+        )
+        buffer_bytes = (
+            position_buffer_bytes
+            + texcoord_buffer_bytes
+            + joints_buffer_bytes
+            + weights_buffer_bytes
+        )
+
+        buffer_dicts = json_dict.get("buffers")
+        if not isinstance(buffer_dicts, list):
+            buffer_dicts = []
+            json_dict["buffers"] = buffer_dicts
+        buffer_index = len(buffer_dicts)
+        buffer_dicts.append(
+            {
+                "uri": "data:application/gltf-buffer;base64,"
+                + base64.b64encode(buffer_bytes).decode("ascii"),
+                "byteLength": len(buffer_bytes),
+            }
+        )
+
+        buffer_view_dicts = json_dict.get("bufferViews")
+        if not isinstance(buffer_view_dicts, list):
+            buffer_view_dicts = []
+            json_dict["bufferViews"] = buffer_view_dicts
+        buffer_view_indices: list[int] = []
+        byte_offset = 0
+        for buffer_view_bytes in [
+            position_buffer_bytes,
+            texcoord_buffer_bytes,
+            joints_buffer_bytes,
+            weights_buffer_bytes,
+        ]:
+            buffer_view_indices.append(len(buffer_view_dicts))
+            buffer_view_dicts.append(
+                {
+                    "buffer": buffer_index,
+                    "byteOffset": byte_offset,
+                    "byteLength": len(buffer_view_bytes),
+                }
+            )
+            byte_offset += len(buffer_view_bytes)
+
+        position, texcoord, joints, weights = buffer_view_indices
+        return SyntheticBufferViewIndices(
+            position=position, texcoord=texcoord, joints=joints, weights=weights
+        )
+
     def import_gltf2_with_indices(self) -> None:
-        json_dict, buffer0_bytes = parse_glb(self.parse_result.filepath.read_bytes())
+        # The parsed json is shared with ParseResult, so modify a copy of it.
+        json_dict = dict(deepcopy(self.parse_result.json_dict))
+        buffer0_bytes = self.parse_result.bin_chunk_bytes
 
         for key in ["nodes", "materials", "meshes"]:
             if key not in json_dict or not isinstance(json_dict[key], list):
@@ -597,54 +701,20 @@ class AbstractBaseVrmImporter(ABC):
                     mesh_extras_dict["targetNames"] = primitive_target_names
                     break
 
+        # ダミーのプリミティブのジオメトリは全て同一のため、一つのバッファを共有する
+        synthetic_buffer_view_indices: Optional[SyntheticBufferViewIndices] = None
+
         texture_dicts = json_dict.get("textures")
         if isinstance(texture_dicts, list) and texture_dicts:
             primitive_dicts = list[Json]()
 
             for texture_index, _ in enumerate(texture_dicts):
-                buffer_dicts = json_dict.get("buffers")
-                if not isinstance(buffer_dicts, list):
-                    buffer_dicts = []
-                    json_dict["buffers"] = buffer_dicts
-                position_buffer_index = len(buffer_dicts)
-                position_buffer_bytes = struct.pack(
-                    "<9f", 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0
-                )
-                buffer_dicts.append(
-                    {
-                        "uri": "data:application/gltf-buffer;base64,"
-                        + base64.b64encode(position_buffer_bytes).decode("ascii"),
-                        "byteLength": len(position_buffer_bytes),
-                    }
-                )
-                texcoord_buffer_index = len(buffer_dicts)
-                texcoord_buffer_bytes = struct.pack("<6f", 0.0, 0.0, 1.0, 0.0, 0.0, 1.0)
-                buffer_dicts.append(
-                    {
-                        "uri": "data:application/gltf-buffer;base64,"
-                        + base64.b64encode(texcoord_buffer_bytes).decode("ascii"),
-                        "byteLength": len(texcoord_buffer_bytes),
-                    }
-                )
-
-                buffer_view_dicts = json_dict.get("bufferViews")
-                if not isinstance(buffer_view_dicts, list):
-                    buffer_view_dicts = []
-                    json_dict["bufferViews"] = buffer_view_dicts
-                position_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": position_buffer_index,
-                        "byteLength": len(position_buffer_bytes),
-                    }
-                )
-                texcoord_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": texcoord_buffer_index,
-                        "byteLength": len(texcoord_buffer_bytes),
-                    }
-                )
+                if synthetic_buffer_view_indices is None:
+                    synthetic_buffer_view_indices = self.append_synthetic_buffer_views(
+                        json_dict
+                    )
+                position_buffer_view_index = synthetic_buffer_view_indices.position
+                texcoord_buffer_view_index = synthetic_buffer_view_indices.texcoord
 
                 accessor_dicts = json_dict.get("accessors")
                 if not isinstance(accessor_dicts, list):
@@ -726,69 +796,13 @@ class AbstractBaseVrmImporter(ABC):
                 if not retain_node_indices:
                     continue
 
-                buffer_dicts = json_dict.get("buffers")
-                if not isinstance(buffer_dicts, list):
-                    buffer_dicts = []
-                    json_dict["buffers"] = buffer_dicts
-                position_buffer_index = len(buffer_dicts)
-                position_buffer_bytes = struct.pack(
-                    "<9f", 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0
-                )
-                buffer_dicts.append(
-                    {
-                        "uri": "data:application/gltf-buffer;base64,"
-                        + base64.b64encode(position_buffer_bytes).decode("ascii"),
-                        "byteLength": len(position_buffer_bytes),
-                    }
-                )
-                joints_buffer_index = len(buffer_dicts)
-                joints_buffer_bytes = struct.pack(
-                    "<12H", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0
-                )
-                buffer_dicts.append(
-                    {
-                        "uri": "data:application/gltf-buffer;base64,"
-                        + base64.b64encode(joints_buffer_bytes).decode("ascii"),
-                        "byteLength": len(joints_buffer_bytes),
-                    }
-                )
-                weights_buffer_index = len(buffer_dicts)
-                weights_buffer_bytes = struct.pack(
-                    "<12f", 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0
-                )
-                buffer_dicts.append(
-                    {
-                        "uri": "data:application/gltf-buffer;base64,"
-                        + base64.b64encode(weights_buffer_bytes).decode("ascii"),
-                        "byteLength": len(weights_buffer_bytes),
-                    }
-                )
-
-                buffer_view_dicts = json_dict.get("bufferViews")
-                if not isinstance(buffer_view_dicts, list):
-                    buffer_view_dicts = []
-                    json_dict["bufferViews"] = buffer_view_dicts
-                position_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": position_buffer_index,
-                        "byteLength": len(position_buffer_bytes),
-                    }
-                )
-                joints_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": joints_buffer_index,
-                        "byteLength": len(joints_buffer_bytes),
-                    }
-                )
-                weights_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": weights_buffer_index,
-                        "byteLength": len(weights_buffer_bytes),
-                    }
-                )
+                if synthetic_buffer_view_indices is None:
+                    synthetic_buffer_view_indices = self.append_synthetic_buffer_views(
+                        json_dict
+                    )
+                position_buffer_view_index = synthetic_buffer_view_indices.position
+                joints_buffer_view_index = synthetic_buffer_view_indices.joints
+                weights_buffer_view_index = synthetic_buffer_view_indices.weights
 
                 accessor_dicts = json_dict.get("accessors")
                 if not isinstance(accessor_dicts, list):
@@ -927,54 +941,30 @@ class AbstractBaseVrmImporter(ABC):
         else:
             bone_heuristic = "BLENDER"
         full_vrm_import_success = False
-        with tempfile.TemporaryDirectory() as temp_dir:
-            indexed_vrm_filepath = Path(temp_dir, "indexed.vrm")
-            indexed_vrm_filepath.write_bytes(pack_glb(json_dict, buffer0_bytes))
+        try:
+            self.import_indexed_gltf(json_dict, buffer0_bytes, bone_heuristic)
+            full_vrm_import_success = True
+        except RuntimeError:
+            logger.exception(
+                'Failed to import indexed "%s" using glTF 2.0 Add-on',
+                self.parse_result.filepath,
+            )
+            self.cleanup_gltf2_with_indices()
+        if not full_vrm_import_success:
+            # Some VRMs have broken animations.
+            # https://github.com/vrm-c/UniVRM/issues/1522
+            # https://github.com/saturday06/VRM-Addon-for-Blender/issues/58
+            json_dict.pop("animations", None)
             try:
-                import_scene_gltf(
-                    ImportSceneGltfArguments(
-                        filepath=str(indexed_vrm_filepath),
-                        import_pack_images=True,
-                        bone_heuristic=bone_heuristic,
-                        guess_original_bind_pose=False,
-                        disable_bone_shape=True,
-                    )
-                )
-                full_vrm_import_success = True
+                self.import_indexed_gltf(json_dict, buffer0_bytes, bone_heuristic)
             except RuntimeError:
                 logger.exception(
-                    'Failed to import "%s" generated from "%s" using glTF 2.0 Add-on',
-                    indexed_vrm_filepath,
+                    'Failed to import indexed "%s"'
+                    " using glTF 2.0 Add-on without animations key",
                     self.parse_result.filepath,
                 )
                 self.cleanup_gltf2_with_indices()
-        if not full_vrm_import_success:
-            # Some VRMs have broken animations.
-            # https://github.com/vrm-c/UniVRM/issues/1522
-            # https://github.com/saturday06/VRM-Addon-for-Blender/issues/58
-            json_dict.pop("animations", None)
-            with tempfile.TemporaryDirectory() as temp_dir:
-                indexed_vrm_filepath = Path(temp_dir, "indexed.vrm")
-                indexed_vrm_filepath.write_bytes(pack_glb(json_dict, buffer0_bytes))
-                try:
-                    import_scene_gltf(
-                        ImportSceneGltfArguments(
-                            filepath=str(indexed_vrm_filepath),
-                            import_pack_images=True,
-                            bone_heuristic=bone_heuristic,
-                            guess_original_bind_pose=False,
-                            disable_bone_shape=True,
-                        )
-                    )
-                except RuntimeError:
-                    logger.exception(
-                        'Failed to import "%s" generated from "%s"'
-                        " using glTF 2.0 Add-on without animations key",
-                        indexed_vrm_filepath,
-                        self.parse_result.filepath,
-                    )
-                    self.cleanup_gltf2_with_indices()
-                    raise
+                raise
         # glTFインポート直後のオブジェクトの選択状態を保存
         self.imported_object_names = [
             selected_object.name for selected_object in self.context.selected_objects
@@ -1307,8 +1297,13 @@ class AbstractBaseVrmImporter(ABC):
             self.context.view_layer.objects.active = self.armature
 
 
-def parse_vrm_json(filepath: Path, *, license_validation: bool) -> ParseResult:
-    json_dict, _ = parse_glb(filepath.read_bytes())
+def parse_vrm_json(
+    filepath: Path,
+    json_dict: dict[str, Json],
+    bin_chunk_bytes: Union[bytes, memoryview],
+    *,
+    license_validation: bool,
+) -> ParseResult:
 
     extensions_dict = json_dict.get("extensions")
     if isinstance(extensions_dict, dict):
@@ -1348,6 +1343,7 @@ def parse_vrm_json(filepath: Path, *, license_validation: bool) -> ParseResult:
     return ParseResult(
         filepath=filepath,
         json_dict=json_dict,
+        bin_chunk_bytes=bin_chunk_bytes,
         spec_version_number=spec_version_number,
         spec_version_str=spec_version_str,
         spec_version_is_stable=spec_version_is_stable,
@@ -19,6 +19,7 @@ from bpy.types import (
 from bpy_extras.io_utils import ImportHelper
 
 from ..common import ops, version
+from ..common.gltf import open_glb
 from ..common.logging import get_logger
 from ..common.preferences import (
     ImportPreferencesProtocol,
@@ -331,21 +332,27 @@ def import_vrm(
     *,
     license_validation: bool,
 ) -> set[str]:
-    parse_result = parse_vrm_json(filepath, license_validation=license_validation)
-    if parse_result.spec_version_number >= (1,):
-        vrm_importer: AbstractBaseVrmImporter = Vrm1Importer(
-            context,
-            parse_result,
-            preferences,
-        )
-    else:
-        vrm_importer = Vrm0Importer(
-            context,
-            parse_result,
-            preferences,
+    with open_glb(filepath) as (json_dict, bin_chunk_bytes):
+        parse_result = parse_vrm_json(
+            filepath,
+            json_dict,
+            bin_chunk_bytes,
+            license_validation=license_validation,
         )
+        if parse_result.spec_version_number >= (1,):
+            vrm_importer: AbstractBaseVrmImporter = Vrm1Importer(
+                context,
+                parse_result,
+                preferences,
+            )
+        else:
+            vrm_importer = Vrm0Importer(
+                context,
+                parse_result,
+                preferences,
+            )
 
-    vrm_importer.import_vrm()
+        vrm_importer.import_vrm()
 
     return {"FINISHED"}
 
@@ -180,21 +180,36 @@ class Vrm0Importer(AbstractBaseVrmImporter):
             for index in range(len(material_dicts))
         ]
 
-        for index, material_property in enumerate(material_properties):
-            assignment_method = shader_to_assignment_method.get(
-                material_property.shader
-            )
-            if not assignment_method:
-                continue
+        with shader.use_mtoon1_template(self.context):
+            index_to_material: dict[int, Material] = {}
+            for index, material_property in enumerate(material_properties):
+                if material_property.shader not in shader_to_assignment_method:
+                    continue
+
+                material = self.materials.get(index)
+                if not material:
+                    material = self.context.blend_data.materials.new(
+                        material_property.name
+                    )
+                    self.materials[index] = material
+
+                self.reset_material(material)
+                index_to_material[index] = material
 
-            material = self.materials.get(index)
-            if not material:
-                material = self.context.blend_data.materials.new(material_property.name)
-                self.materials[index] = material
+            # テンプレートは一度だけアペンドし、全てのマテリアルにコピーする
+            shader.load_mtoon1_shaders(
+                self.context,
+                list(index_to_material.values()),
+                reset_node_groups=False,
+            )
 
-            self.reset_material(material)
-            assignment_method(material, material_property)
-            progress.update(float(index) / len(material_properties))
+            for index, material in index_to_material.items():
+                material_property = material_properties[index]
+                assignment_method = shader_to_assignment_method[
+                    material_property.shader
+                ]
+                assignment_method(material, material_property)
+                progress.update(float(index) / len(material_properties))
 
         progress.update(1)
 
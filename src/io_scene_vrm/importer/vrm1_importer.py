@@ -9,13 +9,14 @@ from bpy.types import (
     CopyRotationConstraint,
     DampedTrackConstraint,
     EditBone,
+    Material,
     Mesh,
     Object,
     PoseBone,
 )
 from mathutils import Matrix, Vector
 
-from ..common import convert, ops, shader
+from ..common import convert, shader
 from ..common.convert import Json
 from ..common.logging import get_logger
 from ..common.preferences import get_preferences
@@ -42,6 +43,7 @@ from ..editor.mtoon1.property_group import (
     Mtoon1TextureInfoPropertyGroup,
     Mtoon1TexturePropertyGroup,
 )
+from ..editor.property_group import BonePropertyGroup
 from ..editor.spring_bone1.property_group import (
     SpringBone1ColliderPropertyGroup,
     SpringBone1SpringBonePropertyGroup,
@@ -168,16 +170,16 @@ class Vrm1Importer(AbstractBaseVrmImporter):
             khr_texture_transform_dict,
         )
 
-    def make_mtoon1_material(
+    def prepare_mtoon1_material(
         self, material_index: int, gltf_dict: dict[str, Json]
-    ) -> None:
+    ) -> Optional[Material]:
         extensions_dict = gltf_dict.get("extensions")
         if not isinstance(extensions_dict, dict):
-            return
+            return None
 
         mtoon_dict = extensions_dict.get("VRMC_materials_mtoon")
         if not isinstance(mtoon_dict, dict):
-            return
+            return None
 
         material = self.materials.get(material_index)
         if not material:
@@ -186,6 +188,19 @@ class Vrm1Importer(AbstractBaseVrmImporter):
                 name = "Material"
             material = self.context.blend_data.materials.new(name)
         self.reset_material(material)
+        return material
+
+    def make_mtoon1_material(
+        self, material: Material, gltf_dict: dict[str, Json]
+    ) -> None:
+        extensions_dict = gltf_dict.get("extensions")
+        if not isinstance(extensions_dict, dict):
+            return
+
+        mtoon_dict = extensions_dict.get("VRMC_materials_mtoon")
+        if not isinstance(mtoon_dict, dict):
+            return
+
         material.use_backface_culling = True
 
         gltf = get_material_extension(material).mtoon1
@@ -391,10 +406,27 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         if not isinstance(material_dicts, list):
             progress.update(1)
             return
-        for index, material_dict in enumerate(material_dicts):
-            if isinstance(material_dict, dict):
-                self.make_mtoon1_material(index, material_dict)
-            progress.update(float(index) / len(material_dicts))
+        with shader.use_mtoon1_template(self.context):
+            index_to_material: dict[int, Material] = {}
+            for index, material_dict in enumerate(material_dicts):
+                if not isinstance(material_dict, dict):
+                    continue
+                material = self.prepare_mtoon1_material(index, material_dict)
+                if material:
+                    index_to_material[index] = material
+
+            # テンプレートは一度だけアペンドし、全てのマテリアルにコピーする
+            shader.load_mtoon1_shaders(
+                self.context,
+                list(index_to_material.values()),
+                reset_node_groups=False,
+            )
+
+            for index, material_dict in enumerate(material_dicts):
+                material = index_to_material.get(index)
+                if material and isinstance(material_dict, dict):
+                    self.make_mtoon1_material(material, material_dict)
+                progress.update(float(index) / len(material_dicts))
         progress.update(1)
 
     def find_vrm1_bone_node_indices(self) -> list[int]:
@@ -1289,13 +1321,16 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         self,
         collider: SpringBone1ColliderPropertyGroup,
         collider_dict: dict[str, Json],
+        bone_name_to_uuid: dict[str, str],
     ) -> None:
         bone: Optional[Bone] = None
         node_index = collider_dict.get("node")
         if isinstance(node_index, int):
             bone_name = self.bone_names.get(node_index)
             if isinstance(bone_name, str):
-                collider.node.set_bone_name(bone_name)
+                bone_uuid = bone_name_to_uuid.get(bone_name)
+                if bone_uuid is not None:
+                    collider.node.assign_bone_uuid(self.armature_data, bone_uuid)
                 if collider.bpy_object:
                     collider.bpy_object.name = f"{bone_name} Collider"
                 bone = self.armature_data.bones.get(collider.node.bone_name)
@@ -1485,6 +1520,7 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         spring_bone: SpringBone1SpringBonePropertyGroup,
         spring_bone_dict: dict[str, Json],
         armature: Object,
+        bone_name_to_uuid: dict[str, str],
     ) -> None:
         collider_dicts = spring_bone_dict.get("colliders")
         if not isinstance(collider_dicts, list):
@@ -1492,21 +1528,16 @@ class Vrm1Importer(AbstractBaseVrmImporter):
 
         for collider_dict in collider_dicts:
             # ColliderGroupからColliderへの参照はindexでの参照のため、
-            # collider_dictの中身が不正でも空のデータは作成しておく
-            if ops.vrm.add_spring_bone1_collider(armature_name=armature.name) != {
-                "FINISHED"
-            }:
-                message = f'Failed to add spring bone 1.0 collider to "{armature.name}"'
-                raise ValueError(message)
-
-            collider = spring_bone.colliders[-1]
+            # collider_dictの中身が不正でも空のデータは作成しておく。
+            # 要素ごとにオペレーターを呼ぶと遅いので、直接追加する
+            collider = spring_bone.add_collider(self.context, armature)
 
             if not isinstance(collider_dict, dict):
                 collider.shape.sphere.radius = 0.0001
                 collider.shape.sphere.offset = (0, 0, -10000)
                 continue
 
-            self.load_spring_bone1_collider(collider, collider_dict)
+            self.load_spring_bone1_collider(collider, collider_dict, bone_name_to_uuid)
 
         for collider in spring_bone.colliders:
             collider.reset_bpy_object(self.context, armature)
@@ -1541,30 +1572,19 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         self,
         spring_bone: SpringBone1SpringBonePropertyGroup,
         spring_bone_dict: dict[str, Json],
-        armature_name: str,
     ) -> None:
         collider_group_dicts = spring_bone_dict.get("colliderGroups")
         if not isinstance(collider_group_dicts, list):
             collider_group_dicts = []
 
-        for collider_group_index, collider_group_dict in enumerate(
-            collider_group_dicts
-        ):
+        for collider_group_dict in collider_group_dicts:
             # SpringからColliderGroupへの参照はindexでの参照のため、
             # collider_group_dictの中身が不正でも空のデータは作成しておく
-            if ops.vrm.add_spring_bone1_collider_group(armature_name=armature_name) != {
-                "FINISHED"
-            }:
-                message = (
-                    f"Failed to add spring bone 1.0 collider group to {armature_name}"
-                )
-                raise ValueError(message)
+            collider_group = spring_bone.add_collider_group()
 
             if not isinstance(collider_group_dict, dict):
                 continue
 
-            collider_group = spring_bone.collider_groups[-1]
-
             name = collider_group_dict.get("name")
             if isinstance(name, str):
                 collider_group.vrm_name = name
@@ -1574,14 +1594,7 @@ class Vrm1Importer(AbstractBaseVrmImporter):
                 continue
 
             for collider_index in collider_indices:
-                if ops.vrm.add_spring_bone1_collider_group_collider(
-                    armature_name=armature_name,
-                    collider_group_index=collider_group_index,
-                ) != {"FINISHED"}:
-                    raise ValueError(
-                        "Failed to assign spring bone 1.0 collider to collider group "
-                        + f"{collider_group_index} in {armature_name}"
-                    )
+                collider_reference = collider_group.colliders.add()
                 if not isinstance(collider_index, int):
                     continue
                 if not 0 <= collider_index < len(spring_bone.colliders):
@@ -1589,7 +1602,6 @@ class Vrm1Importer(AbstractBaseVrmImporter):
                 collider = spring_bone.colliders[collider_index]
                 if not collider:
                     continue
-                collider_reference = collider_group.colliders[-1]
                 collider_reference.collider_name = collider.name
             collider_group.active_collider_index = 0
         spring_bone.active_collider_group_index = 0
@@ -1598,20 +1610,17 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         self,
         spring_bone: SpringBone1SpringBonePropertyGroup,
         spring_bone_dict: dict[str, Json],
-        armature_name: str,
+        bone_name_to_uuid: dict[str, str],
     ) -> None:
         spring_dicts = spring_bone_dict.get("springs")
         if not isinstance(spring_dicts, list):
             spring_dicts = []
 
         for spring_dict in spring_dicts:
-            if ops.vrm.add_spring_bone1_spring(armature_name=armature_name) != {
-                "FINISHED"
-            } or not isinstance(spring_dict, dict):
+            spring = spring_bone.add_spring()
+            if not isinstance(spring_dict, dict):
                 continue
 
-            spring = spring_bone.springs[-1]
-
             name = spring_dict.get("name")
             if isinstance(name, str):
                 spring.vrm_name = name
@@ -1620,27 +1629,25 @@ class Vrm1Importer(AbstractBaseVrmImporter):
             if isinstance(center_index, int):
                 bone_name = self.bone_names.get(center_index)
                 if bone_name:
-                    spring.center.set_bone_name(bone_name)
+                    bone_uuid = bone_name_to_uuid.get(bone_name)
+                    if bone_uuid is not None:
+                        spring.center.assign_bone_uuid(self.armature_data, bone_uuid)
 
             joint_dicts = spring_dict.get("joints")
             if not isinstance(joint_dicts, list):
                 joint_dicts = []
             for joint_dict in joint_dicts:
-                if ops.vrm.add_spring_bone1_spring_joint(
-                    armature_name=armature_name,
-                    spring_index=len(spring_bone.springs) - 1,
-                ) != {"FINISHED"}:
-                    continue
+                joint = spring.joints.add()
                 if not isinstance(joint_dict, dict):
                     continue
 
-                joint = spring.joints[-1]
-
                 node_index = joint_dict.get("node")
                 if isinstance(node_index, int):
                     bone_name = self.bone_names.get(node_index)
                     if bone_name:
-                        joint.node.set_bone_name(bone_name)
+                        bone_uuid = bone_name_to_uuid.get(bone_name)
+                        if bone_uuid is not None:
+                            joint.node.assign_bone_uuid(self.armature_data, bone_uuid)
 
                 hit_radius = joint_dict.get("hitRadius")
                 if isinstance(hit_radius, (int, float)):
@@ -1673,11 +1680,7 @@ class Vrm1Importer(AbstractBaseVrmImporter):
             if not isinstance(collider_group_indices, list):
                 collider_group_indices = []
             for collider_group_index in collider_group_indices:
-                if ops.vrm.add_spring_bone1_spring_collider_group(
-                    armature_name=armature_name,
-                    spring_index=len(spring_bone.springs) - 1,
-                ) != {"FINISHED"}:
-                    continue
+                collider_group_reference = spring.collider_groups.add()
                 if not isinstance(collider_group_index, int):
                     continue
                 if not 0 <= collider_group_index < len(spring_bone.collider_groups):
@@ -1685,7 +1688,6 @@ class Vrm1Importer(AbstractBaseVrmImporter):
                 collider_group = spring_bone.collider_groups[collider_group_index]
                 if not collider_group:
                     continue
-                collider_group_reference = spring.collider_groups[-1]
                 collider_group_reference.collider_group_name = collider_group.name
             spring.active_collider_group_index = 0
         spring_bone.active_spring_index = 0
@@ -1702,20 +1704,25 @@ class Vrm1Importer(AbstractBaseVrmImporter):
             message = "armature is None"
             raise ValueError(message)
 
-        self.load_spring_bone1_colliders(spring_bone, spring_bone_dict, armature)
-
-        self.load_spring_bone1_collider_groups(
-            spring_bone,
-            spring_bone_dict,
-            armature.name,
+        # ボーンの割り当てごとにset_bone_name()を呼ぶと、全ボーンのUUIDの検査などが
+        # 毎回行われるため、対応表を一度だけ作成して直接割り当てる
+        bone_name_to_uuid = BonePropertyGroup.create_bone_name_to_uuid(
+            self.armature_data
         )
 
-        self.load_spring_bone1_springs(
-            spring_bone,
-            spring_bone_dict,
-            armature.name,
+        self.load_spring_bone1_colliders(
+            spring_bone, spring_bone_dict, armature, bone_name_to_uuid
         )
 
+        self.load_spring_bone1_collider_groups(spring_bone, spring_bone_dict)
+
+        self.load_spring_bone1_springs(spring_bone, spring_bone_dict, bone_name_to_uuid)
+
+        # set_bone_name()がボーンの割り当てごとに行っていた更新を、最後に一度だけ行う
+        ext = get_armature_extension(self.armature_data)
+        for collider_group in ext.vrm0.secondary_animation.collider_groups:
+            collider_group.refresh(armature)
+
     def get_object_or_bone_by_node_index(
         self, node_index: int
     ) -> Union[Object, PoseBone, None]:
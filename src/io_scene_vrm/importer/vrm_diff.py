@@ -31,7 +31,10 @@ fixed_asset_generator_value = (
 def create_vrm_json_dict(data: bytes) -> dict[str, Json]:
     json_dict, buffer0_bytes = gltf.parse_glb(data)
     json_dict["__decoded_accessors"] = make_json(
-        read_accessors(json_dict, buffer0_bytes)
+        [
+            None if accessor is None else accessor.tolist()
+            for accessor in read_accessors(json_dict, buffer0_bytes, as_ndarray=True)
+        ]
     )
 
     extensions_dict = json_dict.get("extensions")
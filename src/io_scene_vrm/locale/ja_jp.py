@@ -90,6 +90,13 @@ translation_dictionary: dict[tuple[str, str], str] = {
     ): "4つに制限しません。ほとんどのビューアでは4つに制限するため、"
     + "ボーンを動かした際に予期しないメッシュの変形が発生する可能性があります。",
     ("*", "Export Lights"): "ライトをエクスポートする",
+    ("*", "Cache Encoded Images"): "エンコードした画像をキャッシュする",
+    (
+        "*",
+        "Reuse the encoded images of previous exports"
+        + " if the pixels and the encode settings are the same",
+    ): "画素とエンコード設定が同じ場合、以前のエクスポート時にエンコードした画像を"
+    + "再利用します",
     (
         "*",
         "No error. Ready for export VRM",
@@ -482,6 +489,60 @@ translation_dictionary: dict[tuple[str, str], str] = {
         "*",
         "Enable Animation",
     ): "アニメーションを有効にする",
+    ("*", "Solver"): "ソルバー",
+    ("*", "Calculate joints one by one"): "ジョイントを1つずつ計算します",
+    (
+        "*",
+        "Calculate joints of the same depth at once",
+    ): "同じ深さのジョイントをまとめて計算します",
+    ("*", "Bake SpringBone Animation"): "SpringBoneのアニメーションをベイク",
+    (
+        "*",
+        "Simulate SpringBone over the frames, write it as keyframes"
+        + " and disable the animation",
+    ): (
+        "フレームの範囲でSpringBoneを計算してキーフレームとして書き込み、"
+        + "アニメーションを無効にします"
+    ),
+    (
+        "*",
+        "Replaced the existing rotation keyframes of {bone_names}",
+    ): "既存の{bone_names}の回転のキーフレームを置き換えました",
+    ("*", "Start Frame"): "開始フレーム",
+    ("*", "End Frame"): "終了フレーム",
+    ("*", "Substep Policy"): "サブステップの方針",
+    ("*", "Catch Up"): "追いつく",
+    ("*", "Calculate every elapsed step"): "経過したすべてのステップを計算します",
+    (
+        "*",
+        "Calculate up to the max substeps and drop older steps",
+    ): "最大サブステップ数まで計算し、古いステップは破棄します",
+    ("*", "Limit"): "制限する",
+    ("*", "Merge"): "まとめる",
+    (
+        "*",
+        "Merge older steps into one large step to fit in the max substeps",
+    ): "最大サブステップ数に収まるよう、古いステップを1つの大きなステップにまとめます",
+    ("*", "Skip"): "スキップ",
+    (
+        "*",
+        "Drop the elapsed steps and restart the simulation from the current pose"
+        + " when the max substeps is exceeded",
+    ): (
+        "最大サブステップ数を超えた場合は、経過したステップを破棄して"
+        + "現在の姿勢からシミュレーションをやり直します"
+    ),
+    ("*", "Max Substeps"): "最大サブステップ数",
+    (
+        "*",
+        "Maximum number of steps calculated in a frame",
+    ): "1フレームで計算するステップの最大数",
+    ("*", "Max Substeps in a Frame: {count}"): "1フレームの最大サブステップ数: {count}",
+    ("*", "Reset Substep Counts"): "サブステップ数の記録をリセット",
+    (
+        "*",
+        "Clear the recorded number of substeps calculated in each frame",
+    ): "フレームごとに計算したサブステップ数の記録を消去します",
     ("*", "Armature not found"): "アーマチュアが見つかりませんでした",
     (
         "*",
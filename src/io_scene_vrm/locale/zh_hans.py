@@ -87,6 +87,12 @@ translation_dictionary: dict[tuple[str, str], str] = {
     ): "不限于四个。 大多数观众将自己限制为四人，因为、"
     + "移动骨骼时可能会发生意外的网格变形。",
     ("*", "Export Lights"): "输出灯光",
+    ("*", "Cache Encoded Images"): "缓存已编码的图像",
+    (
+        "*",
+        "Reuse the encoded images of previous exports"
+        + " if the pixels and the encode settings are the same",
+    ): "如果像素和编码设置相同，则重复使用之前导出时编码的图像",
     (
         "*",
         "No error. Ready for export VRM",
@@ -466,6 +472,51 @@ translation_dictionary: dict[tuple[str, str], str] = {
         "*",
         "Enable Animation",
     ): "使动画有效",
+    ("*", "Solver"): "解算器",
+    ("*", "Calculate joints one by one"): "逐个计算关节",
+    ("*", "Calculate joints of the same depth at once"): "同时计算相同深度的关节",
+    ("*", "Bake SpringBone Animation"): "烘焙SpringBone动画",
+    (
+        "*",
+        "Simulate SpringBone over the frames, write it as keyframes"
+        + " and disable the animation",
+    ): "在帧范围内模拟SpringBone并写入关键帧，然后禁用动画",
+    (
+        "*",
+        "Replaced the existing rotation keyframes of {bone_names}",
+    ): "已替换{bone_names}的现有旋转关键帧",
+    ("*", "Start Frame"): "起始帧",
+    ("*", "End Frame"): "结束帧",
+    ("*", "Substep Policy"): "子步策略",
+    ("*", "Catch Up"): "追赶",
+    ("*", "Calculate every elapsed step"): "计算所有经过的步",
+    (
+        "*",
+        "Calculate up to the max substeps and drop older steps",
+    ): "最多计算最大子步数，丢弃较早的步",
+    ("*", "Limit"): "限制",
+    ("*", "Merge"): "合并",
+    (
+        "*",
+        "Merge older steps into one large step to fit in the max substeps",
+    ): "将较早的步合并为一个大步，以不超过最大子步数",
+    ("*", "Skip"): "跳过",
+    (
+        "*",
+        "Drop the elapsed steps and restart the simulation from the current pose"
+        + " when the max substeps is exceeded",
+    ): "超过最大子步数时，丢弃经过的步并从当前姿势重新开始模拟",
+    ("*", "Max Substeps"): "最大子步数",
+    (
+        "*",
+        "Maximum number of steps calculated in a frame",
+    ): "每帧计算的最大步数",
+    ("*", "Max Substeps in a Frame: {count}"): "单帧最大子步数: {count}",
+    ("*", "Reset Substep Counts"): "重置子步数记录",
+    (
+        "*",
+        "Clear the recorded number of substeps calculated in each frame",
+    ): "清除每帧计算的子步数记录",
     (
         "*",
         "Armature not found",
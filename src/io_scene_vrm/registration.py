@@ -116,6 +116,7 @@ def depsgraph_update_pre_once_if_load_post_is_unavailable(_unused: object) -> No
 @persistent
 def depsgraph_update_pre(_unused: object) -> None:
     trigger_clear_addon_version_cache()
+    migration.invalidate_migration_cache()
 
 
 @persistent
@@ -402,7 +403,9 @@ classes: list[
     spring_bone1_ops.VRM_OT_move_up_spring_bone1_joint,
     spring_bone1_ops.VRM_OT_move_down_spring_bone1_joint,
     spring_bone1_ops.VRM_OT_reset_spring_bone1_animation_state,
+    spring_bone1_ops.VRM_OT_reset_spring_bone1_substep_counts,
     spring_bone1_ops.VRM_OT_update_spring_bone1_animation,
+    spring_bone1_ops.VRM_OT_bake_spring_bone1_animation,
     mtoon1_ops.VRM_OT_convert_material_to_mtoon1,
     mtoon1_ops.VRM_OT_convert_mtoon1_to_bsdf_principled,
     mtoon1_ops.VRM_OT_reset_mtoon1_material_shader_node_tree,
@@ -486,6 +489,8 @@ def register() -> None:
     # VIEW3D_MT_mesh_add.append(panel.make_mesh)
 
     bpy.app.handlers.load_post.append(handler.load_post)
+    bpy.app.handlers.undo_post.append(handler.undo_post)
+    bpy.app.handlers.redo_post.append(handler.redo_post)
     bpy.app.handlers.load_post.append(mtoon1_handler.load_post)
     bpy.app.handlers.load_post.append(load_post)
     bpy.app.handlers.depsgraph_update_pre.append(
@@ -493,10 +498,13 @@ def register() -> None:
     )
     bpy.app.handlers.depsgraph_update_pre.append(depsgraph_update_pre)
     bpy.app.handlers.depsgraph_update_pre.append(vrm1_handler.depsgraph_update_pre)
-    bpy.app.handlers.depsgraph_update_pre.append(mtoon1_handler.depsgraph_update_pre)
     bpy.app.handlers.save_pre.append(save_pre)
     bpy.app.handlers.save_pre.append(vrm1_handler.save_pre)
     bpy.app.handlers.save_pre.append(mtoon1_handler.save_pre)
+    bpy.app.handlers.save_pre.append(spring_bone1_handler.save_pre)
+    bpy.app.handlers.animation_playback_post.append(
+        spring_bone1_handler.animation_playback_post
+    )
     bpy.app.handlers.frame_change_pre.append(spring_bone1_handler.frame_change_pre)
     bpy.app.handlers.frame_change_pre.append(vrm0_handler.frame_change_pre)
     bpy.app.handlers.frame_change_post.append(vrm0_handler.frame_change_post)
@@ -505,6 +513,10 @@ def register() -> None:
     bpy.app.handlers.depsgraph_update_pre.append(
         spring_bone1_handler.depsgraph_update_pre
     )
+    bpy.app.handlers.depsgraph_update_post.append(
+        spring_bone1_handler.depsgraph_update_post
+    )
+    bpy.app.handlers.depsgraph_update_post.append(mtoon1_handler.depsgraph_update_post)
 
     io_scene_gltf2_support.init_extras_export()
 
@@ -514,6 +526,10 @@ def register() -> None:
 def unregister() -> None:
     subscription.teardown_subscription()
 
+    bpy.app.handlers.depsgraph_update_post.remove(mtoon1_handler.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.remove(
+        spring_bone1_handler.depsgraph_update_post
+    )
     bpy.app.handlers.depsgraph_update_pre.remove(
         spring_bone1_handler.depsgraph_update_pre
     )
@@ -522,10 +538,13 @@ def unregister() -> None:
     bpy.app.handlers.frame_change_post.remove(vrm0_handler.frame_change_post)
     bpy.app.handlers.frame_change_pre.remove(vrm0_handler.frame_change_pre)
     bpy.app.handlers.frame_change_pre.remove(spring_bone1_handler.frame_change_pre)
+    bpy.app.handlers.animation_playback_post.remove(
+        spring_bone1_handler.animation_playback_post
+    )
+    bpy.app.handlers.save_pre.remove(spring_bone1_handler.save_pre)
     bpy.app.handlers.save_pre.remove(mtoon1_handler.save_pre)
     bpy.app.handlers.save_pre.remove(vrm1_handler.save_pre)
     bpy.app.handlers.save_pre.remove(save_pre)
-    bpy.app.handlers.depsgraph_update_pre.remove(mtoon1_handler.depsgraph_update_pre)
     bpy.app.handlers.depsgraph_update_pre.remove(vrm1_handler.depsgraph_update_pre)
     bpy.app.handlers.depsgraph_update_pre.remove(depsgraph_update_pre)
     if (
@@ -537,6 +556,8 @@ def unregister() -> None:
         )
     bpy.app.handlers.load_post.remove(load_post)
     bpy.app.handlers.load_post.remove(mtoon1_handler.load_post)
+    bpy.app.handlers.redo_post.remove(handler.redo_post)
+    bpy.app.handlers.undo_post.remove(handler.undo_post)
     bpy.app.handlers.load_post.remove(handler.load_post)
 
     # VIEW3D_MT_mesh_add.remove(panel.make_mesh)
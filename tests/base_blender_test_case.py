@@ -144,6 +144,9 @@ class BaseBlenderTestCase(TestCase):
                 bpy.ops.object.mode_set(mode="OBJECT")
             bpy.ops.object.select_all(action="SELECT")
             bpy.ops.object.delete()
+            # シーンに直接リンクされ、選択されていないオブジェクトも削除する
+            while bpy.context.blend_data.objects:
+                bpy.context.blend_data.objects.remove(bpy.context.blend_data.objects[0])
             while bpy.context.blend_data.collections:
                 bpy.context.blend_data.collections.remove(
                     bpy.context.blend_data.collections[0]
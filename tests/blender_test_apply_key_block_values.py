@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+
+import bpy
+from bpy.types import Context, Key
+
+from io_scene_vrm.editor.shape_key import apply_key_block_values
+
+KEY_BLOCK_NAMES = ["A", "B", "C", "D"]
+
+
+def create_shape_key(context: Context, name: str, rng: random.Random) -> Key:
+    mesh = context.blend_data.meshes.new(name)
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    mesh_object = context.blend_data.objects.new(name, mesh)
+    context.scene.collection.objects.link(mesh_object)
+    mesh_object.shape_key_add(name="Basis")
+    for key_block_name in KEY_BLOCK_NAMES:
+        key_block = mesh_object.shape_key_add(name=key_block_name)
+        key_block.slider_min = rng.choice([-1.0, 0.0, 0.25])
+        key_block.slider_max = rng.choice([0.5, 1.0, 2.0])
+    shape_key = mesh.shape_keys
+    if not shape_key:
+        raise AssertionError
+    return shape_key
+
+
+def read_values(shape_keys: list[Key]) -> dict[tuple[str, str], float]:
+    return {
+        (shape_key.name, key_block.name): key_block.value
+        for shape_key in shape_keys
+        for key_block in shape_key.key_blocks
+    }
+
+
+def write_values(
+    context: Context,
+    shape_key_name_and_key_block_name_to_value: dict[tuple[str, str], float],
+) -> None:
+    """キーブロックごとに値を設定していた、以前のframe_change_post()の実装."""
+    for (
+        shape_key_name,
+        key_block_name,
+    ), value in shape_key_name_and_key_block_name_to_value.items():
+        shape_key = context.blend_data.shape_keys.get(shape_key_name)
+        if not shape_key:
+            continue
+        key_blocks = shape_key.key_blocks
+        if not key_blocks:
+            continue
+        key_block = key_blocks.get(key_block_name)
+        if not key_block:
+            continue
+        key_block.value = value
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    rng = random.Random(0)  # noqa: S311
+    shape_keys = [
+        create_shape_key(context, "Face", rng),
+        create_shape_key(context, "Body", rng),
+    ]
+    shape_key_names = [shape_key.name for shape_key in shape_keys]
+
+    for step in range(200):
+        shape_key_name_and_key_block_name_to_value = {
+            (
+                rng.choice([*shape_key_names, "Missing"]),
+                rng.choice([*KEY_BLOCK_NAMES, "Basis", "Missing"]),
+            ): rng.uniform(-2, 3)
+            for _ in range(rng.randrange(8))
+        }
+
+        initial_values = read_values(shape_keys)
+        write_values(context, shape_key_name_and_key_block_name_to_value)
+        expected_values = read_values(shape_keys)
+        write_values(context, initial_values)
+        assert read_values(shape_keys) == initial_values, f"step={step}"
+
+        apply_key_block_values(context, shape_key_name_and_key_block_name_to_value)
+        values = read_values(shape_keys)
+        assert values == expected_values, f"step={step}: {values} != {expected_values}"
+
+        for shape_key in shape_keys:
+            for key_block in shape_key.key_blocks:
+                assert (
+                    key_block.slider_min <= key_block.value <= key_block.slider_max
+                ), f"step={step}: {shape_key.name}/{key_block.name}"
+
+
+if __name__ == "__main__":
+    test(bpy.context)
@@ -10,6 +10,7 @@ from io_scene_vrm.common.vrm0.human_bone import (
     HumanBoneSpecification,
     HumanBoneSpecifications,
 )
+from io_scene_vrm.editor.extension import get_armature_extension
 from io_scene_vrm.editor.property_group import BonePropertyGroup
 
 Tree = dict[str, "Tree"]
@@ -49,6 +50,66 @@ def assert_bone_candidates(
         raise AssertionError("Unexpected diff:\n" + ",".join(diffs))
 
 
+def assert_bone_name_lookup(armature: Object) -> None:
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    node = get_armature_extension(armature_data).vrm1.humanoid.human_bones.hips.node
+
+    node.bone_name = "hips"
+    assert node.bone_name == "hips"
+
+    armature_data.bones["hips"].name = "renamed_hips"
+    assert node.bone_name == "renamed_hips"
+
+    armature_data.bones["renamed_hips"].name = "hips"
+    assert node.bone_name == "hips"
+
+    node.bone_name = "spine"
+    assert node.bone_name == "spine"
+
+    node.bone_name = ""
+    assert node.bone_name == ""
+
+
+def assert_owner_armature_lookup(context: Context, armature: Object) -> None:
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    ext = get_armature_extension(armature_data)
+
+    for _ in range(3):
+        joint = ext.spring_bone1.springs.add().joints.add()
+        joint.node.bone_name = "spine"
+        assert joint.node.bone_name == "spine"
+        assert joint.node.find_owner_armature() == armature
+
+    armature.name = "renamed_armature"
+    node = ext.spring_bone1.springs[0].joints[0].node
+    assert node.find_owner_armature() == armature
+
+    copied_armature = armature.copy()
+    copied_armature_data = armature_data.copy()
+    if not isinstance(copied_armature_data, Armature):
+        raise TypeError
+    copied_armature.data = copied_armature_data
+    context.scene.collection.objects.link(copied_armature)
+    copied_node = (
+        get_armature_extension(copied_armature_data)
+        .spring_bone1.springs[0]
+        .joints[0]
+        .node
+    )
+    assert copied_node.find_owner_armature() == copied_armature
+    assert node.find_owner_armature() == armature
+
+    copied_armature.data = armature_data
+    assert copied_node.find_owner_armature() is None
+    context.blend_data.objects.remove(copied_armature)
+
+    ext.spring_bone1.springs.clear()
+
+
 def test(context: Context) -> None:
     if context.view_layer.objects.active:
         bpy.ops.object.mode_set(mode="OBJECT")
@@ -112,6 +173,9 @@ def test(context: Context) -> None:
         {"hips": {"spine": {"head": {}}}},
     )
 
+    assert_bone_name_lookup(armature)
+    assert_owner_armature_lookup(context, armature)
+
 
 if __name__ == "__main__":
     test(bpy.context)
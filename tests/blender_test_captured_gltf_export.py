@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import tempfile
+from pathlib import Path
+
+import bpy
+from bpy.types import Armature, ArmatureModifier, Context
+from mathutils import Vector
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.common.gltf import parse_glb
+from io_scene_vrm.external.io_scene_gltf2_support import (
+    ExportSceneGltfArguments,
+    capture_exported_glb,
+    export_scene_gltf,
+)
+
+
+def create_export_scene_gltf_arguments(filepath: Path) -> ExportSceneGltfArguments:
+    return ExportSceneGltfArguments(
+        filepath=str(filepath),
+        check_existing=False,
+        export_format="GLB",
+        export_extras=True,
+        export_def_bones=True,
+        export_current_frame=True,
+        use_selection=True,
+        use_active_scene=True,
+        export_animations=True,
+        export_armature_object_remove=False,
+        export_rest_position_armature=False,
+        export_apply=False,
+        export_all_influences=False,
+        export_lights=False,
+        export_try_sparse_sk=False,
+    )
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    mesh = context.blend_data.meshes.new("Mesh")
+    mesh.from_pydata(
+        [(0, 0, 1), (0.5, 0, 1), (0, 0.5, 1), (0, 0, 1.5)],
+        [],
+        [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)],
+    )
+    mesh_object = context.blend_data.objects.new("Mesh", mesh)
+    context.scene.collection.objects.link(mesh_object)
+    mesh_object.shape_key_add(name="Basis")
+    key_block = mesh_object.shape_key_add(name="Key", from_mix=False)
+    key_block.data[3].co = Vector((0, 0, 2))
+    vertex_group = mesh_object.vertex_groups.new(name="spine")
+    vertex_group.add([0, 1, 2, 3], 1.0, "REPLACE")
+    modifier = mesh_object.modifiers.new(name="Armature", type="ARMATURE")
+    if not isinstance(modifier, ArmatureModifier):
+        raise TypeError
+    modifier.object = armature
+    bpy.ops.object.select_all(action="SELECT")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        captured_filepath = Path(temp_dir, "captured.glb")
+        with capture_exported_glb() as exported_glb:
+            assert export_scene_gltf(
+                create_export_scene_gltf_arguments(captured_filepath)
+            ) == {"FINISHED"}
+        if exported_glb is None:
+            message = "The glTF 2.0 add-on output could not be captured"
+            raise AssertionError(message)
+        assert not captured_filepath.exists()
+
+        # キャプチャしていない場合にファイルに書き込まれる内容と一致すること
+        filepath = Path(temp_dir, "written.glb")
+        assert export_scene_gltf(create_export_scene_gltf_arguments(filepath)) == {
+            "FINISHED"
+        }
+        json_dict, buffer0_bytes = parse_glb(filepath.read_bytes())
+
+    assert exported_glb.json_dict == json_dict
+    assert exported_glb.buffer0 == buffer0_bytes
+    assert len(exported_glb.buffer0) % 4 == 0
+
+
+if __name__ == "__main__":
+    test(bpy.context)
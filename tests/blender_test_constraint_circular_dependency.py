@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from typing import Optional, Union
+
+import bpy
+from bpy.types import Armature, Context, CopyRotationConstraint, Object, PoseBone
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor import search
+
+
+def add_copy_rotation_constraint(
+    object_or_bone: Union[Object, PoseBone],
+    name: str,
+    target: Object,
+    subtarget: Optional[str] = None,
+    *,
+    roll_axis: Optional[str] = None,
+) -> None:
+    constraint = object_or_bone.constraints.new(type="COPY_ROTATION")
+    if not isinstance(constraint, CopyRotationConstraint):
+        raise TypeError
+    constraint.name = name
+    constraint.mix_mode = "ADD"
+    constraint.owner_space = "LOCAL"
+    constraint.target_space = "LOCAL"
+    constraint.use_x = roll_axis in [None, "X"]
+    constraint.use_y = roll_axis in [None, "Y"]
+    constraint.use_z = roll_axis in [None, "Z"]
+    constraint.target = target
+    if subtarget is not None:
+        constraint.subtarget = subtarget
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    objs = [armature]
+    for name in ["A", "B", "C", "D"]:
+        obj = context.blend_data.objects.new(name, None)
+        context.scene.collection.objects.link(obj)
+        objs.append(obj)
+    a, b, c, d = objs[1:]
+    bones = armature.pose.bones
+
+    # オブジェクト同士の循環
+    add_copy_rotation_constraint(a, "A to B", b)
+    add_copy_rotation_constraint(b, "B to A", a)
+    # 循環に流れ込むだけのコンストレイントは含めない
+    add_copy_rotation_constraint(c, "C to A", a, roll_axis="X")
+    # ロールのボーン同士の循環
+    add_copy_rotation_constraint(
+        bones["spine"], "Spine to Chest", armature, "chest", roll_axis="Y"
+    )
+    add_copy_rotation_constraint(
+        bones["chest"], "Chest to Spine", armature, "spine", roll_axis="Y"
+    )
+    # 軸が異なるため循環しない
+    add_copy_rotation_constraint(
+        bones["root"], "Root to Neck", armature, "neck", roll_axis="X"
+    )
+    add_copy_rotation_constraint(
+        bones["neck"], "Neck to Root", armature, "root", roll_axis="Z"
+    )
+    # オブジェクトとボーンの循環
+    add_copy_rotation_constraint(d, "D to Hips", armature, "hips")
+    add_copy_rotation_constraint(bones["hips"], "Hips to D", d)
+    add_copy_rotation_constraint(bones["head"], "Head to Hips", armature, "hips")
+
+    with search.use_export_constraints_cache():
+        object_constraints, bone_constraints, messages = search.export_constraints(
+            objs, armature
+        )
+        # スコープ内では検出結果が再利用される
+        assert search.export_constraints(objs, armature)[2] == messages
+
+    # ロールを回転より、オブジェクトをボーンより先に報告する
+    assert list(messages) == [
+        f'Node Constraint "{owner_name} / {constraint_name}" has a circular dependency'
+        for owner_name, constraint_name in [
+            ("spine", "Spine to Chest"),
+            ("chest", "Chest to Spine"),
+            ("A", "A to B"),
+            ("B", "B to A"),
+            ("D", "D to Hips"),
+            ("hips", "Hips to D"),
+        ]
+    ], messages
+
+    assert list(object_constraints.roll_constraints) == ["C"]
+    assert list(object_constraints.rotation_constraints) == []
+    assert list(bone_constraints.roll_constraints) == ["root", "neck"]
+    assert list(bone_constraints.rotation_constraints) == ["head"]
+
+
+if __name__ == "__main__":
+    test(bpy.context)
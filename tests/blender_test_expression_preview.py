@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+from collections.abc import Mapping
+from sys import float_info
+
+import bpy
+from bpy.types import Armature, Context, Mesh, Object
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor.extension import (
+    VrmAddonArmatureExtensionPropertyGroup,
+    get_armature_extension,
+)
+from io_scene_vrm.editor.vrm1.property_group import (
+    Vrm1ExpressionPropertyGroup,
+    Vrm1ExpressionsPropertyGroup,
+)
+
+KEY_BLOCK_NAMES = ["A", "B", "C", "D", "E", "F"]
+OVERRIDE_TYPES = ["none", "block", "blend"]
+
+
+def compute_shape_key_values_by_full_recompute(
+    context: Context,
+    expressions: Vrm1ExpressionsPropertyGroup,
+    name_to_expression: Mapping[str, Vrm1ExpressionPropertyGroup],
+) -> dict[tuple[str, str], float]:
+    """全てのExpressionから再計算していた、以前のupdate_previews()の実装."""
+    mouth_block_rate = 0.0
+    blink_block_rate = 0.0
+    look_at_block_rate = 0.0
+    for expression in name_to_expression.values():
+        if expression.preview < float_info.epsilon:
+            continue
+
+        if expression.override_mouth == "blend":
+            mouth_block_rate += expression.preview
+        if expression.override_blink == "blend":
+            blink_block_rate += expression.preview
+        if expression.override_look_at == "blend":
+            look_at_block_rate += expression.preview
+
+        if expression.override_mouth == "block":
+            mouth_block_rate = 1.0
+        if expression.override_blink == "block":
+            blink_block_rate = 1.0
+        if expression.override_look_at == "block":
+            look_at_block_rate = 1.0
+
+    mouth_blend_factor = max(0, min(1 - mouth_block_rate, 1))
+    blink_blend_factor = max(0, min(1 - blink_block_rate, 1))
+    look_at_blend_factor = max(0, min(1 - look_at_block_rate, 1))
+
+    shape_key_name_and_key_block_name_to_value: dict[tuple[str, str], float] = {}
+    for name, expression in name_to_expression.items():
+        if expression.is_binary:
+            preview = 0.0 if expression.preview < float_info.epsilon else 1.0
+        else:
+            preview = expression.preview
+
+        if expressions.preset.is_mouth_expression(name):
+            preview *= mouth_blend_factor
+        elif expressions.preset.is_blink_expression(name):
+            preview *= blink_blend_factor
+        elif expressions.preset.is_look_at_expression(name):
+            preview *= look_at_blend_factor
+
+        for morph_target_bind in expression.morph_target_binds:
+            mesh_object = context.blend_data.objects.get(
+                morph_target_bind.node.mesh_object_name
+            )
+            if not mesh_object or not isinstance(mesh_object.data, Mesh):
+                continue
+            shape_key = mesh_object.data.shape_keys
+            if not shape_key:
+                continue
+            key_block = shape_key.key_blocks.get(morph_target_bind.index)
+            if not key_block:
+                continue
+            shape_key_name_and_key_block_name = (shape_key.name, key_block.name)
+            shape_key_name_and_key_block_name_to_value[
+                shape_key_name_and_key_block_name
+            ] = (
+                shape_key_name_and_key_block_name_to_value.get(
+                    shape_key_name_and_key_block_name, 0.0
+                )
+                + morph_target_bind.weight * preview
+            )
+    return shape_key_name_and_key_block_name_to_value
+
+
+def assert_shape_key_values(
+    context: Context,
+    expressions: Vrm1ExpressionsPropertyGroup,
+    message: str,
+) -> None:
+    expected = compute_shape_key_values_by_full_recompute(
+        context, expressions, expressions.all_name_to_expression_dict()
+    )
+    for (shape_key_name, key_block_name), value in expected.items():
+        shape_key = context.blend_data.shape_keys[shape_key_name]
+        actual = shape_key.key_blocks[key_block_name].value
+        if abs(actual - value) > 0.000001:
+            message = (
+                f"{message}: {shape_key_name}/{key_block_name}"
+                + f" is {actual} but the full recompute gives {value}"
+            )
+            raise AssertionError(message)
+
+
+def create_mesh_with_shape_keys(context: Context, name: str) -> Object:
+    mesh = context.blend_data.meshes.new(name)
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    mesh_object = context.blend_data.objects.new(name, mesh)
+    context.scene.collection.objects.link(mesh_object)
+    mesh_object.shape_key_add(name="Basis")
+    for key_block_name in KEY_BLOCK_NAMES:
+        key_block = mesh_object.shape_key_add(name=key_block_name)
+        # 合計値がクランプされないよう範囲を広げる
+        key_block.slider_min = -10
+        key_block.slider_max = 10
+    return mesh_object
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    get_armature_extension(
+        armature.data
+    ).spec_version = VrmAddonArmatureExtensionPropertyGroup.SPEC_VERSION_VRM1
+    expressions = get_armature_extension(armature.data).vrm1.expressions
+    for custom_expression_name in ["custom1", "custom2"]:
+        ops.vrm.add_vrm1_expressions_custom_expression(
+            armature_name=armature.name,
+            custom_expression_name=custom_expression_name,
+        )
+
+    mesh_objects = [
+        create_mesh_with_shape_keys(context, "Face"),
+        create_mesh_with_shape_keys(context, "Body"),
+    ]
+
+    rng = random.Random(0)  # noqa: S311
+    name_to_expression = expressions.all_name_to_expression_dict()
+    for expression in name_to_expression.values():
+        for _ in range(rng.randint(0, 3)):
+            morph_target_bind = expression.morph_target_binds.add()
+            morph_target_bind.node.mesh_object_name = rng.choice(mesh_objects).name
+            morph_target_bind.index = rng.choice(KEY_BLOCK_NAMES)
+            morph_target_bind.weight = rng.random()
+
+    expression_names = list(name_to_expression.keys())
+    for step in range(500):
+        expression_name = rng.choice(expression_names)
+        expression = name_to_expression[expression_name]
+        operation = rng.randrange(5)
+        if operation == 0:
+            expression.override_mouth = rng.choice(OVERRIDE_TYPES)
+        elif operation == 1:
+            expression.override_blink = rng.choice(OVERRIDE_TYPES)
+        elif operation == 2:
+            expression.override_look_at = rng.choice(OVERRIDE_TYPES)
+        else:
+            if operation == 3:
+                # is_binaryの変更ではプレビューが更新されないので、値も変更する
+                expression.is_binary = not expression.is_binary
+            expression.preview = rng.choice([0.0, 1.0, rng.random()])
+        assert_shape_key_values(
+            context, expressions, f"step={step} expression={expression_name}"
+        )
+
+
+if __name__ == "__main__":
+    test(bpy.context)
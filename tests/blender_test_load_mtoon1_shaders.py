@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from unittest.mock import patch
+
+import bpy
+from bpy.types import Context
+
+from io_scene_vrm.common import shader, workspace
+from io_scene_vrm.common.char import INTERNAL_NAME_PREFIX
+from io_scene_vrm.editor.mtoon1.property_group import Mtoon1MaterialPropertyGroup
+
+TEMPLATE_MATERIAL_NAME = shader.template_name("VRM Add-on MToon 1.0")
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    # テンプレートと同名のデータを事前に作成しておく
+    old_template_material = context.blend_data.materials.new(TEMPLATE_MATERIAL_NAME)
+    old_template_groups = [
+        context.blend_data.node_groups.new(
+            shader.template_name(shader_node_group_name), "ShaderNodeTree"
+        )
+        for shader_node_group_name in shader.SHADER_NODE_GROUP_NAMES
+    ]
+    old_material_names = {material.name for material in context.blend_data.materials}
+    old_template_group_names = [group.name for group in old_template_groups]
+
+    materials = [
+        context.blend_data.materials.new(f"Material{index}") for index in range(8)
+    ]
+
+    with (
+        patch.object(
+            shader,
+            "wm_append_without_library",
+            wraps=workspace.wm_append_without_library,
+        ) as wm_append_without_library,
+        shader.use_mtoon1_template(context),
+    ):
+        shader.load_mtoon1_shaders(context, materials[:5], reset_node_groups=True)
+        # 同じスコープ内ではテンプレートを使い回す
+        shader.load_mtoon1_shaders(context, materials[5:], reset_node_groups=True)
+
+    template_append_count = sum(
+        1
+        for call in wm_append_without_library.call_args_list
+        if call.kwargs.get("append_filename") == TEMPLATE_MATERIAL_NAME
+    )
+    assert template_append_count == 1, template_append_count
+
+    for material in materials:
+        assert Mtoon1MaterialPropertyGroup.has_output_group_node(material), (
+            material.name
+        )
+
+    # テンプレートが残らず、同名だったデータの名前が元に戻ること
+    assert {material.name for material in context.blend_data.materials} == {
+        *old_material_names,
+        *(material.name for material in materials),
+    }
+    assert old_template_material.name == TEMPLATE_MATERIAL_NAME
+    assert [group.name for group in old_template_groups] == old_template_group_names
+    # テンプレートや退避用の名前を持つノードグループが残らないこと
+    internal_group_names = [
+        group.name
+        for group in context.blend_data.node_groups
+        if group.name.startswith(INTERNAL_NAME_PREFIX)
+    ]
+    assert sorted(internal_group_names) == sorted(old_template_group_names), (
+        internal_group_names
+    )
+
+
+if __name__ == "__main__":
+    test(bpy.context)
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import bpy
+from bpy.types import Context, NodeTree, NodeTreeInterfaceSocket, ShaderNodeGroup
+
+from io_scene_vrm.editor.mtoon1.property_group import MaterialTraceablePropertyGroup
+
+GROUP_NAME = "Socket Cache Test Group"
+
+
+def new_group(context: Context) -> NodeTree:
+    group = context.blend_data.node_groups.new(GROUP_NAME, "ShaderNodeTree")
+    for name in ["Alpha", "Beta"]:
+        if bpy.app.version < (4, 0):
+            group.inputs.new("NodeSocketFloat", name)
+        else:
+            group.interface.new_socket(
+                name, in_out="INPUT", socket_type="NodeSocketFloat"
+            )
+    return group
+
+
+def rename_group_input(group: NodeTree, old_name: str, new_name: str) -> None:
+    if bpy.app.version < (4, 0):
+        group.inputs[old_name].name = new_name
+        return
+    for item in group.interface.items_tree:
+        if isinstance(item, NodeTreeInterfaceSocket) and item.name == old_name:
+            item.name = new_name
+            return
+    raise AssertionError(old_name)
+
+
+def new_group_node(node_tree: NodeTree, group: NodeTree) -> ShaderNodeGroup:
+    node = node_tree.nodes.new("ShaderNodeGroup")
+    if not isinstance(node, ShaderNodeGroup):
+        raise TypeError
+    node.node_tree = group
+    return node
+
+
+def find(node_tree: NodeTree, group_label: str) -> tuple[str, str]:
+    node, socket = MaterialTraceablePropertyGroup.find_node_group_input_socket(
+        node_tree, GROUP_NAME, group_label
+    )
+    # キャッシュが無い場合と同じ結果になること
+    MaterialTraceablePropertyGroup.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE.clear()
+    expected_node, expected_socket = (
+        MaterialTraceablePropertyGroup.find_node_group_input_socket(
+            node_tree, GROUP_NAME, group_label
+        )
+    )
+    result = (node.name if node else "", socket.name if socket else "")
+    expected = (
+        expected_node.name if expected_node else "",
+        expected_socket.name if expected_socket else "",
+    )
+    assert result == expected, f"{result} != {expected}"
+
+    # 次の呼び出しのためにキャッシュを作り直す
+    MaterialTraceablePropertyGroup.find_node_group_input_socket(
+        node_tree, GROUP_NAME, group_label
+    )
+    return result
+
+
+def test(context: Context) -> None:
+    MaterialTraceablePropertyGroup.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE.clear()
+    group = new_group(context)
+    material = context.blend_data.materials.new("Socket Cache Test")
+    material.use_nodes = True
+    node_tree = material.node_tree
+    if not node_tree:
+        raise AssertionError
+
+    other_node = node_tree.nodes.new("ShaderNodeMath")
+    first_node = new_group_node(node_tree, group)
+    # 同名のノードグループが2つある場合は、先頭のものを使う
+    second_node = new_group_node(node_tree, group)
+    assert find(node_tree, "Beta") == (first_node.name, "Beta")
+
+    # ノード数を変えずにノードを削除と追加し、インデックスの指す先を入れ替える
+    node_tree.nodes.remove(other_node)
+    third_node = new_group_node(node_tree, group)
+    assert find(node_tree, "Beta") == (first_node.name, "Beta")
+    node_tree.nodes.remove(first_node)
+    node_tree.nodes.new("ShaderNodeMath")
+    assert find(node_tree, "Beta") == (second_node.name, "Beta")
+
+    # ソケット名の変更
+    rename_group_input(group, "Beta", "Gamma")
+    assert find(node_tree, "Beta") == (second_node.name, "")
+    assert find(node_tree, "Gamma") == (second_node.name, "Gamma")
+    # 存在しなかったソケットが後から現れる場合
+    assert find(node_tree, "Delta") == (second_node.name, "")
+    rename_group_input(group, "Gamma", "Delta")
+    assert find(node_tree, "Delta") == (second_node.name, "Delta")
+    rename_group_input(group, "Delta", "Beta")
+    assert find(node_tree, "Beta") == (second_node.name, "Beta")
+    assert find(node_tree, "Gamma") == (second_node.name, "")
+
+    # アンドゥなどでノードツリーのアドレスが再利用された場合を再現するため、
+    # 別のノードツリーのキャッシュを同じアドレスのものとして登録する
+    node_tree.nodes.remove(second_node)
+    assert find(node_tree, "Beta") == (third_node.name, "Beta")
+    other_material = context.blend_data.materials.new("Socket Cache Test Other")
+    other_material.use_nodes = True
+    other_node_tree = other_material.node_tree
+    if not other_node_tree:
+        raise AssertionError
+    other_node_tree.nodes.new("ShaderNodeMath")
+    other_group_node = new_group_node(other_node_tree, group)
+    while len(other_node_tree.nodes) < len(node_tree.nodes):
+        other_node_tree.nodes.new("ShaderNodeMath")
+    while len(other_node_tree.nodes) > len(node_tree.nodes):
+        node_tree.nodes.new("ShaderNodeMath")
+    cache = MaterialTraceablePropertyGroup.NODE_GROUP_INPUT_SOCKET_INDEX_CACHE
+    cache[(other_node_tree.as_pointer(), GROUP_NAME, "Beta")] = cache[
+        (node_tree.as_pointer(), GROUP_NAME, "Beta")
+    ]
+    node, socket = MaterialTraceablePropertyGroup.find_node_group_input_socket(
+        other_node_tree, GROUP_NAME, "Beta"
+    )
+    assert node and node.name == other_group_node.name, node
+    assert socket and socket.name == "Beta", socket
+
+
+if __name__ == "__main__":
+    test(bpy.context)
@@ -0,0 +1,188 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+
+import bpy
+from bpy.types import Context, Material, Mesh, Object
+
+from io_scene_vrm.editor.extension import get_material_extension
+from io_scene_vrm.editor.mtoon1.handler import (
+    OutlineObjectState,
+    clear_outline_update_state,
+    outline_update_state,
+    update_mtoon1_outline,
+)
+from io_scene_vrm.editor.mtoon1.ops import VRM_OT_refresh_mtoon1_outline
+
+
+def create_material(context: Context, name: str, *, mtoon1: bool) -> Material:
+    material = context.blend_data.materials.new(name)
+    if not mtoon1:
+        return material
+    mtoon1_extension = get_material_extension(material).mtoon1
+    mtoon1_extension.enabled = True
+    mtoon = mtoon1_extension.extensions.vrmc_materials_mtoon
+    mtoon.outline_width_mode = mtoon.OUTLINE_WIDTH_MODE_WORLD_COORDINATES.identifier
+    mtoon.outline_width_factor = 0.01
+    return material
+
+
+def create_mesh(context: Context, name: str, materials: list[Material]) -> Mesh:
+    mesh = context.blend_data.meshes.new(name)
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    for material in materials:
+        mesh.materials.append(material)
+    return mesh
+
+
+def create_object(context: Context, name: str, mesh: Mesh) -> Object:
+    obj = context.blend_data.objects.new(name, mesh)
+    context.scene.collection.objects.link(obj)
+    return obj
+
+
+def read_outline_modifier_names(context: Context) -> dict[str, list[str]]:
+    return {
+        obj.name: [modifier.name for modifier in obj.modifiers]
+        for obj in context.blend_data.objects
+    }
+
+
+def assert_outline_update_state(context: Context, message: str) -> None:
+    # 削除されたオブジェクトの状態が残らないこと
+    object_names = set(context.blend_data.objects.keys())
+    removed_object_names = {
+        *outline_update_state.object_name_to_state,
+        *(
+            object_name
+            for names in [
+                *outline_update_state.material_name_to_object_names.values(),
+                *outline_update_state.mesh_name_to_object_names.values(),
+            ]
+            for object_name in names
+        ),
+    } - object_names
+    if removed_object_names:
+        message = f"{message}: {sorted(removed_object_names)} remain in the state"
+        raise AssertionError(message)
+
+    for obj in context.blend_data.objects:
+        mesh = obj.data
+        if not isinstance(mesh, Mesh):
+            continue
+        object_state = OutlineObjectState(
+            mesh_name=mesh.name,
+            use_auto_smooth=bpy.app.version < (4, 1) and mesh.use_auto_smooth,
+            material_names=tuple(
+                material_ref.name if (material_ref := material_slot.material) else None
+                for material_slot in obj.material_slots
+            ),
+        )
+        actual_object_state = outline_update_state.object_name_to_state.get(obj.name)
+        if actual_object_state != object_state:
+            message = (
+                f"{message}: {obj.name} state is {actual_object_state}"
+                + f" but expected {object_state}"
+            )
+            raise AssertionError(message)
+        for material_name in object_state.material_names:
+            if material_name is None:
+                continue
+            material = context.blend_data.materials[material_name]
+            enabled = get_material_extension(material).mtoon1.get_enabled_in_material(
+                material
+            )
+            actual_enabled = outline_update_state.material_name_to_enabled.get(
+                material_name
+            )
+            if actual_enabled != enabled:
+                message = (
+                    f"{message}: {material_name} enabled is {actual_enabled}"
+                    + f" but expected {enabled}"
+                )
+                raise AssertionError(message)
+
+    # 全体を更新し直しても、モディファイアの状態が変化しないこと
+    outline_modifier_names = read_outline_modifier_names(context)
+    VRM_OT_refresh_mtoon1_outline.refresh(context, create_modifier=False)
+    expected_outline_modifier_names = read_outline_modifier_names(context)
+    if outline_modifier_names != expected_outline_modifier_names:
+        message = (
+            f"{message}: outline modifiers are {outline_modifier_names}"
+            + f" but a full refresh gives {expected_outline_modifier_names}"
+        )
+        raise AssertionError(message)
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    rng = random.Random(0)  # noqa: S311
+    materials = [
+        create_material(context, "MToon1", mtoon1=True),
+        create_material(context, "MToon2", mtoon1=True),
+        create_material(context, "MToon3", mtoon1=True),
+        create_material(context, "Plain", mtoon1=False),
+    ]
+    meshes = [
+        create_mesh(context, f"Mesh{index}", rng.sample(materials, 2))
+        for index in range(4)
+    ]
+    object_names = [f"Object{index}" for index in range(5)]
+    for object_name in object_names[:3]:
+        create_object(context, object_name, rng.choice(meshes))
+
+    clear_outline_update_state()
+    VRM_OT_refresh_mtoon1_outline.refresh(context, create_modifier=True)
+    context.view_layer.update()
+    update_mtoon1_outline()
+    assert_outline_update_state(context, "initial")
+
+    for step in range(200):
+        operation = rng.randrange(6)
+        object_name = rng.choice(object_names)
+        obj = context.blend_data.objects.get(object_name)
+        if operation == 0:
+            if obj:
+                # スロットのマテリアルはメッシュに保存される
+                material_slot = rng.choice(obj.material_slots)
+                material_slot.material = rng.choice([*materials, None])
+        elif operation == 1:
+            mesh = rng.choice(meshes)
+            if len(mesh.materials) < 4:
+                mesh.materials.append(rng.choice(materials))
+        elif operation == 2:
+            material = rng.choice(materials)
+            material.use_nodes = not material.use_nodes
+        elif operation == 3:
+            if obj:
+                obj.data = rng.choice(meshes)
+        elif operation == 4:
+            if obj:
+                context.blend_data.objects.remove(obj)
+            else:
+                create_object(context, object_name, rng.choice(meshes))
+        else:
+            # 新しく追加されたオブジェクトにはモディファイアを作成する
+            VRM_OT_refresh_mtoon1_outline.refresh(context, create_modifier=True)
+
+        context.view_layer.update()
+        update_mtoon1_outline()
+        assert_outline_update_state(context, f"step={step} operation={operation}")
+
+    # 同名のオブジェクトが作られない場合も、削除されたオブジェクトの状態は取り除かれる
+    for object_name in list(context.blend_data.objects.keys()):
+        context.blend_data.objects.remove(context.blend_data.objects[object_name])
+        context.view_layer.update()
+        update_mtoon1_outline()
+        assert_outline_update_state(context, f"removed {object_name}")
+    assert not outline_update_state.object_name_to_state
+    assert not outline_update_state.material_name_to_enabled
+
+
+if __name__ == "__main__":
+    test(bpy.context)
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import importlib
+import struct
+import tempfile
+from pathlib import Path
+
+import bpy
+from bpy.types import Context, Mesh
+
+from io_scene_vrm.common.convert import Json
+from io_scene_vrm.common.gl import GL_FLOAT
+from io_scene_vrm.common.gltf import pack_glb
+from io_scene_vrm.external.io_scene_gltf2_support import (
+    ImportSceneGltfArguments,
+    import_scene_gltf,
+    provide_gltf_to_import,
+)
+
+
+def create_triangle_gltf(
+    node_name: str, positions: list[tuple[float, float, float]]
+) -> tuple[dict[str, Json], bytes]:
+    buffer0_bytes = b"".join(struct.pack("<3f", *position) for position in positions)
+    json_dict: dict[str, Json] = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"name": node_name, "mesh": 0}],
+        "meshes": [
+            {"name": node_name, "primitives": [{"attributes": {"POSITION": 0}}]}
+        ],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": GL_FLOAT,
+                "count": len(positions),
+                "type": "VEC3",
+                "min": [min(p[i] for p in positions) for i in range(3)],
+                "max": [max(p[i] for p in positions) for i in range(3)],
+            }
+        ],
+        "bufferViews": [{"buffer": 0, "byteLength": len(buffer0_bytes)}],
+        "buffers": [{"byteLength": len(buffer0_bytes)}],
+    }
+    return json_dict, buffer0_bytes
+
+
+def import_gltf(filepath: Path) -> None:
+    assert import_scene_gltf(
+        ImportSceneGltfArguments(
+            filepath=str(filepath),
+            import_pack_images=True,
+            bone_heuristic="TEMPERANCE",
+            guess_original_bind_pose=False,
+            disable_bone_shape=True,
+        )
+    ) == {"FINISHED"}
+
+
+def assert_imported_positions(
+    context: Context, node_name: str, positions: list[tuple[float, float, float]]
+) -> None:
+    obj = context.blend_data.objects.get(node_name)
+    if not obj or not isinstance(obj.data, Mesh):
+        message = f"{node_name} is not imported"
+        raise AssertionError(message)
+    # glTFのY-upからBlenderのZ-upに変換される
+    imported_positions = [tuple(vertex.co) for vertex in obj.data.vertices]
+    expected_positions = [(x, -z, y) for x, y, z in positions]
+    assert imported_positions == expected_positions, (
+        f"{node_name}: {imported_positions} != {expected_positions}"
+    )
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    gltf_importer_class = importlib.import_module(
+        "io_scene_gltf2.io.imp.gltf2_io_gltf"
+    ).glTFImporter
+    read = gltf_importer_class.read
+
+    provided_positions = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)]
+    provided_json_dict, provided_buffer0_bytes = create_triangle_gltf(
+        "Provided", provided_positions
+    )
+    written_positions = [(0.0, 0.0, 0.0), (0.0, 0.0, 2.0), (0.0, 2.0, 0.0)]
+    written_json_dict, written_buffer0_bytes = create_triangle_gltf(
+        "Written", written_positions
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        provided_filepath = Path(temp_dir, "provided.glb")
+        written_filepath = Path(temp_dir, "written.glb")
+        written_filepath.write_bytes(pack_glb(written_json_dict, written_buffer0_bytes))
+
+        with provide_gltf_to_import(
+            provided_filepath,
+            provided_json_dict,
+            memoryview(bytearray(provided_buffer0_bytes)),
+        ) as provided:
+            assert provided
+            assert gltf_importer_class.read is not read
+
+            # ファイルを作らずにインポートできること
+            import_gltf(provided_filepath)
+            assert not provided_filepath.exists()
+
+            # 対象外のファイルは通常通り読み込まれること
+            import_gltf(written_filepath)
+
+        assert gltf_importer_class.read is read
+
+    assert_imported_positions(context, "Provided", provided_positions)
+    assert_imported_positions(context, "Written", written_positions)
+
+
+if __name__ == "__main__":
+    test(bpy.context)
@@ -0,0 +1,204 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+import sys
+
+import bpy
+import numpy as np
+from bpy.types import Armature, ArmatureModifier, Context, Key, Mesh, Object
+from mathutils import Euler, Matrix, Quaternion, Vector
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.exporter.abstract_base_vrm_exporter import force_apply_modifiers
+from io_scene_vrm.exporter.vrm0_exporter import (
+    Vrm0Exporter,
+    read_loop_triangle_normals,
+)
+
+
+def clean_scene(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+
+def create_armature_and_mesh(context: Context) -> tuple[Object, Object, Key]:
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    size = 5
+    vertices = [(x * 0.1, y * 0.1, 1.0) for y in range(size) for x in range(size)]
+    faces = [
+        (y * size + x, y * size + x + 1, (y + 1) * size + x + 1, (y + 1) * size + x)
+        for y in range(size - 1)
+        for x in range(size - 1)
+    ]
+    mesh = context.blend_data.meshes.new("Mesh")
+    mesh.from_pydata(vertices, [], faces)
+    mesh_object = context.blend_data.objects.new("Mesh", mesh)
+    context.scene.collection.objects.link(mesh_object)
+    mesh_object.location = (0.5, -0.25, 0.125)
+    mesh_object.rotation_euler = Euler((0.25, 0.5, 0.75))
+    mesh_object.scale = Vector((1.5, 0.75, 1.25))
+
+    vertex_group = mesh_object.vertex_groups.new(name="spine")
+    vertex_group.add(list(range(len(vertices))), 0.75, "REPLACE")
+    modifier = mesh_object.modifiers.new(name="Armature", type="ARMATURE")
+    if not isinstance(modifier, ArmatureModifier):
+        raise TypeError
+    modifier.object = armature
+
+    rng = random.Random(0)  # noqa: S311
+    mesh_object.shape_key_add(name="Basis")
+    for key_block_name in ["Key1", "Key2", "Muted", "Clamped"]:
+        key_block = mesh_object.shape_key_add(name=key_block_name, from_mix=False)
+        for point in key_block.data:
+            point.co = point.co + Vector(
+                (
+                    rng.uniform(-0.05, 0.05),
+                    rng.uniform(-0.05, 0.05),
+                    rng.uniform(-0.05, 0.05),
+                )
+            )
+    shape_keys = mesh.shape_keys
+    if not shape_keys:
+        raise AssertionError
+    shape_keys.key_blocks["Muted"].mute = True
+    # 値を1.0にしてもslider_maxでクランプされる
+    shape_keys.key_blocks["Clamped"].slider_max = 0.5
+    for key_block in shape_keys.key_blocks:
+        key_block.value = 0
+    context.view_layer.update()
+    return armature, mesh_object, shape_keys
+
+
+def create_main_mesh_data(
+    context: Context, mesh_object: Object, mesh_data_transform: Matrix
+) -> Mesh:
+    mesh_data = force_apply_modifiers(context, mesh_object, persistent=False)
+    if not mesh_data:
+        raise AssertionError
+    mesh_data.transform(mesh_data_transform)
+    if bpy.app.version < (4, 1):
+        mesh_data.calc_normals_split()
+    mesh_data.calc_loop_triangles()
+    return mesh_data
+
+
+def assert_key_blocks_match_evaluation(context: Context) -> None:
+    clean_scene(context)
+    armature, mesh_object, shape_keys = create_armature_and_mesh(context)
+    exporter = Vrm0Exporter(context, [mesh_object], armature)
+    assert exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+    mesh_data_transform = mesh_object.matrix_world.copy()
+    main_mesh_data = create_main_mesh_data(context, mesh_object, mesh_data_transform)
+    shape_key_name_to_vertex_positions = (
+        Vrm0Exporter.read_shape_key_name_to_vertex_positions(
+            main_mesh_data, shape_keys, mesh_data_transform
+        )
+    )
+    shape_key_name_to_triangle_normals = (
+        Vrm0Exporter.create_shape_key_name_to_triangle_normals(
+            context, main_mesh_data, shape_key_name_to_vertex_positions
+        )
+    )
+    assert list(shape_key_name_to_vertex_positions) == [
+        "Key1",
+        "Key2",
+        "Muted",
+        "Clamped",
+    ]
+
+    # 以前の実装と同様に、シェイプキーごとに値を1.0にしてメッシュを評価する
+    for key_block in shape_keys.key_blocks:
+        if shape_keys.reference_key.name == key_block.name:
+            continue
+        key_block.value = 1.0
+        context.view_layer.update()
+        evaluated_mesh_data = create_main_mesh_data(
+            context, mesh_object, mesh_data_transform
+        )
+        key_block.value = 0.0
+        context.view_layer.update()
+
+        expected_vertex_positions = np.empty(
+            len(evaluated_mesh_data.vertices) * 3, dtype=np.float32
+        )
+        evaluated_mesh_data.vertices.foreach_get("co", expected_vertex_positions)
+        np.testing.assert_allclose(
+            shape_key_name_to_vertex_positions[key_block.name],
+            expected_vertex_positions.reshape(-1, 3),
+            rtol=0,
+            atol=1e-5,
+            err_msg=key_block.name,
+        )
+
+        expected_vertex_indices, expected_normals = read_loop_triangle_normals(
+            evaluated_mesh_data
+        )
+        vertex_indices, normals = shape_key_name_to_triangle_normals[key_block.name]
+        np.testing.assert_array_equal(vertex_indices, expected_vertex_indices)
+        np.testing.assert_allclose(
+            normals, expected_normals, rtol=0, atol=1e-5, err_msg=key_block.name
+        )
+
+
+def assert_key_blocks_not_read_if_deformed(context: Context) -> None:
+    clean_scene(context)
+    armature, mesh_object, shape_keys = create_armature_and_mesh(context)
+    exporter = Vrm0Exporter(context, [mesh_object], armature)
+    assert exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+    pose_bone = armature.pose.bones["spine"]
+    pose_bone.rotation_mode = "QUATERNION"
+    pose_bone.rotation_quaternion = Quaternion((1, 0, 0), 0.5)
+    context.view_layer.update()
+    assert not exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    armature_data.pose_position = "REST"
+    context.view_layer.update()
+    assert exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+    subdivision_modifier = mesh_object.modifiers.new(name="Subdivision", type="SUBSURF")
+    assert not exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+    subdivision_modifier.show_viewport = False
+    assert exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+    shape_keys.key_blocks["Key1"].vertex_group = "spine"
+    assert not exporter.can_read_shape_key_blocks(mesh_object, shape_keys)
+
+
+FUNCTIONS = [
+    assert_key_blocks_match_evaluation,
+    assert_key_blocks_not_read_if_deformed,
+]
+
+
+def get_test_command_args() -> list[list[str]]:
+    return [[function.__name__] for function in FUNCTIONS]
+
+
+def test(context: Context, function_name: str) -> None:
+    function = next((f for f in FUNCTIONS if f.__name__ == function_name), None)
+    if function is None:
+        message = f"No function name: {function_name}"
+        raise AssertionError(message)
+    function(context)
+
+
+if __name__ == "__main__":
+    context = bpy.context
+    if "--" in sys.argv:
+        test(context, *sys.argv[slice(sys.argv.index("--") + 1, sys.maxsize)])
+    else:
+        for arg in get_test_command_args():
+            test(context, *arg)
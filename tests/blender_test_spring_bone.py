@@ -1,7 +1,10 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import math
 import sys
+import tempfile
 from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
 
 import bpy
 from bpy.types import Armature, Context
@@ -12,13 +15,19 @@ from io_scene_vrm.editor.extension import (
     VrmAddonArmatureExtensionPropertyGroup,
     get_armature_extension,
 )
+from io_scene_vrm.editor.spring_bone1 import handler
+from io_scene_vrm.editor.spring_bone1.property_group import (
+    SpringBone1ColliderPropertyGroup,
+)
 
 addon_version = version.get_addon_version()
 spec_version = VrmAddonArmatureExtensionPropertyGroup.SPEC_VERSION_VRM1
 
 
 def get_test_command_args() -> list[list[str]]:
-    return [[key.__name__] for key in FUNCTIONS]
+    return [
+        [key.__name__, solver] for key in FUNCTIONS for solver in ["scalar", "numpy"]
+    ]
 
 
 def assert_vector3_equals(
@@ -50,7 +59,7 @@ def clean_scene(context: Context) -> None:
     bpy.ops.outliner.orphans_purge(do_recursive=True)
 
 
-def one_joint_extending_in_y_direction(context: Context) -> None:
+def one_joint_extending_in_y_direction(context: Context, solver: str) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -61,6 +70,7 @@ def one_joint_extending_in_y_direction(context: Context) -> None:
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -126,7 +136,9 @@ def one_joint_extending_in_y_direction(context: Context) -> None:
     )
 
 
-def one_joint_extending_in_y_direction_with_rotating_armature(context: Context) -> None:
+def one_joint_extending_in_y_direction_with_rotating_armature(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(
@@ -139,6 +151,7 @@ def one_joint_extending_in_y_direction_with_rotating_armature(context: Context)
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -205,7 +218,7 @@ def one_joint_extending_in_y_direction_with_rotating_armature(context: Context)
 
 
 def one_joint_extending_in_y_direction_with_rotating_armature_stiffness(
-    context: Context,
+    context: Context, solver: str
 ) -> None:
     clean_scene(context)
 
@@ -219,6 +232,7 @@ def one_joint_extending_in_y_direction_with_rotating_armature_stiffness(
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -288,7 +302,7 @@ def one_joint_extending_in_y_direction_with_rotating_armature_stiffness(
     )
 
 
-def two_joints_extending_in_y_direction(context: Context) -> None:
+def two_joints_extending_in_y_direction(context: Context, solver: str) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -299,6 +313,7 @@ def two_joints_extending_in_y_direction(context: Context) -> None:
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -385,7 +400,7 @@ def two_joints_extending_in_y_direction(context: Context) -> None:
     )
 
 
-def two_joints_extending_in_y_direction_roll(context: Context) -> None:
+def two_joints_extending_in_y_direction_roll(context: Context, solver: str) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -396,6 +411,7 @@ def two_joints_extending_in_y_direction_roll(context: Context) -> None:
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -485,7 +501,9 @@ def two_joints_extending_in_y_direction_roll(context: Context) -> None:
     )
 
 
-def two_joints_extending_in_y_direction_local_translation(context: Context) -> None:
+def two_joints_extending_in_y_direction_local_translation(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -496,6 +514,7 @@ def two_joints_extending_in_y_direction_local_translation(context: Context) -> N
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -586,7 +605,9 @@ def two_joints_extending_in_y_direction_local_translation(context: Context) -> N
     )
 
 
-def two_joints_extending_in_y_direction_connected(context: Context) -> None:
+def two_joints_extending_in_y_direction_connected(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -597,6 +618,7 @@ def two_joints_extending_in_y_direction_connected(context: Context) -> None:
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -688,7 +710,7 @@ def two_joints_extending_in_y_direction_connected(context: Context) -> None:
 
 
 def one_joint_extending_in_y_direction_gravity_y_object_move_to_z(
-    context: Context,
+    context: Context, solver: str
 ) -> None:
     clean_scene(context)
 
@@ -700,6 +722,7 @@ def one_joint_extending_in_y_direction_gravity_y_object_move_to_z(
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -781,7 +804,9 @@ def one_joint_extending_in_y_direction_gravity_y_object_move_to_z(
     )
 
 
-def one_joint_extending_in_y_direction_rounding_180_degree(context: Context) -> None:
+def one_joint_extending_in_y_direction_rounding_180_degree(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -792,6 +817,7 @@ def one_joint_extending_in_y_direction_rounding_180_degree(context: Context) ->
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -843,7 +869,9 @@ def one_joint_extending_in_y_direction_rounding_180_degree(context: Context) ->
     )
 
 
-def two_joints_extending_in_y_direction_root_down(context: Context) -> None:
+def two_joints_extending_in_y_direction_root_down(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
@@ -854,6 +882,7 @@ def two_joints_extending_in_y_direction_root_down(context: Context) -> None:
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -936,7 +965,9 @@ def two_joints_extending_in_y_direction_root_down(context: Context) -> None:
     )
 
 
-def two_joints_extending_in_y_direction_with_child_stiffness(context: Context) -> None:
+def two_joints_extending_in_y_direction_with_child_stiffness(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE")
@@ -947,6 +978,7 @@ def two_joints_extending_in_y_direction_with_child_stiffness(context: Context) -
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -1061,7 +1093,9 @@ def two_joints_extending_in_y_direction_with_child_stiffness(context: Context) -
     )
 
 
-def one_joint_extending_in_y_direction_with_roll_stiffness(context: Context) -> None:
+def one_joint_extending_in_y_direction_with_roll_stiffness(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE")
@@ -1072,6 +1106,7 @@ def one_joint_extending_in_y_direction_with_roll_stiffness(context: Context) ->
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     root_bone = armature.data.edit_bones.new("root")
@@ -1136,7 +1171,9 @@ def one_joint_extending_in_y_direction_with_roll_stiffness(context: Context) ->
     )
 
 
-def two_joints_extending_in_y_direction_center_move_to_z(context: Context) -> None:
+def two_joints_extending_in_y_direction_center_move_to_z(
+    context: Context, solver: str
+) -> None:
     clean_scene(context)
 
     bpy.ops.object.add(type="ARMATURE")
@@ -1147,6 +1184,7 @@ def two_joints_extending_in_y_direction_center_move_to_z(context: Context) -> No
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     joint_bone0 = armature.data.edit_bones.new("joint0")
@@ -1224,7 +1262,7 @@ def two_joints_extending_in_y_direction_center_move_to_z(context: Context) -> No
 
 
 def two_joints_extending_in_y_direction_center_move_to_z_no_inertia(
-    context: Context,
+    context: Context, solver: str
 ) -> None:
     clean_scene(context)
 
@@ -1236,6 +1274,7 @@ def two_joints_extending_in_y_direction_center_move_to_z_no_inertia(
     get_armature_extension(armature.data).addon_version = addon_version
     get_armature_extension(armature.data).spec_version = spec_version
     get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
 
     bpy.ops.object.mode_set(mode="EDIT")
     joint_bone0 = armature.data.edit_bones.new("joint0")
@@ -1312,6 +1351,620 @@ def two_joints_extending_in_y_direction_center_move_to_z_no_inertia(
     )
 
 
+def one_joint_extending_in_y_direction_remove_joint_bone(
+    context: Context, solver: str
+) -> None:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+
+    joint_bone0 = armature.data.edit_bones.new("joint0")
+    joint_bone0.parent = root_bone
+    joint_bone0.head = Vector((0, 1, 0))
+    joint_bone0.tail = Vector((0, 2, 0))
+
+    joint_bone1 = armature.data.edit_bones.new("joint1")
+    joint_bone1.parent = joint_bone0
+    joint_bone1.head = Vector((0, 2, 0))
+    joint_bone1.tail = Vector((0, 3, 0))
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+
+    joints = get_armature_extension(armature.data).spring_bone1.springs[0].joints
+    joints[0].node.bone_name = "joint0"
+    joints[0].gravity_power = 1
+    joints[0].drag_force = 1
+    joints[0].stiffness = 0
+    joints[1].node.bone_name = "joint1"
+    joints[1].gravity_power = 1
+    joints[1].drag_force = 1
+    joints[1].stiffness = 0
+
+    context.view_layer.update()
+
+    ops.vrm.update_spring_bone1_animation(delta_time=1)
+
+    # 設定の変更は次の更新で反映される
+    joints[1].node.bone_name = ""
+
+    ops.vrm.update_spring_bone1_animation(delta_time=10000)
+    context.view_layer.update()
+
+    assert_vector3_equals(
+        armature.pose.bones["joint0"].head, (0, 1, 0), "10000秒後のjoint0"
+    )
+    assert_vector3_equals(
+        armature.pose.bones["joint1"].head, (0, 1.7071, -0.7071), "10000秒後のjoint1"
+    )
+
+
+def one_joint_extending_in_y_direction_save_animation_state(
+    context: Context, solver: str
+) -> None:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    get_armature_extension(armature.data).spring_bone1.enable_animation = True
+    get_armature_extension(armature.data).spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+
+    joint_bone0 = armature.data.edit_bones.new("joint0")
+    joint_bone0.parent = root_bone
+    joint_bone0.head = Vector((0, 1, 0))
+    joint_bone0.tail = Vector((0, 2, 0))
+
+    joint_bone1 = armature.data.edit_bones.new("joint1")
+    joint_bone1.parent = joint_bone0
+    joint_bone1.head = Vector((0, 2, 0))
+    joint_bone1.tail = Vector((0, 3, 0))
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+
+    joints = get_armature_extension(armature.data).spring_bone1.springs[0].joints
+    joints[0].node.bone_name = "joint0"
+    joints[0].gravity_power = 1
+    joints[0].drag_force = 1
+    joints[0].stiffness = 0
+    joints[1].node.bone_name = "joint1"
+    joints[1].gravity_power = 1
+    joints[1].drag_force = 1
+    joints[1].stiffness = 0
+
+    context.view_layer.update()
+
+    ops.vrm.update_spring_bone1_animation(delta_time=1)
+    context.view_layer.update()
+
+    # 計算中の状態はプロパティに書き込まれない
+    if joints[1].animation_state.initialized_as_tail:
+        message = "animation state is written before saving"
+        raise AssertionError(message)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bpy.ops.wm.save_as_mainfile(
+            filepath=str(Path(temp_dir, "spring_bone.blend")), copy=True
+        )
+
+    if not joints[1].animation_state.initialized_as_tail:
+        message = "animation state is not written after saving"
+        raise AssertionError(message)
+    assert_vector3_equals(
+        Vector((0, 1.7071, -0.7071)),
+        joints[1].animation_state.current_world_translation,
+        "保存後のjoint1",
+    )
+
+    assert ops.vrm.reset_spring_bone1_animation_state(armature_name=armature.name) == {
+        "FINISHED"
+    }
+    if joints[1].animation_state.initialized_as_tail:
+        message = "animation state is not reset"
+        raise AssertionError(message)
+
+
+def one_joint_extending_in_y_direction_bake(context: Context, solver: str) -> None:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    get_armature_extension(armature.data).spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+
+    joint_bone0 = armature.data.edit_bones.new("joint0")
+    joint_bone0.parent = root_bone
+    joint_bone0.head = Vector((0, 1, 0))
+    joint_bone0.tail = Vector((0, 2, 0))
+
+    joint_bone1 = armature.data.edit_bones.new("joint1")
+    joint_bone1.parent = joint_bone0
+    joint_bone1.head = Vector((0, 2, 0))
+    joint_bone1.tail = Vector((0, 3, 0))
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+
+    joints = get_armature_extension(armature.data).spring_bone1.springs[0].joints
+    joints[0].node.bone_name = "joint0"
+    joints[0].gravity_power = 10000
+    joints[0].drag_force = 1
+    joints[0].stiffness = 0
+    joints[1].node.bone_name = "joint1"
+    joints[1].gravity_power = 10000
+    joints[1].drag_force = 1
+    joints[1].stiffness = 0
+
+    context.scene.render.fps = 1
+    context.scene.render.fps_base = 1
+    context.scene.frame_set(1)
+    context.view_layer.update()
+    get_armature_extension(armature.data).spring_bone1.enable_animation = True
+
+    assert ops.vrm.bake_spring_bone1_animation(
+        armature_name=armature.name, frame_start=1, frame_end=3
+    ) == {"FINISHED"}
+
+    # ベイクしたキーフレームの上でシミュレーションが重ならないこと
+    if get_armature_extension(armature.data).spring_bone1.enable_animation:
+        message = "enable_animation is not disabled by baking"
+        raise AssertionError(message)
+    if context.scene.frame_current != 1:
+        message = f"frame_current is {context.scene.frame_current}"
+        raise AssertionError(message)
+
+    animation_data = armature.animation_data
+    if not animation_data or not animation_data.action:
+        raise AssertionError
+    fcurve = animation_data.action.fcurves.find(
+        'pose.bones["joint0"].rotation_quaternion', index=0
+    )
+    if not fcurve:
+        raise AssertionError
+    if len(fcurve.keyframe_points) != 3:
+        message = f"keyframe count is {len(fcurve.keyframe_points)}"
+        raise AssertionError(message)
+
+    # 1フレームで60回計算され、重力の方向に向く
+    context.scene.frame_set(3)
+    context.view_layer.update()
+    assert_vector3_equals(
+        armature.pose.bones["joint0"].head, (0, 1, 0), "3フレーム目のjoint0"
+    )
+    assert_vector3_equals(
+        armature.pose.bones["joint1"].head, (0, 1, -1), "3フレーム目のjoint1"
+    )
+
+    # 範囲を指定しない場合は、シーンの範囲でベイクする
+    context.scene.frame_start = 2
+    context.scene.frame_end = 5
+    animation_data.action = None
+    assert ops.vrm.bake_spring_bone1_animation(armature_name=armature.name) == {
+        "FINISHED"
+    }
+    action = animation_data.action
+    if not action:
+        raise AssertionError
+    fcurve = action.fcurves.find('pose.bones["joint0"].rotation_quaternion', index=0)
+    if not fcurve:
+        raise AssertionError
+    frames = [keyframe_point.co[0] for keyframe_point in fcurve.keyframe_points]
+    if frames != [2, 3, 4, 5]:
+        message = f"keyframes are inserted at {frames}"
+        raise AssertionError(message)
+
+
+def one_joint_extending_in_y_direction_substep_policy(
+    context: Context, solver: str
+) -> None:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    spring_bone1 = get_armature_extension(armature.data).spring_bone1
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    spring_bone1.enable_animation = True
+    spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+
+    joint_bone0 = armature.data.edit_bones.new("joint0")
+    joint_bone0.parent = root_bone
+    joint_bone0.head = Vector((0, 1, 0))
+    joint_bone0.tail = Vector((0, 2, 0))
+
+    joint_bone1 = armature.data.edit_bones.new("joint1")
+    joint_bone1.parent = joint_bone0
+    joint_bone1.head = Vector((0, 2, 0))
+    joint_bone1.tail = Vector((0, 3, 0))
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+
+    joints = spring_bone1.springs[0].joints
+    joints[0].node.bone_name = "joint0"
+    joints[0].gravity_power = 1
+    joints[0].drag_force = 1
+    joints[0].stiffness = 0
+    joints[1].node.bone_name = "joint1"
+    joints[1].gravity_power = 1
+    joints[1].drag_force = 1
+    joints[1].stiffness = 0
+
+    # 1フレームで60ステップ進む
+    context.scene.render.fps = 1
+    context.scene.render.fps_base = 1
+
+    handler.reset_substep_counts()
+    for substep_policy, max_substeps, expected_substep_count in [
+        (spring_bone1.SUBSTEP_POLICY_CATCH_UP.identifier, 2, 60),
+        (spring_bone1.SUBSTEP_POLICY_LIMIT.identifier, 2, 2),
+        (spring_bone1.SUBSTEP_POLICY_MERGE.identifier, 3, 3),
+        (spring_bone1.SUBSTEP_POLICY_SKIP.identifier, 2, 1),
+    ]:
+        spring_bone1.substep_policy = substep_policy
+        spring_bone1.max_substeps = max_substeps
+        context.scene.frame_set(1)
+        handler.reset_state(context)
+        context.scene.frame_set(2)
+        substep_count = handler.state.object_name_to_substep_counts[armature.name][-1]
+        if substep_count != expected_substep_count:
+            message = (
+                f"{substep_policy}: substep count {substep_count}"
+                + f" is different from {expected_substep_count}"
+            )
+            raise AssertionError(message)
+
+    # ステップ数はアーマチュアのオブジェクトごとに記録される
+    if handler.state.object_name_to_max_substep_count != {armature.name: 60}:
+        message = (
+            "max substep counts are "
+            + f"{handler.state.object_name_to_max_substep_count}"
+        )
+        raise AssertionError(message)
+    assert ops.vrm.reset_spring_bone1_substep_counts(armature_name=armature.name) == {
+        "FINISHED"
+    }
+    if (
+        handler.state.object_name_to_substep_counts
+        or handler.state.object_name_to_max_substep_count
+    ):
+        message = "substep counts are not reset"
+        raise AssertionError(message)
+
+    # 初期姿勢から少しだけ動かし、勢いの付いた姿勢を用意する
+    joints[0].drag_force = 0.2
+    joints[1].drag_force = 0.2
+    spring_bone1.substep_policy = spring_bone1.SUBSTEP_POLICY_CATCH_UP.identifier
+    context.scene.render.fps = 60
+    context.scene.frame_set(1)
+    for bone_name in ["joint0", "joint1"]:
+        armature.pose.bones[bone_name].rotation_quaternion = Quaternion()
+    handler.reset_animation_state(armature.data)
+    context.view_layer.update()
+    handler.reset_state(context)
+    context.scene.frame_set(2)
+    context.scene.frame_set(3)
+    context.view_layer.update()
+    before_skip_head = armature.pose.bones["joint1"].head.copy()
+    before_skip_rotations = {
+        bone_name: armature.pose.bones[bone_name].rotation_quaternion.copy()
+        for bone_name in ["joint0", "joint1"]
+    }
+
+    # スキップは、状態を初期化して現在の姿勢から1ステップ計算するのと同じになる
+    handler.reset_animation_state(armature.data)
+    ops.vrm.update_spring_bone1_animation(delta_time=1 / 60)
+    context.view_layer.update()
+    expected_head = armature.pose.bones["joint1"].head.copy()
+
+    spring_bone1.substep_policy = spring_bone1.SUBSTEP_POLICY_SKIP.identifier
+    context.scene.render.fps = 1
+    context.scene.frame_set(1)
+    for bone_name, rotation in before_skip_rotations.items():
+        armature.pose.bones[bone_name].rotation_quaternion = rotation
+    context.view_layer.update()
+    handler.reset_state(context)
+    context.scene.frame_set(2)
+    context.view_layer.update()
+    skipped_head = armature.pose.bones["joint1"].head
+    assert_vector3_equals(expected_head, skipped_head, "スキップ後のjoint1")
+    if (before_skip_head - skipped_head).length < 0.001:
+        message = f"joint1 is frozen at {tuple(skipped_head)} after skipping"
+        raise AssertionError(message)
+
+
+def two_springs_save_animation_state_after_moving_spring(
+    context: Context, solver: str
+) -> None:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    spring_bone1 = get_armature_extension(armature.data).spring_bone1
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    spring_bone1.enable_animation = True
+    spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+    for prefix, direction in [("a", Vector((0, 1, 0))), ("b", Vector((1, 0, 0)))]:
+        parent_bone = root_bone
+        for index in range(2):
+            joint_bone = armature.data.edit_bones.new(f"{prefix}{index}")
+            joint_bone.parent = parent_bone
+            joint_bone.head = direction * (index + 1)
+            joint_bone.tail = direction * (index + 2)
+            parent_bone = joint_bone
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    for spring_index, prefix in enumerate(["a", "b"]):
+        assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {
+            "FINISHED"
+        }
+        for index in range(2):
+            assert ops.vrm.add_spring_bone1_spring_joint(
+                armature_name=armature.name, spring_index=spring_index
+            ) == {"FINISHED"}
+            joint = spring_bone1.springs[spring_index].joints[index]
+            joint.node.bone_name = f"{prefix}{index}"
+            joint.gravity_power = 1
+            joint.drag_force = 1
+            joint.stiffness = 0
+
+    context.view_layer.update()
+    ops.vrm.update_spring_bone1_animation(delta_time=1)
+    context.view_layer.update()
+
+    # 再生を止めると、状態がプロパティに書き込まれる
+    handler.animation_playback_post(None)
+    for spring in spring_bone1.springs:
+        if not spring.joints[1].animation_state.initialized_as_tail:
+            message = "animation state is not written after the playback"
+            raise AssertionError(message)
+
+    ops.vrm.update_spring_bone1_animation(delta_time=1)
+    context.view_layer.update()
+    expected_translations = {
+        spring.joints[1].node.bone_name: armature.matrix_world
+        @ armature.pose.bones[spring.joints[1].node.bone_name].head
+        for spring in spring_bone1.springs
+    }
+
+    # スプリングの順番を入れ替えても、同じスプリングに状態が書き戻される
+    assert ops.vrm.move_up_spring_bone1_spring(
+        armature_name=armature.name, spring_index=1
+    ) == {"FINISHED"}
+    handler.flush_animation_states(context)
+    for spring in spring_bone1.springs:
+        bone_name = spring.joints[1].node.bone_name
+        assert_vector3_equals(
+            expected_translations[bone_name],
+            spring.joints[1].animation_state.current_world_translation,
+            f"{bone_name} after moving the spring",
+        )
+
+    # ジョイントの数が変わったスプリングには書き戻さない
+    ops.vrm.update_spring_bone1_animation(delta_time=1)
+    assert ops.vrm.add_spring_bone1_spring_joint(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    previous_translation = Vector(
+        spring_bone1.springs[0].joints[1].animation_state.current_world_translation
+    )
+    handler.flush_animation_states(context)
+    assert_vector3_equals(
+        previous_translation,
+        spring_bone1.springs[0].joints[1].animation_state.current_world_translation,
+        "joint count changed",
+    )
+
+
+def simulate_three_joints_with_collider(
+    context: Context, solver: str, ui_collider_type: Optional[str]
+) -> list[Vector]:
+    clean_scene(context)
+
+    bpy.ops.object.add(type="ARMATURE", location=(0, 0, 0))
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+
+    spring_bone1 = get_armature_extension(armature.data).spring_bone1
+    get_armature_extension(armature.data).addon_version = addon_version
+    get_armature_extension(armature.data).spec_version = spec_version
+    spring_bone1.enable_animation = True
+    spring_bone1.solver = solver
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    root_bone = armature.data.edit_bones.new("root")
+    root_bone.head = Vector((0, 0, 0))
+    root_bone.tail = Vector((0, 1, 0))
+
+    parent_bone = root_bone
+    for index in range(3):
+        joint_bone = armature.data.edit_bones.new(f"joint{index}")
+        joint_bone.parent = parent_bone
+        joint_bone.head = Vector((0, index + 1, 0))
+        joint_bone.tail = Vector((0, index + 2, 0))
+        parent_bone = joint_bone
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    for _ in range(3):
+        assert ops.vrm.add_spring_bone1_spring_joint(
+            armature_name=armature.name, spring_index=0
+        ) == {"FINISHED"}
+
+    joints = spring_bone1.springs[0].joints
+    for index, joint in enumerate(joints):
+        joint.node.bone_name = f"joint{index}"
+        joint.gravity_power = 1
+        joint.drag_force = 0.5
+        joint.stiffness = 0
+        joint.hit_radius = 0.1
+
+    if ui_collider_type is not None:
+        assert ops.vrm.add_spring_bone1_collider(armature_name=armature.name) == {
+            "FINISHED"
+        }
+        collider = spring_bone1.colliders[0]
+        collider.node.bone_name = "root"
+        collider.ui_collider_type = ui_collider_type
+        extended = collider.extensions.vrmc_spring_bone_extended_collider
+        if ui_collider_type == collider.UI_COLLIDER_TYPE_SPHERE.identifier:
+            collider.shape.sphere.offset = (0, 2.4, -0.8)
+            collider.shape.sphere.radius = 0.4
+        elif ui_collider_type == collider.UI_COLLIDER_TYPE_CAPSULE.identifier:
+            collider.shape.capsule.offset = (-1, 2.4, -0.8)
+            collider.shape.capsule.tail = (1, 2.4, -0.8)
+            collider.shape.capsule.radius = 0.4
+        elif ui_collider_type == collider.UI_COLLIDER_TYPE_PLANE.identifier:
+            extended.shape.plane.offset = (0, 0, -0.8)
+            extended.shape.plane.normal = (0, 0, 1)
+        elif ui_collider_type == collider.UI_COLLIDER_TYPE_SPHERE_INSIDE.identifier:
+            extended.shape.sphere.offset = (0, 2, 0)
+            extended.shape.sphere.radius = 1
+        elif ui_collider_type == collider.UI_COLLIDER_TYPE_CAPSULE_INSIDE.identifier:
+            extended.shape.capsule.offset = (0, 1, 0)
+            extended.shape.capsule.tail = (0, 3, 0)
+            extended.shape.capsule.radius = 0.6
+        else:
+            message = f"Unexpected collider type: {ui_collider_type}"
+            raise AssertionError(message)
+
+        assert ops.vrm.add_spring_bone1_collider_group(armature_name=armature.name) == {
+            "FINISHED"
+        }
+        assert ops.vrm.add_spring_bone1_collider_group_collider(
+            armature_name=armature.name, collider_group_index=0
+        ) == {"FINISHED"}
+        spring_bone1.collider_groups[0].colliders[0].collider_name = collider.name
+        assert ops.vrm.add_spring_bone1_spring_collider_group(
+            armature_name=armature.name, spring_index=0
+        ) == {"FINISHED"}
+        spring_bone1.springs[0].collider_groups[
+            0
+        ].collider_group_name = spring_bone1.collider_groups[0].name
+
+    context.view_layer.update()
+
+    # 静止して接触し続ける状態になると、単精度と倍精度の差で衝突の有無が
+    # 変わることがあるので、コライダーに当たって動いている間を比べる
+    for _ in range(15):
+        ops.vrm.update_spring_bone1_animation(delta_time=1 / 30)
+    context.view_layer.update()
+
+    # joint0の位置は固定なので、後続のジョイントの位置を返す
+    return [
+        armature.matrix_world @ armature.pose.bones[f"joint{index}"].head
+        for index in [1, 2]
+    ]
+
+
+def three_joints_collider_solver_parity(context: Context, solver: str) -> None:
+    ui_collider_types = [
+        SpringBone1ColliderPropertyGroup.UI_COLLIDER_TYPE_SPHERE.identifier,
+        SpringBone1ColliderPropertyGroup.UI_COLLIDER_TYPE_CAPSULE.identifier,
+        SpringBone1ColliderPropertyGroup.UI_COLLIDER_TYPE_PLANE.identifier,
+        SpringBone1ColliderPropertyGroup.UI_COLLIDER_TYPE_SPHERE_INSIDE.identifier,
+        SpringBone1ColliderPropertyGroup.UI_COLLIDER_TYPE_CAPSULE_INSIDE.identifier,
+    ]
+
+    free_heads = simulate_three_joints_with_collider(context, solver, None)
+    for ui_collider_type in ui_collider_types:
+        # NumPy版の結果はスカラー版と一致する
+        expected_heads = simulate_three_joints_with_collider(
+            context, "scalar", ui_collider_type
+        )
+        actual_heads = simulate_three_joints_with_collider(
+            context, solver, ui_collider_type
+        )
+        for index, (expected_head, actual_head) in enumerate(
+            zip(expected_heads, actual_heads), start=1
+        ):
+            assert_vector3_equals(
+                expected_head, actual_head, f"{ui_collider_type} joint{index}"
+            )
+
+        # コライダーが衝突判定に使われている
+        if all(
+            (free_head - actual_head).length < 0.001
+            for free_head, actual_head in zip(free_heads, actual_heads)
+        ):
+            message = f"{ui_collider_type} does not affect the joints"
+            raise AssertionError(message)
+
+
 FUNCTIONS = [
     one_joint_extending_in_y_direction,
     one_joint_extending_in_y_direction_gravity_y_object_move_to_z,
@@ -1319,6 +1972,10 @@ FUNCTIONS = [
     one_joint_extending_in_y_direction_with_rotating_armature_stiffness,
     one_joint_extending_in_y_direction_rounding_180_degree,
     one_joint_extending_in_y_direction_with_roll_stiffness,
+    one_joint_extending_in_y_direction_remove_joint_bone,
+    one_joint_extending_in_y_direction_save_animation_state,
+    one_joint_extending_in_y_direction_bake,
+    one_joint_extending_in_y_direction_substep_policy,
     two_joints_extending_in_y_direction,
     two_joints_extending_in_y_direction_root_down,
     two_joints_extending_in_y_direction_roll,
@@ -1327,15 +1984,17 @@ FUNCTIONS = [
     two_joints_extending_in_y_direction_with_child_stiffness,
     two_joints_extending_in_y_direction_center_move_to_z,
     two_joints_extending_in_y_direction_center_move_to_z_no_inertia,
+    two_springs_save_animation_state_after_moving_spring,
+    three_joints_collider_solver_parity,
 ]
 
 
-def test(context: Context, function_name: str) -> None:
+def test(context: Context, function_name: str, solver: str) -> None:
     function = next((f for f in FUNCTIONS if f.__name__ == function_name), None)
     if function is None:
         message = f"No function name: {function_name}"
         raise AssertionError(message)
-    function(context)
+    function(context, solver)
 
 
 if __name__ == "__main__":
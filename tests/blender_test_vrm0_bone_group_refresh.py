@@ -0,0 +1,208 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import bpy
+from bpy.types import Armature, Context, Object
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor.extension import (
+    VrmAddonArmatureExtensionPropertyGroup,
+    get_armature_extension,
+)
+from io_scene_vrm.editor.vrm0.property_group import (
+    Vrm0SecondaryAnimationPropertyGroup,
+    bone_group_refresh_state,
+    defer_bone_group_refresh,
+)
+
+COLLIDER_GROUP_BONE_NAMES = [
+    "spine",
+    "chest",
+    "neck",
+    "head",
+    "upper_arm.L",
+    "upper_arm.R",
+]
+
+
+def clean_scene(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+
+def get_secondary_animation(armature: Object) -> Vrm0SecondaryAnimationPropertyGroup:
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    secondary_animation: Vrm0SecondaryAnimationPropertyGroup = get_armature_extension(
+        armature_data
+    ).vrm0.secondary_animation
+    return secondary_animation
+
+
+def create_armature(context: Context) -> Object:
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+    get_armature_extension(
+        armature.data
+    ).spec_version = VrmAddonArmatureExtensionPropertyGroup.SPEC_VERSION_VRM0
+
+    secondary_animation = get_secondary_animation(armature)
+    for index, bone_name in enumerate(COLLIDER_GROUP_BONE_NAMES):
+        assert ops.vrm.add_vrm0_secondary_animation_collider_group(
+            armature_name=armature.name
+        ) == {"FINISHED"}
+        secondary_animation.collider_groups[index].node.set_bone_name(bone_name)
+        assert ops.vrm.add_vrm0_secondary_animation_collider_group_collider(
+            armature_name=armature.name, collider_group_index=index
+        ) == {"FINISHED"}
+
+    rng = random.Random(0)  # noqa: S311
+    for bone_group_index in range(4):
+        assert ops.vrm.add_vrm0_secondary_animation_group(
+            armature_name=armature.name
+        ) == {"FINISHED"}
+        bone_group = secondary_animation.bone_groups[bone_group_index]
+        bone_group.bones.add().set_bone_name("hips")
+        for collider_group in rng.sample(list(secondary_animation.collider_groups), 2):
+            bone_group.collider_groups.add().value = collider_group.name
+    return armature
+
+
+def read_bone_group_collider_group_names(armature: Object) -> list[list[str]]:
+    return [
+        [collider_group.value for collider_group in bone_group.collider_groups]
+        for bone_group in get_secondary_animation(armature).bone_groups
+    ]
+
+
+def assert_bone_groups_refreshed(armature: Object) -> None:
+    secondary_animation = get_secondary_animation(armature)
+    collider_group_names = [
+        collider_group.name for collider_group in secondary_animation.collider_groups
+    ]
+    bone_group_collider_group_names = read_bone_group_collider_group_names(armature)
+    for names in bone_group_collider_group_names:
+        assert names, bone_group_collider_group_names
+        for name in names:
+            assert name in collider_group_names, (name, collider_group_names)
+
+    # 全て更新し直しても変化しないこと
+    for collider_group in secondary_animation.collider_groups:
+        collider_group.refresh(armature)
+    for bone_group in secondary_animation.bone_groups:
+        bone_group.refresh(armature)
+    assert [
+        collider_group.name for collider_group in secondary_animation.collider_groups
+    ] == collider_group_names
+    assert (
+        read_bone_group_collider_group_names(armature)
+        == bone_group_collider_group_names
+    )
+
+
+def assert_bone_groups_refreshed_after_import(context: Context) -> None:
+    clean_scene(context)
+    armature = create_armature(context)
+    expected_bone_group_collider_group_bone_names = [
+        [name.split("#")[0] for name in names]
+        for names in read_bone_group_collider_group_names(armature)
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir, "bone_group_refresh.vrm")
+        assert ops.export_scene.vrm(filepath=str(filepath)) == {"FINISHED"}
+        clean_scene(context)
+        assert ops.import_scene.vrm(filepath=str(filepath)) == {"FINISHED"}
+
+    assert bone_group_refresh_state.scope_depth == 0
+    assert not bone_group_refresh_state.armature_object_name_to_collider_group_uuids
+
+    armature = next(obj for obj in context.blend_data.objects if obj.type == "ARMATURE")
+    bone_group_collider_group_bone_names = [
+        [name.split("#")[0] for name in names]
+        for names in read_bone_group_collider_group_names(armature)
+    ]
+    assert (
+        bone_group_collider_group_bone_names
+        == expected_bone_group_collider_group_bone_names
+    ), bone_group_collider_group_bone_names
+    assert_bone_groups_refreshed(armature)
+
+
+def assert_bone_group_refresh_deferred(context: Context) -> None:
+    clean_scene(context)
+    armature = create_armature(context)
+    secondary_animation = get_secondary_animation(armature)
+    collider_group = secondary_animation.collider_groups[0]
+    old_collider_group_name = collider_group.name
+    bone_group_collider_group_names = read_bone_group_collider_group_names(armature)
+
+    with defer_bone_group_refresh(context):
+        with defer_bone_group_refresh(context):
+            collider_group.node.set_bone_name("hips")
+        new_collider_group_name = collider_group.name
+        assert new_collider_group_name == "hips#" + collider_group.uuid
+
+        # スコープの終了までボーングループは更新されない
+        assert (
+            read_bone_group_collider_group_names(armature)
+            == bone_group_collider_group_names
+        )
+
+    expected_bone_group_collider_group_names = [
+        [
+            new_collider_group_name if name == old_collider_group_name else name
+            for name in names
+        ]
+        for names in bone_group_collider_group_names
+    ]
+    assert (
+        read_bone_group_collider_group_names(armature)
+        == expected_bone_group_collider_group_names
+    )
+    assert_bone_groups_refreshed(armature)
+
+    # スコープの外では即座に更新される
+    collider_group.node.set_bone_name("spine")
+    assert (
+        read_bone_group_collider_group_names(armature)
+        == bone_group_collider_group_names
+    )
+
+
+FUNCTIONS = [
+    assert_bone_groups_refreshed_after_import,
+    assert_bone_group_refresh_deferred,
+]
+
+
+def get_test_command_args() -> list[list[str]]:
+    return [[function.__name__] for function in FUNCTIONS]
+
+
+def test(context: Context, function_name: str) -> None:
+    function = next((f for f in FUNCTIONS if f.__name__ == function_name), None)
+    if function is None:
+        message = f"No function name: {function_name}"
+        raise AssertionError(message)
+    function(context)
+
+
+if __name__ == "__main__":
+    context = bpy.context
+    if "--" in sys.argv:
+        test(context, *sys.argv[slice(sys.argv.index("--") + 1, sys.maxsize)])
+    else:
+        for arg in get_test_command_args():
+            test(context, *arg)
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import bpy
+import numpy as np
+from bpy.types import Armature, Context
+from mathutils import Vector
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor.extension import get_armature_extension
+from io_scene_vrm.exporter.vrm0_exporter import (
+    Vrm0Exporter,
+    axis_blender_to_gltf_vectors,
+)
+
+# 頂点ごとの(頂点グループのインデックス, ウエイト)
+VERTEX_GROUP_WEIGHTS: list[list[tuple[int, float]]] = [
+    # 5つ以上の影響があり、上位4つだけを使う
+    [(0, 0.1), (1, 0.5), (2, 0.2), (3, 0.4), (4, 0.3)],
+    # 同じウエイトの場合はジョイントの降順。ジョイントの無いグループとゼロは無視する
+    [(0, 0.25), (2, 0.25), (5, 0.5), (1, 0.0)],
+    [(3, 1.0)],
+    [(4, 0.5), (0, 0.5)],
+    # ウエイトの無い頂点
+    [],
+]
+
+
+def test(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+    hips_bone_name = next(
+        human_bone.node.bone_name
+        for human_bone in get_armature_extension(
+            armature.data
+        ).vrm0.humanoid.human_bones
+        if human_bone.bone == "hips"
+    )
+
+    # 三角形AとBは同一平面上にあり、三角形Cだけ折れ曲がっている
+    mesh = context.blend_data.meshes.new("Mesh")
+    mesh.from_pydata(
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, -1, 1)],
+        [],
+        [(0, 1, 2), (0, 2, 3), (1, 0, 4)],
+    )
+    for polygon in mesh.polygons:
+        polygon.use_smooth = False
+    uv_layer = mesh.uv_layers.new()
+    for loop, uv_loop in zip(mesh.loops, uv_layer.data):
+        x, y, _ = mesh.vertices[loop.vertex_index].co
+        uv_loop.uv = Vector((x, y))
+    # 三角形Bの頂点2だけ、UVが異なる
+    uv_layer.data[4].uv = Vector((0.5, 0.5))
+    mesh.update()
+    if bpy.app.version < (4, 1):
+        mesh.calc_normals_split()
+    mesh.calc_loop_triangles()
+
+    mesh_object = context.blend_data.objects.new("Mesh", mesh)
+    context.scene.collection.objects.link(mesh_object)
+    for group_index in range(7):
+        mesh_object.vertex_groups.new(name=f"group{group_index}")
+    for vertex_index, group_weights in enumerate(VERTEX_GROUP_WEIGHTS):
+        for group_index, weight in group_weights:
+            mesh_object.vertex_groups[group_index].add([vertex_index], weight, "ADD")
+
+    # 頂点グループ6にはジョイントが無い
+    vertex_group_index_to_joint = {group_index: group_index for group_index in range(6)}
+    bone_name_to_node_index = {hips_bone_name: 10}
+    skin_joints = [20, 21, 22, 23, 24, 25, 10]
+    fallback_joint = skin_joints.index(10)
+
+    exporter = Vrm0Exporter(context, [mesh_object], armature)
+    result = exporter.collect_vertex_attributes_and_targets(
+        mesh_object,
+        mesh,
+        np.zeros(len(mesh.loop_triangles), dtype=np.int32),
+        vertex_group_index_to_joint,
+        bone_name_to_node_index,
+        skin_joints,
+        {},
+        None,
+        set(),
+        have_skin=True,
+    )
+
+    # 法線とUVが同じ頂点だけがまとめられ、最初に出現した順番に並ぶ
+    # A: (0, 1, 2), B: (0, 2', 3), C: (1', 0', 4)
+    assert result.count == 8, result.count
+    np.testing.assert_array_equal(
+        result.material_index_to_vertex_indices[0], [0, 1, 2, 0, 3, 4, 5, 6, 7]
+    )
+    output_vertex_indices = [0, 1, 2, 2, 3, 1, 0, 4]
+    vertex_positions = np.array(
+        [mesh.vertices[vertex_index].co for vertex_index in output_vertex_indices]
+    )
+    np.testing.assert_allclose(
+        result.position, axis_blender_to_gltf_vectors(vertex_positions), atol=1e-6
+    )
+    texcoord = result.texcoord
+    if texcoord is None:
+        raise AssertionError
+    assert texcoord[2].tolist() != texcoord[3].tolist(), "UV"
+    assert result.normal[0].tolist() != result.normal[6].tolist(), "normal"
+
+    weights = result.weights
+    joints = result.joints
+    if weights is None or joints is None:
+        raise AssertionError
+    for output_index, vertex_index in enumerate(output_vertex_indices):
+        # 以前の実装と同様に、(ウエイト, ジョイント)の降順で上位4つを使う
+        weight_and_joints = sorted(
+            (
+                (weight, joint)
+                for group_index, weight in VERTEX_GROUP_WEIGHTS[vertex_index]
+                if (joint := vertex_group_index_to_joint.get(group_index)) is not None
+                and weight > 0
+            ),
+            reverse=True,
+        )[:4]
+        if not weight_and_joints:
+            weight_and_joints = [(1.0, fallback_joint)]
+        weight_and_joints.extend([(0.0, 0)] * (4 - len(weight_and_joints)))
+        expected_weights = np.array([weight for weight, _ in weight_and_joints])
+        expected_weights /= expected_weights.sum()
+        np.testing.assert_allclose(
+            weights[output_index],
+            expected_weights,
+            atol=1e-6,
+            err_msg=f"vertex {vertex_index}",
+        )
+        assert joints[output_index].tolist() == [
+            joint for _, joint in weight_and_joints
+        ], (vertex_index, joints[output_index].tolist(), weight_and_joints)
+
+    assert joints[1].tolist() == [5, 2, 0, 0], joints[1].tolist()
+    assert joints[7].tolist() == [fallback_joint, 0, 0, 0], joints[7].tolist()
+
+
+if __name__ == "__main__":
+    test(bpy.context)
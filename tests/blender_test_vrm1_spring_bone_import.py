@@ -0,0 +1,239 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import bpy
+from bpy.types import Armature, Context, Object
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.common.convert import Json
+from io_scene_vrm.editor.extension import (
+    VrmAddonArmatureExtensionPropertyGroup,
+    get_armature_extension,
+    get_bone_extension,
+)
+from io_scene_vrm.editor.property_group import BonePropertyGroup
+from io_scene_vrm.editor.spring_bone1.property_group import (
+    SpringBone1SpringBonePropertyGroup,
+)
+from io_scene_vrm.editor.vrm0.property_group import (
+    Vrm0SecondaryAnimationColliderGroupPropertyGroup,
+)
+from io_scene_vrm.importer.vrm1_importer import Vrm1Importer
+
+COLLIDER_BONE_NAMES = ["spine", "chest", "head"]
+JOINT_BONE_NAMES = ["upper_arm.L", "lower_arm.L", "hand.L"]
+VRM0_COLLIDER_GROUP_BONE_NAMES = ["neck", "upper_arm.R"]
+
+
+def clean_scene(context: Context) -> None:
+    if context.view_layer.objects.active:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.delete()
+    while context.blend_data.collections:
+        context.blend_data.collections.remove(context.blend_data.collections[0])
+
+
+def get_spring_bone(armature: Object) -> SpringBone1SpringBonePropertyGroup:
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    spring_bone: SpringBone1SpringBonePropertyGroup = get_armature_extension(
+        armature_data
+    ).spring_bone1
+    return spring_bone
+
+
+def create_armature(context: Context) -> Object:
+    ops.icyp.make_basic_armature()
+    armature = context.object
+    if not armature or not isinstance(armature.data, Armature):
+        raise AssertionError
+    bpy.ops.object.mode_set(mode="OBJECT")
+    get_armature_extension(
+        armature.data
+    ).spec_version = VrmAddonArmatureExtensionPropertyGroup.SPEC_VERSION_VRM1
+
+    spring_bone = get_spring_bone(armature)
+    assert ops.vrm.add_spring_bone1_collider_group(armature_name=armature.name) == {
+        "FINISHED"
+    }
+    for index, bone_name in enumerate(COLLIDER_BONE_NAMES):
+        assert ops.vrm.add_spring_bone1_collider(armature_name=armature.name) == {
+            "FINISHED"
+        }
+        spring_bone.colliders[index].node.set_bone_name(bone_name)
+        assert ops.vrm.add_spring_bone1_collider_group_collider(
+            armature_name=armature.name, collider_group_index=0
+        ) == {"FINISHED"}
+        spring_bone.collider_groups[0].colliders[
+            index
+        ].collider_name = spring_bone.colliders[index].name
+
+    assert ops.vrm.add_spring_bone1_spring(armature_name=armature.name) == {"FINISHED"}
+    spring = spring_bone.springs[0]
+    spring.center.set_bone_name("chest")
+    for index, bone_name in enumerate(JOINT_BONE_NAMES):
+        assert ops.vrm.add_spring_bone1_spring_joint(
+            armature_name=armature.name, spring_index=0
+        ) == {"FINISHED"}
+        spring.joints[index].node.set_bone_name(bone_name)
+    assert ops.vrm.add_spring_bone1_spring_collider_group(
+        armature_name=armature.name, spring_index=0
+    ) == {"FINISHED"}
+    spring.collider_groups[0].collider_group_name = spring_bone.collider_groups[0].name
+    return armature
+
+
+def assert_bone_uuid(armature_data: Armature, node: BonePropertyGroup) -> None:
+    bone_name = node.bone_name
+    assert bone_name, "bone is not assigned"
+    assert node.bone_uuid == get_bone_extension(armature_data.bones[bone_name]).uuid, (
+        bone_name
+    )
+
+
+def assert_spring_bones_imported(context: Context) -> None:
+    clean_scene(context)
+    create_armature(context)
+
+    original_load_spring_bone1 = Vrm1Importer.load_spring_bone1
+    original_refresh = Vrm0SecondaryAnimationColliderGroupPropertyGroup.refresh
+    refreshed_collider_group_uuids: list[str] = []
+    load_spring_bone1_refreshed_collider_group_uuids: list[str] = []
+
+    def load_spring_bone1(
+        importer: Vrm1Importer,
+        spring_bone: SpringBone1SpringBonePropertyGroup,
+        spring_bone_dict: Json,
+    ) -> None:
+        armature_data = importer.armature_data
+        # 複製されたアーマチュアなどで、ボーンのUUIDが重複している状態にする
+        for bone in armature_data.bones:
+            get_bone_extension(bone).uuid = "duplicate"
+        BonePropertyGroup.clear_bone_uuid_index(armature_data.name)
+
+        # VRM 0.xのコライダーグループがある状態で読み込む
+        secondary_animation = get_armature_extension(
+            armature_data
+        ).vrm0.secondary_animation
+        for index, bone_name in enumerate(VRM0_COLLIDER_GROUP_BONE_NAMES):
+            collider_group = secondary_animation.collider_groups.add()
+            collider_group.uuid = f"vrm0_collider_group{index}"
+            collider_group.node.bone_name = bone_name
+        refreshed_collider_group_uuids.clear()
+
+        original_load_spring_bone1(importer, spring_bone, spring_bone_dict)
+        load_spring_bone1_refreshed_collider_group_uuids.extend(
+            refreshed_collider_group_uuids
+        )
+
+    def refresh(
+        collider_group: Vrm0SecondaryAnimationColliderGroupPropertyGroup,
+        armature: Object,
+    ) -> None:
+        refreshed_collider_group_uuids.append(collider_group.uuid)
+        original_refresh(collider_group, armature)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir, "spring_bone_import.vrm")
+        assert ops.export_scene.vrm(filepath=str(filepath)) == {"FINISHED"}
+        clean_scene(context)
+        with (
+            patch.object(Vrm1Importer, "load_spring_bone1", load_spring_bone1),
+            patch.object(
+                Vrm0SecondaryAnimationColliderGroupPropertyGroup, "refresh", refresh
+            ),
+        ):
+            assert ops.import_scene.vrm(filepath=str(filepath)) == {"FINISHED"}
+
+    # スプリングボーンの読み込み時、VRM 0.xのコライダーグループは最後に一度だけ更新する
+    assert load_spring_bone1_refreshed_collider_group_uuids == [
+        f"vrm0_collider_group{index}"
+        for index in range(len(VRM0_COLLIDER_GROUP_BONE_NAMES))
+    ], load_spring_bone1_refreshed_collider_group_uuids
+
+    armature = next(obj for obj in context.blend_data.objects if obj.type == "ARMATURE")
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+
+    # 重複していたボーンのUUIDが振り直される
+    bone_uuids = [get_bone_extension(bone).uuid for bone in armature_data.bones]
+    assert all(bone_uuids), bone_uuids
+    assert len(set(bone_uuids)) == len(bone_uuids), bone_uuids
+
+    # 全てのボーンの割り当てにUUIDが設定される
+    spring_bone = get_spring_bone(armature)
+    assert [
+        collider.node.bone_name for collider in spring_bone.colliders
+    ] == COLLIDER_BONE_NAMES
+    for collider in spring_bone.colliders:
+        assert_bone_uuid(armature_data, collider.node)
+    (spring,) = spring_bone.springs
+    assert spring.center.bone_name == "chest"
+    assert_bone_uuid(armature_data, spring.center)
+    assert [joint.node.bone_name for joint in spring.joints] == JOINT_BONE_NAMES
+    for joint in spring.joints:
+        assert_bone_uuid(armature_data, joint.node)
+    (collider_group,) = spring_bone.collider_groups
+    assert [collider.collider_name for collider in collider_group.colliders] == [
+        collider.name for collider in spring_bone.colliders
+    ]
+    assert [
+        collider_group_reference.collider_group_name
+        for collider_group_reference in spring.collider_groups
+    ] == [collider_group.name]
+
+
+def assert_bone_name_to_uuid_fixes_duplicates(context: Context) -> None:
+    clean_scene(context)
+    armature = create_armature(context)
+    armature_data = armature.data
+    if not isinstance(armature_data, Armature):
+        raise TypeError
+    bones = list(armature_data.bones)
+    kept_uuid = get_bone_extension(bones[0]).uuid
+    get_bone_extension(bones[1]).uuid = kept_uuid
+    get_bone_extension(bones[2]).uuid = ""
+
+    bone_name_to_uuid = BonePropertyGroup.create_bone_name_to_uuid(armature_data)
+
+    # 最初に出現したUUIDは維持し、重複や空のUUIDだけを振り直す
+    assert bone_name_to_uuid[bones[0].name] == kept_uuid
+    assert list(bone_name_to_uuid) == [bone.name for bone in bones]
+    assert bone_name_to_uuid == {
+        bone.name: get_bone_extension(bone).uuid for bone in bones
+    }
+    assert all(bone_name_to_uuid.values())
+    assert len(set(bone_name_to_uuid.values())) == len(bones)
+
+
+FUNCTIONS = [
+    assert_spring_bones_imported,
+    assert_bone_name_to_uuid_fixes_duplicates,
+]
+
+
+def get_test_command_args() -> list[list[str]]:
+    return [[function.__name__] for function in FUNCTIONS]
+
+
+def test(context: Context, function_name: str) -> None:
+    function = next((f for f in FUNCTIONS if f.__name__ == function_name), None)
+    if function is None:
+        message = f"No function name: {function_name}"
+        raise AssertionError(message)
+    function(context)
+
+
+if __name__ == "__main__":
+    context = bpy.context
+    if "--" in sys.argv:
+        test(context, *sys.argv[slice(sys.argv.index("--") + 1, sys.maxsize)])
+    else:
+        for arg in get_test_command_args():
+            test(context, *arg)
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 from unittest import TestCase
 
@@ -24,6 +25,38 @@ class TestVersion(TestCase):
             ),
         )
 
+    def test_blender_manifest_cache(self) -> None:
+        cache = version.cache
+        saved_cache = replace(cache)
+        try:
+            cache.use = False
+            cache.blender_manifest = None
+            blender_manifest = version.get_blender_manifest()
+            self.assertEqual(blender_manifest, BlenderManifest.read())
+            self.assertEqual(version.get_addon_version(), blender_manifest.version)
+            self.assertIs(version.get_blender_manifest(), blender_manifest)
+
+            # 更新時刻が変わらない限り、キャッシュの有効期限が切れても読み直さない
+            cache.use = False
+            self.assertIs(version.get_blender_manifest(), blender_manifest)
+
+            # 更新時刻が変わった場合は読み直す
+            cache.use = False
+            cache.last_blender_manifest_modification_time = 0.0
+            reread_blender_manifest = version.get_blender_manifest()
+            self.assertIsNot(reread_blender_manifest, blender_manifest)
+            self.assertEqual(reread_blender_manifest, blender_manifest)
+            self.assertFalse(version.blender_restart_required())
+        finally:
+            cache.use = saved_cache.use
+            cache.last_blender_restart_required = (
+                saved_cache.last_blender_restart_required
+            )
+            cache.last_blender_manifest_modification_time = (
+                saved_cache.last_blender_manifest_modification_time
+            )
+            cache.blender_manifest = saved_cache.blender_manifest
+
 
 class TestBlenderManifest(TestCase):
     def test_read_default(self) -> None:
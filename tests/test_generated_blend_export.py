@@ -0,0 +1,254 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderBlendExportTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_armature_transform_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "YXJtYXR1cmVfdHJhbnNmb3JtLmJsZW5k",
+        )
+
+    def test_array_modifier_vrm1_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "YXJyYXlfbW9kaWZpZXJfdnJtMS5ibGVuZA==",
+        )
+
+    def test_basic_armature_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "YmFzaWNfYXJtYXR1cmUuYmxlbmQ=",
+        )
+
+    def test_bone_child_mesh_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "Ym9uZV9jaGlsZF9tZXNoLmJsZW5k",
+        )
+
+    def test_custom_normal_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "Y3VzdG9tX25vcm1hbC5ibGVuZA==",
+        )
+
+    def test_empty_material_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "ZW1wdHlfbWF0ZXJpYWwuYmxlbmQ=",
+        )
+
+    def test_empty_mesh_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "ZW1wdHlfbWVzaC5ibGVuZA==",
+        )
+
+    def test_empty_mesh_convertibles_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "ZW1wdHlfbWVzaF9jb252ZXJ0aWJsZXMuYmxlbmQ=",
+        )
+
+    def test_expression_migration_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "ZXhwcmVzc2lvbl9taWdyYXRpb24uYmxlbmQ=",
+        )
+
+    def test_image_node_traverse_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "aW1hZ2Vfbm9kZV90cmF2ZXJzZS5ibGVuZA==",
+        )
+
+    def test_look_at_preview_disabled_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bG9va19hdF9wcmV2aWV3X2Rpc2FibGVkLmJsZW5k",
+        )
+
+    def test_look_at_preview_enabled_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bG9va19hdF9wcmV2aWV3X2VuYWJsZWQuYmxlbmQ=",
+        )
+
+    def test_material_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bWF0ZXJpYWwuYmxlbmQ=",
+        )
+
+    def test_mesh_convertibles_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bWVzaF9jb252ZXJ0aWJsZXMuYmxlbmQ=",
+        )
+
+    def test_minimal_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bWluaW1hbC5ibGVuZA==",
+        )
+
+    def test_modifier_shapekey_vrm0_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bW9kaWZpZXJfc2hhcGVrZXlfdnJtMC5ibGVuZA==",
+        )
+
+    def test_modifier_shapekey_vrm1_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bW9kaWZpZXJfc2hhcGVrZXlfdnJtMS5ibGVuZA==",
+        )
+
+    def test_mtoon1_2_10_0_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xXzJfMTBfMC5ibGVuZA==",
+        )
+
+    def test_mtoon1_2_16_4_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xXzJfMTZfNC5ibGVuZA==",
+        )
+
+    def test_mtoon1_2_20_54_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xXzJfMjBfNTQuYmxlbmQ=",
+        )
+
+    def test_mtoon1_2_20_61_vrm0_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xXzJfMjBfNjFfdnJtMC5ibGVuZA==",
+        )
+
+    def test_mtoon1_2_20_61_vrm1_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xXzJfMjBfNjFfdnJtMS5ibGVuZA==",
+        )
+
+    def test_mtoon1_vrm0_gamma_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXRvb24xX3ZybTBfZ2FtbWEuYmxlbmQ=",
+        )
+
+    def test_multi_root_armature_vrm0_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXVsdGlfcm9vdF9hcm1hdHVyZV92cm0wLmJsZW5k",
+        )
+
+    def test_multi_root_armature_vrm1_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bXVsdGlfcm9vdF9hcm1hdHVyZV92cm0xLmJsZW5k",
+        )
+
+    def test_ngon_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bmdvbi5ibGVuZA==",
+        )
+
+    def test_non_humanoid_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "bm9uX2h1bWFub2lkLmJsZW5k",
+        )
+
+    def test_pose_rotation_scale_shape_key_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZV9yb3RhdGlvbl9zY2FsZV9zaGFwZV9rZXkuYmxlbmQ=",
+        )
+
+    def test_pose_rotation_scale_shape_key_skinned_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZV9yb3RhdGlvbl9zY2FsZV9zaGFwZV9rZXlfc2tpbm5lZC5ibGVuZA==",
+        )
+
+    def test_poselib_changed_position_pose_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZWxpYl9jaGFuZ2VkX3Bvc2l0aW9uX3Bvc2UuYmxlbmQ=",
+        )
+
+    def test_poselib_changed_position_rest_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZWxpYl9jaGFuZ2VkX3Bvc2l0aW9uX3Jlc3QuYmxlbmQ=",
+        )
+
+    def test_poselib_position_pose_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZWxpYl9wb3NpdGlvbl9wb3NlLmJsZW5k",
+        )
+
+    def test_poselib_position_rest_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cG9zZWxpYl9wb3NpdGlvbl9yZXN0LmJsZW5k",
+        )
+
+    def test_rest_a_pose_t_position_pose_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cmVzdF9hX3Bvc2VfdF9wb3NpdGlvbl9wb3NlLmJsZW5k",
+        )
+
+    def test_rest_a_pose_t_position_rest_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "cmVzdF9hX3Bvc2VfdF9wb3NpdGlvbl9yZXN0LmJsZW5k",
+        )
+
+    def test_simple_morph_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "c2ltcGxlX21vcnBoLmJsZW5k",
+        )
+
+    def test_sphere_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "c3BoZXJlLmJsZW5k",
+        )
+
+    def test_tga_texture_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "dGdhX3RleHR1cmUuYmxlbmQ=",
+        )
+
+    def test_triangle_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "dHJpYW5nbGUuYmxlbmQ=",
+        )
+
+    def test_uninitialized_texture_blend(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2JsZW5kX2V4cG9ydC5weQ==",
+            "dW5pbml0aWFsaXplZF90ZXh0dXJlLmJsZW5k",
+        )
@@ -0,0 +1,17 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderBonePropertyGroupTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_main(self) -> None:
+        self.run_script("YmxlbmRlcl90ZXN0X2JvbmVfcHJvcGVydHlfZ3JvdXAucHk=")
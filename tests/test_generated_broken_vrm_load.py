@@ -0,0 +1,38 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderBrokenVrmLoadTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_draco_vrm(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2Jyb2tlbl92cm1fbG9hZC5weQ==",
+            "ZHJhY28udnJt",
+        )
+
+    def test_empty_vrm(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2Jyb2tlbl92cm1fbG9hZC5weQ==",
+            "ZW1wdHkudnJt",
+        )
+
+    def test_extensions_required_vrm(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2Jyb2tlbl92cm1fbG9hZC5weQ==",
+            "ZXh0ZW5zaW9uc19yZXF1aXJlZC52cm0=",
+        )
+
+    def test_human_bone_vrm(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2Jyb2tlbl92cm1fbG9hZC5weQ==",
+            "aHVtYW5fYm9uZS52cm0=",
+        )
@@ -0,0 +1,26 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderEstimateTPoseTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_right_upper_arm_a(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2VzdGltYXRlX3RfcG9zZS5weQ==",
+            "cmlnaHRfdXBwZXJfYXJtX2E=",
+        )
+
+    def test_right_upper_arm_a_not_connected(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2VzdGltYXRlX3RfcG9zZS5weQ==",
+            "cmlnaHRfdXBwZXJfYXJtX2Ffbm90X2Nvbm5lY3RlZA==",
+        )
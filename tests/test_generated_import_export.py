@@ -0,0 +1,70 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderImportExportTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_basic_armature_vrm_false(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "YmFzaWNfYXJtYXR1cmUudnJt",
+            "ZmFsc2U=",
+        )
+
+    def test_minimal_vrm_false(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "bWluaW1hbC52cm0=",
+            "ZmFsc2U=",
+        )
+
+    def test_sphere_vrm_false(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "c3BoZXJlLnZybQ==",
+            "ZmFsc2U=",
+        )
+
+    def test_triangle_vrm_false(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "dHJpYW5nbGUudnJt",
+            "ZmFsc2U=",
+        )
+
+    def test_basic_armature_vrm_true(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "YmFzaWNfYXJtYXR1cmUudnJt",
+            "dHJ1ZQ==",
+        )
+
+    def test_minimal_vrm_true(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "bWluaW1hbC52cm0=",
+            "dHJ1ZQ==",
+        )
+
+    def test_sphere_vrm_true(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "c3BoZXJlLnZybQ==",
+            "dHJ1ZQ==",
+        )
+
+    def test_triangle_vrm_true(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X2ltcG9ydF9leHBvcnQucHk=",
+            "dHJpYW5nbGUudnJt",
+            "dHJ1ZQ==",
+        )
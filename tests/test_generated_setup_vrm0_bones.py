@@ -0,0 +1,50 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderSetupVrm0BonesTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_test_eye_bone_world_minus_y(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9leWVfYm9uZV93b3JsZF9taW51c195",
+        )
+
+    def test_test_head_bone_world_plus_z(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9oZWFkX2JvbmVfd29ybGRfcGx1c196",
+        )
+
+    def test_test_multiple_children_right_toes_direction_is_same_as_foot(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9tdWx0aXBsZV9jaGlsZHJlbl9yaWdodF90b2VzX2RpcmVjdGlvbl9pc19zYW1lX2FzX2Zvb3Q=",
+        )
+
+    def test_test_multiple_children_no_left_toes(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9tdWx0aXBsZV9jaGlsZHJlbl9ub19sZWZ0X3RvZXM=",
+        )
+
+    def test_test_multiple_children_no_right_fingers(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9tdWx0aXBsZV9jaGlsZHJlbl9ub19yaWdodF9maW5nZXJz",
+        )
+
+    def test_test_left_finger_only_multiple_children_index_intermediate(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NldHVwX3ZybTBfYm9uZXMucHk=",
+            "dGVzdF9sZWZ0X2Zpbmdlcl9vbmx5X211bHRpcGxlX2NoaWxkcmVuX2luZGV4X2ludGVybWVkaWF0ZQ==",
+        )
@@ -0,0 +1,26 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderShapeKeyExportTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_assert_key_blocks_match_evaluation(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NoYXBlX2tleV9leHBvcnQucHk=",
+            "YXNzZXJ0X2tleV9ibG9ja3NfbWF0Y2hfZXZhbHVhdGlvbg==",
+        )
+
+    def test_assert_key_blocks_not_read_if_deformed(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NoYXBlX2tleV9leHBvcnQucHk=",
+            "YXNzZXJ0X2tleV9ibG9ja3Nfbm90X3JlYWRfaWZfZGVmb3JtZWQ=",
+        )
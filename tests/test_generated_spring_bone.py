@@ -0,0 +1,294 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderSpringBoneTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_one_joint_extending_in_y_direction_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbg==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbg==",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_gravity_y_object_move_to_z_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9ncmF2aXR5X3lfb2JqZWN0X21vdmVfdG9feg==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_gravity_y_object_move_to_z_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9ncmF2aXR5X3lfb2JqZWN0X21vdmVfdG9feg==",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_rotating_armature_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvdGF0aW5nX2FybWF0dXJl",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_rotating_armature_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvdGF0aW5nX2FybWF0dXJl",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_rotating_armature_stiffness_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvdGF0aW5nX2FybWF0dXJlX3N0aWZmbmVzcw==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_rotating_armature_stiffness_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvdGF0aW5nX2FybWF0dXJlX3N0aWZmbmVzcw==",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_rounding_180_degree_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9yb3VuZGluZ18xODBfZGVncmVl",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_rounding_180_degree_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9yb3VuZGluZ18xODBfZGVncmVl",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_roll_stiffness_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvbGxfc3RpZmZuZXNz",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_with_roll_stiffness_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl93aXRoX3JvbGxfc3RpZmZuZXNz",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_remove_joint_bone_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9yZW1vdmVfam9pbnRfYm9uZQ==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_remove_joint_bone_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9yZW1vdmVfam9pbnRfYm9uZQ==",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_save_animation_state_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9zYXZlX2FuaW1hdGlvbl9zdGF0ZQ==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_save_animation_state_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9zYXZlX2FuaW1hdGlvbl9zdGF0ZQ==",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_bake_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9iYWtl",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_bake_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9iYWtl",
+            "bnVtcHk=",
+        )
+
+    def test_one_joint_extending_in_y_direction_substep_policy_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9zdWJzdGVwX3BvbGljeQ==",
+            "c2NhbGFy",
+        )
+
+    def test_one_joint_extending_in_y_direction_substep_policy_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "b25lX2pvaW50X2V4dGVuZGluZ19pbl95X2RpcmVjdGlvbl9zdWJzdGVwX3BvbGljeQ==",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb24=",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb24=",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_root_down_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fcm9vdF9kb3du",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_root_down_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fcm9vdF9kb3du",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_roll_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fcm9sbA==",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_roll_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fcm9sbA==",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_connected_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY29ubmVjdGVk",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_connected_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY29ubmVjdGVk",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_local_translation_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fbG9jYWxfdHJhbnNsYXRpb24=",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_local_translation_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fbG9jYWxfdHJhbnNsYXRpb24=",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_with_child_stiffness_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fd2l0aF9jaGlsZF9zdGlmZm5lc3M=",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_with_child_stiffness_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fd2l0aF9jaGlsZF9zdGlmZm5lc3M=",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_center_move_to_z_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY2VudGVyX21vdmVfdG9feg==",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_center_move_to_z_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY2VudGVyX21vdmVfdG9feg==",
+            "bnVtcHk=",
+        )
+
+    def test_two_joints_extending_in_y_direction_center_move_to_z_no_inertia_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY2VudGVyX21vdmVfdG9fel9ub19pbmVydGlh",
+            "c2NhbGFy",
+        )
+
+    def test_two_joints_extending_in_y_direction_center_move_to_z_no_inertia_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX2pvaW50c19leHRlbmRpbmdfaW5feV9kaXJlY3Rpb25fY2VudGVyX21vdmVfdG9fel9ub19pbmVydGlh",
+            "bnVtcHk=",
+        )
+
+    def test_two_springs_save_animation_state_after_moving_spring_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX3NwcmluZ3Nfc2F2ZV9hbmltYXRpb25fc3RhdGVfYWZ0ZXJfbW92aW5nX3NwcmluZw==",
+            "c2NhbGFy",
+        )
+
+    def test_two_springs_save_animation_state_after_moving_spring_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dHdvX3NwcmluZ3Nfc2F2ZV9hbmltYXRpb25fc3RhdGVfYWZ0ZXJfbW92aW5nX3NwcmluZw==",
+            "bnVtcHk=",
+        )
+
+    def test_three_joints_collider_solver_parity_scalar(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dGhyZWVfam9pbnRzX2NvbGxpZGVyX3NvbHZlcl9wYXJpdHk=",
+            "c2NhbGFy",
+        )
+
+    def test_three_joints_collider_solver_parity_numpy(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3NwcmluZ19ib25lLnB5",
+            "dGhyZWVfam9pbnRzX2NvbGxpZGVyX3NvbHZlcl9wYXJpdHk=",
+            "bnVtcHk=",
+        )
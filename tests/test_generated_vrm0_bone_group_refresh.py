@@ -0,0 +1,26 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderVrm0BoneGroupRefreshTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_assert_bone_groups_refreshed_after_import(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3ZybTBfYm9uZV9ncm91cF9yZWZyZXNoLnB5",
+            "YXNzZXJ0X2JvbmVfZ3JvdXBzX3JlZnJlc2hlZF9hZnRlcl9pbXBvcnQ=",
+        )
+
+    def test_assert_bone_group_refresh_deferred(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3ZybTBfYm9uZV9ncm91cF9yZWZyZXNoLnB5",
+            "YXNzZXJ0X2JvbmVfZ3JvdXBfcmVmcmVzaF9kZWZlcnJlZA==",
+        )
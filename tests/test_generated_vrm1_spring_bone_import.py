@@ -0,0 +1,26 @@
+#
+# This source file is machine generated. Please don't edit it
+#
+
+from .base_blender_test_case import BaseBlenderTestCase
+
+
+class BlenderVrm1SpringBoneImportTestCase(BaseBlenderTestCase):
+    def __init__(self, *args: str, **kwargs: str) -> None:
+        # https://stackoverflow.com/a/19102520
+        super().__init__(*args, **kwargs)
+
+    def test_health_check(self) -> None:
+        self.assertTrue(True)
+
+    def test_assert_spring_bones_imported(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3ZybTFfc3ByaW5nX2JvbmVfaW1wb3J0LnB5",
+            "YXNzZXJ0X3NwcmluZ19ib25lc19pbXBvcnRlZA==",
+        )
+
+    def test_assert_bone_name_to_uuid_fixes_duplicates(self) -> None:
+        self.run_script(
+            "YmxlbmRlcl90ZXN0X3ZybTFfc3ByaW5nX2JvbmVfaW1wb3J0LnB5",
+            "YXNzZXJ0X2JvbmVfbmFtZV90b191dWlkX2ZpeGVzX2R1cGxpY2F0ZXM=",
+        )
@@ -0,0 +1,248 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import json
+import random
+import struct
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import TestCase
+
+from io_scene_vrm.common.convert import Json
+from io_scene_vrm.common.gl import GL_FLOAT, GL_UNSIGNED_BYTE, GL_UNSIGNED_SHORT
+from io_scene_vrm.common.gltf import (
+    BinChunkSegment,
+    open_glb,
+    pack_glb,
+    parse_glb,
+    read_accessor_as_ndarray,
+    read_accessors,
+    read_mat4_accessor,
+    write_glb,
+)
+
+
+def pack_glb_in_memory(json_dict: dict[str, Json], bin_chunk_bytes: bytes) -> bytes:
+    """GLBをメモリ上で連結していた、以前のpack_glb()の実装."""
+    json_chunk_bytes = json.dumps(
+        json_dict, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode()
+    while len(json_chunk_bytes) % 4 != 0:
+        json_chunk_bytes += b"\x20"
+    bin_chunk_padding_bytes = b"\x00" * (-len(bin_chunk_bytes) % 4)
+
+    glb = bytearray()
+    glb.extend(b"glTF")
+    glb.extend(struct.pack("<I", 2))
+    glb.extend(
+        struct.pack(
+            "<I",
+            12
+            + 8
+            + len(json_chunk_bytes)
+            + 8
+            + len(bin_chunk_bytes)
+            + len(bin_chunk_padding_bytes),
+        )
+    )
+    glb.extend(struct.pack("<I", len(json_chunk_bytes)))
+    glb.extend(b"JSON")
+    glb.extend(json_chunk_bytes)
+    glb.extend(struct.pack("<I", len(bin_chunk_bytes) + len(bin_chunk_padding_bytes)))
+    glb.extend(b"BIN\x00")
+    glb.extend(bin_chunk_bytes)
+    glb.extend(bin_chunk_padding_bytes)
+    return bytes(glb)
+
+
+class TestGltfAccessor(TestCase):
+    def test_interleaved(self) -> None:
+        buffer0_bytes = b"".join(
+            struct.pack("<3f2H", i, i + 0.5, -i, i * 1000, 65535) for i in range(3)
+        )
+        json_dict: dict[str, Json] = {
+            "accessors": [
+                {
+                    "bufferView": 0,
+                    "componentType": GL_FLOAT,
+                    "count": 3,
+                    "type": "VEC3",
+                },
+                {
+                    "bufferView": 0,
+                    "byteOffset": 12,
+                    "componentType": GL_UNSIGNED_SHORT,
+                    "count": 3,
+                    "type": "VEC2",
+                    "normalized": True,
+                },
+            ],
+            "bufferViews": [
+                {"buffer": 0, "byteLength": len(buffer0_bytes), "byteStride": 16},
+            ],
+            "buffers": [{"byteLength": len(buffer0_bytes)}],
+        }
+
+        self.assertEqual(
+            read_accessors(json_dict, buffer0_bytes),
+            (
+                ((0.0, 0.5, 0.0), (1.0, 1.5, -1.0), (2.0, 2.5, -2.0)),
+                ((0, 65535), (1000, 65535), (2000, 65535)),
+            ),
+        )
+
+        positions, uvs = read_accessors(json_dict, buffer0_bytes, as_ndarray=True)
+        if positions is None or uvs is None:
+            self.fail()
+        self.assertEqual(positions.shape, (3, 3))
+        self.assertFalse(positions.flags.writeable)
+        self.assertEqual(
+            positions.tolist(), [[0.0, 0.5, 0.0], [1.0, 1.5, -1.0], [2.0, 2.5, -2.0]]
+        )
+        self.assertEqual(uvs.shape, (3, 2))
+        self.assertAlmostEqual(float(uvs[1][0]), 1000 / 65535)
+        self.assertAlmostEqual(float(uvs[2][1]), 1.0)
+
+    def test_mat4(self) -> None:
+        buffer0_bytes = struct.pack("<32f", *range(32))
+        accessor_dict: dict[str, Json] = {
+            "bufferView": 0,
+            "componentType": GL_FLOAT,
+            "count": 2,
+            "type": "MAT4",
+        }
+        buffer_view_dicts: list[Json] = [
+            {"buffer": 0, "byteLength": len(buffer0_bytes)}
+        ]
+        buffer_dicts: list[Json] = [{"byteLength": len(buffer0_bytes)}]
+
+        array = read_accessor_as_ndarray(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        if array is None:
+            self.fail()
+        self.assertEqual(array.shape, (2, 4, 4))
+        self.assertEqual(array[1][2].tolist(), [24.0, 25.0, 26.0, 27.0])
+
+        mat4s = read_mat4_accessor(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        if mat4s is None:
+            self.fail()
+        self.assertEqual(mat4s[1][2], (24.0, 25.0, 26.0, 27.0))
+
+    def test_mat3_column_alignment(self) -> None:
+        buffer0_bytes = bytes([1, 2, 3, 0, 4, 5, 6, 0, 7, 8, 9, 0])
+        array = read_accessor_as_ndarray(
+            {
+                "bufferView": 0,
+                "componentType": GL_UNSIGNED_BYTE,
+                "count": 1,
+                "type": "MAT3",
+            },
+            [{"buffer": 0, "byteLength": len(buffer0_bytes)}],
+            [{"byteLength": len(buffer0_bytes)}],
+            buffer0_bytes,
+        )
+        if array is None:
+            self.fail()
+        self.assertEqual(array.tolist(), [[[1, 2, 3], [4, 5, 6], [7, 8, 9]]])
+
+    def test_out_of_range(self) -> None:
+        buffer0_bytes = struct.pack("<5f", *range(5))
+        array = read_accessor_as_ndarray(
+            {
+                "bufferView": 0,
+                "componentType": GL_FLOAT,
+                "count": 2,
+                "type": "VEC3",
+            },
+            [{"buffer": 0, "byteLength": len(buffer0_bytes)}],
+            [{"byteLength": len(buffer0_bytes)}],
+            buffer0_bytes,
+        )
+        self.assertIsNone(array)
+
+
+class TestGlb(TestCase):
+    def test_open_glb(self) -> None:
+        json_dict: dict[str, Json] = {"asset": {"version": "2.0"}}
+        glb = pack_glb(json_dict, b"\x01\x02\x03")
+        self.assertEqual(parse_glb(glb), (json_dict, b"\x01\x02\x03\x00"))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "test.glb")
+            path.write_bytes(glb)
+            with open_glb(path) as (read_json_dict, bin_chunk_bytes):
+                self.assertEqual(read_json_dict, json_dict)
+                self.assertEqual(bin_chunk_bytes.tobytes(), b"\x01\x02\x03\x00")
+
+    def test_write_glb(self) -> None:
+        json_dict: dict[str, Json] = {"asset": {"version": "2.0"}, "name": "\u3042"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "test.glb")
+            with path.open("wb") as file:
+                length = write_glb(
+                    file,
+                    json_dict,
+                    [b"\x01\x02", bytearray(b"\x03"), memoryview(b"\x04\x05")],
+                )
+            glb = path.read_bytes()
+        self.assertEqual(length, len(glb))
+        self.assertEqual(glb, pack_glb(json_dict, b"\x01\x02\x03\x04\x05"))
+        self.assertEqual(
+            parse_glb(glb), (json_dict, b"\x01\x02\x03\x04\x05\x00\x00\x00")
+        )
+
+    def test_write_glb_segments(self) -> None:
+        for seed in range(200):
+            rng = random.Random(seed)  # noqa: S311
+            json_dict: dict[str, Json] = {
+                "asset": {"version": "2.0"},
+                "name": "あ" * rng.randrange(8),
+                "extras": {"padding": "x" * rng.randrange(8)},
+            }
+            bin_chunk_segments: list[BinChunkSegment] = []
+            for _ in range(rng.randrange(6)):
+                segment = rng.randbytes(rng.randrange(4) * 4 + rng.randrange(4))
+                segment_type = rng.randrange(4)
+                if segment_type == 0:
+                    bin_chunk_segments.append(segment)
+                elif segment_type == 1:
+                    bin_chunk_segments.append(bytearray(segment))
+                elif segment_type == 2:
+                    bin_chunk_segments.append(memoryview(segment))
+                else:
+                    # 要素数とバイト数が異なるmemoryview
+                    aligned_segment = segment[: len(segment) // 4 * 4]
+                    bin_chunk_segments.append(memoryview(aligned_segment).cast("I"))
+            bin_chunk_bytes = b"".join(bytes(s) for s in bin_chunk_segments)
+
+            with BytesIO() as file:
+                length = write_glb(file, json_dict, bin_chunk_segments)
+                glb = file.getvalue()
+            expected_glb = pack_glb_in_memory(json_dict, bin_chunk_bytes)
+            self.assertEqual(length, len(glb), f"seed={seed}")
+            self.assertEqual(glb, expected_glb, f"seed={seed}")
+            self.assertEqual(pack_glb(json_dict, bin_chunk_bytes), glb, f"seed={seed}")
+
+            self.assertEqual(len(glb) % 4, 0, f"seed={seed}")
+            (json_chunk_length,) = struct.unpack_from("<I", glb, 12)
+            self.assertEqual(json_chunk_length % 4, 0, f"seed={seed}")
+            read_json_dict, read_bin_chunk_bytes = parse_glb(glb)
+            self.assertEqual(read_json_dict, json_dict, f"seed={seed}")
+            self.assertEqual(
+                read_bin_chunk_bytes,
+                bin_chunk_bytes + b"\x00" * (-len(bin_chunk_bytes) % 4),
+                f"seed={seed}",
+            )
+
+    def test_open_glb_broken(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "test.glb")
+            path.write_bytes(b"glTF\x02\x00\x00\x00\xff\xff\x00\x00")
+            with self.assertRaises(ValueError), open_glb(path):
+                pass
+
+            path.write_bytes(b"")
+            with self.assertRaises(ValueError), open_glb(path):
+                pass
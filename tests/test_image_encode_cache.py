@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import os
+import random
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import bpy
+import numpy as np
+from bpy.types import Image
+
+from io_scene_vrm.exporter import image_encode_cache
+from io_scene_vrm.exporter.image_encode_cache import (
+    CACHE_FILE_SUFFIX,
+    ImageEncodeSession,
+    create_cache_key_prefix,
+    evict_cache,
+    find_cache,
+    image_encode_session,
+    read_pixels,
+)
+from io_scene_vrm.external.io_scene_gltf2_support import create_export_settings
+
+
+class TestImageEncodeCache(TestCase):
+    def setUp(self) -> None:
+        self.images: list[Image] = []
+
+    def tearDown(self) -> None:
+        for image in self.images:
+            bpy.data.images.remove(image)
+
+    def new_image(self, seed: int) -> Image:
+        image = bpy.data.images.new(f"image_encode_cache_test_{seed}", 8, 8, alpha=True)
+        self.images.append(image)
+        rng = random.Random(seed)  # noqa: S311
+        image.pixels.foreach_set(
+            np.array([rng.random() for _ in range(8 * 8 * 4)], dtype=np.float32)
+        )
+        return image
+
+    def test_cache_hit_returns_same_bytes_as_miss(self) -> None:
+        image = self.new_image(0)
+        export_settings = create_export_settings()
+        with (
+            tempfile.TemporaryDirectory() as temp_dir,
+            ThreadPoolExecutor() as executor,
+        ):
+            cache_dir = Path(temp_dir)
+
+            session = ImageEncodeSession(executor, cache_dir)
+            miss_results = session.encode_images([image], export_settings)
+            for write_future in session.write_futures:
+                write_future.result()
+            self.assertEqual(len(list(cache_dir.glob("*" + CACHE_FILE_SUFFIX))), 1)
+
+            session = ImageEncodeSession(executor, cache_dir)
+            with patch.object(
+                image_encode_cache,
+                "image_to_image_bytes",
+                side_effect=AssertionError("The image is encoded again"),
+            ):
+                hit_results = session.encode_images([image], export_settings)
+            self.assertEqual(session.write_futures, [])
+
+        self.assertEqual(hit_results, miss_results)
+
+    def test_key_changes_with_colorspace_quality_and_pixels(self) -> None:
+        image = self.new_image(1)
+        mime_type = "image/png"
+        export_settings = create_export_settings()
+
+        key_prefix = create_cache_key_prefix(image, mime_type, export_settings)
+        self.assertEqual(
+            create_cache_key_prefix(image, mime_type, export_settings), key_prefix
+        )
+
+        image.colorspace_settings.name = "Non-Color"
+        self.assertNotEqual(
+            create_cache_key_prefix(image, mime_type, export_settings), key_prefix
+        )
+        image.colorspace_settings.name = "sRGB"
+
+        for quality_key in ["gltf_image_quality", "gltf_jpeg_quality"]:
+            changed_export_settings = dict(export_settings)
+            changed_export_settings[quality_key] = 50
+            self.assertNotEqual(
+                create_cache_key_prefix(image, mime_type, changed_export_settings),
+                key_prefix,
+                quality_key,
+            )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            pixels = read_pixels(image)
+            if pixels is None:
+                raise AssertionError
+            path, _ = find_cache(cache_dir, key_prefix, pixels)
+            self.assertEqual(find_cache(cache_dir, key_prefix, pixels.copy())[0], path)
+            pixels[0] += 0.5
+            self.assertNotEqual(find_cache(cache_dir, key_prefix, pixels)[0], path)
+
+    def test_evict_cache_removes_least_recently_used_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir)
+            paths: list[Path] = []
+            for index, mtime in enumerate([300, 100, 400, 200]):
+                path = cache_dir / f"{index}{CACHE_FILE_SUFFIX}"
+                path.write_bytes(bytes(10))
+                os.utime(path, (mtime, mtime))
+                paths.append(path)
+            other_path = cache_dir / "other.tmp"
+            other_path.write_bytes(bytes(100))
+
+            evict_cache(cache_dir, 25)
+
+            self.assertEqual(
+                [path.exists() for path in paths], [True, False, True, False]
+            )
+            self.assertTrue(other_path.exists())
+
+            evict_cache(cache_dir, 20)
+            self.assertEqual(
+                [path.exists() for path in paths], [True, False, True, False]
+            )
+
+    def test_disabled_preference_skips_cache(self) -> None:
+        image = self.new_image(2)
+        export_settings = create_export_settings()
+        with (
+            patch.object(
+                image_encode_cache,
+                "get_preferences",
+                return_value=SimpleNamespace(enable_image_encode_cache=False),
+            ),
+            patch.object(
+                image_encode_cache,
+                "get_cache_dir",
+                side_effect=AssertionError("The cache directory is used"),
+            ),
+            patch.object(
+                image_encode_cache,
+                "find_cache",
+                side_effect=AssertionError("The cache is read"),
+            ),
+            patch.object(
+                image_encode_cache,
+                "evict_cache",
+                side_effect=AssertionError("The cache is evicted"),
+            ),
+            image_encode_session(bpy.context) as session,
+        ):
+            self.assertIsNone(session.cache_dir)
+            ((image_bytes, mime_type),) = session.encode_images(
+                [image], export_settings
+            )
+            self.assertEqual(session.write_futures, [])
+
+        self.assertEqual(mime_type, "image/png")
+        self.assertGreater(len(image_bytes), 0)
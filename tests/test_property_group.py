@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+from typing import TypeVar
+from unittest import TestCase
+
+from io_scene_vrm.common.vrm0 import human_bone as vrm0_human_bone
+from io_scene_vrm.common.vrm1 import human_bone as vrm1_human_bone
+from io_scene_vrm.editor.property_group import BonePropertyGroup, BoneTreeIndex
+
+HumanBoneSpecification = TypeVar(
+    "HumanBoneSpecification",
+    vrm0_human_bone.HumanBoneSpecification,
+    vrm1_human_bone.HumanBoneSpecification,
+)
+
+
+def create_bone_tree_index(parent_indices: list[int]) -> BoneTreeIndex:
+    bone_names = tuple(f"bone{index}" for index in range(len(parent_indices)))
+    children_indices: list[list[int]] = [[] for _ in parent_indices]
+    for index, parent_index in enumerate(parent_indices):
+        if parent_index >= 0:
+            children_indices[parent_index].append(index)
+
+    enter_indices = [0] * len(parent_indices)
+    exit_indices = [0] * len(parent_indices)
+    order = 0
+
+    def visit(index: int) -> None:
+        nonlocal order
+        enter_indices[index] = order
+        order += 1
+        for child_index in children_indices[index]:
+            visit(child_index)
+        exit_indices[index] = order - 1
+
+    for index, parent_index in enumerate(parent_indices):
+        if parent_index < 0:
+            visit(index)
+
+    return BoneTreeIndex(
+        bone_names=bone_names,
+        parent_indices=tuple(parent_indices),
+        bone_name_to_index={name: index for index, name in enumerate(bone_names)},
+        enter_indices=tuple(enter_indices),
+        exit_indices=tuple(exit_indices),
+    )
+
+
+def find_bone_candidates_by_flood_fill(
+    parent_indices: list[int],
+    target: HumanBoneSpecification,
+    bone_index_to_human_bone_specification: dict[int, HumanBoneSpecification],
+) -> set[int]:
+    """祖先を辿り部分木を塗りつぶしていた、以前のfind_bone_candidates()の実装."""
+    children_indices: list[list[int]] = [[] for _ in parent_indices]
+    root_indices: list[int] = []
+    for index, parent_index in enumerate(parent_indices):
+        if parent_index < 0:
+            root_indices.append(index)
+        else:
+            children_indices[parent_index].append(index)
+
+    result = set(range(len(parent_indices)))
+    remove_bones_tree: set[int] = set()
+
+    for (
+        bone_index,
+        human_bone_specification,
+    ) in bone_index_to_human_bone_specification.items():
+        if human_bone_specification == target:
+            continue
+
+        parent = bone_index
+
+        if human_bone_specification.is_ancestor_of(target):
+            remove_ancestors = True
+            remove_ancestor_branches = True
+        elif target.is_ancestor_of(human_bone_specification):
+            remove_bones_tree.add(parent)
+            remove_ancestors = False
+            remove_ancestor_branches = True
+        else:
+            remove_bones_tree.add(parent)
+            remove_ancestors = True
+            remove_ancestor_branches = False
+
+        while True:
+            if remove_ancestors:
+                result.discard(parent)
+            grand_parent = parent_indices[parent]
+            if grand_parent < 0:
+                if remove_ancestor_branches:
+                    remove_bones_tree.update(
+                        root_index
+                        for root_index in root_indices
+                        if root_index != parent
+                    )
+                break
+
+            if remove_ancestor_branches:
+                for grand_parent_child in children_indices[grand_parent]:
+                    if grand_parent_child != parent:
+                        remove_bones_tree.add(grand_parent_child)
+
+            parent = grand_parent
+
+    while remove_bones_tree:
+        child = remove_bones_tree.pop()
+        result.discard(child)
+        remove_bones_tree.update(children_indices[child])
+
+    return result
+
+
+class TestBonePropertyGroup(TestCase):
+    def assert_bone_candidates_match_flood_fill(
+        self,
+        all_human_bones: list[HumanBoneSpecification],
+        seed: int,
+    ) -> None:
+        rng = random.Random(seed)  # noqa: S311
+        bone_count = rng.randint(1, 40)
+        parent_indices = [
+            rng.randrange(-1, index) if index else -1 for index in range(bone_count)
+        ]
+        bone_tree_index = create_bone_tree_index(parent_indices)
+
+        assigned_bone_indices = rng.sample(
+            range(bone_count), rng.randint(0, min(bone_count, 12))
+        )
+        human_bone_specifications = rng.sample(
+            all_human_bones, len(assigned_bone_indices)
+        )
+        bone_index_to_human_bone_specification = dict(
+            zip(assigned_bone_indices, human_bone_specifications)
+        )
+        bpy_bone_name_to_human_bone_specification = {
+            bone_tree_index.bone_names[bone_index]: human_bone_specification
+            for (
+                bone_index,
+                human_bone_specification,
+            ) in bone_index_to_human_bone_specification.items()
+        }
+
+        for target in rng.sample(all_human_bones, 4):
+            expected = find_bone_candidates_by_flood_fill(
+                parent_indices, target, bone_index_to_human_bone_specification
+            )
+            bone_index_and_relations = BonePropertyGroup.find_bone_index_and_relations(
+                bone_tree_index,
+                target,
+                bpy_bone_name_to_human_bone_specification,
+            )
+            candidate_indices = BonePropertyGroup.find_bone_candidate_indices(
+                bone_tree_index, bone_index_and_relations
+            )
+            self.assertEqual(
+                candidate_indices, sorted(candidate_indices), f"seed={seed}"
+            )
+            self.assertEqual(set(candidate_indices), expected, f"seed={seed}")
+
+    def test_find_bone_candidate_indices_vrm0(self) -> None:
+        for seed in range(1000):
+            self.assert_bone_candidates_match_flood_fill(
+                list(vrm0_human_bone.HumanBoneSpecifications.all_human_bones), seed
+            )
+
+    def test_find_bone_candidate_indices_vrm1(self) -> None:
+        for seed in range(1000):
+            self.assert_bone_candidates_match_flood_fill(
+                list(vrm1_human_bone.HumanBoneSpecifications.all_human_bones), seed
+            )
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import random
+from unittest import TestCase
+
+from io_scene_vrm.editor.search import (
+    CONSTRAINT_OWNER_TYPE_BONE,
+    CONSTRAINT_OWNER_TYPE_OBJECT,
+    ConstraintGraph,
+    find_strongly_connected_components,
+)
+
+
+def create_constraint_graph(
+    target_indices: list[int], axis_masks: list[int]
+) -> ConstraintGraph:
+    return ConstraintGraph(
+        owner_types=tuple(
+            CONSTRAINT_OWNER_TYPE_BONE if index % 2 else CONSTRAINT_OWNER_TYPE_OBJECT
+            for index in range(len(target_indices))
+        ),
+        owner_names=tuple(f"owner{index}" for index in range(len(target_indices))),
+        constraint_names=tuple(
+            f"constraint{index}" for index in range(len(target_indices))
+        ),
+        axis_masks=tuple(axis_masks),
+        edges=tuple(
+            () if target_index < 0 else (target_index,)
+            for target_index in target_indices
+        ),
+    )
+
+
+def find_circular_dependency_indices_by_walk(
+    target_indices: list[int], axis_masks: list[int]
+) -> list[int]:
+    """コンストレイントごとにターゲットを辿っていた、以前の検出と同等の実装."""
+    result: list[int] = []
+    for start_index in range(len(target_indices)):
+        axis_mask = axis_masks[start_index]
+        index = start_index
+        visited_indices: set[int] = set()
+        while index not in visited_indices:
+            visited_indices.add(index)
+            target_index = target_indices[index]
+            if target_index < 0:
+                break
+            axis_mask &= axis_masks[target_index]
+            if not axis_mask:
+                break
+            if target_index == start_index:
+                result.append(start_index)
+                break
+            index = target_index
+    return result
+
+
+class TestConstraintGraph(TestCase):
+    def test_find_circular_dependency_indices(self) -> None:
+        for seed in range(1000):
+            rng = random.Random(seed)  # noqa: S311
+            constraint_count = rng.randint(1, 12)
+            target_indices = [
+                rng.randrange(-1, constraint_count) for _ in range(constraint_count)
+            ]
+            # ロールのコンストレイントは1軸、回転のコンストレイントは3軸
+            axis_masks = [
+                rng.choice([0b001, 0b010, 0b100, 0b111, 0b111])
+                for _ in range(constraint_count)
+            ]
+            graph = create_constraint_graph(target_indices, axis_masks)
+            self.assertEqual(
+                graph.find_circular_dependency_indices(),
+                find_circular_dependency_indices_by_walk(target_indices, axis_masks),
+                f"seed={seed}",
+            )
+
+    def test_find_circular_dependency_indices_axis(self) -> None:
+        # 0 -> 1 -> 2 -> 0 の循環だが、共通する軸が無い
+        graph = create_constraint_graph([1, 2, 0], [0b011, 0b110, 0b101])
+        self.assertEqual(graph.find_circular_dependency_indices(), [])
+
+        # 共通するY軸で循環する。循環に流れ込むだけの3は含めない
+        graph = create_constraint_graph([1, 2, 0, 0], [0b011, 0b110, 0b111, 0b111])
+        self.assertEqual(graph.find_circular_dependency_indices(), [0, 1, 2])
+
+        # 自分自身をターゲットにしている
+        graph = create_constraint_graph([0, -1], [0b100, 0b111])
+        self.assertEqual(graph.find_circular_dependency_indices(), [0])
+
+    def test_find_circular_dependency_indices_deep(self) -> None:
+        constraint_count = 100000
+        target_indices = [
+            (index + 1) % constraint_count for index in range(constraint_count)
+        ]
+        graph = create_constraint_graph(target_indices, [0b111] * constraint_count)
+        self.assertEqual(
+            graph.find_circular_dependency_indices(), list(range(constraint_count))
+        )
+
+        target_indices[-1] = -1
+        graph = create_constraint_graph(target_indices, [0b111] * constraint_count)
+        self.assertEqual(graph.find_circular_dependency_indices(), [])
+
+
+class TestFindStronglyConnectedComponents(TestCase):
+    def test_find_strongly_connected_components(self) -> None:
+        components = find_strongly_connected_components(
+            [[1], [2, 3], [0], [4], [5], [3], []]
+        )
+        self.assertEqual(
+            sorted(sorted(component) for component in components),
+            [[0, 1, 2], [3, 4, 5], [6]],
+        )
@@ -5,6 +5,8 @@ from typing import Callable
 def persistent(function: Callable[[object], None]) -> Callable[[object], None]: ...
 
 # TODO: 引数の型を調べる
+animation_playback_post: MutableSequence[Callable[[object], None]]
+animation_playback_pre: MutableSequence[Callable[[object], None]]
 depsgraph_update_post: MutableSequence[Callable[[object], None]]
 depsgraph_update_pre: MutableSequence[Callable[[object], None]]
 frame_change_post: MutableSequence[Callable[[object], None]]
@@ -39,6 +39,7 @@ class bpy_prop_collection(Generic[__BpyPropCollectionElement]):
         key: str,
         default: Optional[__BpyPropCollectionElement] = None,
     ) -> Optional[__BpyPropCollectionElement]: ...
+    def find(self, key: str) -> int: ...
     def __contains__(self, key: str) -> bool: ...
     def __iter__(self) -> Iterator[__BpyPropCollectionElement]: ...
     @overload
@@ -49,6 +50,8 @@ class bpy_prop_collection(Generic[__BpyPropCollectionElement]):
     def keys(self) -> KeysView[str]: ...
     def values(self) -> ValuesView[__BpyPropCollectionElement]: ...
     def items(self) -> ItemsView[str, __BpyPropCollectionElement]: ...
+    def foreach_get(self, attr: str, seq: object) -> None: ...
+    def foreach_set(self, attr: str, seq: object) -> None: ...
 
 # ドキュメントには存在しない
 __BpyPropArrayElement = TypeVar("__BpyPropArrayElement")
@@ -60,6 +63,9 @@ class bpy_prop_array(Generic[__BpyPropArrayElement]):
     @overload
     def __getitem__(self, index: slice) -> tuple[__BpyPropArrayElement, ...]: ...
     def __setitem__(self, index: int, value: __BpyPropArrayElement) -> None: ...
+    def __len__(self) -> int: ...
+    def foreach_get(self, seq: object) -> None: ...
+    def foreach_set(self, seq: object) -> None: ...
 
 # カスタムプロパティ対応クラス。2.93ではID,Bone,PoseBoneのみ
 # https://docs.blender.org/api/2.93/bpy.types.bpy_struct.html#bpy.types.bpy_struct.values
@@ -78,6 +84,8 @@ class ID(bpy_struct, __CustomProperty):
     is_evaluated: bool
     users: int
     use_fake_user: bool
+    @property
+    def original(self) -> ID: ...
 
     def animation_data_create(self) -> Optional[AnimData]: ...
     def animation_data_clear(self) -> None: ...
@@ -216,8 +224,12 @@ class Image(ID):
     generated_height: int
     generated_width: int
     is_dirty: bool
+    is_float: bool
+    has_data: bool
+    channels: int
     bindcode: int
     source: str
+    pixels: bpy_prop_array[float]
     @property
     def packed_file(self) -> Optional[PackedFile]: ...  # Optionalっぽい
     def filepath_from_user(self, image_user: Optional[ImageUser] = None) -> str: ...
@@ -233,6 +245,12 @@ class TimelineMarker(bpy_struct):
 
 class ActionPoseMarkers(bpy_prop_collection[TimelineMarker]): ...
 
+class Keyframe(bpy_struct):
+    interpolation: str
+
+class FCurveKeyframePoints(bpy_prop_collection[Keyframe]):
+    def add(self, count: int) -> None: ...
+
 class FCurve(bpy_struct):
     array_index: int
     auto_smoothing: str
@@ -244,10 +262,18 @@ class FCurve(bpy_struct):
     extrapolation: str
     is_valid: bool
     mute: bool
+    @property
+    def keyframe_points(self) -> FCurveKeyframePoints: ...
 
     def evaluate(self, frame: int) -> float: ...
+    def update(self) -> None: ...
 
-class ActionFCurves(bpy_prop_collection[FCurve]): ...
+class ActionFCurves(bpy_prop_collection[FCurve]):
+    def new(
+        self, data_path: str, index: int = 0, action_group: str = ""
+    ) -> FCurve: ...
+    def find(self, data_path: str, index: int = 0) -> Optional[FCurve]: ...
+    def remove(self, fcurve: FCurve) -> None: ...
 
 class Action(ID):
     @property
@@ -283,8 +309,20 @@ class SpaceView3D(Space):
         region_type: str,
     ) -> None: ...
 
+class DepsgraphUpdate(bpy_struct):
+    @property
+    def id(self) -> ID: ...
+    @property
+    def is_updated_geometry(self) -> bool: ...
+    @property
+    def is_updated_shading(self) -> bool: ...
+    @property
+    def is_updated_transform(self) -> bool: ...
+
 class Depsgraph(bpy_struct):
     def update(self) -> None: ...
+    @property
+    def updates(self) -> bpy_prop_collection[DepsgraphUpdate]: ...
 
 class DriverTarget(bpy_struct):
     bone_target: str
@@ -646,11 +684,18 @@ class ShapeKeyPoint(bpy_struct):
 class ShapeKey(bpy_struct):
     name: str
     value: float
+    mute: bool
+    slider_min: float
+    slider_max: float
+    vertex_group: str
+    @property
+    def relative_key(self) -> ShapeKey: ...
     @property  # TODO: UnknownTypeになっている
     def data(self) -> bpy_prop_collection[ShapeKeyPoint]: ...
     def normals_split_get(self) -> Sequence[float]: ...  # TODO: 正しい型
 
 class Key(ID):
+    use_relative: bool
     @property
     def key_blocks(self) -> bpy_prop_collection[ShapeKey]: ...
     @property
@@ -1726,6 +1771,7 @@ class Scene(ID):
     frame_current: int
     frame_end: int
 
+    def frame_set(self, frame: int, subframe: float = 0.0) -> None: ...
     @property
     def collection(self) -> Collection: ...
     @property
@@ -1909,6 +1955,13 @@ class BlendDataImages(bpy_prop_collection[Image]):
         tiled: bool = False,
     ) -> Image: ...
     def load(self, filepath: str, check_existing: bool = False) -> Image: ...
+    def remove(
+        self,
+        image: Image,
+        do_unlink: bool = True,
+        do_id_user: bool = True,
+        do_ui_user: bool = True,
+    ) -> None: ...
 
 class BlendDataArmatures(bpy_prop_collection[Armature]):
     def new(self, name: str) -> Armature: ...
@@ -2120,6 +2173,7 @@ class Operator(bpy_struct):
     bl_label: str
     @property
     def layout(self) -> UILayout: ...
+    def report(self, type: set[str], message: str) -> None: ...
 
 # この型はUILayout.prop_searchで使うけど、ドキュメントが曖昧なためいまいちな定義になる
 AnyType: typing_extensions.TypeAlias = Union[ID, BlendData, Operator, PropertyGroup]
@@ -45,3 +45,9 @@ def unregister_class(
         ]
     ],
 ) -> None: ...
+def user_resource(
+    resource_type: str, *, path: str = "", create: bool = False
+) -> str: ...
+def extension_path_user(
+    package: str, *, path: str = "", create: bool = False
+) -> str: ...